@@ -3,12 +3,12 @@
 Streamlit + LangGraph + MCP 통합 채팅 애플리케이션
 """
 
-import asyncio
 import os
 
 import streamlit as st
 
-from backend import ChatDatabase, ChatMessage, get_agent, settings
+from backend import ChatMessage, get_runtime, settings
+from components import render_streaming_response
 
 # 페이지 설정
 st.set_page_config(
@@ -19,14 +19,11 @@ st.set_page_config(
 )
 
 
-# 데이터베이스 초기화
-@st.cache_resource
-def get_database() -> ChatDatabase:
-    """데이터베이스 인스턴스 가져오기 (캐시됨)."""
-    return ChatDatabase()
+runtime = get_runtime()  # 에이전트와 MCP 연결은 백그라운드 루프 스레드에서 턴 간 재사용
 
-
-db = get_database()
+# 데이터베이스 (에이전트의 세션 요약과 같은 저장소, 조회 캐시 포함)
+db = runtime.storage
+adb = runtime.async_storage
 
 
 # 세션 상태 초기화
@@ -38,6 +35,10 @@ if "session_id" not in st.session_state:
     session = db.create_session(title="New Conversation")
     st.session_state.session_id = session.session_id
 
+# 이전 턴의 답변 저장이 끝난 뒤 세션 정보를 읽음
+if (pending_save := st.session_state.pop("pending_save", None)) is not None:
+    pending_save.result()
+
 
 # 타이틀
 st.title(f"{settings.page_icon} MCP Chat Client")
@@ -101,37 +102,38 @@ if prompt := st.chat_input("메시지를 입력하세요..."):
     with st.chat_message("user"):
         st.markdown(prompt)
 
-    # 데이터베이스에 저장
     user_msg = ChatMessage(role="user", content=prompt, session_id=st.session_state.session_id)
-    db.add_message(st.session_state.session_id, user_msg)
 
-    # AI 응답 생성
+    # AI 응답 생성 (토큰 단위 스트리밍, 사용자 메시지 저장은 응답 생성과 겹쳐서 진행)
+    save_future = runtime.submit(adb.add_message(user_msg.session_id, user_msg))
     with st.chat_message("assistant"):
-        with st.spinner("🤔 생각 중..."):
-            try:
-                # 에이전트 가져오기 및 응답 생성
-                agent = asyncio.run(get_agent())
-                response = asyncio.run(
-                    agent.chat(prompt, history=st.session_state.messages[:-1])
+        try:
+            response, _ = render_streaming_response(
+                runtime.stream_chat(
+                    prompt,
+                    history=st.session_state.messages[:-1],
+                    session_id=user_msg.session_id,
                 )
-            except Exception as e:
-                response = f"❌ 오류 발생: {str(e)}\n\n"
-                response += "**해결 방법:**\n"
-                response += "1. Ollama가 실행 중인지 확인하세요\n"
-                response += "2. 환경변수가 올바른지 확인하세요\n"
-                response += f"   - OPENAI_API_BASE={settings.openai_api_base}\n"
-                response += f"   - OPENAI_API_KEY={settings.openai_api_key}\n"
+            )
+        except Exception as e:
+            response = f"❌ 오류 발생: {str(e)}\n\n"
+            response += "**해결 방법:**\n"
+            response += "1. Ollama가 실행 중인지 확인하세요\n"
+            response += "2. 환경변수가 올바른지 확인하세요\n"
+            response += f"   - OPENAI_API_BASE={settings.openai_api_base}\n"
+            response += f"   - OPENAI_API_KEY={settings.openai_api_key}\n"
 
             st.markdown(response)
+    save_future.result()
 
     # 응답 저장
     st.session_state.messages.append({"role": "assistant", "content": response})
 
-    # 데이터베이스에 저장
-    assistant_msg = ChatMessage(
-        role="assistant", content=response, session_id=st.session_state.session_id
+    # 데이터베이스에 저장 (사용자 메시지는 응답 생성 중에 이미 저장됨, 답변은 백그라운드에서)
+    assistant_msg = ChatMessage(role="assistant", content=response, session_id=user_msg.session_id)
+    st.session_state.pending_save = runtime.submit(
+        adb.add_message(user_msg.session_id, assistant_msg)
     )
-    db.add_message(st.session_state.session_id, assistant_msg)
 
 # 하단 안내
 st.divider()
@@ -1,17 +1,73 @@
 """Backend package for MCP Chat Client."""
 
+from .agent_pool import AgentPool, PoolRejected
+from .agent_runtime import AgentRuntime, get_runtime
+from .async_database import AsyncChatDatabase
+from .cache import CachedChatStorage
 from .config import settings
+from .context import ContextBudget
 from .database import ChatDatabase
-from .langgraph_agent import MCPAgent, get_agent
-from .models import AgentResponse, ChatMessage, ChatSession, MCPServerConfig
+from .langgraph_agent import MCPAgent, get_agent, get_llm_gateway
+from .mcp_sessions import MCPSessionManager
+from .memory_storage import InMemoryChatStorage
+from .models import (
+    AgentPoolStats,
+    AgentResponse,
+    CacheStats,
+    ChatMessage,
+    ChatSession,
+    ContextStats,
+    MCPServerConfig,
+    MCPServerStatus,
+    ReplayReport,
+    ResponseCacheStats,
+    RetentionPolicy,
+    StageStats,
+)
+from .records import MessageRecord, SessionRecord
+from .response_cache import ResponseCache
+from .sql_storage import SQLChatStorage
+from .storage import ChatStorage, create_storage
+from .tool_cache import ToolResultCache
+from .tool_node import ToolLimiter, create_tool_node
+from .tracing import Tracer, get_tracer
 
 __all__ = [
     "settings",
     "ChatDatabase",
+    "AsyncChatDatabase",
+    "ChatStorage",
+    "create_storage",
+    "InMemoryChatStorage",
+    "SQLChatStorage",
+    "CachedChatStorage",
+    "CacheStats",
     "MCPAgent",
     "get_agent",
+    "get_llm_gateway",
+    "AgentRuntime",
+    "get_runtime",
+    "AgentPool",
+    "AgentPoolStats",
+    "PoolRejected",
+    "MCPSessionManager",
+    "ToolLimiter",
+    "ToolResultCache",
+    "create_tool_node",
+    "ContextBudget",
+    "ContextStats",
+    "ResponseCache",
+    "ResponseCacheStats",
+    "Tracer",
+    "get_tracer",
+    "StageStats",
+    "ReplayReport",
     "ChatMessage",
     "ChatSession",
     "MCPServerConfig",
+    "MCPServerStatus",
     "AgentResponse",
+    "RetentionPolicy",
+    "MessageRecord",
+    "SessionRecord",
 ]
@@ -0,0 +1,279 @@
+"""Multi-session agent pool with per-session graph threads.
+
+`MCPAgent`는 매 턴 히스토리 전체를 메시지로 받아 처음부터 다시 보냈고, 동시 실행에는
+아무 제한이 없었습니다. `AgentPool`은 체크포인터를 가진 `MCPAgent` 하나를 여러 세션이
+함께 쓰게 하면서 다음을 관리합니다.
+
+- 세션 스레드: session_id가 LangGraph thread_id가 되어 대화 상태가 체크포인터에 남으므로
+  턴마다 새 메시지만 보냅니다. 메모리에 없는 세션(처음이거나 밀려난 세션)은 채팅
+  저장소(`ChatDatabase` 등)의 히스토리로 스레드를 다시 채웁니다.
+- 동시 실행: 전체 상한(`max_concurrency`)과 테넌트별 상한(`tenant_limit`),
+  세션당 한 턴 (같은 스레드를 두 턴이 동시에 고치지 않도록)
+- 수용 제어: 대기 중인 턴이 `max_queue`를 넘거나 `queue_timeout` 안에 슬롯을 얻지 못하면
+  `PoolRejected`로 바로 거절해, 과부하일 때 대기열이 끝없이 길어지지 않게 합니다.
+- 메모리: 스레드 수가 `max_threads`를 넘으면 가장 오래 쓰지 않은 스레드를 내리고,
+  `compact_turns` 턴마다 스레드의 체크포인트를 최신 하나로 정리합니다.
+
+테넌트는 호출자가 정하는 키(사용자, API 키 등)이며, 없으면 테넌트 상한을 적용하지 않습니다.
+
+사용 예:
+    >>> agent = MCPAgent(checkpointer=InMemorySaver())
+    >>> await agent.initialize()
+    >>> pool = AgentPool(agent, storage=create_storage(), max_concurrency=16)
+    >>> await pool.chat(session_id, "서울 날씨는?", tenant="user-1")
+    >>> async for event in pool.astream_chat(session_id, "부산은?"):
+    ...     print(event.type, event.content)
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+from .langgraph_agent import MCPAgent
+from .models import AgentEvent, AgentPoolStats
+
+logger = logging.getLogger(__name__)
+
+
+class PoolRejected(RuntimeError):
+    """혼잡으로 턴을 받지 못함 (대기열 초과 또는 대기 시간 초과)."""
+
+
+class AgentPool:
+    """세션별 그래프 스레드로 여러 대화를 동시에 실행하는 에이전트 풀."""
+
+    def __init__(
+        self,
+        agent: MCPAgent,
+        storage: Any | None = None,
+        max_concurrency: int = 16,
+        max_queue: int = 64,
+        queue_timeout: float | None = 30.0,
+        tenant_limit: int = 4,
+        max_threads: int = 1000,
+        compact_turns: int = 20,
+        seed_limit: int = 1000,
+    ) -> None:
+        """풀 생성.
+
+        Args:
+            agent: 체크포인터를 가진 에이전트
+            storage: 스레드를 다시 채울 때 히스토리를 읽을 채팅 저장소 (`ChatStorage` 또는
+                `AsyncChatDatabase`, 닫기는 호출자가 관리, 없으면 빈 스레드로 시작)
+            max_concurrency: 전체 동시 실행 턴 수
+            max_queue: 대기할 수 있는 턴 수 (넘치면 바로 거절)
+            queue_timeout: 슬롯을 기다리는 최대 시간 (초, None이면 무제한)
+            tenant_limit: 테넌트별 동시 실행 턴 수 (0이면 제한 없음)
+            max_threads: 체크포인터에 둘 세션 스레드 수
+            compact_turns: 이 턴 수마다 스레드 체크포인트 정리 (0이면 정리 안 함)
+            seed_limit: 스레드를 채울 때 읽을 최근 메시지 수
+        """
+        if agent.checkpointer is None:
+            raise ValueError("AgentPool에는 체크포인터가 있는 MCPAgent가 필요합니다")
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency는 1 이상이어야 합니다: {max_concurrency}")
+        self.agent = agent
+        self.storage = storage
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.tenant_limit = tenant_limit
+        self.max_threads = max_threads
+        self.compact_turns = compact_turns
+        self.seed_limit = seed_limit
+
+        self._slots = asyncio.Semaphore(max_concurrency)
+        # 실행 중이거나 기다리는 턴이 있는 테넌트만 (테넌트 → 세마포어, 턴 수)
+        self._tenants: dict[str, tuple[asyncio.Semaphore, int]] = {}
+        self._sessions: dict[str, asyncio.Lock] = {}
+        # 메모리에 있는 스레드 (LRU 순서) → 마지막 정리 이후 턴 수
+        self._threads: OrderedDict[str, int] = OrderedDict()
+        self._stats = AgentPoolStats(max_concurrency=max_concurrency)
+        self._wait_ms = 0.0
+        self._admitted = 0
+
+    # ========================================================================
+    # 채팅
+    # ========================================================================
+
+    async def chat(self, session_id: str, user_message: str, tenant: str | None = None) -> str:
+        """세션 스레드에 새 메시지를 보내고 응답을 반환합니다.
+
+        Raises:
+            PoolRejected: 대기열이 가득 찼거나 대기 시간 안에 실행하지 못한 경우
+        """
+        async with self._admit(session_id, tenant):
+            history = await self._seed_history(session_id, user_message)
+            try:
+                return await self.agent.chat(user_message, history, session_id=session_id)
+            finally:
+                await self._after_turn(session_id)
+
+    async def astream_chat(
+        self, session_id: str, user_message: str, tenant: str | None = None
+    ) -> AsyncIterator[AgentEvent]:
+        """`chat`과 같지만 응답을 이벤트 단위로 스트리밍합니다 (`MCPAgent.astream_chat`).
+
+        Raises:
+            PoolRejected: 첫 이벤트 전에, 혼잡으로 턴을 받지 못한 경우
+        """
+        async with self._admit(session_id, tenant):
+            history = await self._seed_history(session_id, user_message)
+            try:
+                async for event in self.agent.astream_chat(
+                    user_message, history, session_id=session_id
+                ):
+                    yield event
+            finally:
+                await self._after_turn(session_id)
+
+    def stats(self) -> AgentPoolStats:
+        """현재 실행/대기 수와 누적 카운터."""
+        stats = self._stats.model_copy(update={"threads": len(self._threads)})
+        if self._admitted:
+            stats.avg_wait_ms = self._wait_ms / self._admitted
+        return stats
+
+    # ========================================================================
+    # 수용 제어
+    # ========================================================================
+
+    @asynccontextmanager
+    async def _admit(self, session_id: str, tenant: str | None) -> AsyncIterator[None]:
+        """세션 → 테넌트 → 전체 순으로 슬롯을 잡고 턴을 실행 (못 잡으면 PoolRejected).
+
+        세션과 테넌트 슬롯을 먼저 잡아야, 같은 세션의 앞 턴이나 바쁜 테넌트를 기다리는
+        턴이 전체 슬롯을 차지하지 않습니다.
+        """
+        stats = self._stats
+        if stats.waiting >= self.max_queue:
+            stats.rejected += 1
+            raise PoolRejected(f"요청이 많아 처리할 수 없습니다 (대기 {stats.waiting}개)")
+
+        if tenant is not None and self.tenant_limit <= 0:
+            tenant = None
+        locks: list[asyncio.Lock | asyncio.Semaphore] = [self._session_lock(session_id)]
+        if tenant is not None:
+            locks.append(self._enter_tenant(tenant))
+        locks.append(self._slots)
+
+        acquired: list[asyncio.Lock | asyncio.Semaphore] = []
+        start = time.perf_counter()
+        stats.waiting += 1
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                for lock in locks:
+                    await lock.acquire()
+                    acquired.append(lock)
+        except TimeoutError:
+            self._release(acquired, tenant)
+            stats.rejected += 1
+            raise PoolRejected(
+                f"실행 대기 시간 초과 ({self.queue_timeout:g}초, 실행 중 {stats.running}개)"
+            ) from None
+        except BaseException:
+            self._release(acquired, tenant)
+            raise
+        finally:
+            stats.waiting -= 1
+
+        self._admitted += 1
+        self._wait_ms += (time.perf_counter() - start) * 1000
+        stats.running += 1
+        try:
+            yield
+        finally:
+            stats.running -= 1
+            stats.completed += 1
+            self._release(acquired, tenant)
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        lock = self._sessions.get(session_id)
+        if lock is None:
+            lock = self._sessions[session_id] = asyncio.Lock()
+        return lock
+
+    def _enter_tenant(self, tenant: str) -> asyncio.Semaphore:
+        """테넌트 세마포어 (턴 수를 세어 쉬는 테넌트는 `_release`에서 지움)."""
+        slot, turns = self._tenants.get(tenant) or (asyncio.Semaphore(self.tenant_limit), 0)
+        self._tenants[tenant] = (slot, turns + 1)
+        return slot
+
+    def _release(
+        self, acquired: list[asyncio.Lock | asyncio.Semaphore], tenant: str | None = None
+    ) -> None:
+        for lock in reversed(acquired):
+            lock.release()
+        if tenant is not None:
+            slot, turns = self._tenants[tenant]
+            if turns > 1:
+                self._tenants[tenant] = (slot, turns - 1)
+            else:
+                del self._tenants[tenant]
+
+    # ========================================================================
+    # 세션 스레드
+    # ========================================================================
+
+    async def _seed_history(self, session_id: str, user_message: str) -> list[dict[str, str]]:
+        """메모리에 없는 세션이면 저장소의 최근 히스토리 (스레드가 비어 있을 때만 에이전트가 사용).
+
+        채팅 페이지는 질문을 응답 생성 전에 저장하므로, 마지막 메시지가 이번 질문이면
+        빼고 돌려줍니다 (에이전트가 질문을 따로 붙임).
+        """
+        if session_id in self._threads or self.storage is None:
+            return []
+        try:
+            if inspect.iscoroutinefunction(self.storage.get_recent_messages):
+                # AsyncChatDatabase: 먼저 제출된 페이지의 저장이 끝난 뒤에 읽음
+                messages = await self.storage.get_recent_messages(session_id, self.seed_limit)
+            else:
+                messages = await asyncio.to_thread(
+                    self.storage.get_recent_messages, session_id, self.seed_limit
+                )
+        except Exception as e:
+            logger.warning(f"세션 히스토리 조회 실패, 빈 스레드로 시작합니다: {e}")
+            return []
+
+        if messages and messages[-1].role == "user" and messages[-1].content == user_message:
+            messages = messages[:-1]
+        history = [{"role": m.role, "content": m.content} for m in messages]
+        if history:
+            self._stats.seeded += 1
+        return history
+
+    async def delete_session(self, session_id: str) -> None:
+        """세션 스레드를 체크포인터에서 지움 (실행 중인 턴이 있으면 끝난 뒤)."""
+        lock = self._session_lock(session_id)
+        async with lock:
+            self._threads.pop(session_id, None)
+            await self.agent.delete_thread(session_id)
+        if not lock.locked():
+            self._sessions.pop(session_id, None)
+
+    async def _after_turn(self, session_id: str) -> None:
+        """스레드 사용 기록, 주기적 체크포인트 정리, 용량 초과 스레드 내리기."""
+        turns = self._threads.pop(session_id, 0) + 1
+        if self.compact_turns and turns >= self.compact_turns:
+            try:
+                await self.agent.compact_thread(session_id)
+                turns = 0
+            except Exception as e:
+                logger.warning(f"스레드 정리 실패 ({session_id}): {e}")
+        self._threads[session_id] = turns
+
+        for old in list(self._threads):
+            if len(self._threads) <= self.max_threads:
+                break
+            lock = self._sessions.get(old)
+            if old == session_id or (lock is not None and lock.locked()):
+                continue
+            del self._threads[old]
+            self._sessions.pop(old, None)
+            await self.agent.delete_thread(old)
+            self._stats.evictions += 1
@@ -0,0 +1,347 @@
+"""Long-lived event loop thread that owns the MCP agent.
+
+Streamlit 스크립트는 동기 코드라서 에이전트를 호출할 때마다 `asyncio.run()`으로
+이벤트 루프를 새로 만들고 닫았습니다. 그런데 `MultiServerMCPClient`의 stdio 세션,
+`ChatOpenAI`의 httpx 연결 풀, 컴파일된 그래프는 처음 만들어진 루프에 묶여 있어서
+루프가 닫히면 재사용할 수 없고, 다음 턴에서 다시 연결하거나 오류가 납니다.
+
+`AgentRuntime`은 백그라운드 스레드 하나에서 이벤트 루프를 계속 돌리고,
+그 루프 위에서 `MCPAgent`를 한 번만 초기화해 모든 턴이 재사용하게 합니다.
+다른 스레드(Streamlit 스크립트 스레드)는 `submit()`/`run()`으로 코루틴을 넘깁니다.
+
+페이지, 에이전트의 세션 요약, 에이전트 풀은 런타임의 채팅 저장소 하나를 함께 씁니다
+(`get_runtime()`이 `DATABASE_URL`로 한 번 생성, memory://도 같은 저장소를 봄).
+
+`AGENT_POOL_MAX_CONCURRENCY`가 0보다 크면 에이전트가 세션별 그래프 스레드를 갖고,
+session_id가 있는 턴은 `AgentPool`을 거쳐 새 메시지만 보냅니다 (수용 제어 포함).
+
+사용 예:
+    >>> runtime = get_runtime()
+    >>> runtime.chat("5 + 3을 계산해줘")            # 동기 호출 (블로킹)
+    >>> for event in runtime.stream_chat("서울 날씨는?"):  # 동기 이터레이터로 스트리밍
+    ...     print(event.type, event.content)
+    >>> future = runtime.submit(some_coroutine())   # concurrent.futures.Future
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import logging
+import queue
+import threading
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
+from typing import Any, TypeVar
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+from .agent_pool import AgentPool
+from .async_database import AsyncChatDatabase
+from .config import settings
+from .langgraph_agent import MCPAgent
+from .models import (
+    AgentEvent,
+    AgentPoolStats,
+    CacheStats,
+    ContextStats,
+    MCPServerStatus,
+    ResponseCacheStats,
+)
+from .storage import ChatStorage, create_storage
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# stream()에서 생산자 코루틴이 끝났음을 알리는 표식
+_DONE = object()
+
+
+def _default_agent(storage: ChatStorage | None = None) -> MCPAgent:
+    """설정에 맞는 에이전트 (풀을 쓰면 세션 스레드를 메모리 체크포인터에 보관)."""
+    if settings.agent_pool_max_concurrency > 0:
+        return MCPAgent(checkpointer=InMemorySaver(), storage=storage)
+    return MCPAgent(storage=storage)
+
+
+class AgentRuntime:
+    """MCPAgent를 소유하는 영속 이벤트 루프 스레드."""
+
+    def __init__(
+        self,
+        agent_factory: Callable[[], MCPAgent] | None = None,
+        name: str = "agent-runtime",
+        storage: ChatStorage | None = None,
+    ) -> None:
+        """런타임 생성 및 루프 스레드 시작.
+
+        Args:
+            agent_factory: 에이전트 생성 함수 (루프 스레드에서 한 번 호출,
+                None이면 storage를 요약 저장소로 쓰는 설정대로의 에이전트)
+            name: 루프 스레드 이름
+            storage: 페이지와 에이전트가 함께 쓸 채팅 저장소 (닫기는 호출자가 관리)
+        """
+        self.storage = storage
+        self.async_storage = AsyncChatDatabase(storage) if storage is not None else None
+        self._agent_factory = agent_factory or functools.partial(_default_agent, storage)
+        self._agent: MCPAgent | None = None
+        self._agent_lock: asyncio.Lock | None = None
+        self._pool: AgentPool | None = None
+        self._closed = False
+
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run_loop, args=(ready,), name=name, daemon=True
+        )
+        self._thread.start()
+        ready.wait()
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        """루프 스레드 본체."""
+        asyncio.set_event_loop(self.loop)
+        self._agent_lock = asyncio.Lock()
+        self.loop.call_soon(ready.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    @property
+    def is_running(self) -> bool:
+        """루프 스레드가 실행 중인지."""
+        return self._thread.is_alive() and not self._closed
+
+    # ========================================================================
+    # 제출
+    # ========================================================================
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """코루틴을 런타임 루프에 예약하고 Future를 반환 (어느 스레드에서나 호출 가능).
+
+        Raises:
+            RuntimeError: 런타임이 이미 종료됨
+        """
+        if self._closed:
+            coro.close()
+            raise RuntimeError("AgentRuntime이 종료되었습니다")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """코루틴을 런타임 루프에서 실행하고 결과를 기다립니다.
+
+        Args:
+            coro: 실행할 코루틴
+            timeout: 최대 대기 시간 (초, 초과하면 코루틴을 취소하고 TimeoutError)
+
+        Raises:
+            RuntimeError: 런타임 루프 스레드 안에서 호출 (교착 상태 방지)
+        """
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("런타임 루프 안에서는 run() 대신 await를 사용하세요")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def stream(self, agen: AsyncIterator[T], timeout: float | None = None) -> Iterator[T]:
+        """비동기 이터레이터를 런타임 루프에서 돌리고 항목을 동기 이터레이터로 전달합니다.
+
+        Args:
+            agen: 런타임 루프에서 소비할 비동기 이터레이터
+            timeout: 다음 항목을 기다리는 최대 시간 (초, 초과하면 취소하고 TimeoutError)
+
+        호출자가 중간에 반복을 멈추면(break, 예외) 생산자 코루틴도 취소됩니다.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("런타임 루프 안에서는 stream() 대신 async for를 사용하세요")
+
+        items: queue.Queue[Any] = queue.Queue()
+
+        async def pump() -> None:
+            try:
+                async for item in agen:
+                    items.put(item)
+            finally:
+                aclose = getattr(agen, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+        future = self.submit(pump())
+        future.add_done_callback(lambda _: items.put(_DONE))
+        try:
+            while True:
+                try:
+                    item = items.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"{timeout}초 동안 스트림 항목이 없습니다") from None
+                if item is _DONE:
+                    break
+                yield item
+            future.result()  # 생산자 예외 전달
+        finally:
+            if not future.done():
+                future.cancel()
+
+    # ========================================================================
+    # 에이전트
+    # ========================================================================
+
+    async def get_agent(self) -> MCPAgent:
+        """런타임 루프에 묶인 에이전트 (처음 호출 시 초기화, 런타임 루프에서 await)."""
+        if self._agent is None:
+            assert self._agent_lock is not None
+            async with self._agent_lock:
+                if self._agent is None:
+                    agent = self._agent_factory()
+                    await agent.initialize()
+                    self._agent = agent
+        return self._agent
+
+    async def get_pool(self) -> AgentPool | None:
+        """세션 턴을 실행할 에이전트 풀 (풀을 쓰지 않으면 None, 런타임 루프에서 await)."""
+        if settings.agent_pool_max_concurrency <= 0:
+            return None
+        agent = await self.get_agent()
+        if getattr(agent, "checkpointer", None) is None:
+            return None
+        if self._pool is None:
+            self._pool = AgentPool(
+                agent,
+                storage=self.async_storage,
+                max_concurrency=settings.agent_pool_max_concurrency,
+                max_queue=settings.agent_pool_max_queue,
+                queue_timeout=settings.agent_pool_queue_timeout,
+                tenant_limit=settings.agent_pool_tenant_limit,
+                max_threads=settings.agent_pool_max_threads,
+                compact_turns=settings.agent_pool_compact_turns,
+            )
+        return self._pool
+
+    def mcp_status(self) -> list[MCPServerStatus]:
+        """MCP 서버별 연결 상태 (에이전트 초기화 전이면 빈 목록)."""
+        return self._agent.mcp_status() if self._agent is not None else []
+
+    def tool_cache_stats(self) -> CacheStats | None:
+        """도구 결과 캐시 카운터 (에이전트 초기화 전이거나 캐시를 쓰지 않으면 None)."""
+        return self._agent.tool_cache_stats() if self._agent is not None else None
+
+    def response_cache_stats(self) -> ResponseCacheStats | None:
+        """응답 캐시 카운터 (에이전트 초기화 전이거나 캐시를 쓰지 않으면 None)."""
+        return self._agent.response_cache_stats() if self._agent is not None else None
+
+    def context_stats(self) -> ContextStats | None:
+        """프롬프트 토큰 누적 집계 (에이전트 초기화 전이거나 예산을 쓰지 않으면 None)."""
+        return self._agent.context_stats() if self._agent is not None else None
+
+    def pool_stats(self) -> AgentPoolStats | None:
+        """에이전트 풀 카운터 (풀을 만들기 전이거나 쓰지 않으면 None)."""
+        return self._pool.stats() if self._pool is not None else None
+
+    def warm_up(self) -> "concurrent.futures.Future[MCPAgent]":
+        """첫 메시지를 기다리지 않고 에이전트 초기화(MCP 서버 시작)를 미리 시작합니다."""
+        return self.submit(self.get_agent())
+
+    def chat(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None = None,
+        timeout: float | None = None,
+        session_id: str | None = None,
+        tenant: str | None = None,
+    ) -> str:
+        """에이전트 응답을 동기적으로 생성합니다.
+
+        session_id가 있으면 히스토리 요약을 세션별로 저장하고, 풀을 쓰면 세션 스레드에
+        새 메시지만 보냅니다 (history는 무시, tenant는 테넌트별 동시 실행 상한용).
+
+        Raises:
+            PoolRejected: 풀이 혼잡해 턴을 받지 못한 경우
+        """
+
+        async def _chat() -> str:
+            pool = await self.get_pool() if session_id is not None else None
+            if pool is not None:
+                return await pool.chat(session_id, user_message, tenant=tenant)
+            agent = await self.get_agent()
+            return await agent.chat(user_message, history=history, session_id=session_id)
+
+        return self.run(_chat(), timeout=timeout)
+
+    def stream_chat(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None = None,
+        timeout: float | None = None,
+        session_id: str | None = None,
+        tenant: str | None = None,
+    ) -> Iterator[AgentEvent]:
+        """에이전트 응답 이벤트(토큰, 도구 호출/결과)를 동기 이터레이터로 스트리밍합니다."""
+
+        async def _events() -> AsyncIterator[AgentEvent]:
+            pool = await self.get_pool() if session_id is not None else None
+            if pool is not None:
+                async for event in pool.astream_chat(session_id, user_message, tenant=tenant):
+                    yield event
+                return
+            agent = await self.get_agent()
+            async for event in agent.astream_chat(
+                user_message, history=history, session_id=session_id
+            ):
+                yield event
+
+        return self.stream(_events(), timeout=timeout)
+
+    def delete_session(self, session_id: str, timeout: float | None = None) -> None:
+        """세션을 저장소에서 지우고 에이전트의 세션 스레드도 지웁니다."""
+
+        async def _delete() -> None:
+            if self.async_storage is not None:
+                await self.async_storage.delete_session(session_id)
+            if self._pool is not None:
+                await self._pool.delete_session(session_id)
+            elif self._agent is not None:
+                await self._agent.delete_thread(session_id)
+
+        self.run(_delete(), timeout=timeout)
+
+    # ========================================================================
+    # 종료
+    # ========================================================================
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """에이전트 리소스(MCP 세션 등)를 정리하고 루프 스레드를 종료합니다."""
+        if self._closed:
+            return
+        if self._agent is not None:
+            try:
+                self.run(self._agent.close(), timeout=timeout)
+            except Exception as e:
+                logger.error(f"에이전트 종료 오류: {e}")
+        if self.async_storage is not None:
+            self.run(self.async_storage.close(), timeout=timeout)
+        self._closed = True
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+
+_runtime: AgentRuntime | None = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> AgentRuntime:
+    """전역 에이전트 런타임 (처음 호출 시 시작하고 에이전트 초기화를 미리 시작)."""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None or not _runtime.is_running:
+            storage = create_storage(settings.database_url, cached=True)
+            atexit.register(storage.close)  # atexit은 역순 실행: 런타임을 먼저 닫음
+            _runtime = AgentRuntime(storage=storage)
+            _runtime.warm_up()
+            atexit.register(_runtime.close)
+        return _runtime
@@ -0,0 +1,187 @@
+"""Async facade over ChatDatabase for use inside the agent event loop.
+
+`ChatDatabase`의 블로킹 호출을 전용 executor 스레드 하나에서 실행하고
+awaitable로 돌려줍니다 (aiosqlite와 같은 방식). 이벤트 루프 스레드는
+SQLite I/O를 기다리지 않으므로 DB 저장이 LLM 응답 생성과 겹쳐서 진행됩니다.
+
+스레드가 하나뿐이므로 호출은 executor에 제출된 순서대로 실행됩니다. 즉
+`add_message` 태스크의 완료를 기다리지 않고 이어서 `get_messages`를 호출해도
+방금 추가한 메시지가 보입니다.
+
+`ChatStorage` 구현체라면 무엇이든 감쌀 수 있으며, 페이지네이션/스트리밍과
+`compact`는 `ChatDatabase`에만 있는 메서드를 그대로 호출합니다.
+"""
+
+import asyncio
+import functools
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .database import ChatDatabase
+from .models import (
+    ChatMessage,
+    ChatSession,
+    ChatStats,
+    CompactionResult,
+    MessageCursor,
+    MessagePage,
+    RetentionPolicy,
+    SearchResult,
+    SessionCursor,
+    SessionPage,
+    SessionSummary,
+)
+from .records import MessageRecord, SessionRecord
+from .storage import ChatStorage, SessionOrder
+
+T = TypeVar("T")
+
+
+class AsyncChatDatabase:
+    """ChatDatabase와 같은 API를 제공하는 비동기 래퍼."""
+
+    def __init__(self, database: ChatStorage | None = None, **kwargs: Any) -> None:
+        """비동기 데이터베이스 초기화.
+
+        Args:
+            database: 감쌀 저장소 (None이면 kwargs로 ChatDatabase 새로 생성)
+            **kwargs: ChatDatabase 생성 인자 (db_path, durability 등)
+        """
+        self._owns_database = database is None
+        self.database: Any = database if database is not None else ChatDatabase(**kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chat-db")
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """블로킹 함수를 DB 전용 스레드에서 실행."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def create_session(self, title: str = "New Conversation") -> ChatSession:
+        """새 채팅 세션 생성."""
+        return await self._run(self.database.create_session, title)
+
+    async def get_session(self, session_id: str) -> ChatSession | None:
+        """세션 조회."""
+        return await self._run(self.database.get_session, session_id)
+
+    async def list_sessions(
+        self, limit: int = 50, order_by: SessionOrder = "updated_at"
+    ) -> list[ChatSession]:
+        """세션 목록 조회."""
+        return await self._run(self.database.list_sessions, limit, order_by)
+
+    async def list_session_records(
+        self, limit: int | None = 50, order_by: SessionOrder = "updated_at"
+    ) -> list[SessionRecord]:
+        """세션 목록을 경량 레코드로 조회 (ChatDatabase 전용)."""
+        return await self._run(self.database.list_session_records, limit, order_by)
+
+    async def stats(self, days: int = 30) -> ChatStats:
+        """전체 통계를 SQL 집계로 계산."""
+        return await self._run(self.database.stats, days)
+
+    async def list_sessions_page(
+        self, limit: int = 50, after: SessionCursor | None = None
+    ) -> SessionPage:
+        """세션 목록을 최신순 키셋 페이지로 조회."""
+        return await self._run(self.database.list_sessions_page, limit, after)
+
+    async def iter_sessions(self, batch_size: int = 200) -> AsyncIterator[ChatSession]:
+        """모든 세션을 최신순으로 지연 순회."""
+        cursor: SessionCursor | None = None
+        while True:
+            page = await self.list_sessions_page(limit=batch_size, after=cursor)
+            for session in page.sessions:
+                yield session
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    async def add_message(self, session_id: str, message: ChatMessage) -> None:
+        """메시지 추가."""
+        await self._run(self.database.add_message, session_id, message)
+
+    async def add_messages(self, session_id: str, messages: list[ChatMessage]) -> None:
+        """여러 메시지를 하나의 트랜잭션으로 추가."""
+        await self._run(self.database.add_messages, session_id, messages)
+
+    async def get_messages(self, session_id: str, limit: int = 100) -> list[ChatMessage]:
+        """세션의 메시지 조회."""
+        return await self._run(self.database.get_messages, session_id, limit)
+
+    async def get_recent_messages(self, session_id: str, limit: int = 100) -> list[ChatMessage]:
+        """세션의 최근 limit개 메시지를 시간순으로 조회."""
+        return await self._run(self.database.get_recent_messages, session_id, limit)
+
+    async def get_message_records(
+        self, session_id: str, limit: int | None = None
+    ) -> list[MessageRecord]:
+        """세션의 메시지를 경량 레코드로 조회 (ChatDatabase 전용)."""
+        return await self._run(self.database.get_message_records, session_id, limit)
+
+    async def get_messages_for_sessions(
+        self, session_ids: list[str], per_session_limit: int = 100
+    ) -> dict[str, list[ChatMessage]]:
+        """여러 세션의 메시지를 한 번의 윈도우 쿼리로 조회."""
+        return await self._run(
+            self.database.get_messages_for_sessions, session_ids, per_session_limit
+        )
+
+    async def get_messages_page(
+        self, session_id: str, limit: int = 100, after: MessageCursor | None = None
+    ) -> MessagePage:
+        """세션의 메시지를 시간순 키셋 페이지로 조회."""
+        return await self._run(self.database.get_messages_page, session_id, limit, after)
+
+    async def iter_messages(
+        self, session_id: str, batch_size: int = 500
+    ) -> AsyncIterator[ChatMessage]:
+        """세션의 모든 메시지를 시간순으로 지연 순회."""
+        cursor: MessageCursor | None = None
+        while True:
+            page = await self.get_messages_page(session_id, limit=batch_size, after=cursor)
+            for message in page.messages:
+                yield message
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    async def search(
+        self, query: str, limit: int = 20, session_id: str | None = None
+    ) -> list[SearchResult]:
+        """전체 대화 기록에서 메시지를 전문 검색."""
+        return await self._run(self.database.search, query, limit, session_id)
+
+    async def get_summary(self, session_id: str) -> SessionSummary | None:
+        """세션 대화 요약 조회."""
+        return await self._run(self.database.get_summary, session_id)
+
+    async def save_summary(self, session_id: str, summary: SessionSummary) -> None:
+        """세션 대화 요약 저장 (기존 요약은 교체)."""
+        await self._run(self.database.save_summary, session_id, summary)
+
+    async def delete_session(self, session_id: str) -> None:
+        """세션 삭제."""
+        await self._run(self.database.delete_session, session_id)
+
+    async def compact(
+        self, policy: RetentionPolicy, batch_size: int = 500, vacuum_pages: int | None = None
+    ) -> CompactionResult:
+        """보존 정책 적용 후 incremental VACUUM 실행."""
+        return await self._run(self.database.compact, policy, batch_size, vacuum_pages)
+
+    async def close(self) -> None:
+        """대기 중인 작업을 마치고 executor를 종료합니다.
+
+        직접 생성한 ChatDatabase만 닫으며, 전달받은 인스턴스는 호출자가 관리합니다.
+        """
+        if self._owns_database:
+            await self._run(self.database.close)
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncChatDatabase":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
@@ -0,0 +1,350 @@
+"""Read-through cache in front of a chat storage backend.
+
+Streamlit은 상호작용마다 페이지 스크립트 전체를 다시 실행하므로 사이드바의
+`get_session`, History 페이지의 세션 목록과 메시지 목록이 매번 같은 값을
+저장소에서 다시 읽습니다. `CachedChatStorage`는 이런 조회 결과를 LRU + TTL
+캐시에 담아 두고, 같은 인스턴스를 통한 쓰기(`add_message`, `delete_session` 등)가
+일어나면 관련 항목을 즉시 무효화합니다.
+
+| 조회 | 캐시 키 | 무효화 시점 |
+|------|---------|-------------|
+| `get_session` | 세션 ID | 그 세션에 쓰기 |
+| `get_messages`, `get_messages_for_sessions` | (세션 ID, limit) | 그 세션에 쓰기 |
+| `list_sessions`, `stats` | 인자 | 모든 쓰기 |
+
+`search`와 페이지네이션/스트리밍 메서드는 캐시하지 않고 그대로 전달합니다.
+백그라운드 컴팩터처럼 래퍼를 거치지 않는 쓰기는 TTL이 지나야 반영됩니다.
+
+캐시된 모델은 호출자 사이에 공유되므로 수정하지 말아야 합니다 (리스트는 복사해 반환).
+
+사용 예:
+    >>> db = CachedChatStorage(create_storage(settings.database_url), maxsize=256, ttl=30)
+    >>> db.get_session(session_id)  # 저장소 조회
+    >>> db.get_session(session_id)  # 캐시 적중
+    >>> db.cache_stats().hit_rate
+    0.5
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any, Generic, NamedTuple, TypeVar
+
+from .models import CacheStats, ChatMessage, ChatSession, ChatStats, SearchResult, SessionSummary
+from .storage import ChatStorage, SessionOrder
+
+V = TypeVar("V")
+
+# 조회 결과가 None일 수도 있으므로 캐시 실패는 별도 값으로 구분
+MISSING: Any = object()
+
+# 세션과 관계없이 모든 쓰기에 무효화되는 항목(목록, 통계)의 태그
+_ALL_SESSIONS = "*"
+
+# 래퍼를 통해 호출되면 캐시 전체를 비우는 ChatDatabase 전용 쓰기 메서드
+_BULK_WRITE_METHODS = frozenset({"prune", "compact", "import_"})
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    tags: tuple[Hashable, ...]
+
+
+class TTLCache(Generic[V]):
+    """용량(LRU)과 수명(TTL)이 제한된 스레드 안전 캐시.
+
+    항목마다 태그를 붙여 두면 `invalidate(tag)`로 관련 항목만 지울 수 있습니다.
+    무효화할 때마다 `generation`이 증가하므로, 조회를 시작할 때의 값을
+    `set(..., generation=)`에 넘기면 조회 도중 무효화된 오래된 값은 저장되지 않습니다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float | None = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """캐시 생성.
+
+        Args:
+            maxsize: 최대 항목 수 (넘치면 가장 오래 사용하지 않은 항목부터 제거)
+            ttl: 항목 수명 (초, None이면 만료 없음)
+            clock: 현재 시각 함수 (테스트용)
+        """
+        if maxsize < 1:
+            raise ValueError(f"maxsize는 1 이상이어야 합니다: {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._keys_by_tag: dict[Hashable, set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self._stats = CacheStats(maxsize=maxsize)
+
+    def get(self, key: Hashable) -> V:
+        """값 조회 (없거나 만료됐으면 MISSING)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: V,
+        tags: Iterable[Hashable] = (),
+        generation: int | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        """값 저장.
+
+        Args:
+            tags: 무효화 단위
+            generation: 조회 시작 시점의 `generation` (그 사이 무효화가 있었으면 저장 안 함)
+            ttl: 이 항목의 수명 (초, 없으면 캐시 기본값)
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = self._clock() + ttl if ttl is not None else float("inf")
+            entry = _Entry(value, expires_at, tuple(tags))
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def invalidate(self, *tags: Hashable) -> int:
+        """태그가 붙은 항목을 모두 제거하고 제거한 수를 반환."""
+        with self._lock:
+            self.generation += 1
+            keys = set().union(*(self._keys_by_tag.get(tag, ()) for tag in tags))
+            for key in keys:
+                self._remove(key)
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """모든 항목 제거 (카운터는 유지)."""
+        with self._lock:
+            self.generation += 1
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self) -> CacheStats:
+        """현재 카운터 스냅샷."""
+        with self._lock:
+            return self._stats.model_copy(update={"size": len(self._entries)})
+
+    def __contains__(self, key: Hashable) -> bool:
+        """만료되지 않은 항목이 있는지 (카운터와 LRU 순서는 바꾸지 않음)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.expires_at > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: Hashable) -> None:
+        """항목과 태그 색인 제거 (잠금을 잡은 상태에서 호출)."""
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class CachedChatStorage:
+    """조회 결과를 캐시하고 쓰기 시 무효화하는 `ChatStorage` 래퍼."""
+
+    def __init__(self, storage: ChatStorage, maxsize: int = 256, ttl: float | None = 30.0) -> None:
+        """캐시 래퍼 생성.
+
+        Args:
+            storage: 감쌀 저장소
+            maxsize: 최대 캐시 항목 수
+            ttl: 항목 수명 (초, None이면 쓰기로만 무효화)
+        """
+        self.storage = storage
+        self.cache: TTLCache[Any] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _cached(self, key: tuple, tag: Hashable, load: Callable[[], Any]) -> Any:
+        """캐시에 있으면 반환하고, 없으면 load() 결과를 저장 후 반환."""
+        value = self.cache.get(key)
+        if value is MISSING:
+            generation = self.cache.generation
+            value = load()
+            self.cache.set(key, value, tags=(tag,), generation=generation)
+        return value
+
+    def _invalidate(self, session_id: str | None = None) -> None:
+        """세션 관련 항목과 목록/통계 항목 무효화."""
+        if session_id is None:
+            self.cache.invalidate(_ALL_SESSIONS)
+        else:
+            self.cache.invalidate(session_id, _ALL_SESSIONS)
+
+    # ========================================================================
+    # 세션
+    # ========================================================================
+
+    def create_session(self, title: str = "New Conversation") -> ChatSession:
+        """새 채팅 세션 생성."""
+        session = self.storage.create_session(title)
+        self._invalidate()
+        return session
+
+    def get_session(self, session_id: str) -> ChatSession | None:
+        """세션 조회 (캐시)."""
+        return self._cached(
+            ("session", session_id), session_id, lambda: self.storage.get_session(session_id)
+        )
+
+    def list_sessions(
+        self, limit: int = 50, order_by: SessionOrder = "updated_at"
+    ) -> list[ChatSession]:
+        """세션 목록 조회 (캐시)."""
+        return list(
+            self._cached(
+                ("sessions", limit, order_by),
+                _ALL_SESSIONS,
+                lambda: self.storage.list_sessions(limit=limit, order_by=order_by),
+            )
+        )
+
+    def stats(self, days: int = 30) -> ChatStats:
+        """전체 통계 (캐시)."""
+        return self._cached(("stats", days), _ALL_SESSIONS, lambda: self.storage.stats(days=days))
+
+    def delete_session(self, session_id: str) -> None:
+        """세션 삭제 후 무효화."""
+        self.storage.delete_session(session_id)
+        self._invalidate(session_id)
+
+    # ========================================================================
+    # 메시지
+    # ========================================================================
+
+    def add_message(self, session_id: str, message: ChatMessage) -> None:
+        """메시지 추가 후 무효화."""
+        self.storage.add_message(session_id, message)
+        self._invalidate(session_id)
+
+    def add_messages(self, session_id: str, messages: list[ChatMessage]) -> None:
+        """메시지 여러 개 추가 후 무효화."""
+        self.storage.add_messages(session_id, messages)
+        self._invalidate(session_id)
+
+    def get_messages(self, session_id: str, limit: int = 100) -> list[ChatMessage]:
+        """세션의 메시지 조회 (캐시)."""
+        return list(
+            self._cached(
+                ("messages", session_id, limit),
+                session_id,
+                lambda: self.storage.get_messages(session_id, limit=limit),
+            )
+        )
+
+    def get_recent_messages(self, session_id: str, limit: int = 100) -> list[ChatMessage]:
+        """세션의 최근 메시지 조회 (캐시)."""
+        return list(
+            self._cached(
+                ("recent_messages", session_id, limit),
+                session_id,
+                lambda: self.storage.get_recent_messages(session_id, limit=limit),
+            )
+        )
+
+    def get_messages_for_sessions(
+        self, session_ids: list[str], per_session_limit: int = 100
+    ) -> dict[str, list[ChatMessage]]:
+        """여러 세션의 메시지 조회.
+
+        세션별로 `get_messages(session_id, per_session_limit)`와 같은 캐시 항목을 쓰며,
+        캐시에 없는 세션만 모아 저장소에 한 번에 요청합니다.
+        """
+        result: dict[str, list[ChatMessage]] = {}
+        missing: list[str] = []
+        for session_id in dict.fromkeys(session_ids):
+            messages = self.cache.get(("messages", session_id, per_session_limit))
+            if messages is MISSING:
+                missing.append(session_id)
+            else:
+                result[session_id] = list(messages)
+
+        if missing:
+            generation = self.cache.generation
+            loaded = self.storage.get_messages_for_sessions(missing, per_session_limit)
+            for session_id in missing:
+                messages = loaded.get(session_id, [])
+                self.cache.set(
+                    ("messages", session_id, per_session_limit),
+                    messages,
+                    tags=(session_id,),
+                    generation=generation,
+                )
+                result[session_id] = list(messages)
+        return result
+
+    def search(
+        self, query: str, limit: int = 20, session_id: str | None = None
+    ) -> list[SearchResult]:
+        """전문 검색 (캐시하지 않음)."""
+        return self.storage.search(query, limit=limit, session_id=session_id)
+
+    def get_summary(self, session_id: str) -> SessionSummary | None:
+        """세션 대화 요약 조회 (캐시하지 않음)."""
+        return self.storage.get_summary(session_id)
+
+    def save_summary(self, session_id: str, summary: SessionSummary) -> None:
+        """세션 대화 요약 저장."""
+        self.storage.save_summary(session_id, summary)
+
+    # ========================================================================
+    # 관리
+    # ========================================================================
+
+    def cache_stats(self) -> CacheStats:
+        """캐시 적중/실패 카운터."""
+        return self.cache.stats()
+
+    def clear_cache(self) -> None:
+        """캐시 전체 비우기 (래퍼 밖에서 저장소를 수정한 경우)."""
+        self.cache.clear()
+
+    def close(self) -> None:
+        """캐시를 비우고 저장소 종료."""
+        self.cache.clear()
+        self.storage.close()
+
+    def __getattr__(self, name: str) -> Any:
+        """나머지 메서드(flush, iter_messages, export 등)는 저장소로 전달."""
+        attr = getattr(self.storage, name)
+        if name not in _BULK_WRITE_METHODS:
+            return attr
+
+        def call_and_clear(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self.cache.clear()
+
+        return call_and_clear
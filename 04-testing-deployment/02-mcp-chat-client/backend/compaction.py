@@ -0,0 +1,80 @@
+"""Background compaction for the chat history database.
+
+`Compactor`는 백그라운드 스레드에서 주기적으로 다음을 실행합니다.
+
+1. 보존 정책(`RetentionPolicy`)을 벗어난 세션을 배치 단위로 삭제
+   (메시지와 전문 검색 색인은 ON DELETE CASCADE와 트리거로 함께 정리)
+2. `PRAGMA incremental_vacuum`으로 빈 페이지를 반환해 파일 크기 축소
+
+배치마다 커밋하므로 채팅 쓰기를 오래 막지 않고, 계속 사용해도 DB 파일이
+보존 정책 범위 안의 크기로 유지됩니다.
+"""
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from .models import CompactionResult, RetentionPolicy
+
+if TYPE_CHECKING:
+    from .database import ChatDatabase
+
+logger = logging.getLogger(__name__)
+
+
+class Compactor:
+    """보존 정책 적용과 incremental VACUUM을 주기적으로 실행하는 스레드."""
+
+    def __init__(
+        self,
+        database: "ChatDatabase",
+        policy: RetentionPolicy,
+        interval: float = 300.0,
+        batch_size: int = 500,
+        vacuum_pages: int | None = None,
+    ) -> None:
+        """컴팩터 초기화 및 백그라운드 스레드 시작.
+
+        Args:
+            database: 정리할 데이터베이스
+            policy: 보존 정책
+            interval: 실행 주기 (초)
+            batch_size: 트랜잭션 하나에서 삭제할 최대 세션 수
+            vacuum_pages: 한 번에 반환할 최대 페이지 수 (None이면 전부)
+        """
+        self.database = database
+        self.policy = policy
+        self.interval = interval
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.last_result: CompactionResult | None = None
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="chat-db-compactor", daemon=True)
+        self._thread.start()
+
+    def run_once(self) -> CompactionResult:
+        """컴팩션을 즉시 한 번 실행합니다."""
+        result = self.database.compact(
+            self.policy, batch_size=self.batch_size, vacuum_pages=self.vacuum_pages
+        )
+        self.last_result = result
+
+        if result.pruned_sessions or result.freed_pages:
+            logger.info(
+                f"컴팩션: 세션 {result.pruned_sessions}개 삭제, 페이지 {result.freed_pages}개 반환"
+            )
+        return result
+
+    def close(self) -> None:
+        """백그라운드 스레드를 멈춥니다 (진행 중인 실행은 끝까지 완료)."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """interval마다 컴팩션을 실행하는 루프."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"컴팩션 실패: {e}")
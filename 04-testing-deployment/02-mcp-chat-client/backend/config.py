@@ -5,6 +5,8 @@ from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .models import RetentionPolicy
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -20,15 +22,69 @@ class Settings(BaseSettings):
     openai_api_key: str = "ollama"  # Ollama는 API 키 불필요
     model_name: str = "qwen3-vl:4b"  # 기본 모델
 
+    # LLM 게이트웨이 (모든 LLM 호출이 연결 풀을 공유, agentic_coding_workshop/llm_gateway.py)
+    llm_max_in_flight: int = 4  # 서버에 동시에 보내는 요청 수 (Ollama OLLAMA_NUM_PARALLEL에 맞춤)
+    llm_max_connections: int = 32  # keep-alive 연결 풀 크기
+    llm_retries: int = 3  # 연결 오류, 429/5xx 응답 재시도 횟수
+    llm_retry_backoff: float = 0.5  # 초, 첫 재시도 최대 대기 (지터, 재시도마다 두 배)
+    llm_coalesce: bool = True  # 진행 중인 똑같은 요청은 한 번만 보내고 응답을 나눠 받음
+
     # SQLite 데이터베이스
     database_url: str = "sqlite:///./chat_history.db"
 
+    # 대화 기록 보존 정책 (미설정 시 삭제하지 않음)
+    retention_max_age_days: int | None = None
+    retention_max_sessions: int | None = None
+    compaction_interval: float = 300.0  # 초
+
+    # 조회 캐시 (Streamlit 재실행마다 반복되는 세션/메시지 조회)
+    cache_maxsize: int = 256  # 0이면 캐시 사용 안 함
+    cache_ttl: float | None = 30.0  # 초
+
     # Streamlit 설정
     page_title: str = "MCP Chat Client"
     page_icon: str = "🤖"
 
     # MCP 서버 설정 파일
     mcp_servers_config_path: str = "./mcp_servers/server_config.json"
+    mcp_ping_interval: float = 30.0  # 초, MCP 세션 상태 확인 및 실패한 서버 재시작 주기
+    mcp_lazy_start: bool = True  # 매니페스트에 도구가 있는 서버는 첫 도구 호출 때 시작
+    mcp_tool_manifest_path: str = "./mcp_servers/tool_manifest.json"  # 서버별 도구 스키마 캐시
+
+    # 도구 동시 실행 (한 턴에 여러 도구 호출이 오면 함께 실행)
+    tool_max_concurrency: int = 8  # 전체 동시 실행 상한 (1이면 순차 실행)
+    tool_timeout: float = 60.0  # 초, 서버 설정에 timeout이 없을 때의 도구 호출 제한 시간
+    tool_cache_maxsize: int = (
+        512  # 도구 결과 캐시 항목 수 (0이면 사용 안 함, 대상은 서버 설정의 cache)
+    )
+
+    # 응답 캐시 (같거나 비슷한 질문에 에이전트를 실행하지 않고 답함, backend/response_cache.py)
+    response_cache_maxsize: int = 0  # 저장할 응답 수 (0이면 사용 안 함)
+    response_cache_ttl: float | None = 300.0  # 초
+    response_cache_similarity: float = 0.9  # 유사도 적중 기준 (1 이상이면 정확히 같은 질문만)
+    response_cache_history: int = 2  # 키에 포함할 직전 메시지 수 (후속 질문 구분)
+
+    # 에이전트 풀 (세션별 그래프 스레드에 대화 상태 보관, 턴마다 새 메시지만 전송)
+    agent_pool_max_concurrency: int = 0  # 동시에 실행할 턴 수 (0이면 풀 없이 매 턴 히스토리 전송)
+    agent_pool_max_queue: int = 64  # 대기할 수 있는 턴 수 (넘치면 바로 거절)
+    agent_pool_queue_timeout: float = 30.0  # 초, 실행 슬롯을 기다리는 최대 시간
+    agent_pool_tenant_limit: int = 4  # 테넌트별 동시 실행 턴 수 (0이면 제한 없음)
+    agent_pool_max_threads: int = 1000  # 메모리에 둘 세션 스레드 수 (넘치면 저장소에서 다시 채움)
+    agent_pool_compact_turns: int = 20  # 이 턴 수마다 스레드 체크포인트를 최신 하나로 정리
+
+    # 프롬프트 컨텍스트 예산 (넘치면 앞쪽 대화를 요약, backend/context.py)
+    context_max_tokens: int = (
+        6000  # 요약 + 최근 메시지 + 질문의 토큰 상한 (0이면 히스토리 전체 전송)
+    )
+    context_tokenizer: str = "approx"  # approx 또는 tiktoken[:인코딩] (tiktoken 설치 필요)
+
+    # 추적/지표 (backend/tracing.py)
+    trace_export_path: str | None = (
+        None  # OTLP/JSON 구간을 한 줄씩 추가할 파일 (예: ./traces.jsonl)
+    )
+    otlp_endpoint: str | None = None  # OTLP/HTTP collector (예: http://localhost:4318)
+    metrics_port: int = 0  # Prometheus /metrics 포트 (0이면 서버 없음, 보통 9464)
+    metrics_host: str = "127.0.0.1"  # 컨테이너 밖에서 수집하려면 0.0.0.0
 
     # 로깅
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
@@ -38,6 +94,15 @@ class Settings(BaseSettings):
         """Ollama를 사용 중인지 확인"""
         return "localhost:11434" in self.openai_api_base or "ollama" in self.openai_api_key.lower()
 
+    @property
+    def retention_policy(self) -> RetentionPolicy | None:
+        """보존 정책 (설정되지 않았으면 None)"""
+        policy = RetentionPolicy(
+            max_age_days=self.retention_max_age_days,
+            max_sessions=self.retention_max_sessions,
+        )
+        return policy if policy.is_enabled else None
+
 
 # 전역 설정 인스턴스
 settings = Settings()
@@ -0,0 +1,360 @@
+"""Token-budgeted conversation context with incremental summaries.
+
+`MCPAgent.chat`은 매 턴 히스토리 전체를 메시지로 바꿔 보냈기 때문에, 세션이 길어질수록
+프롬프트 크기와 지연시간이 선형으로 늘고 결국 모델 컨텍스트를 넘었습니다.
+
+`ContextBudget`은 프롬프트(요약 + 최근 메시지 + 질문)를 `max_tokens` 안에 맞춥니다.
+
+1. 히스토리가 예산 안에 들어가면 그대로 보냅니다.
+2. 넘치면 최근 메시지를 `keep_recent` 비율만큼 남기고, 그 앞의 메시지를 기존 요약에
+   이어서 요약합니다. 요약은 세션별로 저장소에 저장되므로(`get_summary`/`save_summary`)
+   다음 턴에는 요약 이후의 메시지만 토큰을 세고, 다시 넘칠 때까지 요약 호출이 없습니다.
+3. 요약에 실패하면 오래된 메시지부터 잘라서라도 예산을 지킵니다.
+
+저장된 요약은 마지막으로 요약된 메시지의 해시로 현재 히스토리와 일치하는지 확인하며,
+일치하지 않으면(다른 히스토리, 편집된 세션) 무시하고 새로 만듭니다.
+
+토크나이저는 `str -> int` 함수로 바꿀 수 있습니다 (`get_tokenizer("tiktoken")` 등).
+
+사용 예:
+    >>> budget = ContextBudget(llm_summarizer(llm), store=storage, max_tokens=6000)
+    >>> context = await budget.build("이어서 설명해줘", history, session_id=session_id)
+    >>> context.messages            # LangChain 메시지 (요약은 SystemMessage)
+    >>> context.stats.saved_tokens  # 이번 턴에 절약한 토큰 수
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any, NamedTuple, Protocol
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from .models import ContextStats, SessionSummary
+
+logger = logging.getLogger(__name__)
+
+Tokenizer = Callable[[str], int]
+
+# (기존 요약, 새로 요약할 메시지) → 누적 요약
+Summarizer = Callable[[str | None, list[dict[str, str]]], Awaitable[str]]
+
+# 메시지마다 붙는 역할/구분 토큰 (OpenAI chat 형식 기준 근사값)
+MESSAGE_OVERHEAD = 4
+
+SUMMARY_PREFIX = "이전 대화 요약:\n"
+
+SUMMARY_PROMPT = """당신은 대화 기록을 요약하는 도우미입니다.
+아래의 기존 요약과 이어지는 대화를 합쳐 하나의 요약으로 다시 작성하세요.
+사용자가 알려준 사실과 선호, 결정된 사항, 도구로 얻은 결과처럼 이후 대화에 필요한 내용을
+빠짐없이 남기고, 인사말이나 반복은 생략합니다. 요약만 출력하세요.
+
+[기존 요약]
+{summary}
+
+[이어지는 대화]
+{conversation}"""
+
+
+class SummaryStore(Protocol):
+    """세션 요약 저장소 (`ChatStorage` 구현체)."""
+
+    def get_summary(self, session_id: str) -> SessionSummary | None: ...
+
+    def save_summary(self, session_id: str, summary: SessionSummary) -> None: ...
+
+
+class PromptContext(NamedTuple):
+    """예산에 맞춘 프롬프트 메시지와 이번 턴 집계."""
+
+    messages: list[BaseMessage]
+    stats: ContextStats
+
+
+# ============================================================================
+# 토크나이저
+# ============================================================================
+
+
+def approx_tokens(text: str) -> int:
+    """의존성 없는 토큰 수 근사 (ASCII 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰)."""
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def get_tokenizer(name: str = "approx") -> Tokenizer:
+    """이름으로 토크나이저 선택.
+
+    Args:
+        name: "approx" 또는 "tiktoken[:인코딩]" (예: "tiktoken:o200k_base", 기본 cl100k_base)
+
+    Raises:
+        ImportError: tiktoken을 요청했지만 설치되지 않은 경우
+        ValueError: 알 수 없는 이름
+    """
+    if name == "approx":
+        return approx_tokens
+
+    kind, _, encoding_name = name.partition(":")
+    if kind != "tiktoken":
+        raise ValueError(f"지원하지 않는 토크나이저: {name} (가능: approx, tiktoken[:인코딩])")
+    try:
+        import tiktoken
+    except ImportError as e:
+        raise ImportError("tiktoken 토크나이저에는 tiktoken이 필요합니다: uv add tiktoken") from e
+
+    encoding = tiktoken.get_encoding(encoding_name or "cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def message_checksum(message: dict[str, str]) -> str:
+    """메시지 해시 (저장된 요약이 현재 히스토리와 같은 메시지까지 요약했는지 확인)."""
+    digest = hashlib.sha256(f"{message['role']}\0{message['content']}".encode())
+    return digest.hexdigest()[:16]
+
+
+# ============================================================================
+# 요약
+# ============================================================================
+
+
+def llm_summarizer(llm: Any) -> Summarizer:
+    """채팅 모델로 누적 요약을 만드는 Summarizer."""
+
+    async def summarize(summary: str | None, messages: list[dict[str, str]]) -> str:
+        conversation = "\n".join(
+            f"{'사용자' if m['role'] == 'user' else '어시스턴트'}: {m['content']}" for m in messages
+        )
+        prompt = SUMMARY_PROMPT.format(summary=summary or "(없음)", conversation=conversation)
+        response = await llm.ainvoke([HumanMessage(content=prompt)])
+        return str(response.content).strip()
+
+    return summarize
+
+
+# ============================================================================
+# 예산 관리
+# ============================================================================
+
+
+class ContextBudget:
+    """프롬프트 히스토리를 토큰 예산 안에 맞추는 관리자."""
+
+    def __init__(
+        self,
+        summarizer: Summarizer,
+        store: SummaryStore | Any | None = None,
+        max_tokens: int = 6000,
+        keep_recent: float = 0.5,
+        tokenizer: Tokenizer = approx_tokens,
+    ) -> None:
+        """예산 관리자 생성.
+
+        Args:
+            summarizer: 누적 요약 함수
+            store: 세션 요약 저장소 (`get_summary`/`save_summary`가 없으면 메모리에만 보관)
+            max_tokens: 프롬프트(요약 + 히스토리 + 질문) 토큰 예산
+            keep_recent: 요약할 때 최근 메시지에 남겨 둘 예산 비율
+                (작을수록 요약 호출이 드물고, 클수록 원문 맥락이 많이 남음)
+            tokenizer: 문자열 → 토큰 수 함수
+        """
+        if max_tokens < 1:
+            raise ValueError(f"max_tokens는 1 이상이어야 합니다: {max_tokens}")
+        if not 0 < keep_recent < 1:
+            raise ValueError(f"keep_recent는 0과 1 사이여야 합니다: {keep_recent}")
+        self.summarizer = summarizer
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        # 같은 메시지를 턴마다 다시 세지 않도록 내용별로 기억
+        self.count_tokens: Tokenizer = lru_cache(maxsize=4096)(tokenizer)
+        self._store = store if hasattr(store, "get_summary") else None
+        self._local: dict[str, SessionSummary] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._totals = ContextStats()
+
+    def message_tokens(self, content: str) -> int:
+        """메시지 하나의 토큰 수 (역할/구분 토큰 포함)."""
+        return self.count_tokens(content) + MESSAGE_OVERHEAD
+
+    async def build(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None = None,
+        session_id: str | None = None,
+    ) -> PromptContext:
+        """예산에 맞춘 프롬프트 메시지 생성 (필요하면 요약을 갱신해 저장).
+
+        Args:
+            user_message: 이번 질문
+            history: 이전 메시지 ({"role", "content"}, 오래된 순)
+            session_id: 요약을 저장할 세션 (None이면 요약하지 않고 오래된 메시지를 잘라냄)
+        """
+        history = [m for m in history or [] if m["role"] in ("user", "assistant")]
+        if session_id is None:
+            context = self._assemble(user_message, history, None, self._count(history))
+            self._record(context.stats)
+            return context
+
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            summary = await self._load_summary(session_id, history)
+            start = summary.covered_messages if summary else 0
+            tail = history[start:]
+            tail_tokens = self._count(tail)
+
+            question_tokens = self.message_tokens(user_message)
+            summary_tokens = self._summary_tokens(summary)
+            stats = ContextStats()
+            if summary_tokens + sum(tail_tokens) + question_tokens > self.max_tokens:
+                # 최근 메시지를 keep_recent 비율만큼 남기고 나머지를 요약에 합침
+                keep_budget = int(self.max_tokens * self.keep_recent) - question_tokens
+                keep = _fit_from_end(tail_tokens, keep_budget)
+                split = len(tail) - keep
+                if split > 0:
+                    updated = await self._summarize(
+                        session_id, summary, history, start, tail[:split], tail_tokens[:split]
+                    )
+                    if updated is not None:
+                        summary = updated
+                        tail, tail_tokens = tail[split:], tail_tokens[split:]
+                        stats.summaries_created = 1
+
+        covered = summary.covered_messages if summary else 0
+        context = self._assemble(
+            user_message,
+            tail,
+            summary,
+            tail_tokens,
+            history_tokens=(summary.covered_tokens if summary else 0) + sum(tail_tokens),
+        )
+        context.stats.summarized_messages = covered
+        context.stats.summaries_created = stats.summaries_created
+        self._record(context.stats)
+        return context
+
+    def totals(self) -> ContextStats:
+        """누적 집계 (세션 전체 히스토리 대비 실제로 보낸 토큰)."""
+        return self._totals.model_copy()
+
+    # ========================================================================
+    # 내부 구현
+    # ========================================================================
+
+    def _count(self, messages: list[dict[str, str]]) -> list[int]:
+        return [self.message_tokens(m["content"]) for m in messages]
+
+    def _summary_tokens(self, summary: SessionSummary | None) -> int:
+        return summary.tokens + MESSAGE_OVERHEAD if summary else 0
+
+    def _assemble(
+        self,
+        user_message: str,
+        tail: list[dict[str, str]],
+        summary: SessionSummary | None,
+        tail_tokens: list[int],
+        history_tokens: int | None = None,
+    ) -> PromptContext:
+        """요약 + 최근 메시지 + 질문 (그래도 넘치면 오래된 메시지부터 잘라냄)."""
+        question_tokens = self.message_tokens(user_message)
+        available = self.max_tokens - question_tokens - self._summary_tokens(summary)
+        keep = _fit_from_end(tail_tokens, available)
+        dropped = len(tail) - keep
+        if dropped:
+            logger.warning(f"컨텍스트 예산 초과: 오래된 메시지 {dropped}개를 제외합니다")
+
+        messages: list[BaseMessage] = []
+        if summary is not None:
+            messages.append(SystemMessage(content=SUMMARY_PREFIX + summary.content))
+        for message in tail[dropped:]:
+            if message["role"] == "user":
+                messages.append(HumanMessage(content=message["content"]))
+            else:
+                messages.append(AIMessage(content=message["content"]))
+        messages.append(HumanMessage(content=user_message))
+
+        stats = ContextStats(
+            turns=1,
+            history_tokens=(sum(tail_tokens) if history_tokens is None else history_tokens)
+            + question_tokens,
+            prompt_tokens=self._summary_tokens(summary)
+            + sum(tail_tokens[dropped:])
+            + question_tokens,
+            dropped_messages=dropped,
+        )
+        return PromptContext(messages, stats)
+
+    async def _load_summary(
+        self, session_id: str, history: list[dict[str, str]]
+    ) -> SessionSummary | None:
+        """저장된 요약 중 현재 히스토리와 일치하는 것만 반환."""
+        if self._store is not None:
+            summary = await asyncio.to_thread(self._store.get_summary, session_id)
+        else:
+            summary = self._local.get(session_id)
+
+        if summary is None or summary.covered_messages > len(history):
+            return None
+        if message_checksum(history[summary.covered_messages - 1]) != summary.checksum:
+            logger.info(f"저장된 요약이 히스토리와 달라 무시합니다: {session_id}")
+            return None
+        return summary
+
+    async def _summarize(
+        self,
+        session_id: str,
+        summary: SessionSummary | None,
+        history: list[dict[str, str]],
+        start: int,
+        messages: list[dict[str, str]],
+        message_tokens: list[int],
+    ) -> SessionSummary | None:
+        """기존 요약에 messages를 합친 새 요약을 만들어 저장 (실패하면 None)."""
+        try:
+            content = await self.summarizer(summary.content if summary else None, messages)
+        except Exception as e:
+            logger.warning(f"대화 요약 실패, 오래된 메시지를 잘라냅니다: {e}")
+            return None
+
+        covered = start + len(messages)
+        updated = SessionSummary(
+            covered_messages=covered,
+            covered_tokens=(summary.covered_tokens if summary else 0) + sum(message_tokens),
+            content=content,
+            tokens=self.count_tokens(SUMMARY_PREFIX + content),
+            checksum=message_checksum(history[covered - 1]),
+        )
+        try:
+            if self._store is not None:
+                await asyncio.to_thread(self._store.save_summary, session_id, updated)
+            else:
+                self._local[session_id] = updated
+        except Exception as e:
+            # 저장에 실패해도 이번 턴에는 사용 (다음 턴에 다시 요약)
+            logger.warning(f"대화 요약 저장 실패: {e}")
+        logger.info(
+            f"대화 요약 갱신 ({session_id}): 메시지 {covered}개, "
+            f"{updated.covered_tokens}토큰 → {updated.tokens}토큰"
+        )
+        return updated
+
+    def _record(self, stats: ContextStats) -> None:
+        totals = self._totals
+        totals.turns += stats.turns
+        totals.history_tokens += stats.history_tokens
+        totals.prompt_tokens += stats.prompt_tokens
+        totals.dropped_messages += stats.dropped_messages
+        totals.summaries_created += stats.summaries_created
+        totals.summarized_messages += stats.summarized_messages
+
+
+def _fit_from_end(tokens: list[int], budget: int) -> int:
+    """뒤에서부터 budget 안에 들어가는 항목 수."""
+    total = 0
+    for count, size in enumerate(reversed(tokens)):
+        if total + size > budget:
+            return count
+        total += size
+    return len(tokens)
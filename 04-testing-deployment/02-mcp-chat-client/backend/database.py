@@ -1,71 +1,113 @@
-"""SQLite database for chat history storage."""
+"""SQLite database for chat history storage.
+
+주요 조회/쓰기는 `db.*` 추적 구간으로 기록합니다 (backend/tracing.py, 단계 db).
+메시지 쓰기는 실제로 커밋하는 `_write_messages`에서 재므로 write-behind 모드의 추가는
+버퍼 flush 때 기록됩니다.
+"""
 
 import sqlite3
 import uuid
-from datetime import datetime
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
-
-from .models import ChatMessage, ChatSession
+from typing import IO, TYPE_CHECKING
+
+from .compaction import Compactor
+from .migrations import enable_incremental_vacuum, migrate
+from .models import (
+    ChatMessage,
+    ChatSession,
+    ChatStats,
+    CompactionResult,
+    MessageCursor,
+    MessagePage,
+    RetentionPolicy,
+    SearchResult,
+    SessionCursor,
+    SessionPage,
+    SessionSummary,
+    TransferStats,
+)
+from .pool import ConnectionPool, Durability
+from .records import MessageRecord, SessionRecord, to_epoch_us
+from .storage import (
+    SESSION_ORDERINGS,
+    SessionOrder,
+    build_stats,
+    check_session_order,
+    stats_window,
+)
+from .tracing import traced
+from .write_buffer import PendingMessage, WriteBehindBuffer
+
+if TYPE_CHECKING:
+    from .transfer import TransferFormat
 
 
 class ChatDatabase:
     """SQLite 기반 채팅 기록 데이터베이스."""
 
-    def __init__(self, db_path: str = "./chat_history.db") -> None:
-        """데이터베이스 초기화."""
+    # 벌크 조회 시 쿼리 하나에 넣을 최대 세션 ID 수 (SQLITE_MAX_VARIABLE_NUMBER 대비)
+    BULK_QUERY_CHUNK = 500
+
+    def __init__(
+        self,
+        db_path: str = "./chat_history.db",
+        durability: Durability = "normal",
+        write_behind: bool = False,
+        flush_size: int = 100,
+        flush_interval: float = 0.5,
+        readers: int = 4,
+        retention: RetentionPolicy | None = None,
+        compaction_interval: float = 300.0,
+    ) -> None:
+        """데이터베이스 초기화.
+
+        Args:
+            db_path: SQLite 파일 경로
+            durability: 커밋 내구성 수준 (full, normal, off)
+            write_behind: True면 add_message를 버퍼에 모아 한 트랜잭션으로 flush
+            flush_size: write-behind 모드에서 즉시 flush할 메시지 수
+            flush_interval: write-behind 모드에서 최대 flush 지연 (초)
+            readers: 읽기 전용 연결 풀 크기
+            retention: 보존 정책 (설정하면 백그라운드 컴팩터가 주기적으로 정리)
+            compaction_interval: 컴팩션 주기 (초)
+        """
         self.db_path = Path(db_path)
-        self.connection: sqlite3.Connection | None = None
+        self.durability = durability
+        self.pool = ConnectionPool(str(db_path), readers=readers, durability=durability)
         self._init_db()
 
-    def _init_db(self) -> None:
-        """데이터베이스 테이블 생성."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sessions (
-                session_id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                created_at TIMESTAMP NOT NULL,
-                updated_at TIMESTAMP NOT NULL,
-                message_count INTEGER DEFAULT 0
-            )
-        """)
-
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id TEXT NOT NULL,
-                role TEXT NOT NULL,
-                content TEXT NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
-                FOREIGN KEY (session_id) REFERENCES sessions(session_id)
+        self._buffer: WriteBehindBuffer | None = None
+        if write_behind:
+            self._buffer = WriteBehindBuffer(
+                self._write_messages, flush_size=flush_size, flush_interval=flush_interval
             )
-        """)
 
-        conn.commit()
+        self._compactor: Compactor | None = None
+        if retention is not None:
+            self._compactor = Compactor(self, retention, interval=compaction_interval)
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """데이터베이스 연결 가져오기."""
-        if self.connection is None:
-            self.connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row
-        return self.connection
+    def _init_db(self) -> None:
+        """스키마 마이그레이션 적용 및 incremental VACUUM 활성화."""
+        with self.pool.writer() as conn:
+            migrate(conn)
+            # VACUUM은 트랜잭션 밖에서만 실행 가능 (migrate는 매 단계 커밋함)
+            enable_incremental_vacuum(conn)
 
+    @traced("db.create_session")
     def create_session(self, title: str = "New Conversation") -> ChatSession:
         """새 채팅 세션 생성."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
         session_id = str(uuid.uuid4())
         now = datetime.now()
 
-        cursor.execute(
-            "INSERT INTO sessions (session_id, title, created_at, updated_at, message_count) VALUES (?, ?, ?, ?, 0)",
-            (session_id, title, now, now),
-        )
-        conn.commit()
+        with self.pool.writer() as conn:
+            conn.execute(
+                "INSERT INTO sessions (session_id, title, created_at, updated_at, message_count, "
+                "created_at_us, updated_at_us) VALUES (?, ?, ?, ?, 0, ?, ?)",
+                (session_id, title, now, now, to_epoch_us(now), to_epoch_us(now)),
+            )
 
         return ChatSession(
             session_id=session_id,
@@ -75,94 +117,590 @@ class ChatDatabase:
             message_count=0,
         )
 
+    @traced("db.get_session")
     def get_session(self, session_id: str) -> ChatSession | None:
         """세션 조회."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,))
-        row = cursor.fetchone()
+        self.flush()
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                "SELECT * FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
 
         if row is None:
             return None
 
-        return ChatSession(
-            session_id=row["session_id"],
-            title=row["title"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            updated_at=datetime.fromisoformat(row["updated_at"]),
-            message_count=row["message_count"],
+        return self._row_to_session(row)
+
+    @traced("db.list_sessions")
+    def list_sessions(
+        self, limit: int = 50, order_by: SessionOrder = "updated_at"
+    ) -> list[ChatSession]:
+        """세션 목록 조회.
+
+        Args:
+            limit: 최대 세션 수
+            order_by: 정렬 기준 (updated_at, created_at, created_at_asc, message_count)
+        """
+        check_session_order(order_by)
+
+        self.flush()
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                f"SELECT * FROM sessions ORDER BY {SESSION_ORDERINGS[order_by]} LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+        return [self._row_to_session(row) for row in rows]
+
+    def list_session_records(
+        self, limit: int | None = 50, order_by: SessionOrder = "updated_at"
+    ) -> list[SessionRecord]:
+        """세션 목록을 검증 없는 경량 레코드로 조회 (대량 조회용).
+
+        Args:
+            limit: 최대 세션 수 (None이면 전체)
+            order_by: 정렬 기준 (list_sessions와 동일)
+        """
+        check_session_order(order_by)
+
+        self.flush()
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # sqlite3.Row 대신 튜플 그대로
+            rows = cursor.execute(
+                "SELECT session_id, title, created_at_us, updated_at_us, message_count "
+                f"FROM sessions ORDER BY {SESSION_ORDERINGS[order_by]} LIMIT ?",
+                (-1 if limit is None else limit,),
+            ).fetchall()
+
+        return list(map(SessionRecord._make, rows))
+
+    def stats(self, days: int = 30) -> ChatStats:
+        """전체 통계를 SQL 집계로 계산.
+
+        Args:
+            days: 일별 집계에 포함할 최근 일수 (오늘 포함)
+        """
+        _, cutoff = stats_window(days)
+
+        self.flush()
+        with self.pool.reader() as conn:
+            totals = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(message_count), 0), COALESCE(MAX(message_count), 0) "
+                "FROM sessions"
+            ).fetchone()
+            session_days = conn.execute(
+                "SELECT substr(created_at, 1, 10) AS day, COUNT(*) FROM sessions "
+                "WHERE created_at >= ? GROUP BY day",
+                (cutoff,),
+            ).fetchall()
+            message_days = conn.execute(
+                "SELECT substr(timestamp, 1, 10) AS day, COUNT(*) FROM messages "
+                "WHERE timestamp >= ? GROUP BY day",
+                (cutoff,),
+            ).fetchall()
+
+        total_sessions, total_messages, max_messages = totals
+        return build_stats(
+            days,
+            total_sessions,
+            total_messages,
+            max_messages,
+            sessions_by_day={row[0]: row[1] for row in session_days},
+            messages_by_day={row[0]: row[1] for row in message_days},
         )
 
-    def list_sessions(self, limit: int = 50) -> list[ChatSession]:
-        """세션 목록 조회."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+    def list_sessions_page(
+        self, limit: int = 50, after: SessionCursor | None = None
+    ) -> SessionPage:
+        """세션 목록을 최신순 키셋 페이지로 조회.
+
+        Args:
+            limit: 페이지 크기
+            after: 이전 페이지의 next_cursor (None이면 첫 페이지)
+        """
+        self.flush()
+        with self.pool.reader() as conn:
+            if after is None:
+                rows = conn.execute(
+                    "SELECT * FROM sessions ORDER BY updated_at DESC, session_id DESC LIMIT ?",
+                    (limit,),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM sessions WHERE (updated_at, session_id) < (?, ?) "
+                    "ORDER BY updated_at DESC, session_id DESC LIMIT ?",
+                    (*after, limit),
+                ).fetchall()
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = (rows[-1]["updated_at"], rows[-1]["session_id"])
+
+        return SessionPage(
+            sessions=[self._row_to_session(row) for row in rows], next_cursor=next_cursor
+        )
 
-        cursor.execute("SELECT * FROM sessions ORDER BY updated_at DESC LIMIT ?", (limit,))
-        rows = cursor.fetchall()
+    def iter_sessions(self, batch_size: int = 200) -> Iterator[ChatSession]:
+        """모든 세션을 최신순으로 지연 순회.
 
-        return [
-            ChatSession(
-                session_id=row["session_id"],
-                title=row["title"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-                updated_at=datetime.fromisoformat(row["updated_at"]),
-                message_count=row["message_count"],
-            )
-            for row in rows
-        ]
+        한 번에 batch_size개 행만 메모리에 올리며, 배치 사이에는 reader 연결을
+        반환하므로 긴 순회 중에도 다른 스레드의 읽기/쓰기를 막지 않습니다.
+        """
+        cursor: SessionCursor | None = None
+        while True:
+            page = self.list_sessions_page(limit=batch_size, after=cursor)
+            yield from page.sessions
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
 
     def add_message(self, session_id: str, message: ChatMessage) -> None:
-        """메시지 추가."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        """메시지 추가.
 
-        cursor.execute(
-            "INSERT INTO messages (session_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
-            (session_id, message.role, message.content, message.timestamp),
-        )
+        write-behind 모드에서는 버퍼에만 추가되고 다음 flush 때 기록됩니다.
+        """
+        if self._buffer is not None:
+            self._buffer.append(session_id, message)
+            return
 
-        cursor.execute(
-            "UPDATE sessions SET updated_at = ?, message_count = message_count + 1 WHERE session_id = ?",
-            (datetime.now(), session_id),
-        )
+        self._write_messages([(session_id, message)])
+
+    def add_messages(self, session_id: str, messages: list[ChatMessage]) -> None:
+        """여러 메시지를 하나의 트랜잭션으로 추가."""
+        if not messages:
+            return
 
-        conn.commit()
+        if self._buffer is not None:
+            self._buffer.extend(session_id, messages)
+            return
 
+        self._write_messages([(session_id, message) for message in messages])
+
+    def flush(self) -> None:
+        """write-behind 버퍼에 남은 메시지를 즉시 기록."""
+        if self._buffer is not None:
+            self._buffer.flush()
+
+    @traced("db.write_messages")
+    def _write_messages(self, batch: list[PendingMessage]) -> None:
+        """여러 세션의 메시지를 한 트랜잭션(커밋 1회)으로 기록."""
+        now = datetime.now()
+        counts = Counter(session_id for session_id, _ in batch)
+
+        with self.pool.writer() as conn:
+            # 버퍼에 있는 동안 삭제된 세션의 메시지는 CASCADE와 같게 버림
+            # (외래 키 위반으로 배치 전체가 실패하고 재시도되는 것을 방지)
+            conn.executemany(
+                "INSERT INTO messages (session_id, role, content, timestamp, timestamp_us) "
+                "SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM sessions WHERE session_id = ?)",
+                [
+                    (
+                        session_id,
+                        message.role,
+                        message.content,
+                        message.timestamp,
+                        to_epoch_us(message.timestamp),
+                        session_id,
+                    )
+                    for session_id, message in batch
+                ],
+            )
+            conn.executemany(
+                "UPDATE sessions SET updated_at = ?, updated_at_us = ?, "
+                "message_count = message_count + ? WHERE session_id = ?",
+                [
+                    (now, to_epoch_us(now), count, session_id)
+                    for session_id, count in counts.items()
+                ],
+            )
+
+    @traced("db.get_messages")
     def get_messages(self, session_id: str, limit: int = 100) -> list[ChatMessage]:
         """세션의 메시지 조회."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT * FROM messages WHERE session_id = ? ORDER BY timestamp ASC LIMIT ?",
-            (session_id, limit),
+        self.flush()
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                "SELECT * FROM messages WHERE session_id = ? ORDER BY timestamp ASC, id ASC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+
+        return [self._row_to_message(row) for row in rows]
+
+    def get_recent_messages(self, session_id: str, limit: int = 100) -> list[ChatMessage]:
+        """세션의 최근 limit개 메시지를 시간순으로 조회 (인덱스를 역순으로 읽음)."""
+        self.flush()
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                "SELECT * FROM messages WHERE session_id = ? "
+                "ORDER BY timestamp DESC, id DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+
+        return [self._row_to_message(row) for row in reversed(rows)]
+
+    def get_message_records(self, session_id: str, limit: int | None = None) -> list[MessageRecord]:
+        """세션의 메시지를 검증 없는 경량 레코드로 조회 (대량 조회용).
+
+        pydantic 검증과 타임스탬프 문자열 파싱을 건너뛰므로 get_messages보다
+        행당 비용이 훨씬 작습니다. 시간은 정수 epoch 마이크로초로 담깁니다.
+
+        Args:
+            session_id: 세션 ID
+            limit: 최대 메시지 수 (None이면 전체)
+        """
+        self.flush()
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # sqlite3.Row 대신 튜플 그대로
+            rows = cursor.execute(
+                "SELECT id, session_id, role, content, timestamp_us FROM messages "
+                "WHERE session_id = ? ORDER BY timestamp ASC, id ASC LIMIT ?",
+                (session_id, -1 if limit is None else limit),
+            ).fetchall()
+
+        return list(map(MessageRecord._make, rows))
+
+    def get_messages_for_sessions(
+        self, session_ids: list[str], per_session_limit: int = 100
+    ) -> dict[str, list[ChatMessage]]:
+        """여러 세션의 메시지를 한 번의 윈도우 쿼리로 조회.
+
+        세션마다 get_messages를 호출하는 N+1 쿼리 대신, ROW_NUMBER() 윈도우 함수로
+        세션별 앞쪽 per_session_limit개 메시지를 한 번에 가져옵니다.
+
+        Args:
+            session_ids: 조회할 세션 ID 목록
+            per_session_limit: 세션당 최대 메시지 수
+
+        Returns:
+            세션 ID → 시간순 메시지 목록 (메시지가 없는 세션은 빈 목록)
+        """
+        result: dict[str, list[ChatMessage]] = {session_id: [] for session_id in session_ids}
+        unique_ids = list(result)
+        if not unique_ids:
+            return result
+
+        self.flush()
+        with self.pool.reader() as conn:
+            # SQLite 바인딩 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(unique_ids), self.BULK_QUERY_CHUNK):
+                chunk = unique_ids[start : start + self.BULK_QUERY_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"""
+                    SELECT * FROM (
+                        SELECT *, ROW_NUMBER() OVER (
+                            PARTITION BY session_id ORDER BY timestamp ASC, id ASC
+                        ) AS rn
+                        FROM messages
+                        WHERE session_id IN ({placeholders})
+                    )
+                    WHERE rn <= ?
+                    ORDER BY session_id, timestamp ASC, id ASC
+                    """,
+                    (*chunk, per_session_limit),
+                ).fetchall()
+
+                for row in rows:
+                    result[row["session_id"]].append(self._row_to_message(row))
+
+        return result
+
+    @traced("db.get_messages_page")
+    def get_messages_page(
+        self, session_id: str, limit: int = 100, after: MessageCursor | None = None
+    ) -> MessagePage:
+        """세션의 메시지를 시간순 키셋 페이지로 조회.
+
+        OFFSET과 달리 앞 페이지 행을 건너뛰며 읽지 않으므로 페이지 위치와
+        무관하게 (session_id, timestamp) 인덱스에서 바로 시작합니다.
+
+        Args:
+            session_id: 세션 ID
+            limit: 페이지 크기
+            after: 이전 페이지의 next_cursor (None이면 첫 페이지)
+        """
+        self.flush()
+        with self.pool.reader() as conn:
+            if after is None:
+                rows = conn.execute(
+                    "SELECT * FROM messages WHERE session_id = ? "
+                    "ORDER BY timestamp ASC, id ASC LIMIT ?",
+                    (session_id, limit),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM messages WHERE session_id = ? AND (timestamp, id) > (?, ?) "
+                    "ORDER BY timestamp ASC, id ASC LIMIT ?",
+                    (session_id, *after, limit),
+                ).fetchall()
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = (rows[-1]["timestamp"], rows[-1]["id"])
+
+        return MessagePage(
+            messages=[self._row_to_message(row) for row in rows], next_cursor=next_cursor
         )
-        rows = cursor.fetchall()
+
+    def iter_messages(self, session_id: str, batch_size: int = 500) -> Iterator[ChatMessage]:
+        """세션의 모든 메시지를 시간순으로 지연 순회.
+
+        세션 길이와 무관하게 메모리에는 batch_size개 행만 유지됩니다.
+        """
+        cursor: MessageCursor | None = None
+        while True:
+            page = self.get_messages_page(session_id, limit=batch_size, after=cursor)
+            yield from page.messages
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    @traced("db.search")
+    def search(
+        self, query: str, limit: int = 20, session_id: str | None = None
+    ) -> list[SearchResult]:
+        """전체 대화 기록에서 메시지를 전문 검색.
+
+        검색어의 각 단어를 접두어로 매칭하므로 "날씨"로 "날씨는"도 찾습니다.
+        여러 단어는 모두 포함된 메시지만 찾습니다 (AND).
+
+        Args:
+            query: 사용자 입력 검색어
+            limit: 최대 결과 수
+            session_id: 지정하면 해당 세션 안에서만 검색
+
+        Returns:
+            BM25 관련도순 검색 결과
+        """
+        match = self._to_fts_query(query)
+        if not match:
+            return []
+
+        sql = """
+            SELECT m.id, m.session_id, m.role, m.timestamp, s.title,
+                   snippet(messages_fts, 0, '**', '**', '…', 12) AS snippet,
+                   bm25(messages_fts) AS rank
+            FROM messages_fts
+            JOIN messages m ON m.id = messages_fts.rowid
+            LEFT JOIN sessions s ON s.session_id = m.session_id
+            WHERE messages_fts MATCH ?
+        """
+        params: list = [match]
+        if session_id is not None:
+            sql += " AND m.session_id = ?"
+            params.append(session_id)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+
+        self.flush()
+        with self.pool.reader() as conn:
+            rows = conn.execute(sql, params).fetchall()
 
         return [
-            ChatMessage(
+            SearchResult(
+                message_id=row["id"],
+                session_id=row["session_id"],
+                session_title=row["title"],
                 role=row["role"],
-                content=row["content"],
+                snippet=row["snippet"],
                 timestamp=datetime.fromisoformat(row["timestamp"]),
-                session_id=row["session_id"],
+                rank=row["rank"],
             )
             for row in rows
         ]
 
+    @staticmethod
+    def _to_fts_query(query: str) -> str:
+        """사용자 검색어를 FTS5 MATCH 식으로 변환.
+
+        각 단어를 따옴표로 감싸 FTS5 연산자(AND, NEAR, * 등)로 해석되지 않게 하고,
+        접두어 검색(*)을 붙입니다.
+        """
+        terms = [term.replace('"', "") for term in query.split()]
+        return " ".join(f'"{term}"*' for term in terms if term)
+
+    @traced("db.delete_session")
     def delete_session(self, session_id: str) -> None:
-        """세션 삭제."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        """세션 삭제 (메시지는 ON DELETE CASCADE로 함께 삭제)."""
+        self.flush()
+        with self.pool.writer() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    @traced("db.get_summary")
+    def get_summary(self, session_id: str) -> SessionSummary | None:
+        """세션 대화 요약 조회 (없으면 None)."""
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                "SELECT * FROM session_summaries WHERE session_id = ?", (session_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return SessionSummary(
+            covered_messages=row["covered_messages"],
+            covered_tokens=row["covered_tokens"],
+            content=row["content"],
+            tokens=row["tokens"],
+            checksum=row["checksum"],
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+        )
+
+    @traced("db.save_summary")
+    def save_summary(self, session_id: str, summary: SessionSummary) -> None:
+        """세션 대화 요약 저장 (기존 요약은 교체)."""
+        with self.pool.writer() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO session_summaries (session_id, covered_messages, "
+                "covered_tokens, content, tokens, checksum, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session_id,
+                    summary.covered_messages,
+                    summary.covered_tokens,
+                    summary.content,
+                    summary.tokens,
+                    summary.checksum,
+                    summary.updated_at,
+                ),
+            )
+
+    def prune(self, policy: RetentionPolicy, batch_size: int = 500) -> int:
+        """보존 정책을 벗어난 세션을 배치 단위로 삭제.
+
+        배치마다 별도 트랜잭션으로 커밋하므로 대량 삭제 중에도 writer 잠금을
+        오래 잡지 않아 채팅 쓰기가 끼어들 수 있습니다.
+
+        Args:
+            policy: 보존 정책
+            batch_size: 트랜잭션 하나에서 삭제할 최대 세션 수
+
+        Returns:
+            삭제한 세션 수
+        """
+        if not policy.is_enabled:
+            return 0
+
+        self.flush()
+        pruned = 0
+
+        if policy.max_age_days is not None:
+            cutoff = datetime.now() - timedelta(days=policy.max_age_days)
+            while deleted := self._delete_sessions(
+                "SELECT session_id FROM sessions WHERE updated_at < ? LIMIT ?",
+                (cutoff, batch_size),
+            ):
+                pruned += deleted
+
+        if policy.max_sessions is not None:
+            while True:
+                with self.pool.reader() as conn:
+                    total = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+                excess = total - policy.max_sessions
+                if excess <= 0:
+                    break
+                pruned += self._delete_sessions(
+                    "SELECT session_id FROM sessions ORDER BY updated_at ASC, session_id ASC LIMIT ?",
+                    (min(batch_size, excess),),
+                )
+
+        return pruned
+
+    def _delete_sessions(self, select_sql: str, params: tuple) -> int:
+        """select_sql이 고른 세션을 한 트랜잭션으로 삭제하고 삭제 수를 반환."""
+        with self.pool.writer() as conn:
+            return conn.execute(
+                f"DELETE FROM sessions WHERE session_id IN ({select_sql})", params
+            ).rowcount
+
+    def incremental_vacuum(self, max_pages: int | None = None) -> int:
+        """빈 페이지를 파일 시스템에 반환하고 반환한 페이지 수를 돌려줌.
+
+        Args:
+            max_pages: 한 번에 반환할 최대 페이지 수 (None이면 전부)
+        """
+        with self.pool.writer() as conn:
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            pages = 0 if max_pages is None else int(max_pages)
+            # execute()는 결과 행이 없는 PRAGMA를 한 단계(1페이지)만 실행하므로
+            # 끝까지 실행하는 executescript() 사용
+            conn.executescript(f"PRAGMA incremental_vacuum({pages});")
+            after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+            # WAL에 남은 변경을 본 파일에 반영해야 실제 파일 크기가 줄어듦
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+        return before - after
+
+    def compact(
+        self, policy: RetentionPolicy, batch_size: int = 500, vacuum_pages: int | None = None
+    ) -> CompactionResult:
+        """보존 정책 적용 후 incremental VACUUM 실행."""
+        return CompactionResult(
+            pruned_sessions=self.prune(policy, batch_size=batch_size),
+            freed_pages=self.incremental_vacuum(vacuum_pages),
+        )
+
+    def export(
+        self,
+        stream: IO,
+        format: "TransferFormat" = "jsonl",
+        chunk_size: int = 10_000,
+    ) -> TransferStats:
+        """전체 대화 기록을 JSONL/Parquet/Arrow 스트림으로 내보내기 (청크 단위).
+
+        jsonl은 텍스트 스트림, parquet/arrow는 바이너리 스트림을 받습니다.
+        """
+        # `python -m backend.transfer` 실행 시 모듈이 두 번 로드되지 않도록 지연 import
+        from .transfer import export_history
 
-        cursor.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
-        cursor.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        return export_history(self, stream, format, chunk_size)
 
-        conn.commit()
+    def import_(
+        self,
+        stream: IO,
+        format: "TransferFormat" = "jsonl",
+        chunk_size: int = 10_000,
+    ) -> TransferStats:
+        """export()로 만든 스트림을 가져오기 (청크마다 executemany + 커밋).
+
+        이미 있는 세션은 메시지와 함께 건너뜁니다.
+        """
+        from .transfer import import_history
+
+        return import_history(self, stream, format, chunk_size)
 
     def close(self) -> None:
         """데이터베이스 연결 종료."""
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        if self._compactor is not None:
+            self._compactor.close()
+            self._compactor = None
+
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+
+        self.pool.close()
+
+    @staticmethod
+    def _row_to_session(row: sqlite3.Row) -> ChatSession:
+        """sessions 행을 ChatSession으로 변환."""
+        return ChatSession(
+            session_id=row["session_id"],
+            title=row["title"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+            message_count=row["message_count"],
+        )
+
+    @staticmethod
+    def _row_to_message(row: sqlite3.Row) -> ChatMessage:
+        """messages 행을 ChatMessage로 변환."""
+        return ChatMessage(
+            role=row["role"],
+            content=row["content"],
+            timestamp=datetime.fromisoformat(row["timestamp"]),
+            session_id=row["session_id"],
+        )
@@ -1,144 +1,591 @@
 """LangGraph ReAct Agent with MCP Tools.
 
 langchain-mcp-adapters를 사용하여 MCP 서버와 통합된 에이전트를 구현합니다.
+MCP 서버 세션은 `MCPSessionManager`가 열어 두고 재사용하며, 도구 매니페스트에 스키마가
+있는 서버는 첫 도구 호출 때 띄웁니다 (MCP_LAZY_START).
+히스토리는 `ContextBudget`이 토큰 예산에 맞춰 요약/정리한 뒤 보냅니다.
+같거나 비슷한 질문은 `ResponseCache`(설정 시)가 에이전트 실행 없이 답합니다.
+
+체크포인터를 주면 세션마다 LangGraph 스레드(thread_id = session_id)에 대화 상태를
+보관하므로 턴마다 새 메시지만 보냅니다 (`AgentPool`이 사용, backend/agent_pool.py).
+이때 토큰 예산은 모델 호출 직전의 pre_model_hook에서 적용합니다.
+
+LLM 호출은 프로세스 공유 `LLMGateway`(연결 풀, 동시 요청 상한, 재시도, 요청 합치기)를 거칩니다.
+턴과 그 안의 LLM 호출은 추적 구간(`turn`, `llm.call`)으로 기록합니다 (backend/tracing.py).
 """
 
-import asyncio
-import json
 import logging
-from pathlib import Path
-from typing import Any
+import time
+from collections.abc import AsyncIterator, Iterable
+from typing import Any, NamedTuple
+from uuid import UUID
 
-from langchain_core.messages import AIMessage, HumanMessage
-from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.prebuilt import create_react_agent
 
+from agentic_coding_workshop.llm_gateway import LLMGateway
+
 from .config import settings
+from .context import ContextBudget, get_tokenizer, llm_summarizer
+from .mcp_sessions import MCPSessionManager, load_server_configs, to_connection
+from .models import (
+    AgentEvent,
+    CacheStats,
+    ContextStats,
+    MCPServerConfig,
+    MCPServerStatus,
+    ResponseCacheStats,
+)
+from .response_cache import ResponseCache, side_effect_tools
+from .storage import ChatStorage
+from .tool_cache import ToolResultCache
+from .tool_node import ToolLimiter, create_tool_node
+from .tracing import Span, Tracer, get_tracer
 
 logger = logging.getLogger(__name__)
 
 
+class _AgentRun(NamedTuple):
+    """한 턴의 그래프 입력."""
+
+    messages: list[BaseMessage]  # 그래프에 보낼 메시지
+    kwargs: dict[str, Any]  # ainvoke/astream 추가 인자 (스레드 config 등)
+    history: list[dict[str, str]] | None  # 응답 캐시 키에 쓸 이전 대화
+    skip: int  # 그래프 출력에서 이번 턴 이전 메시지 수
+
+
+class _LLMSpanHandler(AsyncCallbackHandler):
+    """그래프 안의 모델 호출을 `llm.call` 구간으로 기록 (부모는 호출 시점의 현재 구간)."""
+
+    def __init__(self, tracer: Tracer) -> None:
+        self.tracer = tracer
+        self._spans: dict[UUID, Span] = {}
+
+    async def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[BaseMessage]],
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        model = (kwargs.get("invocation_params") or {}).get("model")
+        self._spans[run_id] = self.tracer.start_span(
+            "llm.call", stage="llm", model=model, messages=sum(len(m) for m in messages)
+        )
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        span.set_attribute("prompt_tokens", usage.get("prompt_tokens"))
+        span.set_attribute("completion_tokens", usage.get("completion_tokens"))
+        self.tracer.end_span(span)
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._spans.pop(run_id, None)
+        if span is not None:
+            self.tracer.end_span(span, error)
+
+
 class MCPAgent:
     """MCP 도구를 사용하는 LangGraph ReAct 에이전트."""
 
-    def __init__(self) -> None:
-        """에이전트 초기화."""
+    def __init__(
+        self,
+        checkpointer: BaseCheckpointSaver | None = None,
+        llm: BaseChatModel | None = None,
+        storage: ChatStorage | None = None,
+    ) -> None:
+        """에이전트 초기화.
+
+        Args:
+            checkpointer: 세션별 그래프 상태 저장소 (있으면 session_id가 스레드가 되고
+                턴마다 새 메시지만 보냄, 같은 세션의 턴은 동시에 실행하면 안 됨)
+            llm: 사용할 채팅 모델 (None이면 설정대로 게이트웨이를 거치는 ChatOpenAI 생성,
+                재생 벤치마크의 가짜 모델 등)
+            storage: 세션 요약을 보관할 채팅 저장소 (페이지와 같은 인스턴스, 닫기는 호출자가
+                관리, None이면 요약은 프로세스 메모리에만 보관)
+        """
         self.model_name = settings.model_name
         self.api_base = settings.openai_api_base
         self.api_key = settings.openai_api_key
-        self.mcp_client: MultiServerMCPClient | None = None
+        self.mcp_sessions: MCPSessionManager | None = None
+        self.tool_limiter = ToolLimiter(settings.tool_max_concurrency, settings.tool_timeout)
+        self.tool_cache: ToolResultCache | None = None
+        self.response_cache: ResponseCache | None = None
+        self._servers: list[MCPServerConfig] = []
+        self.llm: BaseChatModel | None = llm
+        self.context_budget: ContextBudget | None = None
+        self.storage = storage
+        self.checkpointer = checkpointer
         self.agent = None
+        self.graph_compile_ms: float | None = None  # 마지막 그래프 생성 시간
+        self.tracer = get_tracer()
+        self._callbacks = [_LLMSpanHandler(self.tracer)]
+        self._tools_version = -1
         self._initialized = False
 
     async def initialize(self) -> None:
-        """에이전트 및 MCP 클라이언트 초기화."""
+        """에이전트 및 MCP 세션 초기화.
+
+        서버가 일부(또는 전부) 시작에 실패해도 에이전트는 만들어지며, 실패한 서버는
+        상태 확인 루프가 재시작하고 도구가 돌아오면 다음 턴에 에이전트를 다시 만듭니다.
+        """
         if self._initialized:
             return
 
-        try:
-            config_path = Path(settings.mcp_servers_config_path)
-            if not config_path.exists():
-                logger.warning("MCP 설정 파일 없음, LLM만 사용")
-                await self._initialize_without_mcp()
-                return
-
-            with open(config_path, encoding="utf-8") as f:
-                config = json.load(f)
-
-            # 활성화된 서버만 필터링
-            enabled_servers = [
-                server for server in config.get("servers", []) if server.get("enabled", False)
-            ]
-
-            if not enabled_servers:
-                logger.warning("활성화된 MCP 서버 없음")
-                await self._initialize_without_mcp()
-                return
-
-            # MCP 서버 설정 변환
-            server_configs = {}
-            for server_config in enabled_servers:
-                server_name = server_config.get("name", "unknown")
-                server_configs[server_name] = {
-                    "command": server_config.get("command"),
-                    "args": server_config.get("args", []),
-                    "transport": server_config.get("transport", "stdio"),
-                }
-
-            # MCP 클라이언트 및 도구 로드
-            self.mcp_client = MultiServerMCPClient(server_configs)
-            tools = await self.mcp_client.get_tools()
-            logger.info(f"MCP 도구 {len(tools)}개 로드 완료")
-
-            # LLM 및 에이전트 생성
-            llm = ChatOpenAI(
+        if self.llm is None:
+            self.llm = ChatOpenAI(
                 model=self.model_name,
                 openai_api_base=self.api_base,
                 openai_api_key=self.api_key,
                 temperature=0.7,
+                **get_llm_gateway().openai_kwargs(),
+            )
+
+        if settings.context_max_tokens > 0:
+            self._init_context_budget()
+        if settings.response_cache_maxsize > 0:
+            self.response_cache = ResponseCache(
+                maxsize=settings.response_cache_maxsize,
+                ttl=settings.response_cache_ttl,
+                similarity=settings.response_cache_similarity,
+                history_messages=settings.response_cache_history,
             )
-            self.agent = create_react_agent(llm, tools)
-            self._initialized = True
 
+        try:
+            servers = load_server_configs(settings.mcp_servers_config_path)
+            self._servers = servers
+            self.tool_limiter = ToolLimiter.from_server_configs(
+                servers, settings.tool_max_concurrency, settings.tool_timeout
+            )
+            if settings.tool_cache_maxsize > 0 and any(server.cache for server in servers):
+                self.tool_cache = ToolResultCache.from_server_configs(
+                    servers, maxsize=settings.tool_cache_maxsize
+                )
+            self.mcp_sessions = MCPSessionManager(
+                {server.name: to_connection(server) for server in servers},
+                ping_interval=settings.mcp_ping_interval,
+                manifest_path=settings.mcp_tool_manifest_path,
+                lazy=settings.mcp_lazy_start,
+            )
+            if not servers:
+                logger.warning("활성화된 MCP 서버 없음, LLM만 사용")
+            await self.mcp_sessions.start()
         except Exception as e:
-            logger.error(f"MCP 에이전트 초기화 실패: {e}")
-            await self._initialize_without_mcp()
-
-    async def _initialize_without_mcp(self) -> None:
-        """MCP 없이 LLM만 사용하도록 초기화."""
-        llm = ChatOpenAI(
-            model=self.model_name,
-            openai_api_base=self.api_base,
-            openai_api_key=self.api_key,
-            temperature=0.7,
-        )
-        self.agent = create_react_agent(llm, [])
+            logger.error(f"MCP 세션 초기화 실패: {e}")
+
+        await self._refresh_agent()
         self._initialized = True
 
-    async def chat(self, user_message: str, history: list[dict[str, str]] | None = None) -> str:
-        """사용자 메시지에 응답합니다."""
+    def _init_context_budget(self) -> None:
+        """세션 요약을 채팅 저장소에 보관하는 컨텍스트 예산 관리자 생성."""
+        self.context_budget = ContextBudget(
+            llm_summarizer(self.llm),
+            store=self.storage,
+            max_tokens=settings.context_max_tokens,
+            tokenizer=get_tokenizer(settings.context_tokenizer),
+        )
+
+    async def _refresh_agent(self) -> None:
+        """MCP 도구 목록이 바뀌었으면 에이전트 그래프를 다시 만듭니다."""
+        if self.llm is None:
+            return
+        if self.mcp_sessions is None:
+            if self.agent is None:
+                self.agent = self._create_graph([])
+            return
+        if self.mcp_sessions.tools_version == self._tools_version:
+            return
+
+        tools = await self.mcp_sessions.get_tools()
+        if self.tool_cache is not None:
+            # 도구 정의가 바뀌었으면 이전 결과를 믿을 수 없음
+            self.tool_cache.invalidate()
+        if self.response_cache is not None:
+            # 부작용 도구를 부른 응답은 캐시하지 않음 (server_config.json의 side_effects)
+            self.response_cache.side_effect_tools = side_effect_tools(tools, self._servers)
+        # 한 턴의 여러 도구 호출은 서버별 제한 안에서 동시에 실행 (선언된 도구는 결과 캐시)
+        self.agent = self._create_graph(
+            create_tool_node(tools, self.tool_limiter, self.tool_cache) if tools else []
+        )
+        self._tools_version = self.mcp_sessions.tools_version
+        logger.info(f"MCP 도구 {len(tools)}개로 에이전트 구성")
+
+    def _create_graph(self, tools: Any) -> Any:
+        """ReAct 그래프 생성 (체크포인터가 있으면 세션 스레드 + 예산 hook)."""
+        started = time.perf_counter()
+        if self.checkpointer is None:
+            graph = create_react_agent(self.llm, tools)
+        else:
+            graph = create_react_agent(
+                self.llm,
+                tools,
+                checkpointer=self.checkpointer,
+                pre_model_hook=self._budget_hook if self.context_budget else None,
+            )
+        self.graph_compile_ms = (time.perf_counter() - started) * 1000
+        return graph
+
+    async def _budget_hook(self, state: dict[str, Any], config: RunnableConfig) -> dict[str, Any]:
+        """스레드에 쌓인 대화를 모델 호출 직전에 토큰 예산에 맞춤 (상태는 그대로 둠)."""
+        messages = state["messages"]
+        start = max(i for i, m in enumerate(messages) if isinstance(m, HumanMessage))
+        context = await self.context_budget.build(
+            _content_text(messages[start].content),
+            _dialogue(messages[:start]),
+            config["configurable"]["thread_id"],
+        )
+        # 이번 턴에 진행 중인 도구 호출/결과는 그대로 이어 붙임
+        return {"llm_input_messages": context.messages + messages[start + 1 :]}
+
+    def mcp_status(self) -> list[MCPServerStatus]:
+        """MCP 서버별 연결 상태 (초기화 전이면 빈 목록)."""
+        return self.mcp_sessions.status() if self.mcp_sessions else []
+
+    def tool_cache_stats(self) -> CacheStats | None:
+        """도구 결과 캐시 카운터 (캐시를 쓰지 않으면 None)."""
+        return self.tool_cache.stats() if self.tool_cache else None
+
+    def response_cache_stats(self) -> ResponseCacheStats | None:
+        """응답 캐시 카운터 (캐시를 쓰지 않으면 None)."""
+        return self.response_cache.stats() if self.response_cache else None
+
+    def context_stats(self) -> ContextStats | None:
+        """프롬프트 토큰 누적 집계 (예산을 쓰지 않으면 None)."""
+        return self.context_budget.totals() if self.context_budget else None
+
+    @staticmethod
+    def _build_messages(
+        user_message: str, history: list[dict[str, str]] | None = None
+    ) -> list[BaseMessage]:
+        """메시지 히스토리를 LangChain 형식으로 변환."""
+        messages: list[BaseMessage] = []
+        if history:
+            for msg in history:
+                if msg["role"] == "user":
+                    messages.append(HumanMessage(content=msg["content"]))
+                elif msg["role"] == "assistant":
+                    messages.append(AIMessage(content=msg["content"]))
+
+        messages.append(HumanMessage(content=user_message))
+        return messages
+
+    async def _prepare_messages(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None,
+        session_id: str | None,
+    ) -> list[BaseMessage]:
+        """토큰 예산에 맞춘 프롬프트 메시지 (예산을 쓰지 않으면 히스토리 전체)."""
+        if self.context_budget is None:
+            return self._build_messages(user_message, history)
+
+        context = await self.context_budget.build(user_message, history, session_id)
+        stats = context.stats
+        if stats.saved_tokens:
+            logger.info(
+                f"컨텍스트 {stats.history_tokens} → {stats.prompt_tokens}토큰 "
+                f"(요약 {stats.summarized_messages}개, 제외 {stats.dropped_messages}개)"
+            )
+        return context.messages
+
+    async def _load_thread(self, session_id: str | None) -> list[BaseMessage] | None:
+        """세션 스레드에 쌓인 메시지 (체크포인터를 쓰지 않으면 None)."""
+        if self.checkpointer is None or session_id is None:
+            return None
+        state = await self.agent.aget_state({"configurable": {"thread_id": session_id}})
+        return state.values.get("messages", [])
+
+    async def _prepare_run(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None,
+        session_id: str | None,
+        thread: list[BaseMessage] | None,
+    ) -> _AgentRun:
+        """이번 턴의 그래프 입력.
+
+        스레드가 있으면 스레드에 쌓인 대화가 히스토리가 되고 새 메시지만 보냅니다.
+        스레드가 비어 있으면(처음이거나 밀려난 세션) history로 채워서 시작합니다.
+        """
+        if thread is None:
+            messages = await self._prepare_messages(user_message, history, session_id)
+            kwargs = {"config": {"callbacks": self._callbacks}}
+            return _AgentRun(messages, kwargs, history, len(messages))
+
+        if thread:
+            messages: list[BaseMessage] = [HumanMessage(content=user_message)]
+            history = _dialogue(thread)
+        else:
+            messages = self._build_messages(user_message, history)
+        config: RunnableConfig = {
+            "configurable": {"thread_id": session_id},
+            "callbacks": self._callbacks,
+        }
+        # 턴이 끝날 때만 체크포인트 저장 (도구 호출 단계마다 쌓지 않음)
+        kwargs = {"config": config, "durability": "exit"}
+        return _AgentRun(messages, kwargs, history, len(thread) + len(messages))
+
+    async def compact_thread(self, session_id: str) -> None:
+        """세션 스레드의 체크포인트를 최신 상태 하나로 정리 (메시지는 유지)."""
+        config: RunnableConfig = {"configurable": {"thread_id": session_id}}
+        state = await self.agent.aget_state(config)
+        messages = state.values.get("messages", [])
+        # 실행 중이거나 비어 있는 스레드는 그대로 둠
+        if not messages or state.next:
+            return
+        await self.checkpointer.adelete_thread(session_id)
+        await self.agent.aupdate_state(config, {"messages": messages}, as_node="agent")
+
+    async def delete_thread(self, session_id: str) -> None:
+        """세션 스레드 삭제 (다음 턴은 history로 다시 채움)."""
+        if self.checkpointer is not None:
+            await self.checkpointer.adelete_thread(session_id)
+
+    def _cached_response(
+        self, user_message: str, history: list[dict[str, str]] | None
+    ) -> str | None:
+        """응답 캐시에 같거나 비슷한 질문이 있으면 그 응답."""
+        if self.response_cache is None:
+            return None
+        hit = self.response_cache.lookup(user_message, history)
+        if hit is None:
+            return None
+        logger.info(f"응답 캐시 적중 ({hit.tier}, 유사도 {hit.score:.2f})")
+        return hit.response
+
+    async def _record_cached_turn(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None,
+        session_id: str | None,
+        thread: list[BaseMessage] | None,
+        response: str,
+    ) -> None:
+        """캐시 응답으로 끝난 턴도 세션 스레드에 질문/답변으로 남김 (스레드가 없으면 무시)."""
+        if thread is None:
+            return
+        run = await self._prepare_run(user_message, history, session_id, thread)
+        config: RunnableConfig = {"configurable": {"thread_id": session_id}}
+        messages = [*run.messages, AIMessage(content=response)]
+        await self.agent.aupdate_state(config, {"messages": messages}, as_node="agent")
+
+    def _cache_response(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None,
+        response: str,
+        tools: Iterable[str],
+        start: float,
+    ) -> None:
+        """에이전트가 만든 응답을 응답 캐시에 저장 (부작용 도구를 불렀으면 건너뜀)."""
+        if self.response_cache is None or not response:
+            return
+        elapsed = time.perf_counter() - start
+        if not self.response_cache.store(user_message, history, response, tools, elapsed):
+            logger.info("부작용 도구를 호출한 응답이라 캐시하지 않습니다")
+
+    async def chat(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None = None,
+        session_id: str | None = None,
+    ) -> str:
+        """사용자 메시지에 응답합니다.
+
+        session_id를 주면 예산을 넘는 앞쪽 대화를 요약해 세션별로 저장하고 다음 턴에
+        재사용합니다. 없으면 오래된 메시지부터 잘라 예산을 지킵니다.
+        체크포인터가 있으면 session_id의 스레드 상태를 이어 쓰고 history는 빈 스레드를
+        채울 때만 사용합니다.
+        """
         if not self._initialized:
             await self.initialize()
 
-        try:
-            # 메시지 히스토리를 LangChain 형식으로 변환
-            messages = []
-            if history:
-                for msg in history:
-                    if msg["role"] == "user":
-                        messages.append(HumanMessage(content=msg["content"]))
-                    elif msg["role"] == "assistant":
-                        messages.append(AIMessage(content=msg["content"]))
-
-            messages.append(HumanMessage(content=user_message))
-
-            # 에이전트 실행
-            response = await self.agent.ainvoke({"messages": messages})
-
-            # 응답 추출
-            if "messages" in response and response["messages"]:
-                last_message = response["messages"][-1]
-                if isinstance(last_message, AIMessage):
+        with self.tracer.span("turn", stage="turn", session_id=session_id) as span:
+            try:
+                await self._refresh_agent()
+                start = time.perf_counter()
+                thread = await self._load_thread(session_id)
+                cached = self._cached_response(
+                    user_message, _dialogue(thread) if thread else history
+                )
+                if cached is not None:
+                    span.set_attribute("cached", True)
+                    await self._record_cached_turn(
+                        user_message, history, session_id, thread, cached
+                    )
+                    return cached
+                run = await self._prepare_run(user_message, history, session_id, thread)
+
+                # 에이전트 실행
+                response = await self.agent.ainvoke({"messages": run.messages}, **run.kwargs)
+
+                # 응답 추출
+                if "messages" in response and response["messages"]:
+                    last_message = response["messages"][-1]
+                    if not isinstance(last_message, AIMessage):
+                        return str(last_message.content)
+                    if isinstance(last_message.content, str):
+                        tools = [
+                            call["name"]
+                            for message in response["messages"][run.skip :]
+                            if isinstance(message, AIMessage)
+                            for call in message.tool_calls
+                        ]
+                        self._cache_response(
+                            user_message, run.history, last_message.content, tools, start
+                        )
                     return last_message.content
-                return str(last_message.content)
 
-            return "죄송합니다. 응답을 생성할 수 없습니다."
+                return "죄송합니다. 응답을 생성할 수 없습니다."
 
-        except Exception as e:
-            logger.error(f"채팅 응답 생성 중 오류: {e}")
-            return f"❌ 오류 발생: {str(e)}"
+            except Exception as e:
+                span.record_error(e)
+                logger.error(f"채팅 응답 생성 중 오류: {e}")
+                return f"❌ 오류 발생: {str(e)}"
+
+    async def astream_chat(
+        self,
+        user_message: str,
+        history: list[dict[str, str]] | None = None,
+        session_id: str | None = None,
+    ) -> AsyncIterator[AgentEvent]:
+        """사용자 메시지에 대한 응답을 이벤트 단위로 스트리밍합니다.
+
+        LangGraph의 `messages` 모드로 LLM 토큰 조각을, `updates` 모드로 노드가 끝날 때의
+        도구 호출/결과를 받아 `AgentEvent`로 변환합니다. ReAct 루프 중간의 토큰(도구를
+        고르기 전의 설명 등)도 그대로 전달되므로, 최종 응답은 모든 token 이벤트의
+        content를 이어 붙인 문자열입니다.
+
+        히스토리 처리와 오류는 `chat`과 같습니다 (오류는 예외 대신 마지막 `error` 이벤트).
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        with self.tracer.span("turn", stage="turn", session_id=session_id, stream=True) as span:
+            try:
+                await self._refresh_agent()
+                start = time.perf_counter()
+                thread = await self._load_thread(session_id)
+                cached = self._cached_response(
+                    user_message, _dialogue(thread) if thread else history
+                )
+                if cached is not None:
+                    span.set_attribute("cached", True)
+                    await self._record_cached_turn(
+                        user_message, history, session_id, thread, cached
+                    )
+                    yield AgentEvent(type="token", content=cached)
+                    return
+                run = await self._prepare_run(user_message, history, session_id, thread)
+
+                answer = ""
+                tools: list[str] = []
+                async for mode, chunk in self.agent.astream(
+                    {"messages": run.messages}, stream_mode=["messages", "updates"], **run.kwargs
+                ):
+                    if mode == "messages":
+                        message, metadata = chunk
+                        # 도구 내부에서 호출된 LLM 토큰은 제외하고 에이전트 노드 출력만 전달
+                        if (
+                            isinstance(message, AIMessageChunk)
+                            and metadata.get("langgraph_node") == "agent"
+                        ):
+                            text = _content_text(message.content)
+                            if text:
+                                yield AgentEvent(type="token", content=text)
+                        continue
+
+                    for update in chunk.values():
+                        for message in (update or {}).get("messages", []):
+                            if isinstance(message, AIMessage):
+                                if not message.tool_calls:
+                                    answer = _content_text(message.content)
+                                for call in message.tool_calls:
+                                    tools.append(call["name"])
+                                    yield AgentEvent(
+                                        type="tool_call",
+                                        tool_name=call["name"],
+                                        tool_args=call["args"],
+                                        tool_call_id=call["id"],
+                                    )
+                            elif isinstance(message, ToolMessage):
+                                yield AgentEvent(
+                                    type="tool_result",
+                                    content=_content_text(message.content),
+                                    tool_name=message.name,
+                                    tool_call_id=message.tool_call_id,
+                                )
+
+                self._cache_response(user_message, run.history, answer, tools, start)
+
+            except Exception as e:
+                span.record_error(e)
+                logger.error(f"스트리밍 응답 생성 중 오류: {e}")
+                yield AgentEvent(type="error", content=f"❌ 오류 발생: {str(e)}")
 
     async def close(self) -> None:
         """리소스 정리."""
-        if self.mcp_client:
+        if self.mcp_sessions:
             try:
-                await self.mcp_client.cleanup()
+                await self.mcp_sessions.close()
             except Exception as e:
-                logger.error(f"MCP 클라이언트 종료 오류: {e}")
+                logger.error(f"MCP 세션 종료 오류: {e}")
+
+
+def _dialogue(messages: list[BaseMessage]) -> list[dict[str, str]]:
+    """그래프 메시지에서 사용자 질문과 최종 응답만 {"role", "content"}로 추출."""
+    dialogue = []
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            dialogue.append({"role": "user", "content": _content_text(message.content)})
+        elif isinstance(message, AIMessage) and not message.tool_calls:
+            dialogue.append({"role": "assistant", "content": _content_text(message.content)})
+    return dialogue
+
+
+def _content_text(content: str | list[Any]) -> str:
+    """메시지 content(문자열 또는 content block 목록)에서 텍스트만 추출."""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, str) or block.get("type") == "text"
+    )
 
 
 _agent_instance: MCPAgent | None = None
+_llm_gateway: LLMGateway | None = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """프로세스 공유 LLM 게이트웨이 (처음 호출 시 설정값으로 생성)."""
+    global _llm_gateway
+    if _llm_gateway is None:
+        _llm_gateway = LLMGateway(
+            max_in_flight=settings.llm_max_in_flight,
+            max_connections=settings.llm_max_connections,
+            retries=settings.llm_retries,
+            backoff=settings.llm_retry_backoff,
+            coalesce=settings.llm_coalesce,
+        )
+    return _llm_gateway
 
 
 async def get_agent() -> MCPAgent:
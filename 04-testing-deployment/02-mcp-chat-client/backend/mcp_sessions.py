@@ -0,0 +1,536 @@
+"""Persistent MCP server sessions with health checks and warm restart.
+
+`MultiServerMCPClient.get_tools()`가 돌려주는 도구는 호출할 때마다 새 세션을
+만들기 때문에, stdio 서버라면 도구 호출마다 하위 프로세스를 새로 띄웁니다.
+또 초기화 중 한 번 실패하면 에이전트가 도구 없이 계속 동작했습니다.
+
+`MCPSessionManager`는 활성화된 서버마다 세션 하나를 열어 두고 재사용합니다.
+
+- 서버별 세션은 전용 태스크가 소유합니다 (stdio 클라이언트의 anyio 취소 범위는
+  들어간 태스크에서 나와야 하므로).
+- `ping_interval`마다 ping을 보내고, 응답이 없거나 죽은 서버는 지수 백오프로 재시작합니다.
+- 도구 목록은 시작/재시작 때와 서버가 `notifications/tools/list_changed`를 보냈을 때만
+  다시 가져오고, 실제로 바뀐 경우에만 `tools_version`을 올립니다.
+- LangChain 도구는 세션 대신 관리자를 거쳐 호출하므로 재시작 후에도 그대로 쓸 수 있습니다.
+- `manifest_path`를 주면 서버별 도구 스키마를 파일(도구 매니페스트)에 저장하고,
+  `lazy=True`이면 매니페스트에 도구가 있는 서버는 시작하지 않고(`idle`) 첫 도구 호출 때
+  띄웁니다. 매니페스트 항목은 연결 설정(명령, 인자, URL)이 바뀌면 버리고, 서버를 띄운 뒤
+  받은 도구 목록이 다르면 갱신합니다.
+
+사용 예:
+    >>> manager = MCPSessionManager.from_config(
+    ...     "./mcp_servers/server_config.json",
+    ...     manifest_path="./mcp_servers/tool_manifest.json",
+    ...     lazy=True,
+    ... )
+    >>> await manager.start()
+    >>> tools = await manager.get_tools()
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from pathlib import Path
+from typing import Any
+
+import anyio
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.sessions import Connection, create_session
+from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+from mcp import ClientSession, types
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from .models import MCPServerConfig, MCPServerStatus
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[Connection], AbstractAsyncContextManager[ClientSession]]
+
+# LangChain 도구의 metadata에 담기는 MCP 서버 이름 키
+SERVER_METADATA_KEY = "mcp_server"
+
+# 도구 매니페스트 형식 버전 (바뀌면 이전 파일은 무시)
+MANIFEST_VERSION = 1
+
+# 요청을 보내기 전에 끊긴 세션에서 나는 오류 (서버가 요청을 받지 못했으므로 재시도해도 안전)
+_SEND_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+
+def tool_server(tool: BaseTool | None) -> str | None:
+    """LangChain 도구가 속한 MCP 서버 이름 (MCP 도구가 아니면 None)."""
+    if tool is None or not tool.metadata:
+        return None
+    return tool.metadata.get(SERVER_METADATA_KEY)
+
+
+def load_server_configs(path: str | Path) -> list[MCPServerConfig]:
+    """server_config.json에서 활성화된 서버 설정을 읽습니다 (파일이 없으면 빈 목록)."""
+    config_path = Path(path)
+    if not config_path.exists():
+        return []
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+    servers = [MCPServerConfig(**server) for server in config.get("servers", [])]
+    return [server for server in servers if server.enabled]
+
+
+def to_connection(server: MCPServerConfig) -> Connection:
+    """MCPServerConfig를 langchain-mcp-adapters 연결 설정으로 변환."""
+    if server.transport == "streamable_http":
+        return {"transport": "streamable_http", "url": server.url}
+    return {"transport": "stdio", "command": server.command, "args": server.args}
+
+
+def connection_key(connection: Connection) -> str:
+    """도구 매니페스트 항목이 유효한지 가리는 연결 설정 해시 (session_kwargs 제외)."""
+    fields = {k: v for k, v in connection.items() if k != "session_kwargs"}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _tools_fingerprint(tools: list[types.Tool]) -> str:
+    return hashlib.sha256(
+        json.dumps(
+            [t.model_dump(mode="json", exclude_none=True) for t in tools], sort_keys=True
+        ).encode()
+    ).hexdigest()
+
+
+class _ServerSession:
+    """서버 하나의 세션과 상태."""
+
+    def __init__(self, name: str, connection: Connection) -> None:
+        self.name = name
+        self.connection = connection
+        self.session: ClientSession | None = None
+        self.state: str = "stopped"
+        self.tools: list[types.Tool] = []
+        self.fingerprint = ""
+        self.tools_stale = False
+        self.ever_ready = False
+        self.restarts = 0
+        self.failures = 0
+        self.next_retry_at = 0.0
+        self.last_error: str | None = None
+        self.last_ping_ms: float | None = None
+        self.start_ms: float | None = None  # 마지막 시작(프로세스 spawn + initialize) 시간
+        self.list_tools_ms: float | None = None  # 마지막 도구 목록 조회 시간
+        self.lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._stop: asyncio.Event | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.state == "ready" and self.session is not None
+
+
+class MCPSessionManager:
+    """활성화된 MCP 서버마다 영속 세션을 유지하는 관리자."""
+
+    def __init__(
+        self,
+        connections: dict[str, Connection],
+        ping_interval: float = 30.0,
+        ping_timeout: float = 5.0,
+        start_timeout: float = 30.0,
+        max_backoff: float = 60.0,
+        session_factory: SessionFactory = create_session,
+        manifest_path: str | Path | None = None,
+        lazy: bool = False,
+    ) -> None:
+        """관리자 생성 (연결은 start()에서 시작).
+
+        Args:
+            connections: 서버 이름 → 연결 설정
+            ping_interval: 상태 확인 주기 (초, 0이면 백그라운드 확인 안 함)
+            ping_timeout: ping 응답 대기 시간 (초)
+            start_timeout: 서버 시작(initialize까지) 대기 시간 (초)
+            max_backoff: 재시작 재시도 간격 상한 (초)
+            session_factory: 연결 설정 → 세션 컨텍스트 매니저 (테스트용)
+            manifest_path: 서버별 도구 스키마를 저장할 JSON 파일 (None이면 저장 안 함)
+            lazy: 매니페스트에 도구가 있는 서버는 첫 도구 호출 때 시작
+        """
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.start_timeout = start_timeout
+        self.max_backoff = max_backoff
+        self._session_factory = session_factory
+        self._servers = {name: _ServerSession(name, conn) for name, conn in connections.items()}
+        self._tools: list[BaseTool] = []
+        self._tools_built_for = -1
+        self._health_task: asyncio.Task[None] | None = None
+        self.tools_version = 0
+        self.manifest_path = Path(manifest_path) if manifest_path is not None else None
+        self.lazy = lazy
+        self.start_ms: float | None = None  # start()가 걸린 시간 (서버 동시 시작)
+        self._load_manifest()
+
+    @classmethod
+    def from_config(cls, path: str | Path, **kwargs: Any) -> "MCPSessionManager":
+        """server_config.json의 활성화된 서버로 관리자 생성."""
+        servers = load_server_configs(path)
+        return cls({server.name: to_connection(server) for server in servers}, **kwargs)
+
+    # ========================================================================
+    # 수명 주기
+    # ========================================================================
+
+    async def start(self) -> None:
+        """서버를 동시에 시작하고 상태 확인 루프를 시작합니다.
+
+        lazy이면 매니페스트에 도구가 있는 서버는 `idle`로 두고 첫 도구 호출 때 시작합니다.
+        일부 서버가 실패해도 예외를 던지지 않으며, 실패한 서버는 상태 확인 루프가 재시도합니다.
+        """
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                self._restart(server)
+                for server in self._servers.values()
+                if not (self.lazy and server.state == "idle")
+            )
+        )
+        self.start_ms = (time.perf_counter() - started) * 1000
+        if self.ping_interval > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop(), name="mcp-health")
+
+    async def close(self) -> None:
+        """상태 확인 루프와 모든 세션 종료."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        await asyncio.gather(*(self._stop_session(server) for server in self._servers.values()))
+
+    async def _serve(
+        self, server: _ServerSession, ready: asyncio.Future[None], stop: asyncio.Event
+    ) -> None:
+        """세션을 열고 stop이 설정될 때까지 유지 (세션 컨텍스트를 소유하는 태스크)."""
+
+        async def on_message(message: Any) -> None:
+            if isinstance(message, types.ServerNotification) and isinstance(
+                message.root, types.ToolListChangedNotification
+            ):
+                server.tools_stale = True
+
+        connection = dict(server.connection)
+        connection["session_kwargs"] = {
+            **connection.get("session_kwargs", {}),
+            "message_handler": on_message,
+        }
+        try:
+            async with self._session_factory(connection) as session:
+                await session.initialize()
+                server.session = session
+                ready.set_result(None)
+                await stop.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            elif not stop.is_set():
+                # 연결이 유지되던 중 서버가 죽음 (stdio EOF 등)
+                self._mark_failed(server, session, e)
+        finally:
+            server.session = None
+
+    async def _start_session(self, server: _ServerSession) -> None:
+        """세션 태스크를 시작하고 initialize가 끝날 때까지 기다립니다."""
+        loop = asyncio.get_running_loop()
+        ready: asyncio.Future[None] = loop.create_future()
+        server._stop = asyncio.Event()
+        server._task = asyncio.create_task(
+            self._serve(server, ready, server._stop), name=f"mcp-session-{server.name}"
+        )
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), self.start_timeout)
+        except BaseException:
+            await self._stop_session(server)
+            raise
+
+    async def _stop_session(self, server: _ServerSession) -> None:
+        """세션 태스크 종료 (응답이 없으면 취소)."""
+        task, server._task = server._task, None
+        if server._stop is not None:
+            server._stop.set()
+        if task is not None:
+            try:
+                await asyncio.wait_for(task, self.ping_timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            except Exception as e:
+                logger.debug(f"MCP 세션 종료 중 오류 ({server.name}): {e}")
+        server.session = None
+        server.state = "stopped"
+
+    async def _restart(self, server: _ServerSession, broken: ClientSession | None = None) -> bool:
+        """서버를 (재)시작하고 도구 목록을 갱신합니다.
+
+        기다리는 동안 다른 호출이 이미 (재)시작을 마쳤으면 그 세션을 그대로 씁니다.
+        동시에 들어온 첫 호출이나 같은 세션에서 실패한 호출들이 서로의 세션을 다시
+        띄우지 않도록 합니다.
+
+        Args:
+            broken: 실패한 세션 (준비된 세션이 이것이면 살아 있어 보여도 재시작)
+
+        Returns:
+            준비 완료 여부
+        """
+        async with server.lock:
+            if server.is_ready and (broken is None or server.session is not broken):
+                return True
+
+            if server.state == "idle":
+                logger.info(f"MCP 서버 시작 (첫 도구 호출): {server.name}")
+            await self._stop_session(server)
+            server.state = "starting"
+            try:
+                started = time.perf_counter()
+                await self._start_session(server)
+                server.start_ms = (time.perf_counter() - started) * 1000
+                await self._refresh_tools(server)
+            except Exception as e:
+                await self._stop_session(server)
+                server.state = "failed"
+                server.failures += 1
+                server.last_error = f"{type(e).__name__}: {e}"
+                server.next_retry_at = time.monotonic() + min(
+                    self.max_backoff, 2 ** (server.failures - 1)
+                )
+                logger.warning(f"MCP 서버 시작 실패 ({server.name}): {server.last_error}")
+                return False
+
+            if server.ever_ready:
+                server.restarts += 1
+                logger.info(f"MCP 서버 재시작 완료: {server.name}")
+            server.ever_ready = True
+            server.state = "ready"
+            server.failures = 0
+            server.last_error = None
+            return True
+
+    # ========================================================================
+    # 상태 확인
+    # ========================================================================
+
+    async def _health_loop(self) -> None:
+        """ping_interval마다 check_health 실행."""
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            try:
+                await self.check_health()
+            except Exception as e:
+                logger.error(f"MCP 상태 확인 오류: {e}")
+
+    async def check_health(self) -> None:
+        """모든 서버에 ping을 보내고, 실패한 서버는 재시작하며, 바뀐 도구 목록을 갱신합니다."""
+        await asyncio.gather(*(self._check_server(s) for s in self._servers.values()))
+
+    async def _check_server(self, server: _ServerSession) -> None:
+        if server.state == "idle":
+            # 아직 쓰지 않은 서버는 첫 도구 호출 때 시작
+            return
+        if not server.is_ready:
+            if time.monotonic() >= server.next_retry_at:
+                await self._restart(server)
+            return
+
+        session = server.session
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(session.send_ping(), self.ping_timeout)
+        except Exception as e:
+            server.last_error = f"ping 실패: {type(e).__name__}: {e}"
+            logger.warning(f"MCP 서버 응답 없음 ({server.name}), 재시작합니다")
+            await self._restart(server, broken=session)
+            return
+        server.last_ping_ms = (time.perf_counter() - started) * 1000
+
+        if server.tools_stale:
+            try:
+                await self._refresh_tools(server)
+            except Exception as e:
+                logger.warning(f"MCP 도구 목록 갱신 실패 ({server.name}): {e}")
+
+    async def _refresh_tools(self, server: _ServerSession) -> None:
+        """도구 목록을 다시 가져오고, 바뀌었으면 tools_version을 올립니다."""
+        server.tools_stale = False
+        started = time.perf_counter()
+        tools: list[types.Tool] = []
+        cursor: str | None = None
+        while True:
+            result = await server.session.list_tools(cursor)
+            tools.extend(result.tools)
+            cursor = result.nextCursor
+            if not cursor:
+                break
+        server.list_tools_ms = (time.perf_counter() - started) * 1000
+
+        fingerprint = _tools_fingerprint(tools)
+        if fingerprint != server.fingerprint:
+            server.tools = tools
+            server.fingerprint = fingerprint
+            self.tools_version += 1
+            logger.info(f"MCP 도구 목록 갱신 ({server.name}): {len(tools)}개")
+            self._save_manifest()
+
+    # ========================================================================
+    # 도구 매니페스트
+    # ========================================================================
+
+    def _load_manifest(self) -> None:
+        """매니페스트에서 연결 설정이 같은 서버의 도구 스키마를 채웁니다 (서버는 `idle`)."""
+        if self.manifest_path is None or not self.manifest_path.exists():
+            return
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("version") != MANIFEST_VERSION:
+                return
+            entries = manifest.get("servers", {})
+            for server in self._servers.values():
+                entry = entries.get(server.name)
+                if entry is None or entry.get("key") != connection_key(server.connection):
+                    continue
+                server.tools = [types.Tool.model_validate(tool) for tool in entry["tools"]]
+                server.fingerprint = _tools_fingerprint(server.tools)
+                server.state = "idle"
+        except Exception as e:
+            # 매니페스트가 깨졌으면 서버를 띄워 다시 만듦
+            logger.warning(f"MCP 도구 매니페스트를 읽을 수 없습니다 ({self.manifest_path}): {e}")
+            for server in self._servers.values():
+                server.tools, server.fingerprint, server.state = [], "", "stopped"
+
+    def _save_manifest(self) -> None:
+        """도구 목록을 아는 서버들의 스키마를 매니페스트에 씀 (임시 파일 후 교체)."""
+        if self.manifest_path is None:
+            return
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "servers": {
+                server.name: {
+                    "key": connection_key(server.connection),
+                    "tools": [t.model_dump(mode="json", exclude_none=True) for t in server.tools],
+                }
+                for server in self._servers.values()
+                if server.fingerprint
+            },
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+            tmp_path.write_text(
+                json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+            tmp_path.replace(self.manifest_path)
+        except OSError as e:
+            logger.warning(f"MCP 도구 매니페스트 저장 실패 ({self.manifest_path}): {e}")
+
+    def status(self) -> list[MCPServerStatus]:
+        """서버별 연결 상태."""
+        return [
+            MCPServerStatus(
+                name=server.name,
+                state=server.state,
+                tool_count=len(server.tools) if server.is_ready or server.state == "idle" else 0,
+                restarts=server.restarts,
+                last_error=server.last_error,
+                last_ping_ms=server.last_ping_ms,
+                start_ms=server.start_ms,
+                list_tools_ms=server.list_tools_ms,
+            )
+            for server in self._servers.values()
+        ]
+
+    # ========================================================================
+    # 도구
+    # ========================================================================
+
+    async def get_tools(self) -> list[BaseTool]:
+        """준비된 서버들과 매니페스트의 LangChain 도구 (도구 목록이 바뀐 경우에만 다시 만듦).
+
+        서버가 `idle`이면 매니페스트의 스키마로 도구를 만들고, 서버가 실패 상태여도
+        마지막으로 받은 도구는 유지하며, 호출 시 재시작을 시도합니다.
+        """
+        for server in self._servers.values():
+            if server.is_ready and server.tools_stale:
+                await self._refresh_tools(server)
+
+        if self._tools_built_for != self.tools_version:
+            tools = []
+            for server in self._servers.values():
+                for mcp_tool in server.tools:
+                    tool = convert_mcp_tool_to_langchain_tool(
+                        _ManagedSession(self, server.name), mcp_tool, server_name=server.name
+                    )
+                    # 서버별 동시 실행 제한/결과 캐시 적용에 사용 (tool_server)
+                    tool.metadata = {**(tool.metadata or {}), SERVER_METADATA_KEY: server.name}
+                    tools.append(tool)
+            self._tools = tools
+            self._tools_built_for = self.tools_version
+        return self._tools
+
+    async def call_tool(
+        self, server_name: str, name: str, arguments: dict[str, Any] | None = None, **kwargs: Any
+    ) -> types.CallToolResult:
+        """서버의 영속 세션으로 도구 호출.
+
+        서버가 `idle`이면 여기서 처음 시작하고, 세션이 죽어 있으면 먼저 재시작하며,
+        요청을 보내기 전에 끊긴 경우에만 한 번 재시도합니다.
+        응답을 기다리다 끊긴 경우는 도구가 이미 실행됐을 수 있으므로 재시도하지 않고
+        다음 호출을 위해 재시작만 합니다.
+        """
+        server = self._servers[server_name]
+        for attempt in range(2):
+            session = server.session
+            if not server.is_ready:
+                if not await self._restart(server, broken=session):
+                    raise RuntimeError(
+                        f"MCP 서버에 연결할 수 없습니다: {server_name} ({server.last_error})"
+                    )
+                session = server.session
+
+            try:
+                return await session.call_tool(name, arguments, **kwargs)
+            except _SEND_ERRORS as e:
+                self._mark_failed(server, session, e)
+                if attempt == 1:
+                    raise
+            except McpError as e:
+                if e.error.code == CONNECTION_CLOSED:
+                    self._mark_failed(server, session, e)
+                raise
+        raise AssertionError("unreachable")
+
+    @staticmethod
+    def _mark_failed(server: _ServerSession, session: ClientSession, error: Exception) -> None:
+        """다음 호출이나 상태 확인에서 바로 재시작하도록 표시.
+
+        실패한 세션이 이미 다른 호출의 재시작으로 바뀌었으면 새 세션은 건드리지 않습니다.
+        """
+        if server.session is not session:
+            return
+        server.state = "failed"
+        server.last_error = f"{type(error).__name__}: {error}"
+        server.next_retry_at = 0.0
+
+
+class _ManagedSession:
+    """도구 호출을 관리자로 넘기는 ClientSession 대역 (재시작 후에도 같은 도구 사용)."""
+
+    def __init__(self, manager: MCPSessionManager, server_name: str) -> None:
+        self._manager = manager
+        self._server_name = server_name
+
+    async def call_tool(
+        self, name: str, arguments: dict[str, Any] | None = None, **kwargs: Any
+    ) -> types.CallToolResult:
+        return await self._manager.call_tool(self._server_name, name, arguments, **kwargs)
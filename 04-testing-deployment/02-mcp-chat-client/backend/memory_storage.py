@@ -0,0 +1,219 @@
+"""Lock-free in-memory chat storage.
+
+테스트와 데모용 `ChatStorage` 구현입니다. 파일이나 SQL 없이 딕셔너리와
+리스트만 사용하며, 잠금을 쓰지 않습니다.
+
+CPython에서 `dict` 항목 대입/삭제, `list.extend`, `itertools.count`의 `next()`는
+각각 원자적이므로 여러 스레드가 동시에 호출해도 자료구조가 깨지지 않습니다.
+대신 한 번에 여러 값을 바꾸는 갱신(예: 세션의 메시지 수 증가)은 하지 않고,
+메시지 수와 마지막 활동 시각은 조회 시점에 계산합니다.
+"""
+
+import itertools
+import uuid
+from datetime import datetime
+from typing import NamedTuple
+
+from .models import ChatMessage, ChatSession, ChatStats, SearchResult, SessionSummary
+from .storage import (
+    SessionOrder,
+    build_stats,
+    check_session_order,
+    highlight_snippet,
+    search_terms,
+    stats_window,
+)
+
+
+class _StoredMessage(NamedTuple):
+    """메시지와 저장 순서 ID."""
+
+    id: int
+    message: ChatMessage
+
+
+# list_sessions 정렬 기준 → (정렬 키, 역순 여부)
+_SESSION_SORT_KEYS = {
+    "updated_at": (lambda s: (s.updated_at, s.session_id), True),
+    "created_at": (lambda s: (s.created_at, s.session_id), True),
+    "created_at_asc": (lambda s: (s.created_at, s.session_id), False),
+    "message_count": (lambda s: (s.message_count, s.updated_at), True),
+}
+
+
+class InMemoryChatStorage:
+    """잠금 없는 메모리 기반 채팅 저장소."""
+
+    def __init__(self) -> None:
+        """빈 저장소 생성."""
+        self._sessions: dict[str, ChatSession] = {}
+        self._messages: dict[str, list[_StoredMessage]] = {}
+        self._updated_at: dict[str, datetime] = {}
+        self._summaries: dict[str, SessionSummary] = {}
+        self._ids = itertools.count(1)
+
+    def create_session(self, title: str = "New Conversation") -> ChatSession:
+        """새 채팅 세션 생성."""
+        now = datetime.now()
+        session = ChatSession(
+            session_id=str(uuid.uuid4()),
+            title=title,
+            created_at=now,
+            updated_at=now,
+            message_count=0,
+        )
+
+        # 메시지 목록을 먼저 만들어 두어야 세션이 보이는 순간부터 메시지를 받을 수 있음
+        self._messages[session.session_id] = []
+        self._updated_at[session.session_id] = now
+        self._sessions[session.session_id] = session
+        return session.model_copy()
+
+    def get_session(self, session_id: str) -> ChatSession | None:
+        """세션 조회."""
+        session = self._sessions.get(session_id)
+        return None if session is None else self._snapshot(session)
+
+    def list_sessions(
+        self, limit: int = 50, order_by: SessionOrder = "updated_at"
+    ) -> list[ChatSession]:
+        """세션 목록 조회."""
+        check_session_order(order_by)
+        key, reverse = _SESSION_SORT_KEYS[order_by]
+
+        sessions = [self._snapshot(s) for s in list(self._sessions.values())]
+        sessions.sort(key=key, reverse=reverse)
+        return sessions[:limit]
+
+    def stats(self, days: int = 30) -> ChatStats:
+        """전체 통계 계산."""
+        _, cutoff = stats_window(days)
+        sessions = list(self._sessions.values())
+        counts = [len(self._messages.get(s.session_id, ())) for s in sessions]
+
+        sessions_by_day: dict[str, int] = {}
+        for session in sessions:
+            if session.created_at >= cutoff:
+                key = session.created_at.date().isoformat()
+                sessions_by_day[key] = sessions_by_day.get(key, 0) + 1
+
+        messages_by_day: dict[str, int] = {}
+        for stored in self._all_messages():
+            if stored.message.timestamp >= cutoff:
+                key = stored.message.timestamp.date().isoformat()
+                messages_by_day[key] = messages_by_day.get(key, 0) + 1
+
+        return build_stats(
+            days,
+            len(sessions),
+            sum(counts),
+            max(counts, default=0),
+            sessions_by_day,
+            messages_by_day,
+        )
+
+    def add_message(self, session_id: str, message: ChatMessage) -> None:
+        """메시지 추가."""
+        self.add_messages(session_id, [message])
+
+    def add_messages(self, session_id: str, messages: list[ChatMessage]) -> None:
+        """여러 메시지 추가 (삭제되었거나 없는 세션이면 무시)."""
+        stored = self._messages.get(session_id)
+        if stored is None or not messages:
+            return
+
+        stored.extend(
+            _StoredMessage(next(self._ids), message.model_copy(update={"session_id": session_id}))
+            for message in messages
+        )
+        self._updated_at[session_id] = datetime.now()
+
+    def get_messages(self, session_id: str, limit: int = 100) -> list[ChatMessage]:
+        """세션의 메시지를 시간순으로 조회."""
+        return self._sorted_messages(session_id)[:limit]
+
+    def get_recent_messages(self, session_id: str, limit: int = 100) -> list[ChatMessage]:
+        """세션의 최근 limit개 메시지를 시간순으로 조회."""
+        return self._sorted_messages(session_id)[-limit:] if limit > 0 else []
+
+    def get_messages_for_sessions(
+        self, session_ids: list[str], per_session_limit: int = 100
+    ) -> dict[str, list[ChatMessage]]:
+        """여러 세션의 메시지 조회."""
+        return {
+            session_id: self.get_messages(session_id, per_session_limit)
+            for session_id in session_ids
+        }
+
+    def search(
+        self, query: str, limit: int = 20, session_id: str | None = None
+    ) -> list[SearchResult]:
+        """모든 단어를 포함한 메시지를 최신순으로 검색 (대소문자 무시)."""
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        if session_id is None:
+            candidates = self._all_messages()
+        else:
+            candidates = list(self._messages.get(session_id, ()))
+
+        matches = [
+            stored
+            for stored in candidates
+            if all(term in stored.message.content.lower() for term in terms)
+        ]
+        matches.sort(key=lambda stored: (stored.message.timestamp, stored.id), reverse=True)
+
+        results = []
+        for stored in matches[:limit]:
+            session = self._sessions.get(stored.message.session_id)
+            results.append(
+                SearchResult(
+                    message_id=stored.id,
+                    session_id=stored.message.session_id,
+                    session_title=session.title if session else None,
+                    role=stored.message.role,
+                    snippet=highlight_snippet(stored.message.content, terms),
+                    timestamp=stored.message.timestamp,
+                    rank=0.0,
+                )
+            )
+        return results
+
+    def get_summary(self, session_id: str) -> SessionSummary | None:
+        """세션 대화 요약 조회 (없으면 None)."""
+        return self._summaries.get(session_id)
+
+    def save_summary(self, session_id: str, summary: SessionSummary) -> None:
+        """세션 대화 요약 저장 (기존 요약은 교체)."""
+        self._summaries[session_id] = summary
+
+    def delete_session(self, session_id: str) -> None:
+        """세션과 메시지, 요약 삭제."""
+        self._sessions.pop(session_id, None)
+        self._messages.pop(session_id, None)
+        self._updated_at.pop(session_id, None)
+        self._summaries.pop(session_id, None)
+
+    def close(self) -> None:
+        """메모리 저장소는 정리할 자원이 없음."""
+
+    def _snapshot(self, session: ChatSession) -> ChatSession:
+        """현재 메시지 수와 마지막 활동 시각을 반영한 세션 복사본."""
+        return session.model_copy(
+            update={
+                "message_count": len(self._messages.get(session.session_id, ())),
+                "updated_at": self._updated_at.get(session.session_id, session.updated_at),
+            }
+        )
+
+    def _sorted_messages(self, session_id: str) -> list[ChatMessage]:
+        """세션 메시지를 (timestamp, 저장 순서)로 정렬."""
+        stored = list(self._messages.get(session_id, ()))
+        stored.sort(key=lambda s: (s.message.timestamp, s.id))
+        return [s.message for s in stored]
+
+    def _all_messages(self) -> list[_StoredMessage]:
+        """모든 세션의 메시지 스냅샷."""
+        return [stored for messages in list(self._messages.values()) for stored in list(messages)]
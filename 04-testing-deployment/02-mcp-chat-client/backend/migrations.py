@@ -0,0 +1,272 @@
+"""Versioned schema migrations for the chat history database.
+
+적용된 스키마 버전은 SQLite의 `PRAGMA user_version`에 기록됩니다.
+`migrate()`는 현재 버전보다 높은 마이그레이션만 순서대로, 각각 하나의
+트랜잭션 안에서 실행하므로 기존 `chat_history.db` 파일도 그대로 업그레이드됩니다.
+
+새 마이그레이션 추가 방법:
+    1. `_vN_설명(conn)` 함수를 작성합니다.
+    2. `MIGRATIONS` 목록 끝에 `(N, "설명", 함수)`를 추가합니다.
+"""
+
+import logging
+import sqlite3
+from collections.abc import Callable
+from datetime import datetime
+
+from .records import to_epoch_us
+
+logger = logging.getLogger(__name__)
+
+Migration = tuple[int, str, Callable[[sqlite3.Connection], None]]
+
+
+def _v1_initial_schema(conn: sqlite3.Connection) -> None:
+    """초기 테이블 생성 (기존 `_init_db` 스키마와 동일)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            created_at TIMESTAMP NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            message_count INTEGER DEFAULT 0
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            FOREIGN KEY (session_id) REFERENCES sessions(session_id)
+        )
+    """)
+
+
+def _v2_query_indexes(conn: sqlite3.Connection) -> None:
+    """조회 경로용 인덱스 생성.
+
+    - `get_messages`: session_id 필터 + timestamp 정렬을 인덱스만으로 처리
+    - `list_sessions`: updated_at 정렬을 인덱스 역순 스캔으로 처리
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_messages_session_timestamp "
+        "ON messages(session_id, timestamp)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at)")
+
+
+def _v3_keyset_indexes(conn: sqlite3.Connection) -> None:
+    """키셋 페이지네이션용 인덱스.
+
+    sessions는 (updated_at, session_id) 커서로 넘기므로 session_id를 인덱스에 포함합니다.
+    messages의 (timestamp, id) 커서는 rowid(id)가 인덱스 끝에 암묵적으로 포함되어
+    v2 인덱스로 충분합니다.
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_sessions_updated_at")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_updated_at ON sessions(updated_at, session_id)"
+    )
+
+
+# messages → messages_fts 동기화 트리거 (messages 테이블을 다시 만들 때도 사용)
+FTS_TRIGGERS: dict[str, str] = {
+    "messages_fts_insert": """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_insert AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+    "messages_fts_delete": """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_delete AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+    END
+    """,
+    "messages_fts_update": """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_update AFTER UPDATE OF content ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, content)
+        VALUES ('delete', old.id, old.content);
+        INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+    END
+    """,
+}
+
+
+def _v4_full_text_search(conn: sqlite3.Connection) -> None:
+    """메시지 본문 전문 검색(FTS5) 인덱스.
+
+    messages를 content 테이블로 쓰는 external-content FTS5 테이블이므로 본문을
+    중복 저장하지 않으며, 트리거가 INSERT/UPDATE/DELETE를 인덱스에 반영합니다.
+    """
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+        "content, content='messages', content_rowid='id', tokenize='unicode61')"
+    )
+
+    for trigger in FTS_TRIGGERS.values():
+        conn.execute(trigger)
+
+    # 기존 메시지 색인
+    conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+
+
+def _v5_stats_and_ordering_indexes(conn: sqlite3.Connection) -> None:
+    """통계 및 서버 측 정렬용 인덱스.
+
+    - `list_sessions(order_by=...)`: created_at / message_count 정렬
+    - `stats()`: 최근 N일 메시지 수 집계 (timestamp 범위 검색)
+    """
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions(created_at, session_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sessions_message_count "
+        "ON sessions(message_count, updated_at)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages(timestamp)")
+
+
+def _v6_cascade_deletes(conn: sqlite3.Connection) -> None:
+    """messages 외래 키에 ON DELETE CASCADE 추가.
+
+    SQLite는 기존 제약조건을 ALTER할 수 없으므로 messages 테이블을 새로 만들어
+    복사합니다. id를 그대로 유지하므로 FTS 인덱스는 다시 만들 필요가 없고,
+    테이블과 함께 삭제되는 FTS 트리거와 인덱스만 다시 생성합니다.
+    """
+    # 외래 키가 꺼져 있던 동안 생긴 고아 메시지 정리 (FTS 삭제 트리거가 색인도 정리)
+    conn.execute("DELETE FROM messages WHERE session_id NOT IN (SELECT session_id FROM sessions)")
+
+    conn.execute("""
+        CREATE TABLE messages_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            role TEXT NOT NULL,
+            content TEXT NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
+        )
+    """)
+    conn.execute(
+        "INSERT INTO messages_new (id, session_id, role, content, timestamp) "
+        "SELECT id, session_id, role, content, timestamp FROM messages"
+    )
+    conn.execute("DROP TABLE messages")
+    conn.execute("ALTER TABLE messages_new RENAME TO messages")
+
+    _v2_query_indexes(conn)
+    _v5_stats_and_ordering_indexes(conn)
+
+    # 트리거만 다시 만들고 색인은 유지 (rowid가 그대로이므로 rebuild 불필요)
+    for trigger in FTS_TRIGGERS.values():
+        conn.execute(trigger)
+
+
+def _v7_epoch_timestamps(conn: sqlite3.Connection) -> None:
+    """정수 epoch 마이크로초 타임스탬프 컬럼 추가.
+
+    경량 레코드 조회(`get_message_records` 등)가 문자열 파싱 없이 시간을
+    읽을 수 있도록 `*_us` 컬럼을 추가하고, 기존 행은 Python에서 같은 규칙
+    (`records.to_epoch_us`)으로 계산해 채웁니다. 기존 문자열 컬럼은 정렬,
+    통계, 호환성을 위해 그대로 유지합니다.
+    """
+    conn.create_function(
+        "epoch_us", 1, lambda v: to_epoch_us(datetime.fromisoformat(v)), deterministic=True
+    )
+
+    conn.execute("ALTER TABLE messages ADD COLUMN timestamp_us INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE sessions ADD COLUMN created_at_us INTEGER NOT NULL DEFAULT 0")
+    conn.execute("ALTER TABLE sessions ADD COLUMN updated_at_us INTEGER NOT NULL DEFAULT 0")
+
+    conn.execute("UPDATE messages SET timestamp_us = epoch_us(timestamp)")
+    conn.execute(
+        "UPDATE sessions SET created_at_us = epoch_us(created_at), "
+        "updated_at_us = epoch_us(updated_at)"
+    )
+
+
+def _v8_session_summaries(conn: sqlite3.Connection) -> None:
+    """세션별 대화 요약 테이블 추가 (컨텍스트 토큰 예산용, 세션과 함께 삭제)."""
+    conn.execute("""
+        CREATE TABLE session_summaries (
+            session_id TEXT PRIMARY KEY,
+            covered_messages INTEGER NOT NULL,
+            covered_tokens INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            tokens INTEGER NOT NULL,
+            checksum TEXT NOT NULL,
+            updated_at TIMESTAMP NOT NULL,
+            FOREIGN KEY (session_id) REFERENCES sessions(session_id) ON DELETE CASCADE
+        )
+    """)
+
+
+MIGRATIONS: list[Migration] = [
+    (1, "initial schema", _v1_initial_schema),
+    (2, "query indexes", _v2_query_indexes),
+    (3, "keyset pagination indexes", _v3_keyset_indexes),
+    (4, "full-text search", _v4_full_text_search),
+    (5, "stats and ordering indexes", _v5_stats_and_ordering_indexes),
+    (6, "cascade deletes", _v6_cascade_deletes),
+    (7, "epoch timestamp columns", _v7_epoch_timestamps),
+    (8, "session summaries", _v8_session_summaries),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """현재 데이터베이스의 스키마 버전을 반환합니다."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """auto_vacuum을 INCREMENTAL로 전환합니다.
+
+    auto_vacuum 모드는 파일을 VACUUM해야 바뀌므로 트랜잭션 밖에서 호출해야 하며,
+    이미 INCREMENTAL이면 아무것도 하지 않습니다.
+
+    Returns:
+        이번 호출에서 전환했으면 True
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # 2 = INCREMENTAL
+        return False
+
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    logger.info("auto_vacuum을 INCREMENTAL로 전환")
+    return True
+
+
+def migrate(conn: sqlite3.Connection, target_version: int | None = None) -> int:
+    """대기 중인 마이그레이션을 적용합니다.
+
+    Args:
+        conn: SQLite 연결
+        target_version: 이 버전까지만 적용 (None이면 최신 버전까지)
+
+    Returns:
+        적용 후 스키마 버전
+    """
+    target = SCHEMA_VERSION if target_version is None else target_version
+    current = get_schema_version(conn)
+
+    for version, description, apply in MIGRATIONS:
+        if version <= current or version > target:
+            continue
+
+        conn.execute("BEGIN")
+        try:
+            apply(conn)
+            # PRAGMA는 바인딩 파라미터를 지원하지 않음 (version은 정수 상수)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info(f"스키마 마이그레이션 적용: v{version} ({description})")
+        current = version
+
+    return current
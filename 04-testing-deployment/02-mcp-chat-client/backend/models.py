@@ -1,7 +1,7 @@
 """Data models for MCP Chat Client."""
 
-from datetime import datetime
-from typing import Literal
+from datetime import date, datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -46,6 +46,222 @@ class ChatSession(BaseModel):
         }
 
 
+# 키셋 페이지네이션 커서
+#   메시지: (timestamp, id) 오름차순에서 마지막으로 본 행
+#   세션: (updated_at, session_id) 내림차순에서 마지막으로 본 행
+MessageCursor = tuple[str, int]
+SessionCursor = tuple[str, str]
+
+
+class MessagePage(BaseModel):
+    """메시지 페이지 (키셋 페이지네이션)."""
+
+    messages: list[ChatMessage] = Field(default_factory=list, description="페이지 메시지")
+    next_cursor: MessageCursor | None = Field(None, description="다음 페이지 커서 (없으면 마지막)")
+
+
+class SessionPage(BaseModel):
+    """세션 페이지 (키셋 페이지네이션)."""
+
+    sessions: list[ChatSession] = Field(default_factory=list, description="페이지 세션")
+    next_cursor: SessionCursor | None = Field(None, description="다음 페이지 커서 (없으면 마지막)")
+
+
+class SearchResult(BaseModel):
+    """전문 검색 결과 (관련도순)."""
+
+    message_id: int = Field(..., description="메시지 ID")
+    session_id: str = Field(..., description="세션 ID")
+    session_title: str | None = Field(None, description="세션 제목")
+    role: Literal["user", "assistant", "system"] = Field(..., description="메시지 역할")
+    snippet: str = Field(..., description="검색어가 강조된 본문 발췌")
+    timestamp: datetime = Field(..., description="메시지 생성 시간")
+    rank: float = Field(..., description="BM25 점수 (작을수록 관련도 높음)")
+
+
+class DailyCount(BaseModel):
+    """일별 집계."""
+
+    day: date = Field(..., description="날짜")
+    sessions: int = Field(default=0, description="그날 생성된 세션 수")
+    messages: int = Field(default=0, description="그날 작성된 메시지 수")
+
+
+class ChatStats(BaseModel):
+    """전체 대화 기록 통계."""
+
+    total_sessions: int = Field(default=0, description="전체 세션 수")
+    total_messages: int = Field(default=0, description="전체 메시지 수")
+    avg_messages_per_session: float = Field(default=0.0, description="세션당 평균 메시지 수")
+    max_messages_per_session: int = Field(default=0, description="세션당 최대 메시지 수")
+    daily: list[DailyCount] = Field(default_factory=list, description="최근 일별 집계 (날짜순)")
+
+
+class RetentionPolicy(BaseModel):
+    """대화 기록 보존 정책 (둘 다 None이면 아무것도 삭제하지 않음)."""
+
+    max_age_days: int | None = Field(
+        default=None, ge=1, description="마지막 활동 후 이 일수가 지난 세션 삭제"
+    )
+    max_sessions: int | None = Field(
+        default=None, ge=1, description="최근 활동순으로 이 개수만 남기고 삭제"
+    )
+
+    @property
+    def is_enabled(self) -> bool:
+        """삭제 조건이 하나라도 설정되어 있는지 확인."""
+        return self.max_age_days is not None or self.max_sessions is not None
+
+
+class CompactionResult(BaseModel):
+    """컴팩션 1회 실행 결과."""
+
+    pruned_sessions: int = Field(default=0, description="보존 정책으로 삭제된 세션 수")
+    freed_pages: int = Field(default=0, description="incremental VACUUM으로 반환된 페이지 수")
+
+
+class TransferStats(BaseModel):
+    """내보내기/가져오기 결과."""
+
+    sessions: int = Field(default=0, description="처리한 세션 수")
+    messages: int = Field(default=0, description="처리한 메시지 수")
+    skipped_sessions: int = Field(default=0, description="이미 있어 건너뛴 세션 수 (가져오기)")
+
+
+class CacheStats(BaseModel):
+    """캐시 적중/실패 카운터 (크기 조정용)."""
+
+    hits: int = Field(default=0, description="캐시 적중 수")
+    misses: int = Field(default=0, description="캐시 실패 수 (저장소 조회)")
+    evictions: int = Field(default=0, description="용량 초과로 밀려난 항목 수")
+    expirations: int = Field(default=0, description="TTL이 지나 버려진 항목 수")
+    invalidations: int = Field(default=0, description="쓰기로 무효화된 항목 수")
+    size: int = Field(default=0, description="현재 항목 수")
+    maxsize: int = Field(default=0, description="최대 항목 수")
+
+    @property
+    def hit_rate(self) -> float:
+        """적중률 (조회가 없으면 0)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SessionSummary(BaseModel):
+    """세션 앞부분 대화의 누적 요약 (ContextBudget이 세션별로 저장)."""
+
+    covered_messages: int = Field(..., ge=1, description="요약에 포함된 앞쪽 메시지 수")
+    covered_tokens: int = Field(default=0, description="요약된 메시지의 원래 토큰 수")
+    content: str = Field(..., description="요약 내용")
+    tokens: int = Field(default=0, description="요약 토큰 수")
+    checksum: str = Field(..., description="마지막으로 요약된 메시지의 해시 (히스토리 일치 확인)")
+    updated_at: datetime = Field(default_factory=datetime.now, description="갱신 시간")
+
+
+class ContextStats(BaseModel):
+    """프롬프트 컨텍스트 토큰 집계 (한 턴 또는 누적)."""
+
+    turns: int = Field(default=0, description="집계한 턴 수")
+    history_tokens: int = Field(default=0, description="히스토리를 그대로 보냈을 때의 토큰 수")
+    prompt_tokens: int = Field(
+        default=0, description="실제로 보낸 토큰 수 (요약 + 최근 메시지 + 질문)"
+    )
+    summarized_messages: int = Field(default=0, description="요약으로 대체된 메시지 수")
+    dropped_messages: int = Field(default=0, description="요약하지 못하고 잘라낸 메시지 수")
+    summaries_created: int = Field(default=0, description="새로 만든(갱신한) 요약 수")
+
+    @property
+    def saved_tokens(self) -> int:
+        """절약한 프롬프트 토큰 수"""
+        return max(0, self.history_tokens - self.prompt_tokens)
+
+    @property
+    def savings_rate(self) -> float:
+        """절약 비율 (히스토리가 없으면 0)"""
+        return self.saved_tokens / self.history_tokens if self.history_tokens else 0.0
+
+
+class ResponseCacheStats(BaseModel):
+    """응답 캐시 카운터와 지연시간."""
+
+    exact_hits: int = Field(default=0, description="정규화한 질문이 일치한 적중 수")
+    semantic_hits: int = Field(default=0, description="임베딩 유사도로 찾은 적중 수")
+    misses: int = Field(default=0, description="캐시 실패 수 (에이전트 실행)")
+    skipped: int = Field(default=0, description="부작용 도구 호출로 저장하지 않은 응답 수")
+    size: int = Field(default=0, description="현재 항목 수")
+    maxsize: int = Field(default=0, description="최대 항목 수")
+    hit_latency_ms: float = Field(default=0.0, description="적중 시 평균 응답 시간 (ms)")
+    miss_latency_ms: float = Field(default=0.0, description="실패 시 평균 응답 시간 (ms)")
+
+    @property
+    def hits(self) -> int:
+        """전체 적중 수"""
+        return self.exact_hits + self.semantic_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """적중률 (조회가 없으면 0)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class AgentPoolStats(BaseModel):
+    """에이전트 풀 실행/대기/거절 카운터."""
+
+    running: int = Field(default=0, description="실행 중인 턴 수")
+    waiting: int = Field(default=0, description="대기 중인 턴 수")
+    completed: int = Field(default=0, description="끝난 턴 수 (오류 포함)")
+    rejected: int = Field(default=0, description="대기열 초과/대기 시간 초과로 거절한 턴 수")
+    threads: int = Field(default=0, description="메모리에 있는 세션 스레드 수")
+    seeded: int = Field(default=0, description="저장소 히스토리로 다시 채운 스레드 수")
+    evictions: int = Field(default=0, description="용량 초과로 내린 스레드 수")
+    max_concurrency: int = Field(default=0, description="동시 실행 상한")
+    avg_wait_ms: float = Field(default=0.0, description="실행 전 평균 대기 시간 (ms)")
+
+
+class StageStats(BaseModel):
+    """턴 단계(turn, llm, tool, db, render)별 지연 집계."""
+
+    stage: str = Field(..., description="단계 이름")
+    count: int = Field(default=0, description="기록된 횟수")
+    errors: int = Field(default=0, description="오류로 끝난 횟수")
+    p50_ms: float = Field(default=0.0, description="최근 표본의 중앙값 (ms)")
+    p95_ms: float = Field(default=0.0, description="최근 표본의 95번째 백분위수 (ms)")
+
+    @property
+    def error_rate(self) -> float:
+        """오류율 (기록이 없으면 0)"""
+        return self.errors / self.count if self.count else 0.0
+
+
+class ReplayReport(BaseModel):
+    """대화 기록 재생 벤치마크 결과 (backend/replay.py, 커밋 사이 비교용 JSON)."""
+
+    commit: str | None = Field(None, description="측정한 git 커밋")
+    created_at: datetime = Field(default_factory=datetime.now, description="측정 시각")
+    python: str = Field(default="", description="Python 버전")
+    config: dict[str, Any] = Field(
+        default_factory=dict, description="재생 조건과 관련 설정 (같아야 비교 가능)"
+    )
+    sessions: int = Field(default=0, description="재생한 세션 수")
+    turns: int = Field(default=0, description="재생한 턴 수 (워밍업 제외)")
+    errors: int = Field(default=0, description="오류로 끝난 턴 수")
+    initialize_ms: float = Field(
+        default=0.0, description="에이전트 초기화 시간 (MCP 서버 시작 포함)"
+    )
+    wall_s: float = Field(default=0.0, description="재생 전체 시간 (초)")
+    turns_per_s: float = Field(default=0.0, description="초당 턴 수")
+    turn_p50_ms: float = Field(default=0.0, description="턴 지연 중앙값 (DB 저장 제외)")
+    turn_p95_ms: float = Field(default=0.0, description="턴 지연 95번째 백분위수")
+    stages: list[StageStats] = Field(default_factory=list, description="단계별 지연")
+    tool_calls: dict[str, int] = Field(
+        default_factory=dict, description="'서버/도구/결과' → 호출 수"
+    )
+    peak_rss_mb: float | None = Field(None, description="벤치마크 프로세스 최대 RSS (MB)")
+    servers_peak_rss_mb: float | None = Field(
+        None, description="종료된 MCP 서버 프로세스 중 가장 큰 최대 RSS (MB)"
+    )
+
+
 class MCPServerConfig(BaseModel):
     """MCP 서버 설정 모델."""
 
@@ -55,6 +271,20 @@ class MCPServerConfig(BaseModel):
     transport: Literal["stdio", "streamable_http"] = Field(..., description="전송 방식")
     url: str | None = Field(None, description="HTTP URL (streamable_http 전용)")
     enabled: bool = Field(default=True, description="활성화 여부")
+    max_concurrency: int | None = Field(
+        None, ge=1, description="이 서버 도구의 동시 실행 상한 (없으면 전체 상한만 적용)"
+    )
+    timeout: float | None = Field(
+        None, gt=0, description="도구 호출 제한 시간 (초, 없으면 TOOL_TIMEOUT)"
+    )
+    cache: dict[str, float | None] = Field(
+        default_factory=dict,
+        description="결과를 캐시할 도구 → TTL (초, null이면 만료 없음, '*'는 모든 도구)",
+    )
+    side_effects: list[str] = Field(
+        default_factory=list,
+        description="호출되면 응답을 캐시하지 않을 도구 (부작용/시각 의존, '*'는 모든 도구)",
+    )
 
     class Config:
         json_schema_extra = {
@@ -64,10 +294,41 @@ class MCPServerConfig(BaseModel):
                 "args": ["run", "python", "../03-mcp-tools/02-tools/main.py"],
                 "transport": "stdio",
                 "enabled": True,
+                "max_concurrency": 4,
+                "timeout": 30,
+                "cache": {"add": None, "power": None, "get_forecast": 600},
+                "side_effects": ["write_file"],
             }
         }
 
 
+class MCPServerStatus(BaseModel):
+    """MCP 서버 연결 상태."""
+
+    name: str = Field(..., description="서버 이름")
+    state: Literal["idle", "starting", "ready", "failed", "stopped"] = Field(
+        ..., description="연결 상태 (idle: 매니페스트의 도구만 있고 첫 호출 때 시작)"
+    )
+    tool_count: int = Field(default=0, description="제공 중인 도구 수")
+    restarts: int = Field(default=0, description="재시작 횟수")
+    last_error: str | None = Field(None, description="마지막 오류")
+    last_ping_ms: float | None = Field(None, description="마지막 ping 응답 시간 (ms)")
+    start_ms: float | None = Field(None, description="마지막 서버 시작 시간 (ms)")
+    list_tools_ms: float | None = Field(None, description="마지막 도구 목록 조회 시간 (ms)")
+
+
+class AgentEvent(BaseModel):
+    """스트리밍 응답 이벤트 (MCPAgent.astream_chat)."""
+
+    type: Literal["token", "tool_call", "tool_result", "error"] = Field(
+        ..., description="이벤트 종류"
+    )
+    content: str = Field(default="", description="토큰 조각, 도구 결과 또는 오류 메시지")
+    tool_name: str | None = Field(None, description="도구 이름 (tool_call/tool_result)")
+    tool_args: dict[str, Any] = Field(default_factory=dict, description="도구 인자 (tool_call)")
+    tool_call_id: str | None = Field(None, description="도구 호출 ID (호출과 결과 연결)")
+
+
 class AgentResponse(BaseModel):
     """LangGraph 에이전트 응답 모델."""
 
@@ -0,0 +1,172 @@
+"""SQLite connection pool: one writer, N read-only readers.
+
+SQLite(WAL 모드)는 동시에 하나의 쓰기와 여러 읽기를 허용합니다.
+`ConnectionPool`은 이 모델을 그대로 따릅니다.
+
+- writer: 전용 연결 1개를 잠금으로 보호하며, 블록 단위 트랜잭션으로 사용
+- reader: 읽기 전용(`mode=ro`) 연결 N개를 필요할 때 만들어 재사용
+
+Streamlit처럼 여러 스레드가 하나의 `ChatDatabase`를 공유해도
+연결(커서)을 동시에 건드리지 않으므로 안전하며, History 페이지의 읽기가
+Chat 페이지의 쓰기를 기다리지 않습니다.
+"""
+
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Literal
+
+# 내구성 수준 → PRAGMA synchronous 값
+#   full:   커밋마다 fsync (전원 장애에도 커밋 유실 없음)
+#   normal: WAL 체크포인트 시에만 fsync (전원 장애 시 마지막 커밋 유실 가능)
+#   off:    fsync 안 함 (OS 크래시 시 DB 손상 가능, 벤치마크/테스트용)
+Durability = Literal["full", "normal", "off"]
+
+# 연결마다 적용되는 PRAGMA (journal_mode=WAL은 파일에 영구 기록됨)
+SQLITE_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",  # 읽기와 쓰기가 서로를 막지 않음
+    "synchronous": "NORMAL",  # WAL에서는 체크포인트 시에만 fsync
+    "temp_store": "MEMORY",
+    "cache_size": -16000,  # 16MB (음수 = KiB 단위)
+    "mmap_size": 134217728,  # 128MB
+    "busy_timeout": 5000,  # 잠금 대기 (ms)
+    "foreign_keys": "ON",  # ON DELETE CASCADE 등 외래 키 제약 적용 (연결마다 설정 필요)
+}
+
+
+def _apply_pragmas(
+    conn: sqlite3.Connection, durability: Durability = "normal", read_only: bool = False
+) -> None:
+    """연결에 성능 관련 PRAGMA를 적용합니다."""
+    pragmas = {**SQLITE_PRAGMAS, "synchronous": durability.upper()}
+    if read_only:
+        # 저널 모드는 writer가 설정하며, 읽기 연결은 쓰기를 시도하지 않음
+        del pragmas["journal_mode"]
+        pragmas["query_only"] = "ON"
+
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+class ConnectionPool:
+    """전용 writer 연결과 읽기 전용 reader 연결 풀."""
+
+    def __init__(
+        self,
+        db_path: str | Path,
+        readers: int = 4,
+        durability: Durability = "normal",
+        timeout: float = 30.0,
+    ) -> None:
+        """연결 풀 초기화.
+
+        Args:
+            db_path: SQLite 파일 경로 (":memory:"이면 reader 없이 writer만 사용)
+            readers: 최대 reader 연결 수
+            durability: writer 커밋 내구성 수준
+            timeout: reader 체크아웃 최대 대기 시간 (초)
+        """
+        self.db_path = str(db_path)
+        self.durability = durability
+        self.timeout = timeout
+
+        # 메모리 DB는 연결마다 별개의 DB이므로 reader를 만들 수 없음
+        self.max_readers = 0 if self.db_path == ":memory:" else readers
+
+        self._writer = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._writer.row_factory = sqlite3.Row
+        _apply_pragmas(self._writer, durability)
+        self._writer_lock = threading.RLock()
+
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._all_readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """writer 연결을 트랜잭션 단위로 체크아웃합니다.
+
+        블록이 정상 종료되면 커밋하고, 예외가 발생하면 롤백합니다.
+        같은 스레드에서 중첩 사용하면 가장 바깥 블록에서만 커밋됩니다.
+        """
+        with self._writer_lock:
+            self._check_open()
+            outermost = not self._writer.in_transaction
+            try:
+                yield self._writer
+            except BaseException:
+                if outermost:
+                    self._writer.rollback()
+                raise
+            else:
+                if outermost:
+                    self._writer.commit()
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """읽기 전용 연결을 체크아웃합니다."""
+        self._check_open()
+
+        if self.max_readers == 0:
+            with self._writer_lock:
+                yield self._writer
+            return
+
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            # 읽기 트랜잭션이 열린 채로 반환되면 WAL 체크포인트를 막으므로 정리
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """유휴 reader를 가져오거나, 여유가 있으면 새로 만듭니다."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._readers_lock:
+            if len(self._all_readers) < self.max_readers:
+                conn = self._connect_reader()
+                self._all_readers.append(conn)
+                return conn
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"{self.timeout}초 안에 reader 연결을 얻지 못했습니다 (max_readers={self.max_readers})"
+            ) from None
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        """읽기 전용 연결을 생성합니다."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        _apply_pragmas(conn, self.durability, read_only=True)
+        return conn
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("닫힌 연결 풀입니다.")
+
+    def close(self) -> None:
+        """모든 연결을 닫습니다."""
+        if self._closed:
+            return
+        self._closed = True
+
+        with self._readers_lock:
+            for conn in self._all_readers:
+                conn.close()
+            self._all_readers.clear()
+
+        with self._writer_lock:
+            self._writer.close()
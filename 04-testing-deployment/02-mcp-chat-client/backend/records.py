@@ -0,0 +1,87 @@
+"""Lightweight row records for bulk reads.
+
+`ChatDatabase.get_messages`/`list_sessions`는 행마다 pydantic 모델을 만들고
+타임스탬프 문자열을 파싱하므로, 수천~수십만 행을 내보내거나 렌더링할 때는
+검증 비용이 대부분을 차지합니다.
+
+이 모듈의 레코드는 `NamedTuple`(= 튜플)이라 검증 없이 만들어지고, 시간은
+정수 epoch 마이크로초 컬럼(`*_us`)을 그대로 담습니다. `datetime`이 필요할 때만
+프로퍼티로 변환하고, pydantic 모델이 필요하면 `to_model()`을 호출합니다.
+
+타임스탬프는 기존 컬럼과 같이 naive(로컬) 시각이며, epoch 값은 그 시각을
+UTC로 간주해 계산합니다. 따라서 변환해도 시간대 이동 없이 같은 값이 나옵니다.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from .models import ChatMessage, ChatSession
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """datetime을 epoch 마이크로초 정수로 변환 (aware 값은 UTC 기준 naive로 맞춤)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime:
+    """epoch 마이크로초 정수를 naive datetime으로 변환."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class MessageRecord(NamedTuple):
+    """messages 행 (검증 없는 경량 레코드)."""
+
+    id: int
+    session_id: str
+    role: str
+    content: str
+    timestamp_us: int
+
+    @property
+    def timestamp(self) -> datetime:
+        """메시지 생성 시간."""
+        return from_epoch_us(self.timestamp_us)
+
+    def to_model(self) -> ChatMessage:
+        """ChatMessage로 변환 (검증 생략)."""
+        return ChatMessage.model_construct(
+            role=self.role,
+            content=self.content,
+            timestamp=self.timestamp,
+            session_id=self.session_id,
+        )
+
+
+class SessionRecord(NamedTuple):
+    """sessions 행 (검증 없는 경량 레코드)."""
+
+    session_id: str
+    title: str
+    created_at_us: int
+    updated_at_us: int
+    message_count: int
+
+    @property
+    def created_at(self) -> datetime:
+        """세션 생성 시간."""
+        return from_epoch_us(self.created_at_us)
+
+    @property
+    def updated_at(self) -> datetime:
+        """마지막 업데이트 시간."""
+        return from_epoch_us(self.updated_at_us)
+
+    def to_model(self) -> ChatSession:
+        """ChatSession으로 변환 (검증 생략)."""
+        return ChatSession.model_construct(
+            session_id=self.session_id,
+            title=self.title,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            message_count=self.message_count,
+        )
@@ -0,0 +1,497 @@
+"""Offline replay of recorded conversations through MCPAgent.
+
+`ChatDatabase`에 기록된 대화를 실제 LLM 없이 `MCPAgent`로 다시 실행해 처리량을 잽니다.
+LLM 자리에는 결정적인 가짜 모델(`ScriptedChatModel`)을 넣습니다. 이 모델은 질문을 보고
+정해진 규칙대로 도구를 호출하고(계산식 → add/multiply..., 날씨/예보, 시각, ping),
+도구 결과를 받으면 기록된 답변을 토큰 단위로 스트리밍합니다. 도구는 `03-mcp-tools`의
+실제 MCP 서버(stdio)가 실행하므로 MCP 세션, 도구 노드, DB 저장까지 채팅 페이지와 같은
+경로를 지납니다.
+
+- 재생 결과는 임시 DB에 저장합니다 (기록 DB는 읽기만 함)
+- 턴 수/초, 턴 p50/p95, 단계별 지연(`get_tracer().metrics`, 워밍업 제외), 도구 호출 수,
+  최대 RSS를 `ReplayReport`로 돌려줍니다
+- 재생 조건과 관련 설정, git 커밋을 보고서에 함께 남기므로 JSON으로 저장해 두고
+  다른 커밋의 결과와 비교할 수 있습니다 (`compare_reports`)
+
+CLI는 benchmarks/bench_replay.py 입니다.
+"""
+
+import asyncio
+import json
+import logging
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import Field
+
+from .async_database import AsyncChatDatabase
+from .config import settings
+from .database import ChatDatabase
+from .langgraph_agent import MCPAgent
+from .models import ChatMessage, MCPServerConfig, ReplayReport
+from .tracing import LatencyMetrics, get_tracer
+
+logger = logging.getLogger(__name__)
+
+# 저장소 루트 (03-mcp-tools 예제 서버 위치)
+_WORKSHOP_ROOT = Path(__file__).resolve().parents[3]
+
+# 재생에 쓰는 03-mcp-tools 서버 (서버 이름 → 스크립트)
+WORKSHOP_SERVERS = {
+    "tools": _WORKSHOP_ROOT / "03-mcp-tools" / "02-tools" / "main.py",
+    "basic": _WORKSHOP_ROOT / "03-mcp-tools" / "01-basic-server" / "main.py",
+}
+
+_ARITHMETIC = re.compile(r"(\d+(?:\.\d+)?)\s*([-+*/^×÷])\s*(\d+(?:\.\d+)?)")
+_OPERATORS = {
+    "+": "add",
+    "-": "subtract",
+    "*": "multiply",
+    "×": "multiply",
+    "/": "divide",
+    "÷": "divide",
+    "^": "power",
+}
+_CITIES = re.compile(
+    r"(서울|부산|대구|인천|광주|대전|제주|Seoul|Busan|Tokyo|London)", re.IGNORECASE
+)
+_FORECAST = re.compile(r"예보|forecast", re.IGNORECASE)
+_WEATHER = re.compile(r"날씨|weather", re.IGNORECASE)
+_CLOCK = re.compile(r"몇 시|시각|날짜|\btime\b|\bdate\b", re.IGNORECASE)
+_PING = re.compile(r"\bping\b|핑", re.IGNORECASE)
+
+
+def script_tool_calls(prompt: str, available: Sequence[str] | set[str]) -> list[dict[str, Any]]:
+    """질문에 맞는 도구 호출 목록 (available에 있는 도구만, 같은 질문이면 항상 같음).
+
+    id는 비어 있으므로 호출하는 쪽에서 채웁니다.
+    """
+    calls: list[tuple[str, dict[str, Any]]] = []
+    for a, operator, b in _ARITHMETIC.findall(prompt):
+        name = _OPERATORS[operator]
+        if name == "power":
+            calls.append((name, {"base": float(a), "exponent": float(b)}))
+        else:
+            calls.append((name, {"a": float(a), "b": float(b)}))
+
+    city = _CITIES.search(prompt)
+    city_name = city.group(1) if city else "서울"
+    if _FORECAST.search(prompt):
+        calls.append(("get_forecast", {"city": city_name, "days": 3}))
+    elif _WEATHER.search(prompt):
+        calls.append(("get_weather", {"city": city_name}))
+    if _CLOCK.search(prompt):
+        calls.append(("get_current_datetime", {}))
+    if _PING.search(prompt):
+        calls.append(("ping", {}))
+
+    return [{"name": name, "args": args, "id": ""} for name, args in calls if name in available]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """질문에 따라 정해진 도구를 호출하고 기록된 답변을 돌려주는 결정적 가짜 모델.
+
+    이번 턴(마지막 HumanMessage 뒤)에 도구 결과가 없으면 `script_tool_calls`의 호출을,
+    있으면(또는 부를 도구가 없으면) replies에 기록된 답변을 공백 단위 토큰으로 냅니다.
+    """
+
+    replies: dict[str, str] = Field(default_factory=dict)  # 질문 → 기록된 답변
+    latency: float = 0.0  # 호출마다 기다릴 시간 (초, 모델 응답 시간 흉내)
+    tool_names: frozenset[str] = frozenset()  # bind_tools로 받은 도구
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-replay"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ScriptedChatModel":
+        names = {convert_to_openai_tool(tool)["function"]["name"] for tool in tools}
+        return self.model_copy(update={"tool_names": frozenset(names)})
+
+    def _respond(self, messages: list[BaseMessage]) -> AIMessage:
+        start = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1)
+        prompt = str(messages[start].content) if start >= 0 else ""
+        results = [m for m in messages[start + 1 :] if isinstance(m, ToolMessage)]
+        if not results:
+            calls = script_tool_calls(prompt, self.tool_names)
+            if calls:
+                for i, call in enumerate(calls):
+                    call["id"] = f"call-{len(messages)}-{i}"
+                return AIMessage(content="", tool_calls=calls)
+        reply = self.replies.get(prompt)
+        if reply is None:
+            # 기록에 없는 질문 (요약 요청 등): 도구 결과를 그대로 답변으로
+            reply = "\n".join(str(m.content) for m in results) or "네, 알겠습니다."
+        return AIMessage(content=reply)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    def _chunks(self, message: AIMessage) -> Iterator[ChatGenerationChunk]:
+        if message.tool_calls:
+            chunks = [
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=chunks))
+            return
+        for token in re.split(r"(\s+)", str(message.content)):
+            if token:
+                yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        yield from self._chunks(self._respond(messages))
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(self._respond(messages)):
+            yield chunk
+
+
+class Conversation(NamedTuple):
+    """재생할 대화 하나."""
+
+    title: str
+    turns: list[tuple[str, str]]  # (질문, 기록된 답변)
+
+
+def load_conversations(
+    db: ChatDatabase, limit: int | None = None, max_turns: int | None = None
+) -> list[Conversation]:
+    """기록된 대화를 오래된 세션부터 읽습니다 (답변이 없는 질문은 건너뜀).
+
+    Args:
+        db: 대화 기록 DB
+        limit: 최근 세션 수 상한
+        max_turns: 세션별 턴 수 상한
+    """
+    sessions = []
+    for session in db.iter_sessions():
+        if limit is not None and len(sessions) >= limit:
+            break
+        sessions.append(session)
+
+    conversations = []
+    for session in reversed(sessions):
+        turns: list[tuple[str, str]] = []
+        prompt: str | None = None
+        for message in db.iter_messages(session.session_id):
+            if message.role == "user":
+                prompt = message.content
+            elif message.role == "assistant" and prompt is not None:
+                turns.append((prompt, message.content))
+                prompt = None
+        if max_turns is not None:
+            turns = turns[:max_turns]
+        if turns:
+            conversations.append(Conversation(session.title, turns))
+    return conversations
+
+
+_SEED_PROMPTS = [
+    "{a} + {b}은 얼마야?",
+    "{a} * {b}를 계산해줘",
+    "{a} ^ 2 그리고 {b} / 4 계산해줘",
+    "{city} 날씨 어때?",
+    "{city} 3일 예보 알려줘",
+    "지금 몇 시야?",
+    "ping 보내서 서버 확인해줘",
+    "MCP가 뭔지 한 문장으로 설명해줘",
+]
+_SEED_CITIES = ["서울", "부산", "대구", "인천", "광주", "대전", "제주"]
+
+
+def seed_conversations(db: ChatDatabase, sessions: int, turns: int, seed: int = 0) -> None:
+    """도구 호출이 섞인 합성 대화를 DB에 기록합니다 (seed가 같으면 같은 대화)."""
+    rng = random.Random(seed)
+    for s in range(sessions):
+        session = db.create_session(title=f"재생 {s + 1}")
+        messages = []
+        for _ in range(turns):
+            prompt = rng.choice(_SEED_PROMPTS).format(
+                a=rng.randint(1, 999), b=rng.randint(1, 999), city=rng.choice(_SEED_CITIES)
+            )
+            reply = " ".join(f"답변{rng.randint(0, 9999)}" for _ in range(rng.randint(20, 120)))
+            messages.append(ChatMessage(role="user", content=prompt, session_id=session.session_id))
+            messages.append(
+                ChatMessage(role="assistant", content=reply, session_id=session.session_id)
+            )
+        db.add_messages(session.session_id, messages)
+    db.flush()
+
+
+def workshop_server_configs() -> list[MCPServerConfig]:
+    """03-mcp-tools 예제 서버를 현재 인터프리터로 실행하는 설정."""
+    return [
+        MCPServerConfig(name=name, command=sys.executable, args=[str(script)], transport="stdio")
+        for name, script in WORKSHOP_SERVERS.items()
+    ]
+
+
+def _peak_rss_mb(children: bool = False) -> float | None:
+    """최대 RSS (MB, resource 모듈이 없는 Windows에서는 None)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # Linux는 KB, macOS는 바이트
+    return usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+async def _run_turn(
+    agent: MCPAgent, prompt: str, history: list[dict[str, str]], session_id: str, stream: bool
+) -> tuple[str, bool]:
+    """(응답, 오류 여부)."""
+    if not stream:
+        response = await agent.chat(prompt, history=history, session_id=session_id)
+        return response, response.startswith("❌")
+    tokens, failed = [], False
+    async for event in agent.astream_chat(prompt, history=history, session_id=session_id):
+        if event.type == "token":
+            tokens.append(event.content)
+        elif event.type == "error":
+            tokens.append(event.content)
+            failed = True
+    return "".join(tokens), failed
+
+
+async def _replay_conversation(
+    agent: MCPAgent,
+    db: AsyncChatDatabase,
+    conversation: Conversation,
+    stream: bool,
+    turn_metrics: LatencyMetrics | None,
+) -> int:
+    """채팅 페이지처럼 질문/답변을 저장하며 대화를 재생하고 오류 턴 수를 돌려줍니다."""
+    session = await db.create_session(title=conversation.title)
+    history: list[dict[str, str]] = []
+    errors = 0
+    for prompt, _ in conversation.turns:
+        user = ChatMessage(role="user", content=prompt, session_id=session.session_id)
+        # 사용자 메시지 저장은 응답 생성과 겹쳐서 진행 (pages/1_Chat.py와 같음)
+        save = asyncio.create_task(db.add_message(session.session_id, user))
+        started = time.perf_counter()
+        response, failed = await _run_turn(agent, prompt, history, session.session_id, stream)
+        if turn_metrics is not None:
+            turn_metrics.observe("turn", time.perf_counter() - started, error=failed)
+        errors += failed
+        await save
+        assistant = ChatMessage(role="assistant", content=response, session_id=session.session_id)
+        await db.add_message(session.session_id, assistant)
+        history += [{"role": "user", "content": prompt}, {"role": "assistant", "content": response}]
+    return errors
+
+
+async def run_replay(
+    conversations: list[Conversation],
+    *,
+    concurrency: int = 1,
+    stream: bool = True,
+    llm_latency: float = 0.0,
+    warmup: int = 1,
+    servers: list[MCPServerConfig] | None = None,
+) -> ReplayReport:
+    """대화를 가짜 모델 + 실제 MCP 서버로 재생하고 보고서를 만듭니다.
+
+    서버 설정, 도구 매니페스트, 재생 결과 DB(요약 저장소 포함)는 임시 디렉토리에 만들고
+    끝나면 설정을 되돌립니다. 나머지 설정(도구 동시 실행, 캐시, 토큰 예산 등)은 현재
+    값을 그대로 쓰며 보고서의 config에 기록됩니다.
+
+    Args:
+        conversations: 재생할 대화 (대화 안의 턴은 순서대로, 대화끼리는 동시에 실행)
+        concurrency: 동시에 재생할 대화 수
+        stream: True면 astream_chat, False면 chat으로 실행
+        llm_latency: 가짜 모델 호출마다 기다릴 시간 (초)
+        warmup: 측정 전에 버릴 대화 수 (서버 시작, 첫 호출 비용 제외)
+        servers: MCP 서버 설정 (None이면 03-mcp-tools 예제 서버)
+    """
+    servers = workshop_server_configs() if servers is None else servers
+    model = ScriptedChatModel(
+        replies={prompt: reply for c in conversations for prompt, reply in c.turns},
+        latency=llm_latency,
+    )
+    config = {
+        "conversations": len(conversations),
+        "concurrency": concurrency,
+        "stream": stream,
+        "llm_latency": llm_latency,
+        "warmup": warmup,
+        "servers": [server.name for server in servers],
+        "tool_max_concurrency": settings.tool_max_concurrency,
+        "tool_cache_maxsize": settings.tool_cache_maxsize,
+        "response_cache_maxsize": settings.response_cache_maxsize,
+        "context_max_tokens": settings.context_max_tokens,
+        "mcp_lazy_start": settings.mcp_lazy_start,
+    }
+    overridden = {
+        name: getattr(settings, name)
+        for name in ("mcp_servers_config_path", "mcp_tool_manifest_path")
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        config_path = Path(tmp) / "server_config.json"
+        config_path.write_text(
+            json.dumps({"servers": [s.model_dump(exclude_none=True) for s in servers]}),
+            encoding="utf-8",
+        )
+        db_path = Path(tmp) / "replay.db"
+        settings.mcp_servers_config_path = str(config_path)
+        settings.mcp_tool_manifest_path = str(Path(tmp) / "tool_manifest.json")
+
+        db = AsyncChatDatabase(db_path=str(db_path))
+        agent = MCPAgent(llm=model, storage=db.database)
+        try:
+            started = time.perf_counter()
+            await agent.initialize()
+            initialize_ms = (time.perf_counter() - started) * 1000
+
+            for conversation in conversations[:warmup]:
+                await _replay_conversation(agent, db, conversation, stream, None)
+            measured = conversations[warmup:]
+            metrics = get_tracer().metrics
+            metrics.reset()
+            turn_metrics = LatencyMetrics(window=max(1, sum(len(c.turns) for c in measured)))
+            slots = asyncio.Semaphore(concurrency)
+
+            async def replay(conversation: Conversation) -> int:
+                async with slots:
+                    return await _replay_conversation(agent, db, conversation, stream, turn_metrics)
+
+            started = time.perf_counter()
+            errors = await asyncio.gather(*(replay(c) for c in measured))
+            wall_s = time.perf_counter() - started
+        finally:
+            await agent.close()
+            await db.close()
+            for name, value in overridden.items():
+                setattr(settings, name, value)
+
+    turn_stats = turn_metrics.stats()
+    turns = turn_stats[0].count if turn_stats else 0
+    return ReplayReport(
+        commit=_git_commit(),
+        python=platform.python_version(),
+        config=config,
+        sessions=len(measured),
+        turns=turns,
+        errors=sum(errors),
+        initialize_ms=initialize_ms,
+        wall_s=wall_s,
+        turns_per_s=turns / wall_s if wall_s > 0 else 0.0,
+        turn_p50_ms=turn_stats[0].p50_ms if turn_stats else 0.0,
+        turn_p95_ms=turn_stats[0].p95_ms if turn_stats else 0.0,
+        stages=metrics.stats(),
+        tool_calls={"/".join(key): count for key, count in sorted(metrics.tool_calls().items())},
+        peak_rss_mb=_peak_rss_mb(),
+        servers_peak_rss_mb=_peak_rss_mb(children=True),
+    )
+
+
+class ReplayDelta(NamedTuple):
+    """기준 보고서 대비 지표 하나의 변화."""
+
+    metric: str
+    baseline: float
+    current: float
+    change: float  # (current - baseline) / baseline, 기준이 0이면 0
+    regression: bool  # 나쁜 방향으로 threshold보다 많이 변했는지
+
+
+def _compared_metrics(report: ReplayReport) -> dict[str, tuple[float | None, bool]]:
+    """비교할 지표 → (값, 클수록 좋은지)."""
+    metrics: dict[str, tuple[float | None, bool]] = {
+        "turns_per_s": (report.turns_per_s, True),
+        "turn_p50_ms": (report.turn_p50_ms, False),
+        "turn_p95_ms": (report.turn_p95_ms, False),
+        "peak_rss_mb": (report.peak_rss_mb, False),
+    }
+    for stage in report.stages:
+        metrics[f"{stage.stage}.p95_ms"] = (stage.p95_ms, False)
+    return metrics
+
+
+def compare_reports(
+    current: ReplayReport, baseline: ReplayReport, threshold: float = 0.1
+) -> list[ReplayDelta]:
+    """두 보고서에 모두 있는 지표의 변화 (threshold: 회귀로 볼 변화율)."""
+    before = _compared_metrics(baseline)
+    deltas = []
+    for metric, (value, higher_is_better) in _compared_metrics(current).items():
+        base = before.get(metric, (None, higher_is_better))[0]
+        if value is None or base is None:
+            continue
+        change = (value - base) / base if base else 0.0
+        worse = -change if higher_is_better else change
+        deltas.append(ReplayDelta(metric, base, value, change, worse > threshold))
+    return deltas
+
+
+def config_mismatch(current: ReplayReport, baseline: ReplayReport) -> dict[str, tuple[Any, Any]]:
+    """재생 조건이 다른 항목 → (기준 값, 현재 값) (비어 있어야 결과를 비교할 수 있음)."""
+    keys = current.config.keys() | baseline.config.keys()
+    return {
+        key: (baseline.config.get(key), current.config.get(key))
+        for key in sorted(keys)
+        if baseline.config.get(key) != current.config.get(key)
+    }
@@ -0,0 +1,359 @@
+"""Response cache in front of the chat agent (exact + embedding-similarity tiers).
+
+"서울 날씨는 어때?", "5 + 3을 계산해줘"처럼 여러 사용자가 같은 질문을 반복해도
+에이전트는 매번 LLM과 도구를 다시 호출합니다. `ResponseCache`는 완성된 응답을
+(직전 대화 해시, 정규화한 질문)으로 저장해 두고 두 단계로 찾습니다.
+
+1. 정확 일치: 대소문자, 공백, 끝의 문장 부호를 무시하고 같은 질문
+2. 유사도: 조사를 뗀 문자 n-gram 임베딩의 코사인 유사도가 `similarity` 이상인 질문.
+   같은 직전 대화, 같은 숫자, 같은 핵심 단어(단어마다 앞 두 글자)를 가진 질문끼리만
+   비교하므로 "5 + 3"과 "5 + 4", "서울 날씨"와 "부산 날씨"는 아무리 비슷해도 적중하지
+   않고, 조사나 어미만 다른 질문("날씨 알려줘"/"날씨를 알려줘", "어때"/"어때요")은 적중함
+
+직전 대화(`history_messages`개)를 키에 넣으므로 "그럼 부산은?" 같은 후속 질문은
+앞 대화가 같을 때만 적중합니다. 새 세션의 첫 질문처럼 히스토리가 없는 질문이
+가장 많이 공유됩니다.
+
+응답을 만드는 동안 부작용이 있는 도구(`write_file` 등, server_config.json의
+`side_effects`)가 호출됐으면 저장하지 않습니다. 시각에 따라 답이 달라지는 도구도
+같은 방법으로 제외할 수 있습니다. 오류 응답도 저장하지 않습니다.
+
+임베딩 함수는 바꿀 수 있습니다 (`{차원: 가중치}` 희소 벡터를 돌려주는 함수, L2 정규화).
+기본값은 의존성 없는 해시 문자 2-gram이라 의미를 알지 못합니다. 긴 질문은 단어 하나가
+바뀌어도 유사도가 기준을 넘으므로, 핵심 단어가 같아야 비교하는 규칙이 잘못된 적중을
+막습니다.
+
+사용 예:
+    >>> cache = ResponseCache(maxsize=256, ttl=300, side_effect_tools={"write_file"})
+    >>> hit = cache.lookup("서울 날씨는 어때?", history)
+    >>> if hit is None:
+    ...     response = await agent.run(...)
+    ...     cache.store("서울 날씨는 어때?", history, response, tools=["get_weather"])
+    >>> cache.stats().hit_rate
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from typing import Literal, NamedTuple
+
+from langchain_core.tools import BaseTool
+
+from .cache import MISSING, TTLCache
+from .mcp_sessions import tool_server
+from .models import MCPServerConfig, ResponseCacheStats
+
+# 희소 벡터 ({차원: 가중치})
+Vector = Mapping[int, float]
+Embedder = Callable[[str], Vector]
+
+# 해시 n-gram 임베딩 차원 수
+EMBEDDING_DIM = 1 << 18
+
+# 질문 끝에서 무시할 문장 부호
+_TRAILING_PUNCTUATION = "?!.~,;…"
+
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+_WORD = re.compile(r"\w+")
+
+# 단어 끝에서 떼는 조사 (긴 것부터 비교)
+_PARTICLES = tuple(
+    "에서는 에서 으로 이랑 한테 까지 부터 은 는 이 가 을 를 에 의 도 로 와 과 랑 만".split()
+)
+
+# 핵심 단어로 비교할 단어 앞부분 길이
+_HEAD_CHARS = 2
+
+
+class CacheKey(NamedTuple):
+    """응답 캐시 키."""
+
+    context: str  # 직전 대화 해시
+    prompt: str  # 정규화한 질문
+    numbers: tuple[str, ...]  # 질문에 나온 숫자 (유사도 비교 범위)
+
+
+class CachedResponse(NamedTuple):
+    """캐시 적중 결과."""
+
+    response: str
+    tier: Literal["exact", "semantic"]
+    score: float  # 유사도 (정확 일치는 1.0)
+
+
+# ============================================================================
+# 정규화와 임베딩
+# ============================================================================
+
+
+def normalize_prompt(text: str) -> str:
+    """정확 일치용 질문 정규화 (NFKC, 소문자, 공백 제거, 끝 문장 부호 제거).
+
+    한국어는 띄어쓰기가 일정하지 않으므로 공백을 모두 지웁니다.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = "".join(text.split())
+    return text.rstrip(_TRAILING_PUNCTUATION)
+
+
+def keywords(text: str) -> list[str]:
+    """조사를 뗀 단어 목록 (NFKC, 소문자, 문장 부호 제외).
+
+    조사만 남지 않도록 두 글자 이상 남을 때만 뗍니다 ("날씨를" → "날씨", "가" → "가").
+    """
+    words = _WORD.findall(unicodedata.normalize("NFKC", text).lower())
+    return [_strip_particle(word) for word in words]
+
+
+def _strip_particle(word: str) -> str:
+    for particle in _PARTICLES:
+        if word.endswith(particle) and len(word) - len(particle) >= 2:
+            return word[: -len(particle)]
+    return word
+
+
+def embed_ngrams(text: str, n: int = 2) -> dict[int, float]:
+    """조사를 뗀 질문의 문자 n-gram을 해시한 L2 정규화 희소 벡터.
+
+    짧은 질문은 더 짧은 n-gram을 사용합니다.
+    """
+    text = "".join(keywords(text))
+    if not text:
+        return {}
+    n = min(n, len(text))
+    counts = Counter(
+        zlib.crc32(text[i : i + n].encode()) % EMBEDDING_DIM for i in range(len(text) - n + 1)
+    )
+    norm = math.sqrt(sum(c * c for c in counts.values()))
+    return {dim: c / norm for dim, c in counts.items()}
+
+
+def cosine(a: Vector, b: Vector) -> float:
+    """정규화된 희소 벡터의 코사인 유사도."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(dim, 0.0) for dim, weight in a.items())
+
+
+def side_effect_tools(tools: Iterable[BaseTool], servers: Iterable[MCPServerConfig]) -> set[str]:
+    """server_config.json의 `side_effects` 선언에 해당하는 도구 이름."""
+    declared = {server.name: set(server.side_effects) for server in servers if server.side_effects}
+    names = set()
+    for tool in tools:
+        marked = declared.get(tool_server(tool) or "", set())
+        if "*" in marked or tool.name in marked:
+            names.add(tool.name)
+    return names
+
+
+def _partition(key: CacheKey, user_message: str) -> tuple[str, tuple[str, ...], frozenset[str]]:
+    """유사도 비교 범위 (직전 대화, 숫자, 핵심 단어가 같은 질문끼리).
+
+    핵심 단어는 단어마다 앞 두 글자라서 어미가 다른 "알려줘"/"알려주세요"는 같고
+    "서울"/"부산"은 다릅니다.
+    """
+    heads = frozenset(word[:_HEAD_CHARS] for word in keywords(user_message))
+    return key.context, key.numbers, heads
+
+
+# ============================================================================
+# 벡터 색인
+# ============================================================================
+
+
+class VectorIndex:
+    """파티션별 희소 벡터 색인 (같은 파티션 안에서만 최근접 검색).
+
+    파티션이 (직전 대화, 숫자, 핵심 단어)라서 한 파티션의 항목은 많지 않으므로 전수 비교합니다.
+    """
+
+    def __init__(self) -> None:
+        self._partitions: dict[Hashable, dict[Hashable, Vector]] = {}
+        self._partition_of: dict[Hashable, Hashable] = {}
+
+    def add(self, key: Hashable, vector: Vector, partition: Hashable) -> None:
+        self.remove(key)
+        self._partitions.setdefault(partition, {})[key] = vector
+        self._partition_of[key] = partition
+
+    def remove(self, key: Hashable) -> None:
+        partition = self._partition_of.pop(key, None)
+        if partition is None:
+            return
+        vectors = self._partitions[partition]
+        del vectors[key]
+        if not vectors:
+            del self._partitions[partition]
+
+    def search(
+        self, vector: Vector, partition: Hashable, threshold: float
+    ) -> list[tuple[float, Hashable]]:
+        """유사도가 threshold 이상인 항목 (높은 순)."""
+        matches = [
+            (score, key)
+            for key, candidate in self._partitions.get(partition, {}).items()
+            if (score := cosine(vector, candidate)) >= threshold
+        ]
+        return sorted(matches, key=lambda match: match[0], reverse=True)
+
+    def prune(self, alive: Callable[[Hashable], bool]) -> int:
+        """alive가 False인 항목 제거 (캐시에서 밀려나거나 만료된 항목)."""
+        dead = [key for key in self._partition_of if not alive(key)]
+        for key in dead:
+            self.remove(key)
+        return len(dead)
+
+    def __len__(self) -> int:
+        return len(self._partition_of)
+
+
+# ============================================================================
+# 응답 캐시
+# ============================================================================
+
+
+class ResponseCache:
+    """완성된 에이전트 응답을 질문 단위로 캐시."""
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float | None = 300.0,
+        similarity: float = 0.9,
+        history_messages: int = 2,
+        side_effect_tools: Iterable[str] = (),
+        embedder: Embedder = embed_ngrams,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """캐시 생성.
+
+        Args:
+            maxsize: 최대 응답 수 (넘치면 가장 오래 사용하지 않은 응답부터 제거)
+            ttl: 응답 수명 (초, None이면 만료 없음)
+            similarity: 유사도 적중 기준 (코사인, 1 이상이면 정확 일치만 사용)
+            history_messages: 키에 포함할 직전 메시지 수
+            side_effect_tools: 호출되면 응답을 저장하지 않을 도구 이름
+            embedder: 질문 → 정규화된 희소 벡터
+            clock: 현재 시각 함수 (테스트용)
+        """
+        if history_messages < 0:
+            raise ValueError(f"history_messages는 0 이상이어야 합니다: {history_messages}")
+        self.similarity = similarity
+        self.history_messages = history_messages
+        self.side_effect_tools = set(side_effect_tools)
+        self.embedder = embedder
+        self.cache: TTLCache[str] = TTLCache(maxsize=maxsize, ttl=ttl, clock=clock)
+        self.index = VectorIndex()
+        self._lock = threading.Lock()
+        self._stats = ResponseCacheStats(maxsize=maxsize)
+        self._hit_ms = 0.0
+        self._miss_ms = 0.0
+        self._timed_misses = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self.similarity < 1
+
+    def key(self, user_message: str, history: Sequence[dict[str, str]] | None = None) -> CacheKey:
+        """(직전 대화 해시, 정규화한 질문, 숫자) 키."""
+        recent = [m for m in history or [] if m["role"] in ("user", "assistant")]
+        recent = recent[len(recent) - self.history_messages :] if self.history_messages else []
+        digest = hashlib.sha256()
+        for message in recent:
+            digest.update(f"{message['role']}\0{normalize_prompt(message['content'])}\0".encode())
+        numbers = tuple(_NUMBER.findall(unicodedata.normalize("NFKC", user_message)))
+        return CacheKey(digest.hexdigest()[:16], normalize_prompt(user_message), numbers)
+
+    def lookup(
+        self, user_message: str, history: Sequence[dict[str, str]] | None = None
+    ) -> CachedResponse | None:
+        """캐시된 응답 조회 (정확 일치 → 유사도 순)."""
+        start = time.perf_counter()
+        key = self.key(user_message, history)
+        hit: CachedResponse | None = None
+
+        response = self.cache.get(key)
+        if response is not MISSING:
+            hit = CachedResponse(response, "exact", 1.0)
+        elif self.semantic_enabled:
+            vector = self.embedder(user_message)
+            with self._lock:
+                matches = self.index.search(vector, _partition(key, user_message), self.similarity)
+            for score, match in matches:
+                response = self.cache.get(match)
+                if response is not MISSING:
+                    hit = CachedResponse(response, "semantic", score)
+                    break
+                with self._lock:
+                    self.index.remove(match)
+
+        with self._lock:
+            if hit is None:
+                self._stats.misses += 1
+            else:
+                if hit.tier == "exact":
+                    self._stats.exact_hits += 1
+                else:
+                    self._stats.semantic_hits += 1
+                self._hit_ms += (time.perf_counter() - start) * 1000
+        return hit
+
+    def store(
+        self,
+        user_message: str,
+        history: Sequence[dict[str, str]] | None,
+        response: str,
+        tools: Iterable[str] = (),
+        elapsed: float | None = None,
+    ) -> bool:
+        """에이전트가 만든 응답 저장 (부작용 도구를 호출했으면 저장하지 않음).
+
+        Args:
+            tools: 응답을 만드는 동안 호출된 도구 이름
+            elapsed: 에이전트 실행 시간 (초, 실패 시 지연시간 집계용)
+
+        Returns:
+            저장했는지 여부
+        """
+        with self._lock:
+            if elapsed is not None:
+                self._miss_ms += elapsed * 1000
+                self._timed_misses += 1
+            blocked = self.side_effect_tools.intersection(tools)
+            if blocked:
+                self._stats.skipped += 1
+                return False
+
+        key = self.key(user_message, history)
+        self.cache.set(key, response)
+        if self.semantic_enabled:
+            vector = self.embedder(user_message)
+            with self._lock:
+                self.index.add(key, vector, _partition(key, user_message))
+                # 캐시에서 밀려난 항목이 색인에 쌓이지 않도록 가끔 정리
+                if len(self.index) > 2 * self.cache.maxsize:
+                    self.index.prune(lambda k: k in self.cache)
+        return True
+
+    def clear(self) -> None:
+        """모든 응답 제거 (카운터는 유지)."""
+        self.cache.clear()
+        with self._lock:
+            self.index = VectorIndex()
+
+    def stats(self) -> ResponseCacheStats:
+        """적중/실패 카운터와 평균 응답 시간."""
+        with self._lock:
+            stats = self._stats.model_copy(update={"size": len(self.cache)})
+            if stats.hits:
+                stats.hit_latency_ms = self._hit_ms / stats.hits
+            if self._timed_misses:
+                stats.miss_latency_ms = self._miss_ms / self._timed_misses
+            return stats
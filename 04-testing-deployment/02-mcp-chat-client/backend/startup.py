@@ -0,0 +1,216 @@
+"""MCP tool manifest warm-up and cold-start profiling.
+
+`MCPAgent.initialize()`는 도구 매니페스트(settings.mcp_tool_manifest_path)에 스키마가
+있는 서버를 띄우지 않고 첫 도구 호출 때 시작합니다 (MCP_LAZY_START). 이 모듈은
+매니페스트를 미리 만들고, 콜드 스타트 시간이 어디에 쓰이는지 단계별로 보여 줍니다.
+
+- import: 새 인터프리터에서 `python -X importtime -c "import backend"`를 실행해
+  최상위 패키지별 import 시간을 합산 (이미 import된 현재 프로세스로는 잴 수 없으므로)
+- 서버 시작: 서버별 프로세스 spawn + MCP initialize (`MCPServerStatus.start_ms`)
+- 도구 목록: 서버별 tools/list (`MCPServerStatus.list_tools_ms`)
+- 그래프 생성: ReAct 그래프 compile (`MCPAgent.graph_compile_ms`)
+
+CLI:
+    python -m backend.startup                           # 모든 서버를 띄워 매니페스트 생성
+    python -m backend.startup --profile-startup         # 지금 설정 그대로 콜드 스타트 측정
+    python -m backend.startup --profile-startup --cold  # 매니페스트 없이 (모든 서버 spawn)
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .config import settings
+from .models import MCPServerStatus
+
+# backend 패키지가 있는 디렉토리 (import 측정용 하위 프로세스의 작업 디렉토리)
+_PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+
+@dataclass
+class StartupProfile:
+    """콜드 스타트 단계별 시간 (ms)."""
+
+    import_ms: float = 0.0
+    import_breakdown: dict[str, float] = field(default_factory=dict)  # 최상위 패키지 → ms
+    mcp_start_ms: float = 0.0  # 서버 동시 시작 + 도구 목록 (벽시계 시간)
+    servers: list[MCPServerStatus] = field(default_factory=list)
+    graph_compile_ms: float = 0.0
+    initialize_ms: float = 0.0  # MCPAgent.initialize() 전체
+    lazy: bool = False
+    manifest: bool = False  # 시작할 때 매니페스트가 있었는지
+
+    @property
+    def other_ms(self) -> float:
+        """LLM 클라이언트, 캐시 생성 등 나머지 초기화 시간."""
+        return max(0.0, self.initialize_ms - self.mcp_start_ms - self.graph_compile_ms)
+
+    @property
+    def total_ms(self) -> float:
+        return self.import_ms + self.initialize_ms
+
+
+def parse_importtime(stderr: str, module: str = "backend") -> tuple[float, dict[str, float]]:
+    """`-X importtime` 출력에서 module import 시간과 최상위 패키지별 자체 시간 (ms).
+
+    하위 모듈 줄이 상위 모듈 줄보다 먼저 나오므로, 들여쓰기 0단계의 module 줄 바로 앞까지
+    모인 줄들이 module이 불러온 모듈입니다.
+    """
+    pending: list[tuple[str, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        pending.append((name.strip(), int(self_us)))
+        if (len(name) - len(name.lstrip())) > 1:
+            # 다른 모듈 안에서 import됨 (단계마다 공백 두 칸)
+            continue
+        if name.strip() == module:
+            breakdown: dict[str, float] = defaultdict(float)
+            for imported, us in pending:
+                breakdown[imported.split(".")[0]] += us / 1000
+            return int(cumulative_us) / 1000, dict(breakdown)
+        pending = []
+    return 0.0, {}
+
+
+def measure_imports(module: str = "backend") -> tuple[float, dict[str, float]]:
+    """새 인터프리터에서 module을 import하는 시간 (ms)과 패키지별 내역."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr, module)
+
+
+async def profile_startup(cold: bool = False, imports: bool = True) -> StartupProfile:
+    """MCPAgent를 설정대로 초기화하며 단계별 시간을 잽니다.
+
+    Args:
+        cold: 빈 임시 매니페스트를 써서 모든 서버를 띄움 (기존 매니페스트는 건드리지 않음)
+        imports: import 시간도 잼 (하위 프로세스 실행)
+    """
+    from .langgraph_agent import MCPAgent
+
+    profile = StartupProfile(lazy=settings.mcp_lazy_start)
+    if imports:
+        profile.import_ms, profile.import_breakdown = measure_imports()
+
+    manifest_path = settings.mcp_tool_manifest_path
+    with tempfile.TemporaryDirectory() as tmp:
+        if cold:
+            settings.mcp_tool_manifest_path = str(Path(tmp) / "tool_manifest.json")
+        profile.manifest = Path(settings.mcp_tool_manifest_path).exists()
+        agent = MCPAgent()
+        try:
+            started = time.perf_counter()
+            await agent.initialize()
+            profile.initialize_ms = (time.perf_counter() - started) * 1000
+            if agent.mcp_sessions is not None:
+                profile.mcp_start_ms = agent.mcp_sessions.start_ms or 0.0
+            profile.servers = agent.mcp_status()
+            profile.graph_compile_ms = agent.graph_compile_ms or 0.0
+        finally:
+            await agent.close()
+            settings.mcp_tool_manifest_path = manifest_path
+    return profile
+
+
+def format_profile(profile: StartupProfile, top: int = 8) -> str:
+    """단계별 시간 표."""
+
+    def row(label: str, ms: float | None, note: str = "") -> str:
+        # 한글은 터미널에서 두 칸을 차지
+        width = sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in label)
+        value = "-" if ms is None else f"{ms:,.0f} ms"
+        return f"{label}{' ' * max(1, 28 - width)} {value:>10}  {note}".rstrip()
+
+    mode = "lazy" if profile.lazy else "eager"
+    lines = [
+        f"콜드 스타트 프로파일 ({mode}, 매니페스트 {'있음' if profile.manifest else '없음'})",
+        "-" * 60,
+    ]
+    if profile.import_breakdown:
+        lines.append(row("import backend", profile.import_ms))
+        heaviest = sorted(profile.import_breakdown.items(), key=lambda item: -item[1])
+        for package, ms in heaviest[:top]:
+            lines.append(row(f"  {package}", ms))
+
+    lines.append(row("MCP 서버 시작 + 도구 목록", profile.mcp_start_ms, "(서버 동시 시작)"))
+    for server in profile.servers:
+        if server.state == "idle":
+            lines.append(
+                row(
+                    f"  {server.name}",
+                    None,
+                    f"매니페스트 도구 {server.tool_count}개, 첫 호출 때 시작",
+                )
+            )
+            continue
+        lines.append(row(f"  {server.name} spawn", server.start_ms, server.last_error or ""))
+        lines.append(
+            row(f"  {server.name} tools/list", server.list_tools_ms, f"도구 {server.tool_count}개")
+        )
+
+    lines.append(row("그래프 생성", profile.graph_compile_ms))
+    lines.append(row("기타 초기화", profile.other_ms, "(LLM 클라이언트, 캐시 등)"))
+    lines.append("-" * 60)
+    lines.append(
+        row("합계", profile.total_ms if profile.import_breakdown else profile.initialize_ms)
+    )
+    return "\n".join(lines)
+
+
+async def warm_manifest() -> list[MCPServerStatus]:
+    """활성화된 서버를 모두 띄워 도구 매니페스트를 새로 만듭니다."""
+    from .mcp_sessions import MCPSessionManager
+
+    manager = MCPSessionManager.from_config(
+        settings.mcp_servers_config_path,
+        ping_interval=0,
+        manifest_path=settings.mcp_tool_manifest_path,
+    )
+    try:
+        await manager.start()
+        return manager.status()
+    finally:
+        await manager.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """`python -m backend.startup [--profile-startup]` 진입점."""
+    parser = argparse.ArgumentParser(description="MCP 도구 매니페스트 생성 / 콜드 스타트 측정")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="import, 서버 spawn, 도구 목록, 그래프 생성 단계별 시간 출력",
+    )
+    parser.add_argument(
+        "--cold", action="store_true", help="매니페스트 없이 측정 (모든 서버 spawn)"
+    )
+    parser.add_argument("--skip-imports", action="store_true", help="import 시간 측정 생략")
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        profile = asyncio.run(profile_startup(cold=args.cold, imports=not args.skip_imports))
+        print(format_profile(profile))
+        return
+
+    statuses = asyncio.run(warm_manifest())
+    for status in statuses:
+        print(f"{status.name}: {status.state}, 도구 {status.tool_count}개", file=sys.stderr)
+    print(f"매니페스트 저장: {settings.mcp_tool_manifest_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
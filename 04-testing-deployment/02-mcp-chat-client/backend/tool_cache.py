@@ -0,0 +1,135 @@
+"""Result cache for deterministic or slowly-changing MCP tools.
+
+`add`, `power` 같은 순수 함수나 `get_forecast`처럼 천천히 바뀌는 도구도 에이전트는
+호출할 때마다 stdio로 서버에 다시 요청합니다. `ToolResultCache`는 ToolNode 래퍼로
+들어가 (서버, 도구, 정규화한 인자)를 키로 성공한 결과를 LRU + TTL 캐시에 담아 두고,
+같은 호출이 오면 서버를 거치지 않고 바로 돌려줍니다.
+
+어떤 도구를 얼마나 캐시할지는 server_config.json의 서버별 `cache`로 선언합니다.
+
+    {
+      "name": "tools-server",
+      ...
+      "cache": {"add": null, "power": null, "get_forecast": 600}
+    }
+
+- 값은 TTL(초)이며, `null`은 만료 없음(순수 함수)입니다.
+- `"*"`는 그 서버의 모든 도구에 적용되며, 도구 이름으로 따로 적은 값이 우선합니다.
+- 선언하지 않은 도구와 오류 결과는 캐시하지 않습니다.
+
+도구 목록이 바뀌면(에이전트 그래프를 다시 만들 때) 캐시를 비웁니다.
+
+사용 예:
+    >>> cache = ToolResultCache.from_server_configs(load_server_configs(path))
+    >>> agent = create_react_agent(llm, create_tool_node(tools, limiter, cache))
+    >>> cache.stats().hit_rate
+"""
+
+import copy
+import json
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+from .cache import MISSING, TTLCache
+from .mcp_sessions import tool_server
+from .models import CacheStats, MCPServerConfig
+
+# 서버의 모든 도구에 적용되는 캐시 선언 키
+ALL_TOOLS = "*"
+
+
+class ToolResultCache:
+    """선언된 도구의 성공 결과를 캐시하는 ToolNode 래퍼."""
+
+    def __init__(
+        self,
+        policies: dict[str, dict[str, float | None]],
+        maxsize: int = 512,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """캐시 생성.
+
+        Args:
+            policies: 서버 이름 → (도구 이름 또는 "*" → TTL 초, None이면 만료 없음)
+            maxsize: 최대 항목 수 (넘치면 가장 오래 사용하지 않은 결과부터 제거)
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self.policies = {server: dict(tools) for server, tools in policies.items() if tools}
+        self.cache: TTLCache[tuple[Any, Any]] = TTLCache(maxsize=maxsize, ttl=None, clock=clock)
+
+    @classmethod
+    def from_server_configs(
+        cls, servers: Iterable[MCPServerConfig], maxsize: int = 512
+    ) -> "ToolResultCache":
+        """server_config.json의 서버별 `cache` 선언으로 생성."""
+        return cls({server.name: server.cache for server in servers}, maxsize=maxsize)
+
+    def policy(self, server: str | None, tool: str) -> tuple[bool, float | None]:
+        """(캐시 여부, TTL) 조회."""
+        tools = self.policies.get(server) if server else None
+        if not tools:
+            return False, None
+        if tool in tools:
+            return True, tools[tool]
+        if ALL_TOOLS in tools:
+            return True, tools[ALL_TOOLS]
+        return False, None
+
+    @staticmethod
+    def key(server: str, tool: str, args: dict[str, Any]) -> tuple[str, str, str]:
+        """캐시 키 (인자는 키 순서와 공백에 무관하게 정규화)."""
+        canonical = json.dumps(
+            args, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+        )
+        return server, tool, canonical
+
+    async def __call__(
+        self,
+        request: ToolCallRequest,
+        execute: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+    ) -> ToolMessage | Command:
+        call = request.tool_call
+        server = tool_server(request.tool)
+        cacheable, ttl = self.policy(server, call["name"])
+        if not cacheable:
+            return await execute(request)
+
+        key = self.key(server, call["name"], call["args"])
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            content, artifact = cached
+            return ToolMessage(
+                content=copy.deepcopy(content),
+                artifact=copy.deepcopy(artifact),
+                name=call["name"],
+                tool_call_id=call["id"],
+            )
+
+        generation = self.cache.generation
+        result = await execute(request)
+        if isinstance(result, ToolMessage) and result.status == "success":
+            self.cache.set(
+                key,
+                (copy.deepcopy(result.content), copy.deepcopy(result.artifact)),
+                tags=(server,),
+                generation=generation,
+                ttl=ttl,
+            )
+        return result
+
+    def invalidate(self, *servers: str) -> int:
+        """서버의 캐시 항목 제거 (서버를 지정하지 않으면 전체)."""
+        if not servers:
+            size = len(self.cache)
+            self.cache.clear()
+            return size
+        return self.cache.invalidate(*servers)
+
+    def stats(self) -> CacheStats:
+        """적중/실패 카운터 (캐시 대상 도구 호출만 집계)."""
+        return self.cache.stats()
@@ -0,0 +1,166 @@
+"""Concurrent tool execution with per-server limits and timeouts.
+
+LLM이 한 턴에 서로 독립적인 도구 호출을 여러 개 보내면(세 도시의 `get_weather`와
+`get_current_datetime` 등) LangGraph `ToolNode`는 이를 함께 실행합니다.
+다만 동시 실행 수와 호출 시간에 제한이 없어서, 한 서버에 호출이 몰리거나
+응답 없는 도구 하나가 턴 전체를 붙잡을 수 있습니다.
+
+`ToolLimiter`는 `ToolNode`의 `awrap_tool_call`로 들어가 다음을 적용합니다.
+
+- 전체 동시 실행 상한 (`TOOL_MAX_CONCURRENCY`, 1이면 순차 실행)
+- 서버별 동시 실행 상한 (server_config.json의 `max_concurrency`)
+- 서버별 제한 시간 (server_config.json의 `timeout`, 없으면 `TOOL_TIMEOUT`)
+
+제한 시간을 넘긴 호출은 취소하고 오류 ToolMessage로 바꿔 LLM이 나머지 결과로
+답하게 합니다. 도구가 어느 서버 것인지는 `MCPSessionManager`가 도구 metadata에
+넣어 둔 서버 이름으로 판단합니다.
+
+`create_tool_node`는 캐시와 제한 바깥에서 도구 호출마다 `tool.call` 추적 구간을 기록하고
+서버/도구/결과별 호출 수를 셉니다 (backend/tracing.py).
+
+사용 예:
+    >>> limiter = ToolLimiter.from_server_configs(load_server_configs(path))
+    >>> agent = create_react_agent(llm, create_tool_node(tools, limiter))
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import BaseTool
+from langgraph.prebuilt import ToolNode
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+
+from .mcp_sessions import tool_server
+from .models import MCPServerConfig
+from .tool_cache import ToolResultCache
+from .tracing import Tracer, get_tracer
+
+logger = logging.getLogger(__name__)
+
+ToolResult = ToolMessage | Command
+
+
+class ToolLimiter:
+    """도구 호출의 동시 실행 수와 실행 시간을 제한하는 ToolNode 래퍼."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        timeout: float | None = 60.0,
+        server_limits: dict[str, int] | None = None,
+        server_timeouts: dict[str, float] | None = None,
+    ) -> None:
+        """제한 설정.
+
+        Args:
+            max_concurrency: 전체 동시 실행 상한 (1이면 순차 실행)
+            timeout: 기본 제한 시간 (초, None이면 제한 없음)
+            server_limits: 서버 이름 → 동시 실행 상한
+            server_timeouts: 서버 이름 → 제한 시간 (초)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency는 1 이상이어야 합니다")
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.server_limits = dict(server_limits or {})
+        self.server_timeouts = dict(server_timeouts or {})
+        self._total = asyncio.Semaphore(max_concurrency)
+        self._servers = {
+            name: asyncio.Semaphore(limit) for name, limit in self.server_limits.items()
+        }
+
+    @classmethod
+    def from_server_configs(
+        cls,
+        servers: Iterable[MCPServerConfig],
+        max_concurrency: int = 8,
+        timeout: float | None = 60.0,
+    ) -> "ToolLimiter":
+        """server_config.json의 서버별 `max_concurrency`/`timeout`으로 생성."""
+        servers = list(servers)
+        return cls(
+            max_concurrency=max_concurrency,
+            timeout=timeout,
+            server_limits={s.name: s.max_concurrency for s in servers if s.max_concurrency},
+            server_timeouts={s.name: s.timeout for s in servers if s.timeout},
+        )
+
+    def timeout_for(self, server: str | None) -> float | None:
+        """서버의 도구 호출 제한 시간."""
+        return self.server_timeouts.get(server, self.timeout) if server else self.timeout
+
+    async def __call__(
+        self,
+        request: ToolCallRequest,
+        execute: Callable[[ToolCallRequest], Awaitable[ToolResult]],
+    ) -> ToolResult:
+        server = tool_server(request.tool)
+        timeout = self.timeout_for(server)
+
+        # 서버 슬롯을 먼저 잡아야, 바쁜 서버를 기다리는 호출이 전체 슬롯을 차지하지 않음
+        server_semaphore = self._servers.get(server) if server else None
+        if server_semaphore is not None:
+            await server_semaphore.acquire()
+        try:
+            async with self._total:
+                try:
+                    return await asyncio.wait_for(execute(request), timeout)
+                except asyncio.TimeoutError:
+                    call = request.tool_call
+                    logger.warning(f"도구 실행 시간 초과: {call['name']} ({timeout:g}초)")
+                    return ToolMessage(
+                        content=f"도구 실행 시간 초과: {call['name']} ({timeout:g}초)",
+                        name=call["name"],
+                        tool_call_id=call["id"],
+                        status="error",
+                    )
+        finally:
+            if server_semaphore is not None:
+                server_semaphore.release()
+
+
+def create_tool_node(
+    tools: Sequence[BaseTool],
+    limiter: ToolLimiter | None = None,
+    cache: ToolResultCache | None = None,
+    tracer: Tracer | None = None,
+) -> ToolNode:
+    """제한(과 결과 캐시)이 적용된 ToolNode (create_react_agent의 tools 인자로 전달).
+
+    캐시가 있으면 제한보다 바깥에서 확인하므로, 캐시 적중은 동시 실행 슬롯을 쓰지 않습니다.
+    추적 구간은 그보다 바깥이라 캐시 적중과 슬롯 대기 시간도 포함합니다.
+    """
+    limiter = limiter or ToolLimiter()
+    tracer = tracer or get_tracer()
+
+    async def limited(
+        request: ToolCallRequest, execute: Callable[[ToolCallRequest], Awaitable[ToolResult]]
+    ) -> ToolResult:
+        if cache is None:
+            return await limiter(request, execute)
+        return await cache(request, lambda req: limiter(req, execute))
+
+    async def traced(
+        request: ToolCallRequest, execute: Callable[[ToolCallRequest], Awaitable[ToolResult]]
+    ) -> ToolResult:
+        server = tool_server(request.tool)
+        name = request.tool_call["name"]
+        status = "error"
+        with tracer.span("tool.call", stage="tool", tool=name, server=server) as span:
+            try:
+                result = await limited(request, execute)
+                if isinstance(result, ToolMessage):
+                    status = result.status
+                    if status == "error":
+                        span.record_error(str(result.content)[:200])
+                else:
+                    status = "success"
+                span.set_attribute("status", status)
+                return result
+            finally:
+                tracer.metrics.count_tool_call(server, name, status)
+
+    return ToolNode(tools, awrap_tool_call=traced)
@@ -0,0 +1,558 @@
+"""Per-turn latency tracing spans and Prometheus-style metrics.
+
+느린 턴이 LLM 호출, 어떤 MCP 도구, DB 쓰기, Streamlit 렌더링 중 어디서 시간을
+쓰는지 보이도록 구간(span)을 기록합니다.
+
+- `Tracer.span()`: 현재 구간(contextvar)을 부모로 하는 구간을 열고 닫음. 비동기 태스크와
+  `asyncio.to_thread`로 넘어가도 부모가 이어지므로, 한 턴의 LLM/도구/DB 구간이 같은 trace에
+  묶입니다.
+- 단계(stage: turn, llm, tool, db, render)가 있는 구간은 `LatencyMetrics`의 지연 히스토그램과
+  최근 표본(p50/p95)에 들어가고, 도구 구간은 서버/도구/결과별 호출 수도 셉니다.
+- 끝난 구간은 백그라운드 스레드가 모아서 OTLP/JSON(`ExportTraceServiceRequest`) 형식으로
+  내보냅니다: 파일이면 요청 하나가 한 줄(collector의 otlpjsonfile receiver가 읽는 형식),
+  collector면 OTLP/HTTP `POST {endpoint}/v1/traces`. OpenTelemetry SDK는 필요 없습니다.
+- `MetricsServer`는 `/metrics`에 Prometheus 텍스트 형식을 제공합니다.
+
+설정 (환경변수): TRACE_EXPORT_PATH, OTLP_ENDPOINT, METRICS_PORT, METRICS_HOST
+
+사용 예:
+    >>> tracer = get_tracer()
+    >>> with tracer.span("tool.call", stage="tool", tool="add") as span:
+    ...     span.set_attribute("status", "success")
+    >>> tracer.metrics.stats()
+"""
+
+import json
+import logging
+import math
+import secrets
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Protocol, TypeVar
+
+from .config import settings
+from .models import StageStats
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# 턴 단계 (Settings 페이지 표시 순서)
+STAGES: tuple[str, ...] = ("turn", "llm", "tool", "db", "render")
+
+# 지연 히스토그램 경계 (초, Prometheus 기본값에 긴 LLM 호출 구간 추가)
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+SERVICE_NAME = "mcp-chat-client"
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+# ============================================================================
+# 구간
+# ============================================================================
+
+
+@dataclass
+class Span:
+    """하나의 작업 구간 (OTLP span 필드)."""
+
+    name: str
+    trace_id: str  # 32자리 hex
+    span_id: str  # 16자리 hex
+    parent_id: str | None
+    stage: str | None  # 지연 지표에 넣을 단계 (None이면 내보내기만)
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    error: str | None = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    _duration: float = field(default=0.0, repr=False)
+
+    @property
+    def duration(self) -> float:
+        """구간 길이 (초, 끝나기 전이면 지금까지)."""
+        return self._duration if self.end_ns else time.perf_counter() - self._started
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException | str) -> None:
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+    def to_otlp(self) -> dict[str, Any]:
+        """OTLP/JSON span 객체."""
+        span: dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error:
+            span["status"] = {"code": 2, "message": self.error}  # STATUS_CODE_ERROR
+        return span
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    result = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}  # OTLP/JSON은 int64를 문자열로
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        result.append({"key": key, "value": typed})
+    return result
+
+
+def otlp_request(spans: Sequence[Span], service_name: str = SERVICE_NAME) -> dict[str, Any]:
+    """구간 묶음을 OTLP `ExportTraceServiceRequest` JSON으로."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [
+                    {"scope": {"name": "backend.tracing"}, "spans": [s.to_otlp() for s in spans]}
+                ],
+            }
+        ]
+    }
+
+
+# ============================================================================
+# 내보내기
+# ============================================================================
+
+
+class SpanExporter(Protocol):
+    """OTLP/JSON 요청을 받는 내보내기 대상."""
+
+    def export(self, request: dict[str, Any]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class FileSpanExporter:
+    """OTLP/JSON 요청을 한 줄씩 파일에 추가."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, request: dict[str, Any]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        pass
+
+
+class OTLPHttpSpanExporter:
+    """OTLP/HTTP(JSON)로 collector에 전송 (`{endpoint}/v1/traces`)."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0) -> None:
+        import httpx
+
+        endpoint = endpoint.rstrip("/")
+        self.url = endpoint if endpoint.endswith("/v1/traces") else f"{endpoint}/v1/traces"
+        self._client = httpx.Client(timeout=timeout)
+
+    def export(self, request: dict[str, Any]) -> None:
+        response = self._client.post(self.url, json=request)
+        response.raise_for_status()
+
+    def close(self) -> None:
+        self._client.close()
+
+
+# ============================================================================
+# 지표
+# ============================================================================
+
+
+class _StageHistogram:
+    def __init__(self, buckets: int, window: int) -> None:
+        self.bucket_counts = [0] * buckets
+        self.count = 0
+        self.sum = 0.0
+        self.errors = 0
+        self.recent: deque[float] = deque(maxlen=window)
+
+
+class LatencyMetrics:
+    """단계별 지연 히스토그램, 오류 수, 도구 호출 수 (스레드 안전)."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS, window: int = 1000) -> None:
+        """지표 생성.
+
+        Args:
+            buckets: 히스토그램 경계 (초, 오름차순)
+            window: p50/p95 계산에 쓸 단계별 최근 표본 수
+        """
+        self.buckets = tuple(buckets)
+        self.window = window
+        self._stages: dict[str, _StageHistogram] = {}
+        self._tool_calls: dict[tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float, error: bool = False) -> None:
+        """단계 하나의 소요 시간을 기록합니다."""
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = _StageHistogram(len(self.buckets), self.window)
+            index = bisect_left(self.buckets, seconds)
+            if index < len(self.buckets):
+                histogram.bucket_counts[index] += 1
+            histogram.count += 1
+            histogram.sum += seconds
+            histogram.recent.append(seconds)
+            if error:
+                histogram.errors += 1
+
+    def count_tool_call(self, server: str | None, tool: str, status: str) -> None:
+        """도구 호출 수 (status: success, error)."""
+        key = (server or "", tool, status)
+        with self._lock:
+            self._tool_calls[key] = self._tool_calls.get(key, 0) + 1
+
+    def tool_calls(self) -> dict[tuple[str, str, str], int]:
+        """(서버, 도구, 결과) → 호출 수."""
+        with self._lock:
+            return dict(self._tool_calls)
+
+    def reset(self) -> None:
+        """기록을 모두 지웁니다 (워밍업을 뺀 구간만 집계할 때)."""
+        with self._lock:
+            self._stages.clear()
+            self._tool_calls.clear()
+
+    def stats(self) -> list[StageStats]:
+        """기록된 단계별 횟수, 오류 수, 최근 표본의 p50/p95 (STAGES 순서)."""
+        with self._lock:
+            snapshot = {
+                stage: (h.count, h.errors, sorted(h.recent)) for stage, h in self._stages.items()
+            }
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return [
+            StageStats(
+                stage=stage,
+                count=count,
+                errors=errors,
+                p50_ms=_percentile(recent, 0.5) * 1000,
+                p95_ms=_percentile(recent, 0.95) * 1000,
+            )
+            for stage, (count, errors, recent) in sorted(
+                snapshot.items(), key=lambda item: (order.get(item[0], len(order)), item[0])
+            )
+        ]
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)."""
+        with self._lock:
+            stages = {
+                stage: (list(h.bucket_counts), h.count, h.sum, h.errors)
+                for stage, h in self._stages.items()
+            }
+            tool_calls = dict(self._tool_calls)
+
+        lines = [
+            "# HELP chat_stage_duration_seconds 턴 단계별 소요 시간",
+            "# TYPE chat_stage_duration_seconds histogram",
+        ]
+        for stage, (bucket_counts, count, total, _) in sorted(stages.items()):
+            label = f'stage="{_escape(stage)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'chat_stage_duration_seconds_bucket{{{label},le="{bound:g}"}} {cumulative}'
+                )
+            lines.append(f'chat_stage_duration_seconds_bucket{{{label},le="+Inf"}} {count}')
+            lines.append(f"chat_stage_duration_seconds_sum{{{label}}} {total:.6f}")
+            lines.append(f"chat_stage_duration_seconds_count{{{label}}} {count}")
+
+        lines += [
+            "# HELP chat_stage_errors_total 오류로 끝난 단계 수",
+            "# TYPE chat_stage_errors_total counter",
+        ]
+        for stage, (_, _, _, errors) in sorted(stages.items()):
+            lines.append(f'chat_stage_errors_total{{stage="{_escape(stage)}"}} {errors}')
+
+        lines += [
+            "# HELP chat_tool_calls_total MCP 도구 호출 수",
+            "# TYPE chat_tool_calls_total counter",
+        ]
+        for (server, tool, status), count in sorted(tool_calls.items()):
+            lines.append(
+                f'chat_tool_calls_total{{server="{_escape(server)}",tool="{_escape(tool)}",'
+                f'status="{_escape(status)}"}} {count}'
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """정렬된 표본의 nearest-rank 백분위수 (표본이 없으면 0)."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(len(ordered) * q) - 1))]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """`/metrics`를 제공하는 HTTP 서버 (데몬 스레드)."""
+
+    def __init__(self, metrics: LatencyMetrics, host: str = "127.0.0.1", port: int = 9464) -> None:
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-server", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+# ============================================================================
+# 추적기
+# ============================================================================
+
+
+class Tracer:
+    """구간을 만들고, 지표에 기록하고, 백그라운드에서 내보내는 추적기."""
+
+    def __init__(
+        self,
+        metrics: LatencyMetrics | None = None,
+        exporters: Sequence[SpanExporter] = (),
+        service_name: str = SERVICE_NAME,
+        export_interval: float = 5.0,
+        max_batch: int = 512,
+        max_queue: int = 10_000,
+    ) -> None:
+        """추적기 생성 (내보내기 대상이 있으면 내보내기 스레드 시작).
+
+        Args:
+            metrics: 단계별 지연 지표 (None이면 새로 만듦)
+            exporters: 끝난 구간을 받을 대상 (없으면 지표만 기록)
+            service_name: OTLP resource의 service.name
+            export_interval: 내보내기 주기 (초)
+            max_batch: 한 요청에 담을 최대 구간 수 (차면 주기 전에 내보냄)
+            max_queue: 내보내기를 기다릴 최대 구간 수 (넘치면 버림)
+        """
+        self.metrics = metrics or LatencyMetrics()
+        self.exporters = list(exporters)
+        self.service_name = service_name
+        self.export_interval = export_interval
+        self.max_batch = max_batch
+        self.dropped = 0
+        self._queue: deque[Span] = deque(maxlen=max_queue)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        if self.exporters:
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+
+    def start_span(
+        self, name: str, stage: str | None = None, parent: Span | None = None, **attributes: Any
+    ) -> Span:
+        """구간 시작 (parent가 없으면 현재 구간이 부모, 현재 구간으로 설정하지는 않음)."""
+        parent = parent or _current_span.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            stage=stage,
+            attributes=attributes,
+        )
+
+    def end_span(self, span: Span, error: BaseException | str | None = None) -> None:
+        """구간을 끝내고 지표에 기록한 뒤 내보내기 대기열에 넣습니다."""
+        if span.end_ns:
+            return
+        if error is not None:
+            span.record_error(error)
+        span._duration = time.perf_counter() - span._started
+        span.end_ns = span.start_ns + int(span._duration * 1e9)
+        if span.stage is not None:
+            self.metrics.observe(span.stage, span._duration, error=span.error is not None)
+        if not self.exporters:
+            return
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(span)
+            full = len(self._queue) >= self.max_batch
+        if full:
+            self._wake.set()
+
+    @contextmanager
+    def span(self, name: str, stage: str | None = None, **attributes: Any) -> Iterator[Span]:
+        """현재 구간을 부모로 하는 구간 (블록 안에서는 이 구간이 현재 구간).
+
+        블록에서 예외가 나면 오류로 기록하고 다시 던집니다.
+        """
+        span = self.start_span(name, stage, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except GeneratorExit:
+            # 소비자가 스트림을 일찍 닫음 (오류 아님)
+            raise
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # 다른 컨텍스트에서 닫힌 비동기 제너레이터
+                pass
+            self.end_span(span)
+
+    def flush(self) -> None:
+        """대기 중인 구간을 지금 내보냅니다."""
+        while True:
+            with self._lock:
+                batch = [
+                    self._queue.popleft() for _ in range(min(self.max_batch, len(self._queue)))
+                ]
+            if not batch:
+                return
+            request = otlp_request(batch, self.service_name)
+            for exporter in self.exporters:
+                try:
+                    exporter.export(request)
+                except Exception as e:
+                    logger.warning(f"구간 내보내기 실패 ({type(exporter).__name__}): {e}")
+
+    def close(self) -> None:
+        """내보내기 스레드를 멈추고 남은 구간을 내보냅니다."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        for exporter in self.exporters:
+            exporter.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.export_interval)
+            self._wake.clear()
+            self.flush()
+
+
+def current_span() -> Span | None:
+    """지금 열려 있는 구간."""
+    return _current_span.get()
+
+
+def traced(name: str, stage: str = "db") -> Callable[[F], F]:
+    """동기 함수 호출을 전역 추적기의 구간으로 기록하는 데코레이터."""
+
+    def decorate(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with get_tracer().span(name, stage=stage):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+_tracer: Tracer | None = None
+_metrics_server: MetricsServer | None = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """프로세스 공유 추적기 (처음 호출 시 설정값으로 내보내기 대상과 /metrics 서버 생성)."""
+    global _tracer, _metrics_server
+    if _tracer is not None:
+        return _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            exporters: list[SpanExporter] = []
+            if settings.trace_export_path:
+                exporters.append(FileSpanExporter(settings.trace_export_path))
+            if settings.otlp_endpoint:
+                exporters.append(OTLPHttpSpanExporter(settings.otlp_endpoint))
+            tracer = Tracer(exporters=exporters)
+            if settings.metrics_port > 0:
+                try:
+                    _metrics_server = MetricsServer(
+                        tracer.metrics, settings.metrics_host, settings.metrics_port
+                    )
+                    logger.info(
+                        f"지표 서버: http://{settings.metrics_host}:{_metrics_server.port}/metrics"
+                    )
+                except OSError as e:
+                    logger.warning(
+                        f"지표 서버를 시작할 수 없습니다 (포트 {settings.metrics_port}): {e}"
+                    )
+            _tracer = tracer
+    return _tracer
@@ -0,0 +1,508 @@
+"""Streaming export/import of chat history.
+
+세션과 메시지를 JSONL 또는 Arrow 계열(Parquet, Arrow IPC 스트림) 형식으로
+내보내고 가져옵니다. 모든 단계가 `chunk_size` 행 단위로 처리되므로 수천만 개의
+메시지도 메모리에 한꺼번에 올리지 않고 환경 간에 옮길 수 있습니다.
+
+- 내보내기: 하나의 읽기 트랜잭션(일관된 스냅샷) 안에서 키셋 페이지로 읽어 씀
+- 가져오기: 청크마다 `executemany` + 커밋 1회, 이미 있는 세션은 메시지째 건너뜀
+
+레코드 형식 (JSONL 한 줄 = 한 레코드, 세션이 메시지보다 먼저 나옴):
+    {"type": "session", "session_id": ..., "title": ..., "created_at": ..., "updated_at": ..., "message_count": ...}
+    {"type": "message", "session_id": ..., "role": ..., "content": ..., "timestamp": ...}
+
+Parquet/Arrow는 같은 필드를 가진 단일 스키마(`type` 컬럼으로 구분)를 쓰고,
+시간은 `timestamp[us]` 컬럼입니다. pyarrow가 필요합니다 (선택 의존성).
+
+CLI:
+    python -m backend.transfer export ./chat_history.db backup.jsonl
+    python -m backend.transfer export ./chat_history.db backup.parquet --format parquet
+    python -m backend.transfer import ./other.db backup.parquet --format parquet
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from collections.abc import Iterator
+from datetime import datetime
+from typing import IO, TYPE_CHECKING, Any, Literal
+
+from .migrations import FTS_TRIGGERS
+from .models import TransferStats
+from .records import from_epoch_us, to_epoch_us
+
+if TYPE_CHECKING:
+    from .database import ChatDatabase
+
+TransferFormat = Literal["jsonl", "parquet", "arrow"]
+TRANSFER_FORMATS: tuple[str, ...] = ("jsonl", "parquet", "arrow")
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# (session_id, title, created_at_us, updated_at_us, message_count)
+SessionRow = tuple[str, str, int, int, int]
+# (session_id, role, content, timestamp_us)
+MessageRow = tuple[str, str, str, int]
+
+
+# ----------------------------------------------------------------------
+# 공통: 청크 단위 읽기/쓰기
+# ----------------------------------------------------------------------
+
+
+def _iter_chunks(
+    conn: sqlite3.Connection, chunk_size: int
+) -> Iterator[tuple[list[SessionRow], list[MessageRow]]]:
+    """세션 청크를 모두 내보낸 뒤 메시지 청크를 내보냅니다 (키셋 페이지)."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+
+    last_session = ""
+    while rows := cursor.execute(
+        "SELECT session_id, title, created_at_us, updated_at_us, message_count FROM sessions "
+        "WHERE session_id > ? ORDER BY session_id LIMIT ?",
+        (last_session, chunk_size),
+    ).fetchall():
+        yield rows, []
+        last_session = rows[-1][0]
+
+    last_id = 0
+    while rows := cursor.execute(
+        "SELECT id, session_id, role, content, timestamp_us FROM messages "
+        "WHERE id > ? ORDER BY id LIMIT ?",
+        (last_id, chunk_size),
+    ).fetchall():
+        yield [], [row[1:] for row in rows]
+        last_id = rows[-1][0]
+
+
+class _Importer:
+    """청크를 받아 executemany로 기록하는 가져오기 상태."""
+
+    def __init__(self, db: "ChatDatabase") -> None:
+        self.db = db
+        self.stats = TransferStats()
+        self._skipped: set[str] = set()
+
+    def add_sessions(self, rows: list[SessionRow]) -> None:
+        """세션 청크 기록 (이미 있는 세션은 건너뛰고 기억해 둠)."""
+        if not rows:
+            return
+
+        with self.db.pool.writer() as conn:
+            existing: set[str] = set()
+            ids = [row[0] for row in rows]
+            for start in range(0, len(ids), self.db.BULK_QUERY_CHUNK):
+                chunk = ids[start : start + self.db.BULK_QUERY_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                existing.update(
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT session_id FROM sessions WHERE session_id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+            new_rows = [row for row in rows if row[0] not in existing]
+            conn.executemany(
+                "INSERT INTO sessions (session_id, title, created_at, updated_at, message_count, "
+                "created_at_us, updated_at_us) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        sid,
+                        title,
+                        from_epoch_us(created),
+                        from_epoch_us(updated),
+                        count,
+                        created,
+                        updated,
+                    )
+                    for sid, title, created, updated, count in new_rows
+                ],
+            )
+
+        self._skipped |= existing
+        self.stats.sessions += len(new_rows)
+        self.stats.skipped_sessions += len(existing)
+
+    def add_messages(self, rows: list[MessageRow]) -> None:
+        """메시지 청크 기록 (건너뛴 세션과 없는 세션의 메시지는 제외)."""
+        rows = [row for row in rows if row[0] not in self._skipped]
+        if not rows:
+            return
+
+        with self.db.pool.writer() as conn:
+            # 행마다 FTS 삽입 트리거를 실행하는 대신 (가장 큰 비용) 같은 트랜잭션 안에서
+            # 트리거를 잠시 내리고 청크를 한 번에 색인합니다. DDL도 트랜잭션에 포함되므로
+            # 다른 연결에는 트리거가 없는 순간이 보이지 않습니다.
+            conn.execute("BEGIN")
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM messages").fetchone()[0]
+            conn.execute("DROP TRIGGER messages_fts_insert")
+
+            cursor = conn.executemany(
+                "INSERT INTO messages (session_id, role, content, timestamp, timestamp_us) "
+                "SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM sessions WHERE session_id = ?)",
+                [
+                    (sid, role, content, from_epoch_us(ts), ts, sid)
+                    for sid, role, content, ts in rows
+                ],
+            )
+
+            conn.execute(
+                "INSERT INTO messages_fts(rowid, content) "
+                "SELECT id, content FROM messages WHERE id > ?",
+                (last_id,),
+            )
+            conn.execute(FTS_TRIGGERS["messages_fts_insert"])
+
+        # 없는 세션의 메시지는 INSERT되지 않으므로 실제 삽입된 행 수를 셈
+        self.stats.messages += cursor.rowcount
+
+
+# ----------------------------------------------------------------------
+# JSONL
+# ----------------------------------------------------------------------
+
+
+def _iso(epoch_us: int) -> str:
+    return from_epoch_us(epoch_us).isoformat()
+
+
+def _epoch(value: str) -> int:
+    return to_epoch_us(datetime.fromisoformat(value))
+
+
+def _write_jsonl(chunks, stream: IO[str]) -> TransferStats:
+    stats = TransferStats()
+    for sessions, messages in chunks:
+        lines = [
+            json.dumps(
+                {
+                    "type": "session",
+                    "session_id": sid,
+                    "title": title,
+                    "created_at": _iso(created),
+                    "updated_at": _iso(updated),
+                    "message_count": count,
+                },
+                ensure_ascii=False,
+            )
+            for sid, title, created, updated, count in sessions
+        ]
+        lines += [
+            json.dumps(
+                {
+                    "type": "message",
+                    "session_id": sid,
+                    "role": role,
+                    "content": content,
+                    "timestamp": _iso(ts),
+                },
+                ensure_ascii=False,
+            )
+            for sid, role, content, ts in messages
+        ]
+        if lines:
+            stream.write("\n".join(lines) + "\n")
+        stats.sessions += len(sessions)
+        stats.messages += len(messages)
+    return stats
+
+
+def _read_jsonl(
+    stream: IO[str], chunk_size: int
+) -> Iterator[tuple[list[SessionRow], list[MessageRow]]]:
+    sessions: list[SessionRow] = []
+    messages: list[MessageRow] = []
+
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        kind = record.get("type")
+        if kind == "session":
+            sessions.append(
+                (
+                    record["session_id"],
+                    record["title"],
+                    _epoch(record["created_at"]),
+                    _epoch(record["updated_at"]),
+                    int(record.get("message_count", 0)),
+                )
+            )
+        elif kind == "message":
+            messages.append(
+                (
+                    record["session_id"],
+                    record["role"],
+                    record["content"],
+                    _epoch(record["timestamp"]),
+                )
+            )
+        else:
+            raise ValueError(f"{line_no}번째 줄: 알 수 없는 레코드 타입 {kind!r}")
+
+        if len(sessions) + len(messages) >= chunk_size:
+            yield sessions, messages
+            sessions, messages = [], []
+
+    yield sessions, messages
+
+
+# ----------------------------------------------------------------------
+# Parquet / Arrow IPC (pyarrow 선택 의존성)
+# ----------------------------------------------------------------------
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow 형식에는 pyarrow가 필요합니다: uv add pyarrow") from e
+    return pyarrow
+
+
+def _arrow_schema(pa: Any) -> Any:
+    return pa.schema(
+        [
+            ("type", pa.string()),
+            ("session_id", pa.string()),
+            ("title", pa.string()),
+            ("message_count", pa.int64()),
+            ("created_at", pa.timestamp("us")),
+            ("updated_at", pa.timestamp("us")),
+            ("role", pa.string()),
+            ("content", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+        ]
+    )
+
+
+def _to_record_batch(pa: Any, schema: Any, sessions: list, messages: list) -> Any:
+    """세션/메시지 청크를 하나의 RecordBatch로 (해당 없는 필드는 null)."""
+    n_sessions, n_messages = len(sessions), len(messages)
+    none_s, none_m = [None] * n_sessions, [None] * n_messages
+    columns = {
+        "type": ["session"] * n_sessions + ["message"] * n_messages,
+        "session_id": [r[0] for r in sessions] + [r[0] for r in messages],
+        "title": [r[1] for r in sessions] + none_m,
+        "message_count": [r[4] for r in sessions] + none_m,
+        # 정수 epoch 컬럼을 그대로 timestamp[us]로 (문자열 파싱 없음)
+        "created_at": [r[2] for r in sessions] + none_m,
+        "updated_at": [r[3] for r in sessions] + none_m,
+        "role": none_s + [r[1] for r in messages],
+        "content": none_s + [r[2] for r in messages],
+        "timestamp": none_s + [r[3] for r in messages],
+    }
+    return pa.RecordBatch.from_arrays(
+        [pa.array(columns[field.name], type=field.type) for field in schema], schema=schema
+    )
+
+
+def _write_arrow(chunks, stream: IO[bytes], format: str) -> TransferStats:
+    pa = _require_pyarrow()
+    schema = _arrow_schema(pa)
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(stream, schema)
+    else:
+        writer = pa.ipc.new_stream(stream, schema)
+
+    stats = TransferStats()
+    try:
+        for sessions, messages in chunks:
+            if sessions or messages:
+                # 청크 하나 = Parquet row group 하나 (읽을 때도 청크 단위로 읽힘)
+                writer.write_batch(_to_record_batch(pa, schema, sessions, messages))
+            stats.sessions += len(sessions)
+            stats.messages += len(messages)
+    finally:
+        writer.close()
+    return stats
+
+
+def _read_arrow(
+    stream: IO[bytes], format: str, chunk_size: int
+) -> Iterator[tuple[list[SessionRow], list[MessageRow]]]:
+    pa = _require_pyarrow()
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        batches = pq.ParquetFile(stream).iter_batches(batch_size=chunk_size)
+    else:
+        batches = pa.ipc.open_stream(stream)
+
+    for batch in batches:
+        columns = {
+            name: batch.column(name).cast(pa.int64()).to_pylist()
+            if name in ("created_at", "updated_at", "timestamp")
+            else batch.column(name).to_pylist()
+            for name in batch.schema.names
+        }
+        sessions: list[SessionRow] = []
+        messages: list[MessageRow] = []
+        for i, kind in enumerate(columns["type"]):
+            if kind == "session":
+                sessions.append(
+                    (
+                        columns["session_id"][i],
+                        columns["title"][i],
+                        columns["created_at"][i],
+                        columns["updated_at"][i],
+                        columns["message_count"][i] or 0,
+                    )
+                )
+            else:
+                messages.append(
+                    (
+                        columns["session_id"][i],
+                        columns["role"][i],
+                        columns["content"][i],
+                        columns["timestamp"][i],
+                    )
+                )
+        yield sessions, messages
+
+
+# ----------------------------------------------------------------------
+# 공개 API
+# ----------------------------------------------------------------------
+
+
+def _check_format(format: str) -> None:
+    if format not in TRANSFER_FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {format} (가능: {', '.join(TRANSFER_FORMATS)})")
+
+
+def export_history(
+    db: "ChatDatabase",
+    stream: IO,
+    format: TransferFormat = "jsonl",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> TransferStats:
+    """전체 대화 기록을 스트림으로 내보냅니다.
+
+    Args:
+        db: 내보낼 데이터베이스
+        stream: jsonl이면 텍스트 스트림, parquet/arrow면 바이너리 스트림
+        format: 출력 형식
+        chunk_size: 한 번에 읽고 쓰는 최대 행 수
+
+    Returns:
+        내보낸 세션/메시지 수
+    """
+    _check_format(format)
+    db.flush()
+
+    with db.pool.reader() as conn:
+        # 하나의 읽기 트랜잭션으로 묶어 내보내는 동안 추가된 쓰기가 섞이지 않게 함
+        conn.execute("BEGIN")
+        try:
+            chunks = _iter_chunks(conn, chunk_size)
+            if format == "jsonl":
+                return _write_jsonl(chunks, stream)
+            return _write_arrow(chunks, stream, format)
+        finally:
+            conn.rollback()
+
+
+def import_history(
+    db: "ChatDatabase",
+    stream: IO,
+    format: TransferFormat = "jsonl",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> TransferStats:
+    """스트림의 대화 기록을 가져옵니다.
+
+    이미 있는 세션(같은 session_id)은 메시지와 함께 건너뛰므로 같은 파일을
+    다시 가져와도 중복되지 않습니다.
+
+    Args:
+        db: 가져올 대상 데이터베이스
+        stream: jsonl이면 텍스트 스트림, parquet/arrow면 바이너리 스트림
+        format: 입력 형식
+        chunk_size: 트랜잭션 하나에 기록할 최대 행 수
+
+    Returns:
+        가져온 세션/메시지 수와 건너뛴 세션 수
+    """
+    _check_format(format)
+    db.flush()
+
+    if format == "jsonl":
+        chunks = _read_jsonl(stream, chunk_size)
+    else:
+        chunks = _read_arrow(stream, format, chunk_size)
+
+    importer = _Importer(db)
+    for sessions, messages in chunks:
+        importer.add_sessions(sessions)
+        importer.add_messages(messages)
+    return importer.stats
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+
+def _guess_format(path: str) -> str:
+    if path.endswith(".parquet"):
+        return "parquet"
+    if path.endswith((".arrow", ".arrows")):
+        return "arrow"
+    return "jsonl"
+
+
+def main(argv: list[str] | None = None) -> None:
+    """`python -m backend.transfer {export,import} DB FILE` 진입점."""
+    from .database import ChatDatabase
+
+    parser = argparse.ArgumentParser(description="채팅 기록 내보내기/가져오기")
+    parser.add_argument("command", choices=["export", "import"])
+    parser.add_argument("db_path", help="SQLite 파일 경로")
+    parser.add_argument("file", help="입출력 파일 ('-'이면 stdout/stdin)")
+    parser.add_argument(
+        "--format", choices=TRANSFER_FORMATS, default=None, help="기본값: 파일 확장자로 추정"
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    format = args.format or _guess_format(args.file)
+    binary = format != "jsonl"
+    db = ChatDatabase(db_path=args.db_path)
+
+    try:
+        if args.command == "export":
+            if args.file == "-":
+                stream = sys.stdout.buffer if binary else sys.stdout
+                stats = export_history(db, stream, format, args.chunk_size)
+            else:
+                with open(
+                    args.file, "wb" if binary else "w", encoding=None if binary else "utf-8"
+                ) as f:
+                    stats = export_history(db, f, format, args.chunk_size)
+        else:
+            if args.file == "-":
+                stream = sys.stdin.buffer if binary else sys.stdin
+                stats = import_history(db, stream, format, args.chunk_size)
+            else:
+                with open(
+                    args.file, "rb" if binary else "r", encoding=None if binary else "utf-8"
+                ) as f:
+                    stats = import_history(db, f, format, args.chunk_size)
+    finally:
+        db.close()
+
+    print(
+        f"{args.command}: 세션 {stats.sessions}개, 메시지 {stats.messages}개"
+        + (f", 건너뛴 세션 {stats.skipped_sessions}개" if stats.skipped_sessions else ""),
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Write-behind buffer for chat message appends.
+
+여러 세션에서 들어오는 메시지 추가 요청을 메모리에 모아 두었다가,
+개수(`flush_size`) 또는 시간(`flush_interval`) 기준으로 한 번에 flush합니다.
+flush 한 번이 하나의 트랜잭션(= fsync 한 번)이 되므로 대화 턴마다
+커밋하던 기존 방식보다 쓰기 처리량이 크게 늘어납니다.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+
+from .models import ChatMessage
+
+logger = logging.getLogger(__name__)
+
+PendingMessage = tuple[str, ChatMessage]
+
+
+class WriteBehindBuffer:
+    """크기/시간 기준으로 flush되는 메시지 쓰기 버퍼."""
+
+    def __init__(
+        self,
+        flush_func: Callable[[list[PendingMessage]], None],
+        flush_size: int = 100,
+        flush_interval: float = 0.5,
+    ) -> None:
+        """버퍼 초기화.
+
+        Args:
+            flush_func: 모인 메시지를 한 트랜잭션으로 기록하는 함수
+            flush_size: 이 개수만큼 쌓이면 즉시 flush
+            flush_interval: 마지막 flush 이후 이 시간(초)이 지나면 flush
+        """
+        self._flush_func = flush_func
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self._pending: list[PendingMessage] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="chat-db-write-behind", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """flush 대기 중인 메시지 수."""
+        with self._lock:
+            return len(self._pending)
+
+    def append(self, session_id: str, message: ChatMessage) -> None:
+        """메시지를 버퍼에 추가합니다."""
+        self.extend(session_id, [message])
+
+    def extend(self, session_id: str, messages: list[ChatMessage]) -> None:
+        """여러 메시지를 버퍼에 추가합니다."""
+        if self._closed:
+            raise RuntimeError("닫힌 버퍼에는 메시지를 추가할 수 없습니다.")
+
+        with self._lock:
+            self._pending.extend((session_id, message) for message in messages)
+            should_flush = len(self._pending) >= self.flush_size
+
+        if should_flush:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """대기 중인 메시지를 즉시 기록하고 기록한 개수를 반환합니다."""
+        # flush 순서를 보장하기 위해 swap과 기록을 하나의 잠금으로 직렬화
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+
+            if not batch:
+                return 0
+
+            try:
+                self._flush_func(batch)
+            except Exception:
+                # 실패한 배치는 다음 flush에서 재시도하도록 앞쪽에 되돌려 놓음
+                with self._lock:
+                    self._pending[:0] = batch
+                raise
+
+            return len(batch)
+
+    def close(self) -> None:
+        """백그라운드 스레드를 멈추고 남은 메시지를 flush합니다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        """flush_interval마다 또는 flush_size 도달 시 flush하는 루프."""
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"write-behind flush 실패: {e}")
@@ -0,0 +1,164 @@
+"""동시 채팅 세션 부하 테스트: 턴마다 히스토리 전송 vs `AgentPool` 세션 스레드.
+
+세션 --sessions개(기본 100)가 동시에 시작해 각자 --turns턴씩 대화합니다. 가짜 LLM 서버는
+동시에 --llm-capacity개 요청만 처리하고 호출마다 --llm-ms가 걸립니다 (넘치는 요청은
+서버 안에서 기다림). 세션은 --tenants개 테넌트에 골고루 나뉩니다.
+
+- no pool: 전역 에이전트 하나에 매 턴 히스토리 전체를 보내고 동시 실행 제한 없음
+- pool c=N: `AgentPool(max_concurrency=N)`, 세션 스레드에 새 메시지만 보냄,
+  대기열이 넘치거나 --queue-timeout 안에 실행하지 못한 턴은 거절
+
+턴 처리량(turns/s), 성공한 턴의 p50/p95 지연, 거절 수, 턴당 요청 크기
+(에이전트에 넘기는 질문 + 히스토리 JSON)를 비교합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_agent_pool.py
+    uv run python benchmarks/bench_agent_pool.py --sessions 200 --turns 10 --concurrency 16 64
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import AgentPool, MCPAgent, PoolRejected  # noqa: E402
+
+ANSWER = "오늘 서울은 맑고 낮 기온은 23도입니다. 저녁에는 조금 쌀쌀하니 겉옷을 챙기세요."
+
+
+class FakeLLMServer(GenericFakeChatModel):
+    """동시 처리 용량이 정해진 가짜 LLM 서버 (넘치는 요청은 서버에서 대기)."""
+
+    delay: float = 0.05
+    slots: asyncio.Semaphore | None = None
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        async with self.slots:
+            await asyncio.sleep(self.delay)
+        return self._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def replies():
+    for turn in itertools.count(1):
+        yield AIMessage(content=f"{ANSWER} ({turn})")
+
+
+def make_agent(args: argparse.Namespace, checkpointer: InMemorySaver | None) -> MCPAgent:
+    model = FakeLLMServer(
+        messages=replies(),
+        delay=args.llm_ms / 1000,
+        slots=asyncio.Semaphore(args.llm_capacity),
+    )
+    agent = MCPAgent(checkpointer=checkpointer)
+    agent.agent = create_react_agent(model, [], checkpointer=checkpointer)
+    agent._initialized = True
+    return agent
+
+
+async def run(args: argparse.Namespace, concurrency: int | None) -> dict[str, float]:
+    """concurrency가 None이면 풀 없이 히스토리 전송."""
+    if concurrency is None:
+        agent, pool = make_agent(args, None), None
+    else:
+        agent = make_agent(args, InMemorySaver())
+        pool = AgentPool(
+            agent,
+            max_concurrency=concurrency,
+            max_queue=args.max_queue,
+            queue_timeout=args.queue_timeout,
+            tenant_limit=args.tenant_limit,
+        )
+
+    latencies: list[float] = []
+    payload_bytes: list[int] = []
+    rejected = 0
+
+    async def session(index: int) -> None:
+        nonlocal rejected
+        session_id, tenant = f"s{index}", f"t{index % args.tenants}"
+        history: list[dict[str, str]] = []
+        for turn in range(args.turns):
+            prompt = f"세션 {index}의 {turn + 1}번째 질문: 오늘 날씨는 어때?"
+            start = time.perf_counter()
+            try:
+                if pool is None:
+                    payload_bytes.append(len(json.dumps([prompt, history]).encode()))
+                    response = await agent.chat(prompt, history, session_id=session_id)
+                else:
+                    payload_bytes.append(len(json.dumps([prompt]).encode()))
+                    response = await pool.chat(session_id, prompt, tenant=tenant)
+            except PoolRejected:
+                rejected += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            history += [
+                {"role": "user", "content": prompt},
+                {"role": "assistant", "content": response},
+            ]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(args.sessions)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "rejected": rejected,
+        "payload": statistics.mean(payload_bytes),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--llm-ms", type=float, default=500, help="가짜 LLM 호출 지연")
+    parser.add_argument("--llm-capacity", type=int, default=32, help="가짜 LLM 동시 처리 수")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 100])
+    parser.add_argument("--max-queue", type=int, default=64)
+    parser.add_argument("--queue-timeout", type=float, default=5.0)
+    parser.add_argument("--tenant-limit", type=int, default=10)
+    args = parser.parse_args()
+
+    print(
+        f"sessions={args.sessions}, turns={args.turns}, tenants={args.tenants}, "
+        f"llm-ms={args.llm_ms:g}, llm-capacity={args.llm_capacity}, "
+        f"max-queue={args.max_queue}, queue-timeout={args.queue_timeout:g}s"
+    )
+    print(
+        f"{'mode':>10} | {'turns/s':>8} | {'p50':>9} | {'p95':>9} | {'rejected':>8} | "
+        f"{'req/turn':>9}"
+    )
+    print("-" * 70)
+    for concurrency in [None, *args.concurrency]:
+        result = await run(args, concurrency)
+        name = "no pool" if concurrency is None else f"pool c={concurrency}"
+        print(
+            f"{name:>10} | {result['throughput']:>8.1f} | {result['p50']:>6.1f} ms | "
+            f"{result['p95']:>6.1f} ms | {result['rejected']:>8} | "
+            f"{result['payload']:>7.0f} B"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+"""턴당 에이전트 호출 지연시간: 턴마다 asyncio.run vs 영속 AgentRuntime.
+
+LLM과 MCP 서버 없이 비용 구조만 재현한 가짜 에이전트를 사용합니다.
+
+- MCP stdio 서버: 실제 파이썬 하위 프로세스 (줄 단위 echo)
+- LLM HTTP 연결: 로컬 TCP echo 서버에 대한 keep-alive 연결 (루프에 묶임)
+
+stdio 세션과 연결은 만든 이벤트 루프에 묶이므로, 턴마다 `asyncio.run()`을 쓰면
+매 턴 하위 프로세스 시작 + 연결 수립을 다시 해야 합니다. `AgentRuntime`은
+첫 턴에만 이 비용을 냅니다.
+
+실행 방법:
+    uv run python benchmarks/bench_agent_runtime.py
+    uv run python benchmarks/bench_agent_runtime.py --turns 100
+"""
+
+import argparse
+import asyncio
+import socketserver
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import AgentRuntime  # noqa: E402
+
+ECHO_SERVER = (
+    "import sys\nfor line in sys.stdin:\n    sys.stdout.write(line)\n    sys.stdout.flush()\n"
+)
+
+
+class _EchoHandler(socketserver.StreamRequestHandler):
+    """연결이 닫힐 때까지 줄 단위로 응답 (keep-alive)."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            self.wfile.write(line)
+
+
+class FakeMCPAgent:
+    """stdio 하위 프로세스와 TCP 연결을 쓰는 가짜 에이전트."""
+
+    port = 0
+
+    async def initialize(self) -> None:
+        self.proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            ECHO_SERVER,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        self.conn: tuple[asyncio.StreamReader, asyncio.StreamWriter] | None = None
+
+    async def chat(self, user_message: str, history=None) -> str:
+        # 도구 호출 (stdio 왕복)
+        self.proc.stdin.write(user_message.encode() + b"\n")
+        await self.proc.stdin.drain()
+        tool_result = await self.proc.stdout.readline()
+
+        # LLM 호출 (연결이 없을 때만 새로 연결)
+        if self.conn is None:
+            self.conn = await asyncio.open_connection("127.0.0.1", self.port)
+        reader, writer = self.conn
+        writer.write(tool_result)
+        await writer.drain()
+        return (await reader.readline()).decode().strip()
+
+    async def close(self) -> None:
+        if self.conn is not None:
+            self.conn[1].close()
+        self.proc.stdin.close()
+        await self.proc.wait()
+
+
+def per_turn_asyncio_run(turns: int) -> list[float]:
+    """턴마다 새 루프: 에이전트 초기화부터 종료까지 매번 반복."""
+
+    async def turn(i: int) -> str:
+        agent = FakeMCPAgent()
+        await agent.initialize()
+        try:
+            return await agent.chat(f"turn {i}")
+        finally:
+            await agent.close()
+
+    samples = []
+    for i in range(turns):
+        start = time.perf_counter()
+        asyncio.run(turn(i))
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def persistent_runtime(turns: int) -> list[float]:
+    """AgentRuntime: 같은 루프에서 에이전트와 연결 재사용."""
+    runtime = AgentRuntime(agent_factory=FakeMCPAgent)
+    samples = []
+    for i in range(turns):
+        start = time.perf_counter()
+        runtime.chat(f"turn {i}")
+        samples.append((time.perf_counter() - start) * 1000)
+    runtime.close()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=30)
+    args = parser.parse_args()
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _EchoHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeMCPAgent.port = server.server_address[1]
+
+    print(f"turns={args.turns}")
+    print(f"{'mode':>16} | {'first turn':>10} | {'p50':>9} | {'p95':>9}")
+    print("-" * 54)
+    for name, func in [("asyncio.run", per_turn_asyncio_run), ("AgentRuntime", persistent_runtime)]:
+        samples = func(args.turns)
+        rest = sorted(samples[1:])
+        p95 = rest[min(len(rest) - 1, int(len(rest) * 0.95))]
+        print(
+            f"{name:>16} | {samples[0]:>7.2f} ms | {statistics.median(rest):>6.2f} ms | {p95:>6.2f} ms"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""AsyncChatDatabase 겹침(overlap) 벤치마크.
+
+가짜 LLM 스트리밍(토큰마다 `asyncio.sleep`)과 DB 저장을 한 턴으로 묶어
+다음 두 방식의 턴당 시간과 이벤트 루프 최대 지연을 비교합니다.
+
+- blocking: 이벤트 루프 스레드에서 `ChatDatabase.add_message` 호출 후 스트리밍
+- overlap:  `AsyncChatDatabase.add_message`를 태스크로 띄우고 동시에 스트리밍
+
+durability=full로 커밋마다 fsync가 일어나도록 하고, `--disk-latency`로
+느린 디스크(네트워크 볼륨 등)의 커밋 지연을 추가로 흉내낼 수 있습니다.
+
+실행 방법:
+    uv run python benchmarks/bench_async_db.py
+    uv run python benchmarks/bench_async_db.py --turns 50 --tokens 40 --disk-latency 0
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import AsyncChatDatabase, ChatDatabase, ChatMessage  # noqa: E402
+
+
+class SlowDiskChatDatabase(ChatDatabase):
+    """커밋마다 고정 지연을 더해 느린 디스크를 흉내내는 ChatDatabase."""
+
+    def __init__(self, *args, disk_latency: float = 0.0, **kwargs) -> None:
+        self.disk_latency = disk_latency
+        super().__init__(*args, **kwargs)
+
+    def _write_messages(self, batch) -> None:
+        super()._write_messages(batch)
+        time.sleep(self.disk_latency)
+
+
+async def fake_llm_stream(tokens: int, token_delay: float) -> str:
+    """토큰을 하나씩 내보내는 LLM 스트리밍 흉내."""
+    parts = []
+    for i in range(tokens):
+        await asyncio.sleep(token_delay)
+        parts.append(f"tok{i}")
+    return " ".join(parts)
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.001) -> float:
+    """이벤트 루프가 막힌 최대 시간(ms)을 측정합니다."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst * 1000
+
+
+async def run(
+    mode: str, turns: int, tokens: int, token_delay: float, disk_latency: float
+) -> tuple[float, float]:
+    """턴당 중앙값 시간(ms)과 최대 루프 지연(ms)을 반환합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SlowDiskChatDatabase(
+            db_path=str(Path(tmp) / "bench.db"), durability="full", disk_latency=disk_latency
+        )
+        adb = AsyncChatDatabase(db)
+        session_id = db.create_session(title="bench").session_id
+
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(measure_loop_lag(stop))
+        samples = []
+        pending: asyncio.Task | None = None
+
+        for turn in range(turns):
+            user_msg = ChatMessage(role="user", content=f"question {turn}")
+            start = time.perf_counter()
+
+            if mode == "blocking":
+                db.add_message(session_id, user_msg)
+                response = await fake_llm_stream(tokens, token_delay)
+                db.add_message(session_id, ChatMessage(role="assistant", content=response))
+            else:
+                save_task = asyncio.create_task(adb.add_message(session_id, user_msg))
+                response = await fake_llm_stream(tokens, token_delay)
+                await save_task
+                # 응답 저장은 다음 턴의 스트리밍과 겹치도록 기다리지 않음
+                pending = asyncio.create_task(
+                    adb.add_message(session_id, ChatMessage(role="assistant", content=response))
+                )
+
+            samples.append((time.perf_counter() - start) * 1000)
+
+        if pending is not None:
+            await pending
+        stop.set()
+        max_lag = await lag_task
+        await adb.close()
+        db.close()
+
+    return statistics.median(samples), max_lag
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--token-delay", type=float, default=0.001)
+    parser.add_argument(
+        "--disk-latency", type=float, default=0.005, help="커밋마다 추가할 지연 (초)"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"turns={args.turns}, tokens/turn={args.tokens}, token_delay={args.token_delay}s, "
+        f"disk_latency={args.disk_latency}s"
+    )
+    print(f"{'mode':>9} | {'turn (median)':>14} | {'max loop lag':>13}")
+    print("-" * 43)
+
+    for mode in ["blocking", "overlap"]:
+        turn_ms, lag_ms = asyncio.run(
+            run(mode, args.turns, args.tokens, args.token_delay, args.disk_latency)
+        )
+        print(f"{mode:>9} | {turn_ms:>11.2f} ms | {lag_ms:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
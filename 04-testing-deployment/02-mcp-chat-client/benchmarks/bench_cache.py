@@ -0,0 +1,100 @@
+"""조회 캐시 벤치마크 (Streamlit 재실행 시뮬레이션).
+
+재실행 한 번마다 페이지가 하는 조회를 흉내 냅니다.
+
+- 사이드바: `get_session` (현재 세션 메시지 수), `stats(days=1)`
+- History: `list_sessions` + 펼친 세션들의 `get_messages_for_sessions`
+
+`--write-every` 번째 재실행마다 현재 세션에 메시지를 추가해 무효화가 일어나게 합니다.
+캐시 없음과 `--sizes`의 캐시 크기별로 재실행당 지연시간과 적중률을 비교합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_cache.py
+    uv run python benchmarks/bench_cache.py --sessions 500 --reruns 2000 --sizes 16 64 256
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import CachedChatStorage, ChatDatabase, ChatMessage, ChatStorage  # noqa: E402
+
+MESSAGES_PER_SESSION = 40
+OPEN_SESSIONS = 5
+
+
+def populate(db: ChatDatabase, num_sessions: int) -> list[str]:
+    """세션과 메시지를 채우고 세션 ID 목록을 반환합니다."""
+    ids = []
+    for s in range(num_sessions):
+        session_id = db.create_session(title=f"session {s}").session_id
+        db.add_messages(
+            session_id,
+            [
+                ChatMessage(role="user", content=f"message {s}-{i}")
+                for i in range(MESSAGES_PER_SESSION)
+            ],
+        )
+        ids.append(session_id)
+    return ids
+
+
+def simulate(db: ChatStorage, session_ids: list[str], reruns: int, write_every: int) -> float:
+    """재실행을 반복하고 재실행당 평균 지연(ms)을 반환합니다."""
+    rng = random.Random(0)
+    current = session_ids[0]
+    start = time.perf_counter()
+    for rerun in range(1, reruns + 1):
+        # 가끔 다른 세션으로 이동
+        if rng.random() < 0.05:
+            current = rng.choice(session_ids)
+        if rerun % write_every == 0:
+            db.add_message(current, ChatMessage(role="user", content=f"rerun {rerun}"))
+
+        db.get_session(current)
+        db.stats(days=1)
+        sessions = db.list_sessions(limit=20)
+        open_ids = [s.session_id for s in sessions[:OPEN_SESSIONS]]
+        db.get_messages_for_sessions(open_ids)
+    return (time.perf_counter() - start) * 1000 / reruns
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--reruns", type=int, default=1000)
+    parser.add_argument("--write-every", type=int, default=10)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 16, 64, 256])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ChatDatabase(db_path=str(Path(tmp) / "bench.db"))
+        session_ids = populate(db, args.sessions)
+
+        print(f"sessions={args.sessions}, reruns={args.reruns}, write_every={args.write_every}")
+        print(f"{'cache':>10} | {'per rerun':>10} | {'hit rate':>8} | {'evictions':>9}")
+        print("-" * 48)
+
+        baseline = simulate(db, session_ids, args.reruns, args.write_every)
+        print(f"{'none':>10} | {baseline:>7.3f} ms | {'-':>8} | {'-':>9}")
+
+        for size in args.sizes:
+            cached = CachedChatStorage(db, maxsize=size, ttl=30.0)
+            ms = simulate(cached, session_ids, args.reruns, args.write_every)
+            stats = cached.cache_stats()
+            print(
+                f"{size:>10} | {ms:>7.3f} ms | {stats.hit_rate:>8.0%} | {stats.evictions:>9,}"
+                f"   ({baseline / ms:.1f}x)"
+            )
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
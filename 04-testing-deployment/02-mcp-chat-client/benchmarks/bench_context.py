@@ -0,0 +1,127 @@
+"""세션 길이별 프롬프트 토큰과 턴 지연시간: 히스토리 전체 전송 vs `ContextBudget`.
+
+대화를 처음부터 --turns 턴까지 이어 가며 매 턴 보낼 프롬프트를 만들고, 구간별로
+평균 프롬프트 토큰과 턴 시간을 비교합니다. 턴 시간은 프롬프트 구성에 실제로 걸린 시간에
+모의 LLM 지연(고정 지연 + 입력 토큰당 prefill 비용)을 더한 값이며, `ContextBudget`의
+요약 호출도 같은 모의 비용으로 계산해 그 턴에 포함합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_context.py
+    uv run python benchmarks/bench_context.py --turns 400 --budget 4000 --tokenizer tiktoken
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import ContextBudget, InMemoryChatStorage  # noqa: E402
+from backend.context import get_tokenizer  # noqa: E402
+
+SENTENCES = [
+    "서울의 오늘 날씨는 맑고 기온은 23도입니다.",
+    "5와 3을 더하면 8이고, 2의 10제곱은 1024입니다.",
+    "Please summarize the previous answer in one sentence.",
+    "부산행 열차는 오전 9시와 오후 2시에 출발합니다.",
+    "The forecast for Jeju shows light rain in the afternoon.",
+    "지난번에 말씀드린 일정은 다음 주 화요일로 확정되었습니다.",
+]
+
+
+class SimulatedLLM:
+    """입력 토큰 수에 비례하는 지연을 누적하는 모의 LLM (실제로 기다리지는 않음)."""
+
+    def __init__(self, base_ms: float, prefill_us: float, count_tokens) -> None:
+        self.base_ms = base_ms
+        self.prefill_us = prefill_us
+        self.count_tokens = count_tokens
+        self.spent_ms = 0.0
+
+    def call(self, prompt_tokens: int) -> None:
+        self.spent_ms += self.base_ms + prompt_tokens * self.prefill_us / 1000
+
+    async def summarize(self, summary, messages) -> str:
+        tokens = sum(self.count_tokens(m["content"]) for m in messages)
+        self.call(tokens + (self.count_tokens(summary) if summary else 0))
+        return "요약: " + " ".join(m["content"][:20] for m in messages[-8:])
+
+
+def make_message(rng: random.Random, role: str) -> dict[str, str]:
+    count = rng.randint(1, 6) if role == "user" else rng.randint(4, 16)
+    return {"role": role, "content": " ".join(rng.choices(SENTENCES, k=count))}
+
+
+async def run(args, llm: SimulatedLLM, budget: ContextBudget | None, session_id: str):
+    """턴마다 (프롬프트 토큰, 턴 시간 ms)."""
+    rng = random.Random(0)
+    history: list[dict[str, str]] = []
+    samples = []
+    for _ in range(args.turns):
+        question = make_message(rng, "user")
+        llm.spent_ms = 0.0
+        start = time.perf_counter()
+        if budget is None:
+            prompt_tokens = sum(llm.count_tokens(m["content"]) + 4 for m in history)
+            prompt_tokens += llm.count_tokens(question["content"]) + 4
+        else:
+            context = await budget.build(question["content"], history, session_id)
+            prompt_tokens = context.stats.prompt_tokens
+        llm.call(prompt_tokens)
+        samples.append((prompt_tokens, (time.perf_counter() - start) * 1000 + llm.spent_ms))
+        history += [question, make_message(rng, "assistant")]
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=6000, help="CONTEXT_MAX_TOKENS")
+    parser.add_argument("--tokenizer", default="approx")
+    parser.add_argument("--base-ms", type=float, default=5, help="LLM 호출 고정 지연")
+    parser.add_argument("--prefill-us", type=float, default=20, help="입력 토큰당 지연 (µs)")
+    args = parser.parse_args()
+
+    count_tokens = get_tokenizer(args.tokenizer)
+    llm = SimulatedLLM(args.base_ms, args.prefill_us, count_tokens)
+    storage = InMemoryChatStorage()
+    session_id = storage.create_session().session_id
+    budget = ContextBudget(
+        llm.summarize, store=storage, max_tokens=args.budget, tokenizer=count_tokens
+    )
+
+    full = await run(args, llm, None, session_id)
+    budgeted = await run(args, llm, budget, session_id)
+
+    print(f"turns={args.turns}, budget={args.budget}, tokenizer={args.tokenizer}")
+    print(
+        f"{'turns':>9} | {'full tokens':>11} | {'budget tokens':>13} | {'full ms':>8} | {'budget ms':>9}"
+    )
+    print("-" * 64)
+    step = max(1, args.turns // 5)
+    for end in range(step, args.turns + 1, step):
+        window = slice(end - step, end)
+        print(
+            f"{end - step + 1:>4}-{end:<4} | "
+            f"{statistics.mean(t for t, _ in full[window]):>11,.0f} | "
+            f"{statistics.mean(t for t, _ in budgeted[window]):>13,.0f} | "
+            f"{statistics.mean(ms for _, ms in full[window]):>8.1f} | "
+            f"{statistics.mean(ms for _, ms in budgeted[window]):>9.1f}"
+        )
+
+    totals = budget.totals()
+    print(
+        f"\n누적 {totals.history_tokens:,} → {totals.prompt_tokens:,}토큰 "
+        f"({totals.savings_rate:.0%} 절약), 요약 {totals.summaries_created}회, "
+        f"잘라낸 메시지 {totals.dropped_messages}개"
+    )
+    storage.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
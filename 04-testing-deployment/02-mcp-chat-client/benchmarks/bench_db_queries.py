@@ -0,0 +1,136 @@
+"""ChatDatabase 조회 지연시간 벤치마크.
+
+메시지 행 수를 늘려가며 인덱스가 없는 v1 스키마(기존)와 최신 스키마
+(복합 인덱스 + WAL)의 `get_messages` / `list_sessions` 지연시간을 비교합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_db_queries.py
+    uv run python benchmarks/bench_db_queries.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.database import ChatDatabase  # noqa: E402
+from backend.migrations import migrate  # noqa: E402
+
+MESSAGES_PER_SESSION = 20
+
+
+def populate(conn: sqlite3.Connection, num_messages: int) -> list[str]:
+    """합성 세션/메시지 데이터를 삽입하고 세션 ID 목록을 반환합니다."""
+    num_sessions = max(1, num_messages // MESSAGES_PER_SESSION)
+    base = datetime(2025, 1, 1)
+    session_ids = [str(uuid.uuid4()) for _ in range(num_sessions)]
+
+    conn.executemany(
+        "INSERT INTO sessions (session_id, title, created_at, updated_at, message_count) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (
+            (sid, f"Session {i}", base + timedelta(minutes=i), base + timedelta(minutes=i), 0)
+            for i, sid in enumerate(session_ids)
+        ),
+    )
+
+    # 세션들이 번갈아 메시지를 쓰는 실제 패턴을 흉내내어 행을 섞어서 삽입
+    def rows():
+        for i in range(num_messages):
+            sid = session_ids[i % num_sessions]
+            role = "user" if i % 2 == 0 else "assistant"
+            yield (sid, role, f"message {i}", base + timedelta(seconds=i))
+
+    conn.executemany(
+        "INSERT INTO messages (session_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+        rows(),
+    )
+    conn.execute(
+        "UPDATE sessions SET message_count = "
+        "(SELECT COUNT(*) FROM messages m WHERE m.session_id = sessions.session_id)"
+    )
+    conn.commit()
+    return session_ids
+
+
+def time_call(func, repeat: int) -> float:
+    """함수를 반복 실행하여 중앙값 지연시간(ms)을 반환합니다."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(num_messages: int, schema_version: int | None, repeat: int) -> tuple[float, float]:
+    """주어진 행 수와 스키마 버전으로 조회 지연시간을 측정합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+
+        # 대상 스키마 버전까지만 마이그레이션한 파일을 먼저 만든다
+        conn = sqlite3.connect(db_path)
+        migrate(conn, target_version=schema_version)
+        session_ids = populate(conn, num_messages)
+        conn.close()
+
+        rng = random.Random(42)
+        if schema_version is None:
+            db = ChatDatabase(db_path=str(db_path))
+            get_ms = time_call(lambda: db.get_messages(rng.choice(session_ids)), repeat)
+            list_ms = time_call(lambda: db.list_sessions(), repeat)
+            db.close()
+            return get_ms, list_ms
+
+        # 기존 동작 재현: 인덱스/PRAGMA 없는 기본 연결에서 동일한 SQL 실행
+        conn = sqlite3.connect(str(db_path))
+        get_ms = time_call(
+            lambda: conn.execute(
+                "SELECT * FROM messages WHERE session_id = ? ORDER BY timestamp ASC LIMIT 100",
+                (rng.choice(session_ids),),
+            ).fetchall(),
+            repeat,
+        )
+        list_ms = time_call(
+            lambda: conn.execute(
+                "SELECT * FROM sessions ORDER BY updated_at DESC LIMIT 50"
+            ).fetchall(),
+            repeat,
+        )
+        conn.close()
+
+    return get_ms, list_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'messages':>10} | {'get_messages v1':>16} | {'get_messages':>13} | "
+        f"{'list_sessions v1':>17} | {'list_sessions':>14}"
+    )
+    print("-" * 83)
+
+    for size in args.sizes:
+        old_get, old_list = run(size, schema_version=1, repeat=args.repeat)
+        new_get, new_list = run(size, schema_version=None, repeat=args.repeat)
+        print(
+            f"{size:>10,} | {old_get:>13.3f} ms | {new_get:>10.3f} ms | "
+            f"{old_list:>14.3f} ms | {new_list:>11.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
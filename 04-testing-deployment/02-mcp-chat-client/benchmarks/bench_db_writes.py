@@ -0,0 +1,78 @@
+"""ChatDatabase 쓰기 처리량 벤치마크.
+
+대화 턴(사용자 메시지 + 어시스턴트 응답)을 여러 세션에 번갈아 기록하며
+다음 경로의 초당 메시지 수를 비교합니다.
+
+- per-message: 메시지마다 `add_message` (턴당 커밋 2회, 기존 방식)
+- per-turn:    턴마다 `add_messages` (턴당 커밋 1회)
+- write-behind: 버퍼에 모아 크기/시간 기준으로 flush (여러 세션이 커밋 1회 공유)
+
+실행 방법:
+    uv run python benchmarks/bench_db_writes.py
+    uv run python benchmarks/bench_db_writes.py --turns 5000 --durability full
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.database import ChatDatabase  # noqa: E402
+from backend.models import ChatMessage  # noqa: E402
+
+NUM_SESSIONS = 20
+
+
+def run(mode: str, turns: int, durability: str) -> float:
+    """주어진 모드로 턴을 기록하고 초당 메시지 수를 반환합니다."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ChatDatabase(
+            db_path=str(Path(tmp) / "bench.db"),
+            durability=durability,
+            write_behind=(mode == "write-behind"),
+            flush_size=200,
+            flush_interval=0.05,
+        )
+        session_ids = [db.create_session(title=f"S{i}").session_id for i in range(NUM_SESSIONS)]
+
+        start = time.perf_counter()
+        for turn in range(turns):
+            session_id = session_ids[turn % NUM_SESSIONS]
+            user_msg = ChatMessage(role="user", content=f"question {turn}")
+            assistant_msg = ChatMessage(role="assistant", content=f"answer {turn}")
+
+            if mode == "per-message":
+                db.add_message(session_id, user_msg)
+                db.add_message(session_id, assistant_msg)
+            else:
+                db.add_messages(session_id, [user_msg, assistant_msg])
+
+        # 버퍼에 남은 메시지까지 기록해야 공정한 비교
+        db.flush()
+        elapsed = time.perf_counter() - start
+        db.close()
+
+    return turns * 2 / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--durability", choices=["full", "normal", "off"], default="normal")
+    args = parser.parse_args()
+
+    print(f"turns={args.turns}, sessions={NUM_SESSIONS}, durability={args.durability}")
+    print(f"{'mode':>14} | {'messages/sec':>13}")
+    print("-" * 30)
+
+    for mode in ["per-message", "per-turn", "write-behind"]:
+        throughput = run(mode, args.turns, args.durability)
+        print(f"{mode:>14} | {throughput:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
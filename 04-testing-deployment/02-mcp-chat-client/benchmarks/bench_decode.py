@@ -0,0 +1,109 @@
+"""행 디코딩 비용 벤치마크 (100k 행당).
+
+한 세션에 메시지를 N개 넣고, 같은 행을 읽어 다음 방식으로 변환하는 시간을 비교합니다.
+
+- pydantic:        `get_messages` (행마다 `fromisoformat` + 모델 검증)
+- model_construct: 같은 쿼리 + `ChatMessage.model_construct` (검증 생략)
+- records:         `get_message_records` (튜플 레코드, 정수 epoch 시간)
+- records+time:    레코드 + 행마다 `.timestamp`로 datetime 변환
+
+결과는 100k 행 기준 시간(ms)으로 환산해 출력합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_decode.py
+    uv run python benchmarks/bench_decode.py --rows 200000 --repeat 5
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import ChatDatabase, ChatMessage  # noqa: E402
+
+PER_ROWS = 100_000
+
+
+def populate(db: ChatDatabase, num_rows: int) -> str:
+    """한 세션에 메시지를 채우고 세션 ID를 반환합니다."""
+    session_id = db.create_session(title="decode").session_id
+    base = datetime(2025, 1, 1)
+    for start in range(0, num_rows, 10_000):
+        db.add_messages(
+            session_id,
+            [
+                ChatMessage(
+                    role="user" if i % 2 == 0 else "assistant",
+                    content=f"message {i} 서울 날씨",
+                    timestamp=base + timedelta(milliseconds=i),
+                )
+                for i in range(start, min(start + 10_000, num_rows))
+            ],
+        )
+    return session_id
+
+
+def model_construct_read(db: ChatDatabase, session_id: str) -> list[ChatMessage]:
+    """get_messages와 같은 쿼리를 검증 없이 모델로 변환."""
+    with db.pool.reader() as conn:
+        rows = conn.execute(
+            "SELECT * FROM messages WHERE session_id = ? ORDER BY timestamp ASC, id ASC",
+            (session_id,),
+        ).fetchall()
+    return [
+        ChatMessage.model_construct(
+            role=row["role"],
+            content=row["content"],
+            timestamp=datetime.fromisoformat(row["timestamp"]),
+            session_id=row["session_id"],
+        )
+        for row in rows
+    ]
+
+
+def median_ms(func, repeat: int) -> float:
+    """repeat번 실행한 중앙값 시간(ms)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ChatDatabase(db_path=str(Path(tmp) / "bench.db"))
+        session_id = populate(db, args.rows)
+
+        modes = {
+            "pydantic": lambda: db.get_messages(session_id, limit=args.rows),
+            "model_construct": lambda: model_construct_read(db, session_id),
+            "records": lambda: db.get_message_records(session_id),
+            "records+time": lambda: [r.timestamp for r in db.get_message_records(session_id)],
+        }
+        results = {name: median_ms(func, args.repeat) for name, func in modes.items()}
+        db.close()
+
+    baseline = results["pydantic"]
+    scale = PER_ROWS / args.rows
+    print(f"rows={args.rows:,}, repeat={args.repeat}")
+    print(f"{'mode':>16} | {'per 100k rows':>14} | {'speedup':>8}")
+    print("-" * 45)
+    for name, ms in results.items():
+        print(f"{name:>16} | {ms * scale:>11.1f} ms | {baseline / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
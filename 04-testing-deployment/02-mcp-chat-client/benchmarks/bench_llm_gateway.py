@@ -0,0 +1,184 @@
+"""가짜 OpenAI 호환 서버에 몰리는 동시 요청: 호출마다 새 클라이언트 vs 공유 클라이언트 vs `LLMGateway`.
+
+로컬 포트에 띄운 가짜 서버는 Ollama처럼 동시에 --capacity개만 처리하고(호출마다 --llm-ms),
+--queue개까지는 줄 세우며, 그보다 많이 밀려오면 503을 돌려줍니다. 요청 --requests개를 한꺼번에
+보내고, 질문은 자주 묻는 몇 개에 몰리는 분포(Zipf)에서 뽑아 같은 질문이 동시에 진행되게 합니다.
+
+- per-call: 요청마다 `AsyncOpenAI`를 새로 만듦 (연결 재사용 없음, SDK 기본 재시도)
+- shared: `AsyncOpenAI` 하나를 공유 (SDK 기본 연결 풀과 재시도, 동시 요청 제한 없음)
+- gateway: `LLMGateway(max_in_flight=--capacity, coalesce=False)`
+- gateway+coalesce: 위 + 진행 중인 같은 요청 합치기
+
+전체 시간, 요청 지연 p50/p95, 실패 수, 서버가 받은 요청 수(503 포함), 연 연결 수를 비교합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_llm_gateway.py
+    uv run python benchmarks/bench_llm_gateway.py --requests 500 --capacity 8 --queue 32
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from openai import APIStatusError, AsyncOpenAI
+
+from agentic_coding_workshop.llm_gateway import LLMGateway
+
+
+class FakeOpenAIServer:
+    """동시 처리 수와 대기열 길이가 정해진 가짜 OpenAI 호환 서버 (HTTP/1.1 keep-alive)."""
+
+    def __init__(self, latency: float, capacity: int, queue: int) -> None:
+        self.latency = latency
+        self.limit = capacity + queue
+        self.slots = asyncio.Semaphore(capacity)
+        self.busy = 0
+        self.connections = 0
+        self.requests = 0
+        self.rejected = 0
+
+    def reset(self) -> None:
+        self.connections = self.requests = self.rejected = 0
+
+    async def start(self) -> str:
+        server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while await reader.readline():
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, value = line.decode().split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = await self.respond(json.loads(body))
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode()
+                    + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, body: dict) -> tuple[str, dict]:
+        self.requests += 1
+        if self.busy >= self.limit:
+            self.rejected += 1
+            return "503 Service Unavailable", {"error": {"message": "server busy"}}
+        self.busy += 1
+        try:
+            async with self.slots:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.busy -= 1
+        prompt = body["messages"][-1]["content"]
+        return "200 OK", {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": 0,
+            "model": body["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"답: {prompt}"},
+                    "finish_reason": "stop",
+                }
+            ],
+        }
+
+
+def make_prompts(count: int, distinct: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    questions = [f"질문 {i}: 오늘 추천 메뉴는?" for i in range(distinct)]
+    weights = [1 / (rank + 1) for rank in range(distinct)]
+    return rng.choices(questions, weights, k=count)
+
+
+async def run(mode: str, base_url: str, prompts: list[str], capacity: int) -> dict[str, float]:
+    shared: AsyncOpenAI | None = None
+    if mode == "shared":
+        shared = AsyncOpenAI(base_url=base_url, api_key="bench")
+    elif mode.startswith("gateway"):
+        gateway = LLMGateway(max_in_flight=capacity, coalesce=mode == "gateway+coalesce")
+        shared = gateway.async_openai(base_url=base_url, api_key="bench")
+
+    latencies: list[float] = []
+    failures = 0
+
+    async def call(prompt: str) -> None:
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            if shared is None:
+                async with AsyncOpenAI(base_url=base_url, api_key="bench") as client:
+                    await client.chat.completions.create(
+                        model="bench", messages=[{"role": "user", "content": prompt}]
+                    )
+            else:
+                await shared.chat.completions.create(
+                    model="bench", messages=[{"role": "user", "content": prompt}]
+                )
+        except APIStatusError:
+            failures += 1
+            return
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(call(prompt) for prompt in prompts))
+    elapsed = time.perf_counter() - start
+    if shared is not None:
+        await shared.close()
+
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0,
+        "failures": failures,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=40, help="서로 다른 질문 수")
+    parser.add_argument("--llm-ms", type=float, default=100, help="가짜 서버 요청 처리 시간")
+    parser.add_argument("--capacity", type=int, default=4, help="가짜 서버 동시 처리 수")
+    parser.add_argument("--queue", type=int, default=16, help="가짜 서버 대기열 길이")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(args.llm_ms / 1000, args.capacity, args.queue)
+    base_url = await server.start()
+    prompts = make_prompts(args.requests, args.distinct)
+
+    print(
+        f"requests={args.requests}, distinct={args.distinct}, llm-ms={args.llm_ms:g}, "
+        f"capacity={args.capacity}, queue={args.queue}"
+    )
+    print(
+        f"{'mode':>17} | {'elapsed':>8} | {'p50':>9} | {'p95':>9} | {'failed':>6} | "
+        f"{'upstream':>8} | {'503':>5} | {'conns':>5}"
+    )
+    print("-" * 90)
+    for mode in ["per-call", "shared", "gateway", "gateway+coalesce"]:
+        server.reset()
+        result = await run(mode, base_url, prompts, args.capacity)
+        print(
+            f"{mode:>17} | {result['elapsed']:>6.2f} s | {result['p50']:>6.0f} ms | "
+            f"{result['p95']:>6.0f} ms | {result['failures']:>6} | {server.requests:>8} | "
+            f"{server.rejected:>5} | {server.connections:>5}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
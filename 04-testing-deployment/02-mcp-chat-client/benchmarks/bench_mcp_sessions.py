@@ -0,0 +1,127 @@
+"""도구 호출 지연시간: 호출마다 새 세션(MultiServerMCPClient) vs 영속 세션(MCPSessionManager).
+
+실제 stdio MCP 서버(FastMCP) 하위 프로세스를 띄워 측정합니다.
+`MultiServerMCPClient.get_tools()`가 돌려주는 도구는 호출마다 서버를 새로 띄우고
+initialize 핸드셰이크를 하므로, 도구를 여러 번 부르는 턴일수록 차이가 커집니다.
+
+마지막 단계에서는 서버 프로세스를 강제로 죽인 뒤 다음 호출이 재시작 후 성공하는지와
+그 호출의 지연시간을 함께 보여줍니다.
+
+실행 방법:
+    uv run python benchmarks/bench_mcp_sessions.py
+    uv run python benchmarks/bench_mcp_sessions.py --calls 50
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from langchain_mcp_adapters.client import MultiServerMCPClient  # noqa: E402
+
+from backend import MCPSessionManager  # noqa: E402
+
+SERVER_SCRIPT = """
+import os
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("bench", log_level="WARNING")
+
+@mcp.tool()
+def add(a: int, b: int) -> int:
+    \"\"\"두 수를 더합니다.\"\"\"
+    return a + b
+
+@mcp.tool()
+def pid() -> int:
+    \"\"\"서버 프로세스 ID.\"\"\"
+    return os.getpid()
+
+mcp.run()
+"""
+
+
+async def time_calls(tool, calls: int) -> list[float]:
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        await tool.ainvoke({"a": i, "b": 1})
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def tool_by_name(tools, name: str):
+    return next(t for t in tools if t.name == name)
+
+
+async def per_call_sessions(connection: dict, calls: int) -> list[float]:
+    """호출마다 세션을 새로 여는 기존 방식."""
+    client = MultiServerMCPClient({"bench": connection})
+    tools = await client.get_tools()
+    return await time_calls(tool_by_name(tools, "add"), calls)
+
+
+async def persistent_sessions(connection: dict, calls: int) -> tuple[list[float], float]:
+    """영속 세션: 마지막에 서버를 죽이고 재시작 호출 지연도 측정."""
+    manager = MCPSessionManager({"bench": connection}, ping_interval=0)
+    await manager.start()
+    try:
+        tools = await manager.get_tools()
+        samples = await time_calls(tool_by_name(tools, "add"), calls)
+
+        server_pid = int(_text(await tool_by_name(tools, "pid").ainvoke({})))
+        os.kill(server_pid, signal.SIGKILL)
+        await asyncio.sleep(0.2)
+
+        start = time.perf_counter()
+        result = _text(await tool_by_name(tools, "add").ainvoke({"a": 1, "b": 1}))
+        recovery_ms = (time.perf_counter() - start) * 1000
+        assert result == "2", result
+        (status,) = manager.status()
+        assert status.restarts == 1, status
+        return samples, recovery_ms
+    finally:
+        await manager.close()
+
+
+def _text(result) -> str:
+    if isinstance(result, str):
+        return result
+    return "".join(block["text"] for block in result if block.get("type") == "text")
+
+
+def report(name: str, samples: list[float]) -> None:
+    rest = sorted(samples)
+    p95 = rest[min(len(rest) - 1, int(len(rest) * 0.95))]
+    print(f"{name:>20} | {statistics.median(rest):>7.2f} ms | {p95:>7.2f} ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "bench_server.py"
+        script.write_text(SERVER_SCRIPT, encoding="utf-8")
+        connection = {"transport": "stdio", "command": sys.executable, "args": [str(script)]}
+
+        print(f"calls={args.calls}")
+        print(f"{'mode':>20} | {'p50':>10} | {'p95':>10}")
+        print("-" * 46)
+        report("per-call session", await per_call_sessions(connection, args.calls))
+        samples, recovery_ms = await persistent_sessions(connection, args.calls)
+        report("MCPSessionManager", samples)
+        print(f"\n서버 강제 종료 후 첫 호출 (재시작 포함): {recovery_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""MCP 콜드 스타트: 모든 서버를 띄우고 도구 목록 조회(eager) vs 도구 매니페스트 + 첫 호출 때 시작(lazy).
+
+실제 stdio MCP 서버(FastMCP) --servers개를 설정하고, 서버마다 (start + get_tools)가 끝나
+첫 응답을 시작할 수 있을 때까지의 시간, 그 뒤 서버 하나의 도구를 처음 호출하는 시간,
+그때까지 띄운 서버 프로세스 수를 비교합니다.
+
+- eager: 매니페스트 없음, 모든 서버 spawn + initialize + tools/list
+- lazy (cold): lazy=True지만 매니페스트가 비어 있음 (첫 실행, 결과는 eager와 같고 매니페스트를 씀)
+- lazy (warm): 위에서 만든 매니페스트로 시작, 서버는 첫 도구 호출 때 spawn
+
+실행 방법:
+    uv run python benchmarks/bench_mcp_startup.py
+    uv run python benchmarks/bench_mcp_startup.py --servers 5 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import MCPSessionManager  # noqa: E402
+
+SERVER_SCRIPT = """
+from mcp.server.fastmcp import FastMCP
+
+mcp = FastMCP("bench", log_level="WARNING")
+
+@mcp.tool()
+def add(a: int, b: int) -> int:
+    \"\"\"두 수를 더합니다.\"\"\"
+    return a + b
+
+@mcp.tool()
+def echo(text: str) -> str:
+    \"\"\"입력을 그대로 돌려줍니다.\"\"\"
+    return text
+
+mcp.run()
+"""
+
+
+async def run(
+    connections: dict, manifest_path: Path | None, lazy: bool
+) -> tuple[float, float, int]:
+    """(도구 준비까지 ms, 첫 도구 호출 ms, 띄운 서버 수)."""
+    start = time.perf_counter()
+    manager = MCPSessionManager(
+        connections, ping_interval=0, manifest_path=manifest_path, lazy=lazy
+    )
+    await manager.start()
+    tools = await manager.get_tools()
+    ready_ms = (time.perf_counter() - start) * 1000
+    try:
+        add = next(t for t in tools if t.name == "add")
+        start = time.perf_counter()
+        await add.ainvoke({"a": 1, "b": 2})
+        first_call_ms = (time.perf_counter() - start) * 1000
+        spawned = sum(status.start_ms is not None for status in manager.status())
+        return ready_ms, first_call_ms, spawned
+    finally:
+        await manager.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "bench_server.py"
+        script.write_text(SERVER_SCRIPT, encoding="utf-8")
+        connections = {
+            f"server-{i}": {
+                "transport": "stdio",
+                "command": sys.executable,
+                "args": [str(script), str(i)],
+            }
+            for i in range(args.servers)
+        }
+
+        print(f"servers={args.servers}, repeat={args.repeat}")
+        print(f"{'mode':>12} | {'ready':>10} | {'first call':>10} | {'spawned':>7}")
+        print("-" * 50)
+        for mode in ["eager", "lazy (cold)", "lazy (warm)"]:
+            samples = []
+            for _ in range(args.repeat):
+                manifest = Path(tmp) / "tool_manifest.json"
+                if mode != "lazy (warm)":
+                    manifest.unlink(missing_ok=True)
+                samples.append(
+                    await run(connections, None if mode == "eager" else manifest, mode != "eager")
+                )
+            ready, first_call, spawned = (statistics.median(column) for column in zip(*samples))
+            print(
+                f"{mode:>12} | {ready:>7.0f} ms | {first_call:>7.0f} ms | "
+                f"{spawned:>3.0f}/{args.servers}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
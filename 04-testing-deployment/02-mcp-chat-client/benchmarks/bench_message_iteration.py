@@ -0,0 +1,109 @@
+"""긴 세션 조회 벤치마크: 전체 리스트 vs 키셋 스트리밍.
+
+하나의 세션에 메시지를 N개 넣고 다음을 비교합니다.
+
+- 최대 메모리: `get_messages(limit=N)` (전체 리스트) vs `iter_messages` (배치 스트리밍)
+- 깊은 페이지 지연: `LIMIT/OFFSET` vs `get_messages_page` 키셋 커서
+
+실행 방법:
+    uv run python benchmarks/bench_message_iteration.py
+    uv run python benchmarks/bench_message_iteration.py --sizes 10000 100000 500000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import ChatDatabase, ChatMessage  # noqa: E402
+
+PAGE_SIZE = 100
+
+
+def populate(db: ChatDatabase, num_messages: int) -> str:
+    """한 세션에 메시지를 채우고 세션 ID를 반환합니다."""
+    session_id = db.create_session(title="long").session_id
+    base = datetime(2025, 1, 1)
+    batch = []
+    for i in range(num_messages):
+        batch.append(
+            ChatMessage(
+                role="user", content=f"message {i} " * 8, timestamp=base + timedelta(seconds=i)
+            )
+        )
+        if len(batch) == 10_000:
+            db.add_messages(session_id, batch)
+            batch = []
+    db.add_messages(session_id, batch)
+    return session_id
+
+
+def peak_memory(func) -> float:
+    """함수 실행 중 최대 메모리 사용량(MB)을 반환합니다."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def deep_page_ms(db: ChatDatabase, session_id: str, num_messages: int) -> tuple[float, float]:
+    """마지막 페이지를 OFFSET과 키셋 커서로 읽는 시간(ms)."""
+    offset = max(0, num_messages - PAGE_SIZE)
+
+    with db.pool.reader() as conn:
+        start = time.perf_counter()
+        conn.execute(
+            "SELECT * FROM messages WHERE session_id = ? ORDER BY timestamp, id LIMIT ? OFFSET ?",
+            (session_id, PAGE_SIZE, offset),
+        ).fetchall()
+        offset_ms = (time.perf_counter() - start) * 1000
+
+        # 키셋 커서는 직전 페이지의 마지막 행에서 얻는 값
+        cursor_row = conn.execute(
+            "SELECT timestamp, id FROM messages WHERE session_id = ? "
+            "ORDER BY timestamp, id LIMIT 1 OFFSET ?",
+            (session_id, max(0, offset - 1)),
+        ).fetchone()
+
+    start = time.perf_counter()
+    db.get_messages_page(session_id, limit=PAGE_SIZE, after=(cursor_row[0], cursor_row[1]))
+    keyset_ms = (time.perf_counter() - start) * 1000
+    return offset_ms, keyset_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(
+        f"{'messages':>10} | {'list peak':>10} | {'iter peak':>10} | "
+        f"{'OFFSET page':>12} | {'keyset page':>12}"
+    )
+    print("-" * 66)
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = ChatDatabase(db_path=str(Path(tmp) / "bench.db"))
+            session_id = populate(db, size)
+
+            list_mb = peak_memory(lambda: db.get_messages(session_id, limit=size))
+            iter_mb = peak_memory(lambda: sum(1 for _ in db.iter_messages(session_id)))
+            offset_ms, keyset_ms = deep_page_ms(db, session_id, size)
+            db.close()
+
+        print(
+            f"{size:>10,} | {list_mb:>7.1f} MB | {iter_mb:>7.1f} MB | "
+            f"{offset_ms:>9.2f} ms | {keyset_ms:>9.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
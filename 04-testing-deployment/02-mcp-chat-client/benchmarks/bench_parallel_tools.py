@@ -0,0 +1,143 @@
+"""한 턴에 도구 호출이 여러 개일 때의 턴 시간: 순차 실행 vs 동시 실행 (서버별 제한).
+
+실제 stdio MCP 서버(FastMCP) 두 개를 띄우고 `MCPSessionManager`로 연결합니다.
+
+- weather 서버: `get_weather(city)` (호출당 --tool-ms 지연)
+- datetime 서버: `get_current_datetime()` (호출당 --tool-ms 지연)
+
+가짜 모델이 한 번에 `get_weather` 세 도시 + `get_current_datetime`을 요청한 뒤
+답하는 ReAct 턴을 `ToolLimiter` 설정만 바꿔 실행합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_parallel_tools.py
+    uv run python benchmarks/bench_parallel_tools.py --tool-ms 1000 --turns 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from langchain_core.language_models.chat_models import generate_from_stream
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langgraph.prebuilt import create_react_agent
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import MCPSessionManager, ToolLimiter, create_tool_node  # noqa: E402
+
+SERVER_SCRIPT = """
+import asyncio
+import sys
+from mcp.server.fastmcp import FastMCP
+
+delay = float(sys.argv[2]) / 1000
+mcp = FastMCP(sys.argv[1], log_level="WARNING")
+
+if sys.argv[1] == "weather":
+    @mcp.tool()
+    async def get_weather(city: str) -> str:
+        \"\"\"도시의 현재 날씨.\"\"\"
+        await asyncio.sleep(delay)
+        return f"{city}: 맑음"
+else:
+    @mcp.tool()
+    async def get_current_datetime() -> str:
+        \"\"\"현재 날짜와 시간.\"\"\"
+        await asyncio.sleep(delay)
+        return "2025-01-22T12:00:00"
+
+mcp.run()
+"""
+
+TOOL_CALLS = [
+    {"name": "get_weather", "args": {"city": "서울"}, "id": "c1"},
+    {"name": "get_weather", "args": {"city": "부산"}, "id": "c2"},
+    {"name": "get_weather", "args": {"city": "제주"}, "id": "c3"},
+    {"name": "get_current_datetime", "args": {}, "id": "c4"},
+]
+
+SCENARIOS = [
+    ("sequential", ToolLimiter(max_concurrency=1)),
+    ("weather limit 2", ToolLimiter(max_concurrency=8, server_limits={"weather": 2})),
+    ("concurrent", ToolLimiter(max_concurrency=8)),
+]
+
+
+class ScriptedModel(GenericFakeChatModel):
+    """도구 4개를 한 번에 호출하고, 결과를 받으면 답하는 가짜 모델."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return generate_from_stream(self._stream(messages, stop, **kwargs))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        if messages[-1].type == "human":
+            chunks = [
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(TOOL_CALLS)
+            ]
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=chunks))
+        else:
+            yield ChatGenerationChunk(message=AIMessageChunk(content="모두 맑습니다."))
+
+
+async def run_scenario(tools, limiter: ToolLimiter, turns: int) -> list[float]:
+    model = ScriptedModel(messages=iter([]))
+    agent = create_react_agent(model, create_tool_node(tools, limiter))
+    samples = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        result = await agent.ainvoke({"messages": [("user", "세 도시 날씨와 지금 시간은?")]})
+        samples.append((time.perf_counter() - start) * 1000)
+        tool_messages = [m for m in result["messages"] if m.type == "tool"]
+        assert len(tool_messages) == len(TOOL_CALLS), result
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tool-ms", type=float, default=300)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "slow_server.py"
+        script.write_text(SERVER_SCRIPT, encoding="utf-8")
+        connections = {
+            name: {
+                "transport": "stdio",
+                "command": sys.executable,
+                "args": [str(script), name, str(args.tool_ms)],
+            }
+            for name in ("weather", "datetime")
+        }
+        manager = MCPSessionManager(connections, ping_interval=0)
+        await manager.start()
+        try:
+            tools = await manager.get_tools()
+            print(
+                f"tool calls/turn={len(TOOL_CALLS)}, tool-ms={args.tool_ms:g}, turns={args.turns}"
+            )
+            print(f"{'scenario':>16} | {'p50 turn':>10} | {'max turn':>10}")
+            print("-" * 44)
+            for name, limiter in SCENARIOS:
+                samples = await run_scenario(tools, limiter, args.turns)
+                print(
+                    f"{name:>16} | {statistics.median(samples):>7.0f} ms | {max(samples):>7.0f} ms"
+                )
+        finally:
+            await manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,140 @@
+"""오프라인 재생: 기록된 대화를 가짜 LLM + 실제 MCP 서버(03-mcp-tools)로 다시 실행.
+
+`backend/replay.py`의 `run_replay`로 대화를 재생하고 턴 수/초, 턴 p50/p95, 단계별 지연
+(턴/LLM/도구/DB), 도구 호출 수, 최대 RSS를 출력합니다. LLM은 질문에 따라 정해진 도구를
+부르고 기록된 답변을 돌려주는 결정적 가짜 모델이므로 같은 입력이면 같은 호출이 일어납니다.
+
+- --db를 주면 그 대화 기록을 재생 (읽기만 함), 없으면 --seed로 만든 합성 대화를 재생
+- --json으로 보고서를 저장하고, 다른 커밋에서 --baseline으로 비교
+  (재생 조건이 다르면 경고, 회귀가 --threshold를 넘으면 종료 코드 1)
+
+실행 방법:
+    uv run python benchmarks/bench_replay.py
+    uv run python benchmarks/bench_replay.py --db ./chat_history.db --limit 50 --concurrency 8
+    uv run python benchmarks/bench_replay.py --json base.json            # 기준 커밋에서
+    uv run python benchmarks/bench_replay.py --baseline base.json        # 변경 후
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import ChatDatabase, ReplayReport  # noqa: E402
+from backend.replay import (  # noqa: E402
+    compare_reports,
+    config_mismatch,
+    load_conversations,
+    run_replay,
+    seed_conversations,
+)
+
+
+def print_report(report: ReplayReport) -> None:
+    print(f"commit={report.commit}, python={report.python}")
+    print(
+        f"sessions={report.sessions}, turns={report.turns}, errors={report.errors}, "
+        f"initialize={report.initialize_ms:.0f} ms"
+    )
+    print(
+        f"{report.turns_per_s:.1f} turns/s | turn p50 {report.turn_p50_ms:.1f} ms, "
+        f"p95 {report.turn_p95_ms:.1f} ms | wall {report.wall_s:.2f} s"
+    )
+    if report.peak_rss_mb is not None:
+        print(
+            f"peak RSS {report.peak_rss_mb:.0f} MB (MCP 서버 {report.servers_peak_rss_mb:.0f} MB)"
+        )
+
+    print(f"\n{'stage':>8} | {'count':>6} | {'p50':>10} | {'p95':>10} | {'errors':>6}")
+    print("-" * 52)
+    for stage in report.stages:
+        print(
+            f"{stage.stage:>8} | {stage.count:>6} | {stage.p50_ms:>7.2f} ms | "
+            f"{stage.p95_ms:>7.2f} ms | {stage.errors:>6}"
+        )
+    if report.tool_calls:
+        print("\ntool calls: " + ", ".join(f"{k}={v}" for k, v in report.tool_calls.items()))
+
+
+def print_comparison(report: ReplayReport, baseline: ReplayReport, threshold: float) -> bool:
+    """기준 대비 변화를 출력하고 회귀가 있었는지 돌려줍니다."""
+    print(f"\nbaseline commit={baseline.commit}")
+    for key, (before, after) in config_mismatch(report, baseline).items():
+        print(f"  ⚠️ 재생 조건이 다름: {key} {before} → {after}")
+    print(f"{'metric':>16} | {'baseline':>10} | {'current':>10} | {'change':>8}")
+    print("-" * 54)
+    regressed = False
+    for delta in compare_reports(report, baseline, threshold):
+        mark = " ❌" if delta.regression else ""
+        print(
+            f"{delta.metric:>16} | {delta.baseline:>10.2f} | {delta.current:>10.2f} | "
+            f"{delta.change:>+7.1%}{mark}"
+        )
+        regressed |= delta.regression
+    return regressed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="재생할 대화 기록 (ChatDatabase SQLite 파일)")
+    parser.add_argument("--limit", type=int, help="--db에서 읽을 최근 세션 수")
+    parser.add_argument("--max-turns", type=int, help="세션별 최대 턴 수")
+    parser.add_argument("--sessions", type=int, default=20, help="합성 대화 세션 수")
+    parser.add_argument("--turns", type=int, default=5, help="합성 대화 세션별 턴 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--no-stream", action="store_true", help="astream_chat 대신 chat")
+    parser.add_argument("--llm-ms", type=float, default=0.0, help="가짜 모델 호출당 지연 (ms)")
+    parser.add_argument("--warmup", type=int, default=1, help="측정에서 뺄 대화 수")
+    parser.add_argument("--json", help="보고서를 저장할 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 기준 보고서 JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="회귀로 볼 변화율")
+    args = parser.parse_args()
+
+    if args.db:
+        db = ChatDatabase(db_path=args.db)
+        try:
+            conversations = load_conversations(db, args.limit, args.max_turns)
+        finally:
+            db.close()
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = ChatDatabase(db_path=str(Path(tmp) / "recorded.db"), durability="off")
+            try:
+                seed_conversations(db, args.sessions, args.turns, args.seed)
+                conversations = load_conversations(db, max_turns=args.max_turns)
+            finally:
+                db.close()
+    if len(conversations) <= args.warmup:
+        print(f"재생할 대화가 부족합니다 ({len(conversations)}개, 워밍업 {args.warmup}개)")
+        return 1
+
+    report = await run_replay(
+        conversations,
+        concurrency=args.concurrency,
+        stream=not args.no_stream,
+        llm_latency=args.llm_ms / 1000,
+        warmup=args.warmup,
+    )
+    report.config["source"] = (
+        Path(args.db).name
+        if args.db
+        else f"seed={args.seed},sessions={args.sessions},turns={args.turns}"
+    )
+    print_report(report)
+    if args.json:
+        Path(args.json).write_text(report.model_dump_json(indent=2), encoding="utf-8")
+        print(f"\n보고서 저장: {args.json}")
+    if args.baseline:
+        baseline = ReplayReport.model_validate_json(Path(args.baseline).read_text(encoding="utf-8"))
+        if print_comparison(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,111 @@
+"""반복되는 질문의 턴 지연시간: 응답 캐시 없음 vs 정확 일치 vs 정확 일치 + 유사도.
+
+느린 가짜 모델(호출마다 --llm-ms)로 `MCPAgent.chat`을 실행하고, 질문은 자주 묻는
+질문 몇 개에 몰리는 분포(Zipf)에서 뽑습니다. 같은 질문도 띄어쓰기/문장 부호가 다르거나
+("서울 날씨는 어때?" / "서울 날씨는 어때") 어미가 다른("서울 날씨는 어때요?") 형태로 섞여
+들어오므로, 정확 일치만으로는 놓치는 적중을 유사도 단계가 얼마나 더 잡는지 비교합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_response_cache.py
+    uv run python benchmarks/bench_response_cache.py --queries 500 --llm-ms 500
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.prebuilt import create_react_agent
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import MCPAgent, ResponseCache  # noqa: E402
+
+CITIES = ["서울", "부산", "제주", "대구", "광주", "대전", "인천", "울산"]
+TOPICS = ["날씨는 어때", "내일 날씨는 어때", "가볼 만한 곳은 어디야", "지금 몇 시야"]
+
+
+def variants(stem: str) -> list[str]:
+    """같은 질문의 표현 변형 (앞의 두 개는 정규화로 같아지고, 마지막은 어미가 다름)."""
+    return [f"{stem}?", f"{stem} ", f"{stem}요?"]
+
+
+# 도시 × 주제 질문, 각 질문은 표현 변형 3가지
+QUESTIONS = [variants(f"{city} {topic}") for city in CITIES for topic in TOPICS]
+
+
+class SlowModel(GenericFakeChatModel):
+    """호출마다 delay초 걸리는 가짜 모델."""
+
+    delay: float = 0.1
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.delay)
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def make_queries(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(QUESTIONS))]
+    return [rng.choice(rng.choices(QUESTIONS, weights)[0]) for _ in range(count)]
+
+
+async def run(queries: list[str], llm_ms: float, cache: ResponseCache | None) -> list[float]:
+    model = SlowModel(
+        messages=itertools.repeat(AIMessage(content="답변입니다")), delay=llm_ms / 1000
+    )
+    agent = MCPAgent()
+    agent.agent = create_react_agent(model, [])
+    agent.response_cache = cache
+    agent._initialized = True
+
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        await agent.chat(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--llm-ms", type=float, default=100, help="가짜 모델 호출 지연")
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries)
+    modes = [
+        ("no cache", None),
+        ("exact", ResponseCache(similarity=1.0)),
+        ("exact+sim", ResponseCache()),
+    ]
+
+    print(f"queries={args.queries}, distinct={len(QUESTIONS)}, llm-ms={args.llm_ms:g}")
+    print(f"{'mode':>10} | {'p50':>9} | {'mean':>9} | {'hit rate':>8} | {'exact/sim':>9}")
+    print("-" * 58)
+    for name, cache in modes:
+        samples = await run(queries, args.llm_ms, cache)
+        if cache is None:
+            hit_rate, tiers = f"{'-':>8}", f"{'-':>9}"
+        else:
+            stats = cache.stats()
+            hit_rate = f"{stats.hit_rate:>8.0%}"
+            tiers = f"{f'{stats.exact_hits}/{stats.semantic_hits}':>9}"
+        print(
+            f"{name:>10} | {statistics.median(samples):>6.2f} ms | "
+            f"{statistics.mean(samples):>6.2f} ms | {hit_rate} | {tiers}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""보존 정책 + 컴팩션 벤치마크.
+
+대화가 계속 쌓이는 상황을 라운드 단위로 흉내내며, 라운드마다 DB 파일 크기와
+`list_sessions` / `search` 지연시간을 기록합니다.
+
+- none:    보존 정책 없음 (파일이 계속 커짐)
+- compact: 라운드마다 `compact(RetentionPolicy(max_sessions=...))` 실행
+
+실행 방법:
+    uv run python benchmarks/bench_retention.py
+    uv run python benchmarks/bench_retention.py --rounds 20 --sessions-per-round 200 --keep 500
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import ChatDatabase, ChatMessage, RetentionPolicy  # noqa: E402
+
+MESSAGES_PER_SESSION = 20
+
+
+def file_size_mb(db_path: Path) -> float:
+    """DB 파일과 WAL 파일을 합친 크기(MB)."""
+    wal = db_path.with_name(db_path.name + "-wal")
+    total = db_path.stat().st_size + (wal.stat().st_size if wal.exists() else 0)
+    return total / 1024 / 1024
+
+
+def elapsed_ms(func) -> float:
+    """함수 한 번 실행 시간(ms)."""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(mode: str, rounds: int, sessions_per_round: int, keep: int) -> list[tuple]:
+    """라운드별 (세션 수, 파일 크기, list_sessions ms, search ms, compact ms)."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        db = ChatDatabase(db_path=str(db_path))
+        policy = RetentionPolicy(max_sessions=keep)
+
+        for round_no in range(rounds):
+            for s in range(sessions_per_round):
+                session_id = db.create_session(title=f"r{round_no} s{s}").session_id
+                db.add_messages(
+                    session_id,
+                    [
+                        ChatMessage(role="user", content=f"질문 {i} 서울 날씨 " * 10)
+                        for i in range(MESSAGES_PER_SESSION)
+                    ],
+                )
+
+            compact_ms = elapsed_ms(lambda: db.compact(policy)) if mode == "compact" else 0.0
+            with db.pool.writer() as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+            rows.append(
+                (
+                    db.stats(days=1).total_sessions,
+                    file_size_mb(db_path),
+                    elapsed_ms(lambda: db.list_sessions(limit=50, order_by="message_count")),
+                    elapsed_ms(lambda: db.search("날씨", limit=20)),
+                    compact_ms,
+                )
+            )
+
+        db.close()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--sessions-per-round", type=int, default=100)
+    parser.add_argument("--keep", type=int, default=200, help="compact 모드에서 남길 세션 수")
+    args = parser.parse_args()
+
+    for mode in ["none", "compact"]:
+        print(f"\n[{mode}]")
+        print(
+            f"{'round':>5} | {'sessions':>8} | {'size':>9} | {'list':>9} | {'search':>9} | {'compact':>9}"
+        )
+        print("-" * 64)
+        for round_no, (sessions, size, list_ms, search_ms, compact_ms) in enumerate(
+            run(mode, args.rounds, args.sessions_per_round, args.keep), start=1
+        ):
+            print(
+                f"{round_no:>5} | {sessions:>8,} | {size:>6.2f} MB | {list_ms:>6.2f} ms | "
+                f"{search_ms:>6.2f} ms | {compact_ms:>6.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""전문 검색(FTS5) 지연시간 벤치마크.
+
+합성 대화 코퍼스에서 `ChatDatabase.search`와 기존 방식(모든 세션을
+`get_messages`로 읽어 Python에서 부분 문자열 검색)의 지연시간을 비교합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_search.py
+    uv run python benchmarks/bench_search.py --sizes 100000 1000000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import ChatDatabase, ChatMessage  # noqa: E402
+
+MESSAGES_PER_SESSION = 20
+QUERIES = ["날씨", "계산", "서울 맑음", "파일 목록", "forecast"]
+VOCABULARY = (
+    "서울 부산 날씨 맑음 흐림 비 기온 계산 더하기 곱하기 결과 파일 목록 읽기 쓰기 "
+    "현재 시간 내일 예보 forecast weather calculator file read write today"
+).split()
+
+
+def populate(db: ChatDatabase, num_messages: int, seed: int = 42) -> None:
+    """무작위 단어로 합성 코퍼스를 만듭니다."""
+    rng = random.Random(seed)
+    base = datetime(2025, 1, 1)
+    num_sessions = max(1, num_messages // MESSAGES_PER_SESSION)
+
+    for s in range(num_sessions):
+        session_id = db.create_session(title=f"Session {s}").session_id
+        db.add_messages(
+            session_id,
+            [
+                ChatMessage(
+                    role="user" if i % 2 == 0 else "assistant",
+                    content=" ".join(rng.choices(VOCABULARY, k=12)),
+                    timestamp=base + timedelta(seconds=s * MESSAGES_PER_SESSION + i),
+                )
+                for i in range(MESSAGES_PER_SESSION)
+            ],
+        )
+
+
+def python_scan(db: ChatDatabase, query: str, limit: int) -> list[ChatMessage]:
+    """기존 방식: 세션별로 메시지를 읽어 Python에서 검색."""
+    terms = query.split()
+    results = []
+    for session in db.iter_sessions():
+        for message in db.get_messages(session.session_id, limit=10_000):
+            if all(term in message.content for term in terms):
+                results.append(message)
+    return results[:limit]
+
+
+def median_ms(func, queries: list[str]) -> float:
+    """쿼리 목록을 실행한 중앙값 지연시간(ms)."""
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument(
+        "--skip-scan-above", type=int, default=200_000, help="이 크기를 넘으면 Python 스캔 생략"
+    )
+    args = parser.parse_args()
+
+    print(f"{'messages':>10} | {'FTS5 search':>12} | {'python scan':>12}")
+    print("-" * 41)
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = ChatDatabase(db_path=str(Path(tmp) / "bench.db"))
+            populate(db, size)
+
+            fts_ms = median_ms(lambda q: db.search(q, limit=args.limit), QUERIES)
+            if size <= args.skip_scan_above:
+                scan = f"{median_ms(lambda q: python_scan(db, q, args.limit), QUERIES):>9.2f} ms"
+            else:
+                scan = f"{'skipped':>12}"
+            db.close()
+
+        print(f"{size:>10,} | {fts_ms:>9.2f} ms | {scan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""첫 토큰까지 걸리는 시간(TTFT): `chat` vs `astream_chat`.
+
+LLM 없이 토큰마다 지연이 있는 가짜 모델로 ReAct 루프(도구 호출 1회 + 답변)를 재현합니다.
+`chat`은 그래프 전체가 끝나야 응답을 돌려주므로 TTFT가 전체 시간과 같고,
+`astream_chat`은 답변의 첫 토큰이 생성되는 즉시 전달합니다.
+
+실행 방법:
+    uv run python benchmarks/bench_streaming.py
+    uv run python benchmarks/bench_streaming.py --tokens 200 --token-ms 15 --tool-ms 300
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from langchain_core.language_models.chat_models import generate_from_stream
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import MCPAgent  # noqa: E402
+
+
+class SlowFakeModel(GenericFakeChatModel):
+    """토큰마다 token_delay초씩 걸리는 가짜 모델."""
+
+    token_delay: float = 0.02
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        # 스트리밍하지 않는 호출(ainvoke)도 같은 지연을 거침
+        return generate_from_stream(self._stream(messages, stop, **kwargs))
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = next(self.messages)
+        if message.tool_calls:
+            time.sleep(self.token_delay * 5)
+            chunks = [
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=chunks))
+            return
+        for token in re.split(r"(\s)", message.content):
+            time.sleep(self.token_delay)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+def make_agent(tokens: int, token_ms: float, tool_ms: float) -> MCPAgent:
+    """도구 1회 호출 후 tokens개 단어로 답하는 에이전트."""
+
+    @tool
+    async def lookup(query: str) -> str:
+        """느린 조회 도구."""
+        await asyncio.sleep(tool_ms / 1000)
+        return f"{query}: 맑음"
+
+    answer = " ".join(f"단어{i}" for i in range(tokens))
+    responses = iter(
+        [
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "lookup", "args": {"query": "서울"}, "id": "c1"}],
+            ),
+            AIMessage(content=answer),
+        ]
+    )
+    agent = MCPAgent()
+    agent.agent = create_react_agent(
+        SlowFakeModel(messages=responses, token_delay=token_ms / 1000), [lookup]
+    )
+    agent._initialized = True
+    return agent
+
+
+async def measure_chat(agent: MCPAgent) -> tuple[float, float]:
+    start = time.perf_counter()
+    await agent.chat("서울 날씨는?")
+    total = time.perf_counter() - start
+    return total, total
+
+
+async def measure_stream(agent: MCPAgent) -> tuple[float, float]:
+    start = time.perf_counter()
+    first = None
+    async for event in agent.astream_chat("서울 날씨는?"):
+        if event.type == "token" and first is None:
+            first = time.perf_counter() - start
+    return first or 0.0, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--token-ms", type=float, default=10)
+    parser.add_argument("--tool-ms", type=float, default=200)
+    args = parser.parse_args()
+
+    print(f"tokens={args.tokens}, token_ms={args.token_ms}, tool_ms={args.tool_ms}")
+    print(f"{'mode':>14} | {'TTFT':>9} | {'total':>9}")
+    print("-" * 38)
+    for name, measure in [("chat", measure_chat), ("astream_chat", measure_stream)]:
+        agent = make_agent(args.tokens, args.token_ms, args.tool_ms)
+        ttft, total = asyncio.run(measure(agent))
+        print(f"{name:>14} | {ttft * 1000:>6.0f} ms | {total * 1000:>6.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
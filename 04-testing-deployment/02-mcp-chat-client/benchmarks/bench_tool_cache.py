@@ -0,0 +1,138 @@
+"""반복되는 도구 호출의 턴당 도구 시간: 결과 캐시 없음 vs `ToolResultCache`.
+
+실제 stdio MCP 서버(FastMCP)를 `MCPSessionManager`로 연결하고, 에이전트 턴마다
+도구 노드가 받는 호출(계산 2개 + 예보 1개)을 적은 종류의 인자에서 뽑아 재현합니다.
+대화가 이어지면 같은 계산이나 같은 도시 예보를 다시 묻는 경우가 많다는 가정입니다.
+
+- `add`, `power`: 순수 함수 (만료 없음)
+- `get_forecast`: 느리게 바뀌는 조회 (--forecast-ms 지연, TTL 600초)
+
+실행 방법:
+    uv run python benchmarks/bench_tool_cache.py
+    uv run python benchmarks/bench_tool_cache.py --turns 200 --distinct 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from langchain_core.messages import AIMessage
+from langgraph.graph import START, MessagesState, StateGraph
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import (  # noqa: E402
+    MCPSessionManager,
+    ToolLimiter,
+    ToolResultCache,
+    create_tool_node,
+)
+
+SERVER_SCRIPT = """
+import asyncio
+import sys
+from mcp.server.fastmcp import FastMCP
+
+delay = float(sys.argv[1]) / 1000
+mcp = FastMCP("tools", log_level="WARNING")
+
+@mcp.tool()
+def add(a: int, b: int) -> int:
+    \"\"\"두 수를 더합니다.\"\"\"
+    return a + b
+
+@mcp.tool()
+def power(base: int, exponent: int) -> int:
+    \"\"\"거듭제곱.\"\"\"
+    return base ** exponent
+
+@mcp.tool()
+async def get_forecast(city: str) -> str:
+    \"\"\"도시의 일기 예보.\"\"\"
+    await asyncio.sleep(delay)
+    return f"{city}: 맑음"
+
+mcp.run()
+"""
+
+CITIES = ["서울", "부산", "제주", "대구", "광주", "대전", "인천", "울산"]
+
+
+def make_turns(turns: int, distinct: int, seed: int = 0) -> list[AIMessage]:
+    """턴마다 계산 2개 + 예보 1개 (인자는 distinct가지 중에서)."""
+    rng = random.Random(seed)
+    messages = []
+    for t in range(turns):
+        n = rng.randrange(distinct)
+        calls = [
+            {"name": "add", "args": {"a": n, "b": n + 1}},
+            {"name": "power", "args": {"base": 2, "exponent": n % 16}},
+            {"name": "get_forecast", "args": {"city": CITIES[n % len(CITIES)]}},
+        ]
+        messages.append(
+            AIMessage(
+                content="",
+                tool_calls=[{**c, "id": f"t{t}-{i}"} for i, c in enumerate(calls)],
+            )
+        )
+    return messages
+
+
+async def run(tools, turns: list[AIMessage], cache: ToolResultCache | None) -> list[float]:
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", create_tool_node(tools, ToolLimiter(), cache))
+    graph.add_edge(START, "tools")
+    app = graph.compile()
+
+    samples = []
+    for message in turns:
+        start = time.perf_counter()
+        await app.ainvoke({"messages": [message]})
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=10, help="서로 다른 인자 조합 수")
+    parser.add_argument("--forecast-ms", type=float, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "tools_server.py"
+        script.write_text(SERVER_SCRIPT, encoding="utf-8")
+        connection = {
+            "transport": "stdio",
+            "command": sys.executable,
+            "args": [str(script), str(args.forecast_ms)],
+        }
+        manager = MCPSessionManager({"tools": connection}, ping_interval=0)
+        await manager.start()
+        try:
+            tools = await manager.get_tools()
+            turns = make_turns(args.turns, args.distinct)
+            cache = ToolResultCache({"tools": {"add": None, "power": None, "get_forecast": 600}})
+
+            print(f"turns={args.turns}, distinct={args.distinct}, forecast-ms={args.forecast_ms:g}")
+            print(f"{'mode':>12} | {'p50 turn':>10} | {'mean turn':>10} | {'hit rate':>8}")
+            print("-" * 52)
+            for name, c in [("no cache", None), ("cache", cache)]:
+                samples = await run(tools, turns, c)
+                hit_rate = f"{c.stats().hit_rate:>7.0%}" if c else f"{'-':>7}"
+                print(
+                    f"{name:>12} | {statistics.median(samples):>7.2f} ms | "
+                    f"{statistics.mean(samples):>7.2f} ms | {hit_rate}"
+                )
+        finally:
+            await manager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
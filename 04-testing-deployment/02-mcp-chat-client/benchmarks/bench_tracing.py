@@ -0,0 +1,81 @@
+"""추적 비용: 구간 하나의 오버헤드와 `ChatDatabase` 조회/쓰기에 붙은 `db.*` 구간의 영향.
+
+- 구간: 지표만 기록 vs 파일 내보내기(OTLP/JSON, 백그라운드 스레드)까지 켠 경우의 구간당 시간
+- DB: 같은 `get_messages` / `add_message` 호출을 추적 데코레이터 없이(`__wrapped__`)와
+  있을 때 비교 (지표만 기록하는 기본 설정)
+
+실행 방법:
+    uv run python benchmarks/bench_tracing.py
+    uv run python benchmarks/bench_tracing.py --spans 200000 --ops 5000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import ChatDatabase, ChatMessage  # noqa: E402
+from backend.tracing import FileSpanExporter, Tracer  # noqa: E402
+
+
+def time_spans(tracer: Tracer, count: int) -> float:
+    """구간 하나당 µs."""
+    start = time.perf_counter()
+    for _ in range(count):
+        with tracer.span("tool.call", stage="tool", tool="add", server="calc"):
+            pass
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def time_db(db: ChatDatabase, session_id: str, ops: int, traced: bool) -> tuple[float, float]:
+    """(add_message µs, get_messages µs)."""
+    write = ChatDatabase._write_messages if traced else ChatDatabase._write_messages.__wrapped__
+    read = ChatDatabase.get_messages if traced else ChatDatabase.get_messages.__wrapped__
+    message = ChatMessage(role="user", content="안녕하세요", session_id=session_id)
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        write(db, [(session_id, message)])
+    write_us = (time.perf_counter() - start) / ops * 1e6
+
+    start = time.perf_counter()
+    for _ in range(ops):
+        read(db, session_id, 20)
+    return write_us, (time.perf_counter() - start) / ops * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"spans={args.spans}")
+        print(f"{'tracer':>16} | {'per span':>10}")
+        print("-" * 30)
+        print(f"{'metrics only':>16} | {time_spans(Tracer(), args.spans):>7.2f} µs")
+        tracer = Tracer(exporters=[FileSpanExporter(Path(tmp) / "traces.jsonl")])
+        per_span = time_spans(tracer, args.spans)
+        tracer.close()
+        print(f"{'+ file export':>16} | {per_span:>7.2f} µs")
+
+        db = ChatDatabase(db_path=str(Path(tmp) / "bench.db"), durability="off")
+        session_id = db.create_session().session_id
+        time_db(db, session_id, args.ops // 4, traced=False)  # 워밍업 (SQLite 페이지 캐시)
+        print(f"\nops={args.ops}")
+        print(f"{'db':>16} | {'add_message':>12} | {'get_messages':>12}")
+        print("-" * 48)
+        for traced in (False, True):
+            write_us, read_us = time_db(db, session_id, args.ops, traced)
+            label = "traced" if traced else "untraced"
+            print(f"{label:>16} | {write_us:>9.1f} µs | {read_us:>9.1f} µs")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
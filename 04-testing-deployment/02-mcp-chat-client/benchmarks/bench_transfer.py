@@ -0,0 +1,99 @@
+"""내보내기/가져오기 처리량 및 메모리 벤치마크.
+
+메시지 N개를 형식별로 파일에 내보내고 빈 DB로 다시 가져오면서
+초당 처리 행 수, 최대 메모리(tracemalloc), 파일 크기를 측정합니다.
+최대 메모리가 N에 비례하지 않고 `--chunk-size`에 비례하는지 확인하는 용도입니다.
+
+실행 방법:
+    uv run python benchmarks/bench_transfer.py
+    uv run python benchmarks/bench_transfer.py --messages 1000000 --chunk-size 20000
+"""
+
+import argparse
+import importlib.util
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# 백엔드 모듈을 import할 수 있도록 경로 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend import ChatDatabase, ChatMessage  # noqa: E402
+
+MESSAGES_PER_SESSION = 200
+
+
+def populate(db: ChatDatabase, num_messages: int) -> None:
+    """세션당 MESSAGES_PER_SESSION개씩 메시지를 채웁니다."""
+    for s in range(max(1, num_messages // MESSAGES_PER_SESSION)):
+        session_id = db.create_session(title=f"session {s}").session_id
+        db.add_messages(
+            session_id,
+            [
+                ChatMessage(role="user", content=f"서울 날씨 질문 {s}-{i} " * 4)
+                for i in range(MESSAGES_PER_SESSION)
+            ],
+        )
+
+
+def measure(func) -> tuple[float, float]:
+    """(실행 시간 초, 최대 메모리 MB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    formats = ["jsonl"]
+    if importlib.util.find_spec("pyarrow") is not None:
+        formats += ["parquet", "arrow"]
+
+    print(f"messages={args.messages:,}, chunk_size={args.chunk_size:,}")
+    print(
+        f"{'format':>8} | {'export rows/s':>13} | {'import rows/s':>13} | {'peak mem':>9} | {'file':>9}"
+    )
+    print("-" * 66)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = ChatDatabase(db_path=str(Path(tmp) / "source.db"))
+        populate(source, args.messages)
+
+        for format in formats:
+            path = Path(tmp) / f"backup.{format}"
+            binary = format != "jsonl"
+
+            def export() -> None:
+                with open(path, "wb" if binary else "w", encoding=None if binary else "utf-8") as f:
+                    source.export(f, format=format, chunk_size=args.chunk_size)
+
+            target = ChatDatabase(db_path=str(Path(tmp) / f"target_{format}.db"))
+
+            def import_() -> None:
+                with open(path, "rb" if binary else "r", encoding=None if binary else "utf-8") as f:
+                    target.import_(f, format=format, chunk_size=args.chunk_size)
+
+            export_s, export_mb = measure(export)
+            import_s, import_mb = measure(import_)
+            target.close()
+
+            print(
+                f"{format:>8} | {args.messages / export_s:>13,.0f} | {args.messages / import_s:>13,.0f} | "
+                f"{max(export_mb, import_mb):>6.1f} MB | {path.stat().st_size / 1024 / 1024:>6.1f} MB"
+            )
+
+        source.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 from .chat_message import (
     render_chat_message,
     render_message_with_border,
+    render_streaming_response,
     render_typing_indicator,
 )
 from .sidebar import (
@@ -19,6 +20,7 @@ __all__ = [
     # chat_message
     "render_chat_message",
     "render_message_with_border",
+    "render_streaming_response",
     "render_typing_indicator",
     # sidebar
     "render_api_info",
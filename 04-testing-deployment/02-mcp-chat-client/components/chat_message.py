@@ -3,11 +3,17 @@
 채팅 메시지를 일관된 형식으로 표시하는 재사용 가능한 컴포넌트
 """
 
+import json
+import time
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Literal
 
 import streamlit as st
 
+from backend.models import AgentEvent
+from backend.tracing import get_tracer
+
 
 def render_chat_message(
     role: Literal["user", "assistant", "system"],
@@ -102,6 +108,72 @@ def render_message_with_border(
     )
 
 
+def render_streaming_response(events: Iterable[AgentEvent]) -> tuple[str, float | None]:
+    """에이전트 이벤트 스트림을 도착하는 대로 렌더링합니다.
+
+    `st.chat_message("assistant")` 블록 안에서 호출합니다. 도구 호출/결과는 응답
+    위의 상태 박스에, 토큰은 커서(▌)와 함께 이어 붙여 표시합니다.
+
+    Args:
+        events: `AgentRuntime.stream_chat()` 등이 돌려주는 이벤트
+
+    Returns:
+        (최종 응답 문자열, 첫 토큰까지 걸린 시간(초) 또는 None)
+
+    화면 갱신에 쓴 시간은 추적 지표의 render 단계로 기록합니다 (이벤트 대기 시간 제외).
+    """
+    tracer = get_tracer()
+    tool_area = st.container()
+    placeholder = st.empty()
+    placeholder.markdown("🤔 생각 중...")
+
+    status = None
+    response = ""
+    first_token: float | None = None
+    started = time.perf_counter()
+    # 이벤트를 기다린 시간을 뺀 화면 갱신 시간 (render 단계)
+    render_seconds = 0.0
+
+    span = tracer.start_span("render.response")
+    try:
+        for event in events:
+            event_started = time.perf_counter()
+            if event.type in ("token", "error"):
+                if event.type == "token" and first_token is None:
+                    first_token = time.perf_counter() - started
+                response += event.content
+                placeholder.markdown(response + "▌")
+            elif event.type == "tool_call":
+                if status is None:
+                    status = tool_area.status("🔧 도구 사용 중...", expanded=False)
+                args = json.dumps(event.tool_args, ensure_ascii=False)
+                status.markdown(f"**{event.tool_name}** `{args}`")
+            elif event.type == "tool_result" and status is not None:
+                status.code(event.content[:500])
+            render_seconds += time.perf_counter() - event_started
+    except BaseException as e:
+        tracer.end_span(span, e)
+        raise
+
+    event_started = time.perf_counter()
+    if status is not None:
+        status.update(label="🔧 도구 사용 완료", state="complete")
+    response = response or "죄송합니다. 응답을 생성할 수 없습니다."
+    placeholder.markdown(response)
+
+    total = time.perf_counter() - started
+    if first_token is not None:
+        st.caption(f"⏱️ 첫 토큰 {first_token:.2f}초 · 전체 {total:.1f}초")
+    render_seconds += time.perf_counter() - event_started
+
+    span.set_attribute("render_ms", render_seconds * 1000)
+    if first_token is not None:
+        span.set_attribute("first_token_ms", first_token * 1000)
+    tracer.end_span(span)
+    tracer.metrics.observe("render", render_seconds)
+    return response, first_token
+
+
 def render_typing_indicator() -> None:
     """타이핑 중 표시 애니메이션."""
     st.markdown(
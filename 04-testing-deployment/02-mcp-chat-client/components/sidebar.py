@@ -7,7 +7,7 @@ from typing import Any
 
 import streamlit as st
 
-from backend import ChatDatabase, settings
+from backend import CachedChatStorage, ChatStorage, settings
 
 
 def render_api_info() -> None:
@@ -23,7 +23,7 @@ def render_api_info() -> None:
         st.warning("⚠️ OpenAI (유료)")
 
 
-def render_session_info(db: ChatDatabase) -> None:
+def render_session_info(db: ChatStorage) -> None:
     """현재 세션 정보를 표시합니다.
 
     Args:
@@ -75,7 +75,7 @@ uv run python server.py
     )
 
 
-def render_statistics(db: ChatDatabase) -> None:
+def render_statistics(db: ChatStorage) -> None:
     """전체 통계를 표시합니다.
 
     Args:
@@ -83,20 +83,25 @@ def render_statistics(db: ChatDatabase) -> None:
     """
     st.header("📊 통계")
 
-    all_sessions = db.list_sessions()
-    total_messages = sum(session.message_count for session in all_sessions)
+    stats = db.stats(days=1)
 
     col1, col2 = st.columns(2)
 
     with col1:
-        st.metric("총 세션", len(all_sessions))
+        st.metric("총 세션", stats.total_sessions)
 
     with col2:
-        st.metric("총 메시지", total_messages)
+        st.metric("총 메시지", stats.total_messages)
 
-    if all_sessions:
-        avg_messages = total_messages / len(all_sessions)
-        st.metric("평균 메시지/세션", f"{avg_messages:.1f}")
+    if stats.total_sessions:
+        st.metric("평균 메시지/세션", f"{stats.avg_messages_per_session:.1f}")
+
+    if isinstance(db, CachedChatStorage):
+        cache = db.cache_stats()
+        st.caption(
+            f"조회 캐시: 적중률 {cache.hit_rate:.0%} "
+            f"(적중 {cache.hits} / 실패 {cache.misses}, 항목 {cache.size}/{cache.maxsize})"
+        )
 
 
 def render_new_chat_button() -> bool:
@@ -117,7 +122,7 @@ def render_reset_button() -> bool:
     return st.button("🗑️ 대화 초기화", type="secondary", use_container_width=True)
 
 
-def render_complete_sidebar(db: ChatDatabase, show_stats: bool = False) -> dict[str, Any]:
+def render_complete_sidebar(db: ChatStorage, show_stats: bool = False) -> dict[str, Any]:
     """완전한 사이드바를 렌더링합니다.
 
     Args:
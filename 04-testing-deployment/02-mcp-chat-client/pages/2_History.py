@@ -5,7 +5,7 @@
 
 import streamlit as st
 
-from backend import ChatDatabase, settings
+from backend import get_runtime, settings
 
 # 페이지 설정
 st.set_page_config(
@@ -15,19 +15,35 @@ st.set_page_config(
 )
 
 
-# 데이터베이스 초기화
-@st.cache_resource
-def get_database() -> ChatDatabase:
-    """데이터베이스 인스턴스 가져오기 (캐시됨)."""
-    return ChatDatabase()
-
-
-db = get_database()
+# 데이터베이스 (채팅 페이지, 에이전트와 같은 저장소, 조회 캐시 포함)
+runtime = get_runtime()
+db = runtime.storage
 
 # 타이틀
 st.title("📚 대화 기록")
 st.caption("저장된 모든 세션과 메시지를 조회합니다")
 
+# 전체 대화 검색
+search_query = st.text_input("🔎 대화 검색", placeholder="검색어를 입력하세요 (예: 서울 날씨)")
+
+if search_query:
+    results = db.search(search_query, limit=30)
+    st.subheader(f"🔎 검색 결과 ({len(results)}개)")
+
+    if not results:
+        st.info("검색 결과가 없습니다.")
+
+    for result in results:
+        role_icon = "👤" if result.role == "user" else "🤖"
+        st.markdown(
+            f"{role_icon} **{result.session_title or result.session_id[:8]}** "
+            f"<small style='color: gray;'>({result.timestamp.strftime('%Y-%m-%d %H:%M')})</small>",
+            unsafe_allow_html=True,
+        )
+        st.markdown(f"> {result.snippet}")
+
+    st.divider()
+
 # 사이드바: 필터 및 정렬
 with st.sidebar:
     st.header("🔍 필터 및 정렬")
@@ -42,32 +58,35 @@ with st.sidebar:
 
     st.divider()
 
-    # 통계
+    # 통계 (SQL 집계, 전체 세션 대상)
     st.subheader("📊 통계")
-    all_sessions = db.list_sessions()
-    total_messages = sum(session.message_count for session in all_sessions)
-
-    st.metric("전체 세션 수", len(all_sessions))
-    st.metric("전체 메시지 수", total_messages)
-
-    if all_sessions:
-        avg_messages = total_messages / len(all_sessions)
-        st.metric("평균 메시지 수", f"{avg_messages:.1f}")
-
-
-# 세션 목록 가져오기
-sessions = db.list_sessions()
+    stats = db.stats(days=14)
+
+    st.metric("전체 세션 수", stats.total_sessions)
+    st.metric("전체 메시지 수", stats.total_messages)
+
+    if stats.total_sessions:
+        st.metric("평균 메시지 수", f"{stats.avg_messages_per_session:.1f}")
+
+    st.caption("최근 14일 메시지 수")
+    st.bar_chart(
+        {
+            "날짜": [d.day.strftime("%m-%d") for d in stats.daily],
+            "메시지": [d.messages for d in stats.daily],
+        },
+        x="날짜",
+        y="메시지",
+        height=160,
+    )
 
-# 정렬 적용
-if sort_order == "최신순":
-    sessions = sorted(sessions, key=lambda s: s.created_at, reverse=True)
-elif sort_order == "오래된 순":
-    sessions = sorted(sessions, key=lambda s: s.created_at)
-elif sort_order == "메시지 많은 순":
-    sessions = sorted(sessions, key=lambda s: s.message_count, reverse=True)
 
-# 제한 적용
-sessions = sessions[:show_limit]
+# 세션 목록 가져오기 (정렬/제한은 인덱스를 타는 SQL로 처리)
+SORT_ORDERS = {
+    "최신순": "created_at",
+    "오래된 순": "created_at_asc",
+    "메시지 많은 순": "message_count",
+}
+sessions = db.list_sessions(limit=show_limit, order_by=SORT_ORDERS[sort_order])
 
 # 세션이 없는 경우
 if not sessions:
@@ -75,13 +94,28 @@ if not sessions:
     st.page_link("pages/1_Chat.py", label="➡️ 채팅 페이지로 이동", icon="💬")
     st.stop()
 
+# 메시지를 펼쳐 본 세션 (첫 번째 세션은 기본으로 표시)
+if "opened_sessions" not in st.session_state:
+    st.session_state.opened_sessions = set()
+
+opened_sessions: set[str] = st.session_state.opened_sessions
+open_ids = [
+    session.session_id
+    for idx, session in enumerate(sessions, start=1)
+    if idx == 1 or session.session_id in opened_sessions
+]
+
+# 펼친 세션의 메시지만 한 번의 쿼리로 조회 (세션마다 쿼리하지 않음)
+messages_by_session = db.get_messages_for_sessions(open_ids)
+
 # 세션 목록 표시
 st.subheader(f"📋 세션 목록 ({len(sessions)}개)")
 
 for idx, session in enumerate(sessions, start=1):
+    is_open = session.session_id in messages_by_session
     with st.expander(
         f"**{idx}. {session.title}** ({session.message_count}개 메시지) - {session.created_at.strftime('%Y-%m-%d %H:%M')}",
-        expanded=(idx == 1),  # 첫 번째만 기본 확장
+        expanded=is_open,  # 첫 번째 세션과 메시지를 불러온 세션만 확장
     ):
         col1, col2, col3 = st.columns([2, 2, 1])
 
@@ -94,16 +128,23 @@ for idx, session in enumerate(sessions, start=1):
         with col3:
             # 삭제 버튼
             if st.button("🗑️ 삭제", key=f"delete_{session.session_id}"):
-                db.delete_session(session.session_id)
+                runtime.delete_session(session.session_id)  # 에이전트의 세션 스레드도 정리
                 st.success(f"세션 삭제됨: {session.session_id[:8]}...")
                 st.rerun()
 
         st.divider()
 
-        # 메시지 표시
-        messages = db.get_messages(session.session_id)
-
-        if not messages:
+        # 메시지 표시 (펼친 세션만 조회)
+        messages = messages_by_session.get(session.session_id)
+
+        if messages is None:
+            st.button(
+                "💬 메시지 보기",
+                key=f"open_{session.session_id}",
+                on_click=opened_sessions.add,
+                args=(session.session_id,),
+            )
+        elif not messages:
             st.info("이 세션에는 메시지가 없습니다.")
         else:
             for msg_idx, msg in enumerate(messages, start=1):
@@ -125,6 +166,9 @@ for idx, session in enumerate(sessions, start=1):
         st.divider()
         if st.button("📂 이 세션 불러오기", key=f"load_{session.session_id}"):
             # 세션 상태에 저장
+            if messages is None:
+                messages = db.get_messages(session.session_id)
+
             st.session_state.session_id = session.session_id
             st.session_state.messages = [
                 {"role": msg.role, "content": msg.content} for msg in messages
@@ -9,7 +9,7 @@ from pathlib import Path
 
 import streamlit as st
 
-from backend import settings
+from backend import get_llm_gateway, get_runtime, get_tracer, settings
 
 # 페이지 설정
 st.set_page_config(
@@ -46,6 +46,107 @@ with tab1:
         else:
             st.warning("⚠️ OpenAI 모드")
 
+    if settings.context_max_tokens > 0:
+        context_caption = (
+            f"🧮 컨텍스트 예산: {settings.context_max_tokens:,}토큰 "
+            f"({settings.context_tokenizer}), 넘치면 앞쪽 대화를 요약합니다."
+        )
+        context_stats = get_runtime().context_stats()
+        if context_stats is not None and context_stats.turns:
+            context_caption += (
+                f" 지금까지 {context_stats.turns}턴, "
+                f"{context_stats.history_tokens:,} → {context_stats.prompt_tokens:,}토큰 "
+                f"({context_stats.savings_rate:.0%} 절약, 요약 {context_stats.summaries_created}회)"
+            )
+        st.caption(context_caption)
+    else:
+        st.caption("🧮 컨텍스트 예산 없음: 매 턴 히스토리 전체를 보냅니다 (CONTEXT_MAX_TOKENS=0).")
+
+    response_stats = get_runtime().response_cache_stats()
+    if response_stats is not None:
+        st.caption(
+            f"⚡ 응답 캐시: 적중률 {response_stats.hit_rate:.0%} "
+            f"(정확 {response_stats.exact_hits} · 유사 {response_stats.semantic_hits} · "
+            f"실패 {response_stats.misses} · 부작용으로 제외 {response_stats.skipped}, "
+            f"{response_stats.size}/{response_stats.maxsize}개) · 평균 응답 "
+            f"{response_stats.hit_latency_ms:.1f} ms (적중) / "
+            f"{response_stats.miss_latency_ms:,.0f} ms (실행)"
+        )
+
+    gateway_stats = get_llm_gateway().stats()
+    st.caption(
+        f"🔌 LLM 게이트웨이: 동시 요청 {gateway_stats.in_flight}/{settings.llm_max_in_flight} "
+        f"(최대 {gateway_stats.peak_in_flight}, 대기 {gateway_stats.waiting}) · "
+        f"요청 {gateway_stats.requests} · 서버 전송 {gateway_stats.upstream} · "
+        f"합침 {gateway_stats.coalesced} · 재시도 {gateway_stats.retries} · "
+        f"실패 {gateway_stats.failures}"
+    )
+
+    pool_stats = get_runtime().pool_stats()
+    if pool_stats is not None:
+        st.caption(
+            f"🧵 에이전트 풀: 실행 {pool_stats.running}/{pool_stats.max_concurrency} · "
+            f"대기 {pool_stats.waiting} · 완료 {pool_stats.completed} · "
+            f"거절 {pool_stats.rejected} · 세션 스레드 {pool_stats.threads}개 "
+            f"(다시 채움 {pool_stats.seeded} · 내림 {pool_stats.evictions}) · "
+            f"평균 대기 {pool_stats.avg_wait_ms:,.0f} ms"
+        )
+
+    st.subheader("📈 단계별 지연")
+    stage_stats = get_tracer().metrics.stats()
+    if not stage_stats:
+        st.info("아직 기록된 턴이 없습니다.")
+    else:
+        stage_names = {
+            "turn": "턴 전체",
+            "llm": "LLM 호출",
+            "tool": "MCP 도구",
+            "db": "DB",
+            "render": "화면 렌더링",
+        }
+        st.dataframe(
+            [
+                {
+                    "단계": stage_names.get(s.stage, s.stage),
+                    "횟수": s.count,
+                    "p50 (ms)": round(s.p50_ms, 1),
+                    "p95 (ms)": round(s.p95_ms, 1),
+                    "오류율": f"{s.error_rate:.1%}",
+                }
+                for s in stage_stats
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+    tool_calls = get_tracer().metrics.tool_calls()
+    if tool_calls:
+        st.caption(
+            "🔧 도구 호출: "
+            + ", ".join(
+                f"{tool} {count}회" + (" (오류)" if status == "error" else "")
+                for (_, tool, status), count in sorted(tool_calls.items())
+            )
+        )
+    export_targets = [
+        target
+        for target in (
+            settings.trace_export_path,
+            settings.otlp_endpoint,
+            f"http://{settings.metrics_host}:{settings.metrics_port}/metrics"
+            if settings.metrics_port
+            else None,
+        )
+        if target
+    ]
+    st.caption(
+        "p50/p95는 단계별 최근 1000개 기록 기준입니다. "
+        + (
+            f"구간/지표 내보내기: {', '.join(export_targets)}"
+            if export_targets
+            else "TRACE_EXPORT_PATH, OTLP_ENDPOINT, METRICS_PORT로 내보낼 수 있습니다."
+        )
+    )
+
     st.divider()
 
     # 설정 변경 폼
@@ -148,6 +249,52 @@ with tab2:
             st.rerun()
 
     else:
+        # 실행 중인 세션 상태
+        st.subheader("🩺 연결 상태")
+        statuses = get_runtime().mcp_status()
+        if not statuses:
+            st.info("에이전트가 아직 MCP 서버에 연결하지 않았습니다.")
+        else:
+            state_icons = {
+                "idle": "💤",
+                "ready": "🟢",
+                "starting": "🟡",
+                "failed": "🔴",
+                "stopped": "⚪",
+            }
+            st.dataframe(
+                [
+                    {
+                        "서버": s.name,
+                        "상태": f"{state_icons[s.state]} {s.state}",
+                        "도구": s.tool_count,
+                        "재시작": s.restarts,
+                        "ping (ms)": round(s.last_ping_ms, 1) if s.last_ping_ms else None,
+                        "시작 (ms)": round(s.start_ms) if s.start_ms else None,
+                        "도구 목록 (ms)": round(s.list_tools_ms, 1) if s.list_tools_ms else None,
+                        "마지막 오류": s.last_error or "",
+                    }
+                    for s in statuses
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+            st.caption(
+                f"{settings.mcp_ping_interval:g}초마다 상태를 확인하고 응답 없는 서버는 재시작합니다."
+                + (
+                    " 💤 서버는 도구 매니페스트의 도구만 제공 중이며 첫 도구 호출 때 시작합니다."
+                    if settings.mcp_lazy_start
+                    else ""
+                )
+            )
+            cache_stats = get_runtime().tool_cache_stats()
+            if cache_stats is not None:
+                st.caption(
+                    f"🗄️ 도구 결과 캐시: 적중률 {cache_stats.hit_rate:.0%} "
+                    f"(적중 {cache_stats.hits} · 실패 {cache_stats.misses} · "
+                    f"{cache_stats.size}/{cache_stats.maxsize}개)"
+                )
+
         # 설정 파일 표시
         with open(config_path, encoding="utf-8") as f:
             config = json.load(f)
@@ -164,6 +311,18 @@ with tab2:
                 ):
                     st.markdown(f"**설명:** {server.get('description', 'N/A')}")
                     st.code(f"{server.get('command', 'N/A')} {' '.join(server.get('args', []))}")
+                    st.caption(
+                        f"동시 실행 상한: {server.get('max_concurrency') or '제한 없음'} · "
+                        f"제한 시간: {server.get('timeout') or settings.tool_timeout:g}초"
+                    )
+                    if server.get("cache"):
+                        st.caption(
+                            "결과 캐시: "
+                            + ", ".join(
+                                f"{tool} ({'만료 없음' if ttl is None else f'{ttl:g}초'})"
+                                for tool, ttl in server["cache"].items()
+                            )
+                        )
 
                     # 활성화/비활성화 토글
                     enabled = st.checkbox(
@@ -0,0 +1,305 @@
+"""Tests for the multi-session agent pool."""
+
+import asyncio
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+
+from backend import AgentPool, AsyncChatDatabase, InMemoryChatStorage, MCPAgent, PoolRejected
+from backend.models import ChatMessage
+
+
+class RecordingModel(GenericFakeChatModel):
+    """받은 메시지 수를 기록하고 delay초 뒤에 답하는 가짜 모델."""
+
+    delay: float = 0.0
+    inputs: list[int] = []
+    running: int = 0
+    peak: int = 0
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.inputs.append(len(messages))
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return self._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def replies():
+    """매번 새 AIMessage (같은 객체를 다시 쓰면 스레드에서 id로 합쳐짐)."""
+    turn = 0
+    while True:
+        turn += 1
+        yield AIMessage(content=f"답변 {turn}")
+
+
+def make_agent(delay: float = 0.0) -> tuple[MCPAgent, RecordingModel]:
+    model = RecordingModel(messages=replies(), delay=delay, inputs=[])
+    agent = MCPAgent(checkpointer=InMemorySaver())
+    agent.agent = create_react_agent(model, [], checkpointer=agent.checkpointer)
+    agent._initialized = True
+    return agent, model
+
+
+@pytest.fixture
+def agent_and_model():
+    return make_agent()
+
+
+async def thread_messages(agent: MCPAgent, session_id: str) -> list:
+    return await agent._load_thread(session_id)
+
+
+class TestSessionThreads:
+    """세션별 그래프 스레드."""
+
+    async def test_only_new_message_sent(self, agent_and_model):
+        agent, model = agent_and_model
+        pool = AgentPool(agent)
+
+        assert await pool.chat("s1", "서울 날씨는?") == "답변 1"
+        assert await pool.chat("s1", "부산은?") == "답변 2"
+
+        # 두 번째 턴의 입력은 스레드에 쌓인 대화 (질문, 답, 새 질문)
+        assert model.inputs == [1, 3]
+        assert len(await thread_messages(agent, "s1")) == 4
+
+    async def test_sessions_isolated(self, agent_and_model):
+        agent, model = agent_and_model
+        pool = AgentPool(agent)
+
+        await pool.chat("s1", "서울 날씨는?")
+        await pool.chat("s2", "부산 날씨는?")
+
+        assert model.inputs == [1, 1]
+        assert pool.stats().threads == 2
+
+    async def test_requires_checkpointer(self):
+        with pytest.raises(ValueError):
+            AgentPool(MCPAgent())
+
+    async def test_seeds_from_storage(self, agent_and_model):
+        """메모리에 없는 세션은 저장소 히스토리로 한 번만 채움."""
+        agent, model = agent_and_model
+        storage = InMemoryChatStorage()
+        session = storage.create_session()
+        storage.add_messages(
+            session.session_id,
+            [
+                ChatMessage(role="user", content="서울 날씨는?"),
+                ChatMessage(role="assistant", content="맑음"),
+            ],
+        )
+        pool = AgentPool(agent, storage=storage)
+
+        await pool.chat(session.session_id, "부산은?")
+        await pool.chat(session.session_id, "제주는?")
+
+        assert model.inputs == [3, 5]
+        assert pool.stats().seeded == 1
+
+    async def test_current_question_not_seeded_twice(self, agent_and_model):
+        """응답 전에 저장된 이번 질문은 히스토리에서 빼고 한 번만 보냄."""
+        agent, model = agent_and_model
+        storage = InMemoryChatStorage()
+        session = storage.create_session()
+        storage.add_messages(
+            session.session_id,
+            [
+                ChatMessage(role="user", content="서울 날씨는?"),
+                ChatMessage(role="assistant", content="맑음"),
+                ChatMessage(role="user", content="부산은?"),
+            ],
+        )
+        pool = AgentPool(agent, storage=storage)
+
+        await pool.chat(session.session_id, "부산은?")
+
+        assert model.inputs == [3]
+        contents = [m.content for m in await thread_messages(agent, session.session_id)]
+        assert contents == ["서울 날씨는?", "맑음", "부산은?", "답변 1"]
+
+    async def test_seeds_from_async_storage(self, agent_and_model):
+        """AsyncChatDatabase를 받으면 먼저 제출된 저장이 끝난 뒤의 히스토리로 채움."""
+        agent, model = agent_and_model
+        storage = InMemoryChatStorage()
+        session = storage.create_session()
+        adb = AsyncChatDatabase(storage)
+        pool = AgentPool(agent, storage=adb)
+
+        save = asyncio.create_task(
+            adb.add_messages(
+                session.session_id,
+                [
+                    ChatMessage(role="user", content="서울 날씨는?"),
+                    ChatMessage(role="assistant", content="맑음"),
+                ],
+            )
+        )
+        await asyncio.sleep(0)  # 저장 작업을 먼저 executor에 제출
+        await pool.chat(session.session_id, "부산은?")
+        await save
+        await adb.close()
+
+        assert model.inputs == [3]
+        assert pool.stats().seeded == 1
+
+    async def test_seeds_most_recent_messages(self, agent_and_model):
+        """seed_limit보다 긴 세션은 가장 최근 메시지로 채움."""
+        agent, _ = agent_and_model
+        storage = InMemoryChatStorage()
+        session = storage.create_session()
+        storage.add_messages(
+            session.session_id,
+            [ChatMessage(role="user", content=f"질문 {i}") for i in range(5)],
+        )
+        pool = AgentPool(agent, storage=storage, seed_limit=2)
+
+        await pool.chat(session.session_id, "마지막 질문")
+
+        contents = [m.content for m in await thread_messages(agent, session.session_id)]
+        assert contents[:3] == ["질문 3", "질문 4", "마지막 질문"]
+
+    async def test_evicted_thread_reseeded(self, agent_and_model):
+        agent, model = agent_and_model
+        storage = InMemoryChatStorage()
+        first, second = storage.create_session(), storage.create_session()
+        pool = AgentPool(agent, storage=storage, max_threads=1)
+
+        for session in (first, second):
+            reply = await pool.chat(session.session_id, "안녕")
+            storage.add_messages(
+                session.session_id,
+                [
+                    ChatMessage(role="user", content="안녕"),
+                    ChatMessage(role="assistant", content=reply),
+                ],
+            )
+
+        assert pool.stats().evictions == 1
+        assert await thread_messages(agent, first.session_id) == []
+
+        model.inputs.clear()
+        await pool.chat(first.session_id, "다시 왔어")
+        assert model.inputs == [3]
+
+    async def test_delete_session_drops_thread(self, agent_and_model):
+        agent, model = agent_and_model
+        pool = AgentPool(agent)
+        await pool.chat("s1", "서울 날씨는?")
+
+        await pool.delete_session("s1")
+
+        assert await thread_messages(agent, "s1") == []
+        assert pool.stats().threads == 0
+        model.inputs.clear()
+        await pool.chat("s1", "부산은?")
+        assert model.inputs == [1]
+
+    async def test_compaction_keeps_messages(self, agent_and_model):
+        agent, model = agent_and_model
+        pool = AgentPool(agent, compact_turns=2)
+        config = {"configurable": {"thread_id": "s1"}}
+
+        for turn in range(4):
+            await pool.chat("s1", f"질문 {turn}")
+
+        checkpoints = [c async for c in agent.checkpointer.alist(config)]
+        assert len(checkpoints) == 1
+        assert len(await thread_messages(agent, "s1")) == 8
+
+        await pool.chat("s1", "질문 4")
+        assert model.inputs[-1] == 9
+
+    async def test_stream(self, agent_and_model):
+        agent, model = agent_and_model
+        pool = AgentPool(agent)
+
+        await pool.chat("s1", "서울 날씨는?")
+        events = [e async for e in pool.astream_chat("s1", "부산은?")]
+
+        assert "".join(e.content for e in events if e.type == "token") == "답변 2"
+        assert len(await thread_messages(agent, "s1")) == 4
+
+
+class TestAdmission:
+    """동시 실행 상한과 수용 제어."""
+
+    async def test_global_limit(self):
+        agent, model = make_agent(0.02)
+        pool = AgentPool(agent, max_concurrency=3, tenant_limit=0)
+
+        await asyncio.gather(*(pool.chat(f"s{i}", "안녕") for i in range(10)))
+
+        assert model.peak == 3
+        assert pool.stats().completed == 10
+
+    async def test_session_serialized(self):
+        """같은 세션의 턴은 차례로 실행되어 스레드에 모두 쌓임."""
+        agent, model = make_agent(0.01)
+        pool = AgentPool(agent, max_concurrency=8)
+
+        await asyncio.gather(*(pool.chat("s1", f"질문 {i}") for i in range(4)))
+
+        assert model.peak == 1
+        assert model.inputs == [1, 3, 5, 7]
+
+    async def test_tenant_limit(self):
+        agent, model = make_agent(0.02)
+        pool = AgentPool(agent, max_concurrency=8, tenant_limit=2)
+
+        await asyncio.gather(*(pool.chat(f"s{i}", "안녕", tenant="t1") for i in range(6)))
+        assert model.peak == 2
+
+        model.peak = 0
+        await asyncio.gather(*(pool.chat(f"a{i}", "안녕", tenant=f"t{i % 3}") for i in range(6)))
+        assert model.peak == 6
+
+    async def test_idle_tenants_released(self):
+        """턴이 모두 끝난(거절 포함) 테넌트의 세마포어는 남지 않음."""
+        agent, _ = make_agent(0.02)
+        pool = AgentPool(agent, max_concurrency=8, queue_timeout=0.01, tenant_limit=1)
+
+        results = await asyncio.gather(
+            *(pool.chat(f"s{i}", "안녕", tenant=f"t{i % 3}") for i in range(6)),
+            return_exceptions=True,
+        )
+
+        assert any(isinstance(r, PoolRejected) for r in results)
+        assert pool._tenants == {}
+
+    async def test_queue_full_rejected(self):
+        agent, _ = make_agent(0.05)
+        pool = AgentPool(agent, max_concurrency=1, max_queue=2, tenant_limit=0)
+
+        results = await asyncio.gather(
+            *(pool.chat(f"s{i}", "안녕") for i in range(5)), return_exceptions=True
+        )
+
+        rejected = [r for r in results if isinstance(r, PoolRejected)]
+        assert len(rejected) == 2
+        stats = pool.stats()
+        assert (stats.completed, stats.rejected, stats.waiting, stats.running) == (3, 2, 0, 0)
+
+    async def test_queue_timeout_releases_slots(self):
+        agent, _ = make_agent(0.1)
+        pool = AgentPool(agent, max_concurrency=1, queue_timeout=0.02, tenant_limit=1)
+
+        first = asyncio.create_task(pool.chat("s1", "안녕", tenant="t1"))
+        await asyncio.sleep(0)
+        with pytest.raises(PoolRejected):
+            await pool.chat("s1", "또 왔어", tenant="t1")
+        await first
+
+        # 거절된 턴이 잡았던 슬롯이 풀려서 다음 턴은 실행됨
+        assert await pool.chat("s1", "다시", tenant="t1") == "답변 2"
+        assert pool.stats().rejected == 1
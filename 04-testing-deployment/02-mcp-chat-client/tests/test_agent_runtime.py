@@ -0,0 +1,219 @@
+"""Tests for the long-lived agent runtime."""
+
+import asyncio
+import threading
+
+import pytest
+
+from backend import AgentRuntime
+from backend.models import AgentEvent
+
+
+class FakeAgent:
+    """초기화한 루프를 기억하는 가짜 에이전트."""
+
+    instances = 0
+
+    def __init__(self) -> None:
+        FakeAgent.instances += 1
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.closed = False
+
+    async def initialize(self) -> None:
+        await asyncio.sleep(0.01)  # MCP 서버 시작 대신
+        self.loop = asyncio.get_running_loop()
+
+    async def chat(self, user_message: str, history=None, session_id=None) -> str:
+        # 루프에 묶인 리소스는 초기화한 루프에서만 사용할 수 있음
+        assert asyncio.get_running_loop() is self.loop
+        return f"{user_message} ({len(history or [])})"
+
+    async def astream_chat(self, user_message: str, history=None, session_id=None):
+        for word in user_message.split():
+            await asyncio.sleep(0)
+            yield AgentEvent(type="token", content=word)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def runtime():
+    FakeAgent.instances = 0
+    rt = AgentRuntime(agent_factory=FakeAgent)
+    yield rt
+    rt.close()
+
+
+class TestAgentRuntime:
+    """백그라운드 이벤트 루프 스레드."""
+
+    def test_agent_reused_across_turns(self, runtime):
+        """여러 턴이 같은 루프와 같은 에이전트를 사용."""
+        assert runtime.chat("안녕") == "안녕 (0)"
+        assert runtime.chat("다시", history=[{"role": "user", "content": "안녕"}]) == "다시 (1)"
+        assert FakeAgent.instances == 1
+
+    def test_concurrent_submit_initializes_once(self, runtime):
+        """여러 스레드에서 동시에 호출해도 에이전트는 한 번만 초기화."""
+        results = []
+
+        def worker(i: int) -> None:
+            results.append(runtime.chat(f"m{i}"))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(results) == sorted(f"m{i} (0)" for i in range(8))
+        assert FakeAgent.instances == 1
+
+    def test_submit_returns_future(self, runtime):
+        """submit은 concurrent Future를 반환하고 예외를 전달."""
+
+        async def fail() -> None:
+            raise ValueError("boom")
+
+        future = runtime.submit(asyncio.sleep(0, result=42))
+        assert future.result(timeout=1) == 42
+        with pytest.raises(ValueError, match="boom"):
+            runtime.run(fail())
+
+    def test_run_timeout_cancels(self, runtime):
+        """시간 초과 시 TimeoutError, 코루틴은 취소됨."""
+        cancelled = threading.Event()
+
+        async def slow() -> None:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            runtime.run(slow(), timeout=0.05)
+        assert cancelled.wait(1)
+
+    def test_run_inside_loop_is_rejected(self, runtime):
+        """루프 스레드 안에서 run()을 호출하면 교착 대신 오류."""
+
+        async def nested() -> None:
+            runtime.run(asyncio.sleep(0))
+
+        with pytest.raises(RuntimeError, match="await"):
+            runtime.run(nested())
+
+    def test_stream_chat(self, runtime):
+        """비동기 이벤트 스트림을 스크립트 스레드에서 동기적으로 순회."""
+        events = list(runtime.stream_chat("서울 날씨 알려줘"))
+        assert [e.content for e in events] == ["서울", "날씨", "알려줘"]
+
+    def test_stream_propagates_errors(self, runtime):
+        """생산자 예외는 이미 받은 항목 다음에 호출자에게 전달."""
+
+        async def items():
+            yield 1
+            raise ValueError("boom")
+
+        received = []
+        with pytest.raises(ValueError, match="boom"):
+            for item in runtime.stream(items()):
+                received.append(item)
+        assert received == [1]
+
+    def test_stream_stopped_early_cancels_producer(self, runtime):
+        """호출자가 중간에 멈추면 생산자도 정리됨."""
+        finished = threading.Event()
+
+        async def endless():
+            try:
+                while True:
+                    yield "tick"
+                    await asyncio.sleep(0.001)
+            finally:
+                finished.set()
+
+        stream = runtime.stream(endless())
+        assert next(stream) == "tick"
+        stream.close()
+        assert finished.wait(1)
+
+    def test_stream_timeout(self, runtime):
+        """다음 항목이 제때 오지 않으면 TimeoutError."""
+
+        async def stalled():
+            await asyncio.sleep(10)
+            yield "late"
+
+        with pytest.raises(TimeoutError):
+            list(runtime.stream(stalled(), timeout=0.05))
+
+    def test_close_releases_agent(self, runtime):
+        """종료 시 에이전트를 정리하고 이후 제출은 거부."""
+        runtime.warm_up().result(timeout=1)
+        agent = runtime.run(runtime.get_agent())
+
+        runtime.close()
+
+        assert agent.closed
+        assert not runtime.is_running
+        with pytest.raises(RuntimeError):
+            runtime.submit(asyncio.sleep(0))
+
+    def test_default_agent_shares_storage(self, monkeypatch):
+        """기본 에이전트는 세션 요약을 런타임 저장소에 보관 (저장소를 따로 열지 않음)."""
+        from backend import InMemoryChatStorage, settings
+
+        monkeypatch.setattr(settings, "context_max_tokens", 1000)
+        storage = InMemoryChatStorage()
+        session = storage.create_session()
+        rt = AgentRuntime(storage=storage)
+        try:
+            agent = rt._agent_factory()
+            agent._init_context_budget()  # initialize()에서 호출 (MCP 서버 시작 없이)
+            assert agent.context_budget._store is storage
+            assert rt.async_storage.database is storage
+        finally:
+            rt.close()
+        # 런타임은 전달받은 저장소를 닫지 않음
+        assert storage.get_session(session.session_id) is not None
+
+    def test_session_turns_use_pool(self, monkeypatch):
+        """풀을 켜면 session_id가 있는 턴은 세션 스레드로 새 메시지만 보냄."""
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        from langgraph.checkpoint.memory import InMemorySaver
+        from langgraph.prebuilt import create_react_agent
+
+        from backend import InMemoryChatStorage, MCPAgent, settings
+
+        class PooledAgent(MCPAgent):
+            async def initialize(self) -> None:
+                replies = (AIMessage(content=f"답변 {i}") for i in range(1, 10))
+                self.agent = create_react_agent(
+                    GenericFakeChatModel(messages=replies), [], checkpointer=self.checkpointer
+                )
+                self._initialized = True
+
+        monkeypatch.setattr(settings, "agent_pool_max_concurrency", 2)
+        rt = AgentRuntime(
+            agent_factory=lambda: PooledAgent(checkpointer=InMemorySaver()),
+            storage=InMemoryChatStorage(),
+        )
+        try:
+            assert rt.chat("안녕", session_id="s1") == "답변 1"
+            assert rt.run(rt.get_pool()).storage is rt.async_storage
+            history = [{"role": "user", "content": "무시됨"}]
+            assert rt.chat("또 왔어", history=history, session_id="s1") == "답변 2"
+
+            stats = rt.pool_stats()
+            assert (stats.completed, stats.threads) == (2, 1)
+            agent = rt.run(rt.get_agent())
+            assert len(rt.run(agent._load_thread("s1"))) == 4
+
+            rt.delete_session("s1")
+            assert rt.run(agent._load_thread("s1")) == []
+        finally:
+            rt.close()
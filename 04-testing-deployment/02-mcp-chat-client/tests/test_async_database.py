@@ -0,0 +1,88 @@
+"""AsyncChatDatabase tests for MCP Chat Client."""
+
+import asyncio
+import threading
+
+import pytest
+
+from backend import AsyncChatDatabase, ChatDatabase, ChatMessage, ChatSession
+
+
+@pytest.fixture
+async def async_db(tmp_path):
+    """임시 비동기 데이터베이스를 생성합니다."""
+    async with AsyncChatDatabase(db_path=str(tmp_path / "async.db")) as db:
+        yield db
+
+
+class TestAsyncChatDatabase:
+    """AsyncChatDatabase 클래스 테스트."""
+
+    async def test_session_lifecycle(self, async_db):
+        """세션 생성/조회/삭제."""
+        session = await async_db.create_session(title="Async")
+        assert isinstance(session, ChatSession)
+
+        retrieved = await async_db.get_session(session.session_id)
+        assert retrieved.title == "Async"
+
+        await async_db.delete_session(session.session_id)
+        assert await async_db.get_session(session.session_id) is None
+
+    async def test_add_and_get_messages(self, async_db):
+        """메시지 추가 및 조회."""
+        session = await async_db.create_session()
+        await async_db.add_message(session.session_id, ChatMessage(role="user", content="Q"))
+        await async_db.add_messages(
+            session.session_id, [ChatMessage(role="assistant", content="A")]
+        )
+
+        messages = await async_db.get_messages(session.session_id)
+        assert [m.content for m in messages] == ["Q", "A"]
+        assert len(await async_db.list_sessions()) == 1
+
+    async def test_calls_run_off_event_loop_thread(self, async_db):
+        """DB 호출은 이벤트 루프 스레드가 아닌 전용 스레드에서 실행."""
+        loop_thread = threading.get_ident()
+        db_thread = await async_db._run(threading.get_ident)
+        assert db_thread != loop_thread
+
+    async def test_submission_order_is_preserved(self, async_db):
+        """완료를 기다리지 않은 쓰기도 이후에 제출된 읽기보다 먼저 실행."""
+        session = await async_db.create_session()
+        writes = [
+            asyncio.ensure_future(
+                async_db.add_message(session.session_id, ChatMessage(role="user", content=str(i)))
+            )
+            for i in range(5)
+        ]
+        await asyncio.sleep(0)  # 태스크들이 executor에 제출되도록 한 번 양보
+        messages = await async_db.get_messages(session.session_id)
+        await asyncio.gather(*writes)
+
+        assert len(messages) == 5
+
+    async def test_wraps_existing_database(self, tmp_path):
+        """기존 ChatDatabase를 감싸면 닫지 않음."""
+        db = ChatDatabase(db_path=str(tmp_path / "shared.db"))
+        try:
+            async with AsyncChatDatabase(db) as async_db:
+                session = await async_db.create_session(title="Shared")
+
+            # 래퍼 종료 후에도 원본은 사용 가능
+            assert db.get_session(session.session_id).title == "Shared"
+        finally:
+            db.close()
+
+    async def test_iter_messages(self, async_db):
+        """비동기 키셋 순회."""
+        session = await async_db.create_session()
+        await async_db.add_messages(
+            session.session_id,
+            [ChatMessage(role="user", content=str(i)) for i in range(5)],
+        )
+
+        contents = [
+            m.content async for m in async_db.iter_messages(session.session_id, batch_size=2)
+        ]
+        assert contents == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,212 @@
+"""Tests for the read-through storage cache."""
+
+import pytest
+
+from backend import CachedChatStorage, ChatDatabase, ChatMessage, InMemoryChatStorage
+from backend.cache import MISSING, TTLCache
+
+
+class FakeClock:
+    """수동으로 진행하는 시계."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def user(content: str) -> ChatMessage:
+    return ChatMessage(role="user", content=content)
+
+
+class TestTTLCache:
+    """LRU + TTL 캐시."""
+
+    def test_lru_eviction(self):
+        """용량을 넘으면 가장 오래 사용하지 않은 항목부터 제거."""
+        cache = TTLCache(maxsize=2, ttl=None)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # a를 최근 사용으로
+        cache.set("c", 3)
+
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats().evictions == 1
+
+    def test_ttl_expiry(self):
+        """TTL이 지나면 실패로 처리."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+        cache.set("a", None)  # None도 캐시 가능한 값
+
+        clock.now = 9.9
+        assert cache.get("a") is None
+        clock.now = 10
+        assert cache.get("a") is MISSING
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.expirations, stats.size) == (1, 1, 1, 0)
+
+    def test_per_entry_ttl(self):
+        """항목별 TTL이 캐시 기본값보다 우선."""
+        clock = FakeClock()
+        cache = TTLCache(maxsize=4, ttl=None, clock=clock)
+        cache.set("pure", 1)
+        cache.set("forecast", 2, ttl=5)
+
+        clock.now = 5
+        assert cache.get("forecast") is MISSING
+        assert cache.get("pure") == 1
+
+    def test_invalidate_by_tag(self):
+        """태그가 붙은 항목만 제거."""
+        cache = TTLCache(maxsize=8, ttl=None)
+        cache.set("s1", 1, tags=["session-1"])
+        cache.set("m1", 2, tags=["session-1"])
+        cache.set("s2", 3, tags=["session-2"])
+
+        assert cache.invalidate("session-1") == 2
+        assert cache.get("s1") is MISSING
+        assert cache.get("s2") == 3
+
+    def test_stale_set_is_dropped(self):
+        """조회 도중 무효화가 있었으면 오래된 값은 저장하지 않음."""
+        cache = TTLCache(maxsize=8, ttl=None)
+        generation = cache.generation
+        cache.invalidate("session-1")  # 조회 중 다른 스레드의 쓰기
+
+        cache.set("s1", "stale", tags=["session-1"], generation=generation)
+        assert cache.get("s1") is MISSING
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            TTLCache(maxsize=0)
+
+
+class CountingStorage(InMemoryChatStorage):
+    """저장소 조회 횟수를 세는 메모리 저장소."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    def get_session(self, session_id):
+        self.reads += 1
+        return super().get_session(session_id)
+
+    def get_messages(self, session_id, limit=100):
+        self.reads += 1
+        return super().get_messages(session_id, limit)
+
+    def get_messages_for_sessions(self, session_ids, per_session_limit=100):
+        reads = self.reads  # 내부의 get_messages 호출은 세지 않음
+        result = super().get_messages_for_sessions(session_ids, per_session_limit)
+        self.reads = reads + 1
+        return result
+
+    def list_sessions(self, limit=50, order_by="updated_at"):
+        self.reads += 1
+        return super().list_sessions(limit, order_by)
+
+
+@pytest.fixture
+def backend():
+    return CountingStorage()
+
+
+@pytest.fixture
+def db(backend):
+    return CachedChatStorage(backend, maxsize=64, ttl=None)
+
+
+class TestCachedChatStorage:
+    """쓰기 시 무효화되는 조회 캐시."""
+
+    def test_repeated_reads_hit_cache(self, db, backend):
+        """같은 조회는 저장소를 한 번만 읽음."""
+        session = db.create_session("캐시")
+        for _ in range(5):
+            db.get_session(session.session_id)
+            db.get_messages(session.session_id)
+
+        assert backend.reads == 2
+        stats = db.cache_stats()
+        assert (stats.hits, stats.misses) == (8, 2)
+        assert stats.hit_rate == 0.8
+
+    def test_add_message_invalidates_session(self, db):
+        """메시지를 추가하면 메시지 수와 목록이 바로 반영됨."""
+        session = db.create_session()
+        assert db.get_session(session.session_id).message_count == 0
+        assert db.get_messages(session.session_id) == []
+        assert db.list_sessions()[0].message_count == 0
+
+        db.add_message(session.session_id, user("안녕"))
+
+        assert db.get_session(session.session_id).message_count == 1
+        assert [m.content for m in db.get_messages(session.session_id)] == ["안녕"]
+        assert db.list_sessions()[0].message_count == 1
+        assert db.stats().total_messages == 1
+
+    def test_write_keeps_other_sessions_cached(self, db, backend):
+        """다른 세션의 캐시 항목은 유지."""
+        first = db.create_session()
+        second = db.create_session()
+        db.get_messages(first.session_id)
+        reads = backend.reads
+
+        db.add_message(second.session_id, user("다른 세션"))
+        db.get_messages(first.session_id)
+
+        assert backend.reads == reads
+
+    def test_delete_session_invalidates(self, db):
+        """삭제된 세션은 더 이상 보이지 않음."""
+        session = db.create_session()
+        db.get_session(session.session_id)
+        assert len(db.list_sessions()) == 1
+
+        db.delete_session(session.session_id)
+
+        assert db.get_session(session.session_id) is None
+        assert db.list_sessions() == []
+
+    def test_bulk_messages_share_entries(self, db, backend):
+        """일괄 조회는 캐시에 없는 세션만 저장소에 요청하고 get_messages와 항목을 공유."""
+        ids = [db.create_session().session_id for _ in range(3)]
+        db.add_message(ids[0], user("첫 번째"))
+        db.get_messages(ids[0])
+        reads = backend.reads
+
+        result = db.get_messages_for_sessions(ids)
+        assert [m.content for m in result[ids[0]]] == ["첫 번째"]
+        assert result[ids[1]] == [] and result[ids[2]] == []
+        assert backend.reads == reads + 1
+
+        db.get_messages(ids[2])
+        db.get_messages_for_sessions(ids)
+        assert backend.reads == reads + 1
+
+    def test_returned_lists_are_copies(self, db):
+        """반환된 리스트를 수정해도 캐시는 바뀌지 않음."""
+        session = db.create_session()
+        db.get_messages(session.session_id).append(user("밖에서 추가"))
+        assert db.get_messages(session.session_id) == []
+
+    def test_bulk_write_methods_clear_cache(self, tmp_path):
+        """ChatDatabase 전용 쓰기(prune 등)는 전달 후 캐시를 비움."""
+        from backend import RetentionPolicy
+
+        db = CachedChatStorage(ChatDatabase(db_path=str(tmp_path / "chat.db")), ttl=None)
+        for _ in range(3):
+            db.create_session()
+        assert len(db.list_sessions()) == 3
+
+        db.prune(RetentionPolicy(max_sessions=1))
+
+        assert len(db.list_sessions()) == 1
+        db.flush()  # 나머지 메서드는 그대로 전달
+        db.close()
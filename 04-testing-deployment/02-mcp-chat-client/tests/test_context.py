@@ -0,0 +1,196 @@
+"""Tests for token-budgeted conversation context."""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from backend import ContextBudget, InMemoryChatStorage
+from backend.context import SUMMARY_PREFIX, approx_tokens, get_tokenizer
+
+
+class FakeSummarizer:
+    """호출 기록을 남기고 짧은 누적 요약을 돌려주는 가짜 요약기."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[tuple[str | None, int]] = []
+        self.fail = fail
+
+    async def __call__(self, summary, messages) -> str:
+        self.calls.append((summary, len(messages)))
+        if self.fail:
+            raise RuntimeError("LLM 연결 실패")
+        return f"요약{len(self.calls)}"
+
+
+def words(n: int) -> str:
+    """approx 토크나이저 기준 n토큰짜리 문자열."""
+    return "abcd" * n
+
+
+def make_history(turns: int, tokens: int = 50) -> list[dict[str, str]]:
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"q{i:03d}" + words(tokens)})
+        history.append({"role": "assistant", "content": f"a{i:03d}" + words(tokens)})
+    return history
+
+
+@pytest.fixture
+def store():
+    storage = InMemoryChatStorage()
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def session_id(store):
+    return store.create_session().session_id
+
+
+class TestTokenizer:
+    def test_approx_tokens(self):
+        assert approx_tokens("") == 0
+        assert approx_tokens("abcd" * 10) == 10
+        assert approx_tokens("안녕하세요") == 5
+
+    def test_get_tokenizer(self):
+        assert get_tokenizer("approx") is approx_tokens
+        with pytest.raises(ValueError):
+            get_tokenizer("sentencepiece")
+
+    def test_tiktoken(self):
+        pytest.importorskip("tiktoken")
+        try:
+            count = get_tokenizer("tiktoken")
+            assert count("hello world") == 2
+        except Exception as e:  # 인코딩 파일을 내려받을 수 없는 환경
+            pytest.skip(f"tiktoken 인코딩 사용 불가: {e}")
+
+
+class TestContextBudget:
+    """예산 안에서 요약 + 최근 메시지 + 질문 구성."""
+
+    async def test_short_history_sent_as_is(self, store, session_id):
+        """예산 안이면 요약 없이 히스토리 전체."""
+        summarizer = FakeSummarizer()
+        budget = ContextBudget(summarizer, store=store, max_tokens=2000)
+        history = make_history(3)
+
+        context = await budget.build("질문", history, session_id)
+
+        assert len(context.messages) == 7
+        assert isinstance(context.messages[0], HumanMessage)
+        assert isinstance(context.messages[1], AIMessage)
+        assert context.messages[-1].content == "질문"
+        assert summarizer.calls == []
+        assert context.stats.saved_tokens == 0
+
+    async def test_long_history_summarized_within_budget(self, store, session_id):
+        """예산을 넘으면 앞쪽을 요약하고 최근 메시지는 원문 유지."""
+        summarizer = FakeSummarizer()
+        budget = ContextBudget(summarizer, store=store, max_tokens=1000)
+        history = make_history(20)  # 40개 × 약 56토큰
+
+        context = await budget.build("질문", history, session_id)
+
+        assert len(summarizer.calls) == 1
+        assert isinstance(context.messages[0], SystemMessage)
+        assert context.messages[0].content == SUMMARY_PREFIX + "요약1"
+        assert context.messages[-2].content == history[-1]["content"]
+        assert context.stats.prompt_tokens <= 1000
+        assert context.stats.history_tokens > 2000
+        assert context.stats.summaries_created == 1
+
+        summary = store.get_summary(session_id)
+        assert summary.covered_messages == context.stats.summarized_messages
+        assert len(context.messages) == 1 + (40 - summary.covered_messages) + 1
+
+    async def test_summary_reused_incrementally(self, store, session_id):
+        """다음 턴에는 저장된 요약을 재사용하고, 다시 넘칠 때 이어서 요약."""
+        summarizer = FakeSummarizer()
+        budget = ContextBudget(summarizer, store=store, max_tokens=1000)
+        history = make_history(20)
+
+        await budget.build("질문", history, session_id)
+        covered = store.get_summary(session_id).covered_messages
+
+        # 한 턴 추가: 아직 예산 안 (keep_recent 덕분에 여유가 있음)
+        history += make_history(1)
+        context = await budget.build("다음", history, session_id)
+        assert len(summarizer.calls) == 1
+        assert context.messages[0].content == SUMMARY_PREFIX + "요약1"
+        assert context.stats.summarized_messages == covered
+
+        # 계속 늘어나면 기존 요약에 새 메시지만 합침
+        history += make_history(10)
+        context = await budget.build("또", history, session_id)
+        assert len(summarizer.calls) == 2
+        previous, new_messages = summarizer.calls[1]
+        assert previous == "요약1"
+        assert new_messages < len(history) - covered
+        assert store.get_summary(session_id).covered_messages > covered
+        assert context.stats.prompt_tokens <= 1000
+
+    async def test_mismatched_summary_ignored(self, store, session_id):
+        """저장된 요약이 현재 히스토리와 다르면 무시하고 새로 요약."""
+        summarizer = FakeSummarizer()
+        budget = ContextBudget(summarizer, store=store, max_tokens=1000)
+        history = make_history(20)
+        await budget.build("질문", history, session_id)
+
+        edited = make_history(20, tokens=51)
+        await budget.build("질문", edited, session_id)
+
+        assert len(summarizer.calls) == 2
+        assert summarizer.calls[1][0] is None
+
+    async def test_summarizer_failure_falls_back_to_truncation(self, store, session_id):
+        """요약에 실패하면 오래된 메시지를 잘라 예산을 지킴."""
+        budget = ContextBudget(FakeSummarizer(fail=True), store=store, max_tokens=1000)
+        history = make_history(20)
+
+        context = await budget.build("질문", history, session_id)
+
+        assert not any(isinstance(m, SystemMessage) for m in context.messages)
+        assert context.stats.prompt_tokens <= 1000
+        assert context.stats.dropped_messages > 0
+        assert context.messages[-2].content == history[-1]["content"]
+        assert store.get_summary(session_id) is None
+
+    async def test_without_session_truncates(self):
+        """session_id가 없으면 요약하지 않고 잘라냄."""
+        summarizer = FakeSummarizer()
+        budget = ContextBudget(summarizer, max_tokens=500)
+
+        context = await budget.build("질문", make_history(20))
+
+        assert summarizer.calls == []
+        assert context.stats.prompt_tokens <= 500
+
+    async def test_store_without_summaries_uses_memory(self):
+        """요약 메서드가 없는 저장소면 프로세스 메모리에 보관."""
+        summarizer = FakeSummarizer()
+        budget = ContextBudget(summarizer, store=object(), max_tokens=1000)
+        history = make_history(20)
+
+        await budget.build("질문", history, "s1")
+        await budget.build("질문", history + make_history(1), "s1")
+
+        assert len(summarizer.calls) == 1
+
+    async def test_totals(self, store, session_id):
+        budget = ContextBudget(FakeSummarizer(), store=store, max_tokens=1000)
+        history = make_history(20)
+
+        await budget.build("질문", history, session_id)
+        await budget.build("질문", history, session_id)
+
+        totals = budget.totals()
+        assert totals.turns == 2
+        assert totals.summaries_created == 1
+        assert 0.5 < totals.savings_rate < 1
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            ContextBudget(FakeSummarizer(), max_tokens=0)
+        with pytest.raises(ValueError):
+            ContextBudget(FakeSummarizer(), keep_recent=1.0)
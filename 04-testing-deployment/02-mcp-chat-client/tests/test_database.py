@@ -1,12 +1,16 @@
 """Database tests for MCP Chat Client."""
 
+import sqlite3
 import tempfile
-from datetime import datetime
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import pytest
 
-from backend import ChatDatabase, ChatMessage, ChatSession
+from backend import ChatDatabase, ChatMessage, ChatSession, RetentionPolicy
+from backend.models import SessionSummary
+from backend.migrations import SCHEMA_VERSION, get_schema_version, migrate
 
 
 @pytest.fixture
@@ -188,3 +192,656 @@ class TestChatDatabase:
         assert sessions[0].session_id == session3.session_id
         assert sessions[1].session_id == session2.session_id
         assert sessions[2].session_id == session1.session_id
+
+
+class TestSchemaMigrations:
+    """스키마 마이그레이션 및 저장 엔진 설정 테스트."""
+
+    def test_schema_version_is_latest(self, temp_db):
+        """새 데이터베이스는 최신 스키마 버전으로 생성."""
+        with temp_db.pool.reader() as conn:
+            assert get_schema_version(conn) == SCHEMA_VERSION
+
+    def test_query_indexes_exist(self, temp_db):
+        """조회용 인덱스 생성 확인."""
+        with temp_db.pool.reader() as conn:
+            indexes = {
+                row["name"]
+                for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+
+        assert "idx_messages_session_timestamp" in indexes
+        assert "idx_sessions_updated_at" in indexes
+
+    def test_get_messages_uses_index(self, temp_db):
+        """get_messages 쿼리가 풀 스캔 대신 인덱스를 사용."""
+        with temp_db.pool.reader() as conn:
+            plan = " ".join(
+                row["detail"]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM messages "
+                    "WHERE session_id = ? ORDER BY timestamp ASC LIMIT 100",
+                    ("any",),
+                )
+            )
+
+        assert "idx_messages_session_timestamp" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_wal_journal_mode(self, temp_db):
+        """WAL 저널 모드 적용 확인."""
+        with temp_db.pool.reader() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_upgrade_existing_database(self, tmp_path):
+        """v1 스키마의 기존 데이터베이스를 데이터 손실 없이 업그레이드."""
+        db_path = tmp_path / "legacy.db"
+        conn = sqlite3.connect(db_path)
+        migrate(conn, target_version=1)
+        conn.execute(
+            "INSERT INTO sessions (session_id, title, created_at, updated_at, message_count) "
+            "VALUES ('legacy', 'Legacy', ?, ?, 0)",
+            (datetime.now(), datetime.now()),
+        )
+        conn.commit()
+        conn.close()
+
+        db = ChatDatabase(db_path=str(db_path))
+        try:
+            with db.pool.reader() as conn:
+                assert get_schema_version(conn) == SCHEMA_VERSION
+            assert db.get_session("legacy").title == "Legacy"
+        finally:
+            db.close()
+
+
+class TestBatchedWrites:
+    """배치 메시지 추가 및 write-behind 모드 테스트."""
+
+    def test_add_messages(self, temp_db):
+        """여러 메시지를 한 번에 추가."""
+        session = temp_db.create_session(title="Batch")
+        temp_db.add_messages(
+            session.session_id,
+            [
+                ChatMessage(role="user", content="Q", session_id=session.session_id),
+                ChatMessage(role="assistant", content="A", session_id=session.session_id),
+            ],
+        )
+
+        messages = temp_db.get_messages(session.session_id)
+        assert [m.content for m in messages] == ["Q", "A"]
+        assert temp_db.get_session(session.session_id).message_count == 2
+
+    def test_add_messages_empty(self, temp_db):
+        """빈 목록은 아무 것도 하지 않음."""
+        session = temp_db.create_session(title="Empty")
+        temp_db.add_messages(session.session_id, [])
+        assert temp_db.get_session(session.session_id).message_count == 0
+
+    def test_durability_sets_synchronous(self, tmp_path):
+        """durability 옵션이 PRAGMA synchronous에 반영됨."""
+        db = ChatDatabase(db_path=str(tmp_path / "full.db"), durability="full")
+        try:
+            # 0=OFF, 1=NORMAL, 2=FULL
+            with db.pool.writer() as conn:
+                assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+        finally:
+            db.close()
+
+    def test_write_behind_flushes_on_size(self, tmp_path):
+        """flush_size에 도달하면 백그라운드에서 기록."""
+        db = ChatDatabase(
+            db_path=str(tmp_path / "wb.db"), write_behind=True, flush_size=2, flush_interval=60
+        )
+        try:
+            session = db.create_session(title="WB")
+            db.add_message(session.session_id, ChatMessage(role="user", content="1"))
+            db.add_message(session.session_id, ChatMessage(role="assistant", content="2"))
+
+            # 백그라운드 flush 대기
+            deadline = time.monotonic() + 5
+            while len(db._buffer) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert len(db._buffer) == 0
+        finally:
+            db.close()
+
+    def test_write_behind_read_your_writes(self, tmp_path):
+        """버퍼에 남은 메시지도 조회 시 보임."""
+        db = ChatDatabase(
+            db_path=str(tmp_path / "wb.db"), write_behind=True, flush_size=1000, flush_interval=60
+        )
+        try:
+            s1 = db.create_session(title="A")
+            s2 = db.create_session(title="B")
+            db.add_message(s1.session_id, ChatMessage(role="user", content="a"))
+            db.add_message(s2.session_id, ChatMessage(role="user", content="b"))
+
+            assert [m.content for m in db.get_messages(s1.session_id)] == ["a"]
+            assert db.get_session(s2.session_id).message_count == 1
+        finally:
+            db.close()
+
+    def test_write_behind_close_flushes(self, tmp_path):
+        """close 시 남은 메시지를 기록."""
+        db_path = str(tmp_path / "wb.db")
+        db = ChatDatabase(db_path=db_path, write_behind=True, flush_size=1000, flush_interval=60)
+        session = db.create_session(title="Close")
+        db.add_message(session.session_id, ChatMessage(role="user", content="pending"))
+        db.close()
+
+        reopened = ChatDatabase(db_path=db_path)
+        try:
+            assert len(reopened.get_messages(session.session_id)) == 1
+        finally:
+            reopened.close()
+
+
+class TestKeysetPagination:
+    """키셋 페이지네이션 및 스트리밍 순회 테스트."""
+
+    def _add_messages(self, db, session_id, count):
+        db.add_messages(
+            session_id,
+            [ChatMessage(role="user", content=f"m{i}") for i in range(count)],
+        )
+
+    def test_get_messages_page(self, temp_db):
+        """커서를 따라가면 모든 메시지를 순서대로 한 번씩 조회."""
+        session = temp_db.create_session()
+        self._add_messages(temp_db, session.session_id, 7)
+
+        contents = []
+        cursor = None
+        pages = 0
+        while True:
+            page = temp_db.get_messages_page(session.session_id, limit=3, after=cursor)
+            contents += [m.content for m in page.messages]
+            pages += 1
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert contents == [f"m{i}" for i in range(7)]
+        assert pages == 3
+
+    def test_same_timestamp_messages_are_not_skipped(self, temp_db):
+        """타임스탬프가 같아도 id로 구분하여 누락/중복 없음."""
+        session = temp_db.create_session()
+        same_time = datetime(2025, 1, 1, 12, 0, 0)
+        temp_db.add_messages(
+            session.session_id,
+            [ChatMessage(role="user", content=str(i), timestamp=same_time) for i in range(5)],
+        )
+
+        contents = [m.content for m in temp_db.iter_messages(session.session_id, batch_size=2)]
+        assert contents == ["0", "1", "2", "3", "4"]
+
+    def test_iter_messages_beyond_limit(self, temp_db):
+        """iter_messages는 get_messages의 100개 제한 없이 전부 순회."""
+        session = temp_db.create_session()
+        self._add_messages(temp_db, session.session_id, 250)
+
+        assert len(temp_db.get_messages(session.session_id)) == 100
+        assert sum(1 for _ in temp_db.iter_messages(session.session_id, batch_size=64)) == 250
+
+    def test_iter_messages_is_lazy(self, temp_db):
+        """iter_messages는 제너레이터로 필요한 만큼만 조회."""
+        session = temp_db.create_session()
+        self._add_messages(temp_db, session.session_id, 10)
+
+        iterator = temp_db.iter_messages(session.session_id, batch_size=3)
+        assert next(iterator).content == "m0"
+
+    def test_list_sessions_page_and_iter_sessions(self, temp_db):
+        """세션 키셋 페이지네이션 (최신순)."""
+        created = [temp_db.create_session(title=f"S{i}") for i in range(5)]
+
+        first = temp_db.list_sessions_page(limit=2)
+        second = temp_db.list_sessions_page(limit=2, after=first.next_cursor)
+
+        assert [s.title for s in first.sessions] == ["S4", "S3"]
+        assert [s.title for s in second.sessions] == ["S2", "S1"]
+
+        all_ids = [s.session_id for s in temp_db.iter_sessions(batch_size=2)]
+        assert all_ids == [s.session_id for s in reversed(created)]
+
+
+class TestFullTextSearch:
+    """전문 검색 테스트."""
+
+    @pytest.fixture
+    def populated_db(self, temp_db):
+        weather = temp_db.create_session(title="Weather")
+        calc = temp_db.create_session(title="Calc")
+        temp_db.add_messages(
+            weather.session_id,
+            [
+                ChatMessage(role="user", content="서울 날씨는 어때?"),
+                ChatMessage(role="assistant", content="서울은 현재 맑고 15도입니다."),
+            ],
+        )
+        temp_db.add_messages(
+            calc.session_id,
+            [
+                ChatMessage(role="user", content="5 + 3을 계산해줘"),
+                ChatMessage(role="assistant", content="계산 결과는 8입니다. 서울과는 무관합니다."),
+            ],
+        )
+        return temp_db, weather, calc
+
+    def test_search_returns_snippets(self, populated_db):
+        """검색 결과에 강조된 발췌와 세션 제목 포함."""
+        db, weather, _ = populated_db
+        results = db.search("날씨")
+
+        assert len(results) == 1
+        assert results[0].session_id == weather.session_id
+        assert results[0].session_title == "Weather"
+        assert "**날씨는**" in results[0].snippet
+
+    def test_search_across_sessions(self, populated_db):
+        """여러 세션에 걸친 검색."""
+        db, _, _ = populated_db
+        assert {r.session_title for r in db.search("서울")} == {"Weather", "Calc"}
+
+    def test_search_within_session(self, populated_db):
+        """session_id로 범위 제한."""
+        db, _, calc = populated_db
+        results = db.search("서울", session_id=calc.session_id)
+        assert [r.session_id for r in results] == [calc.session_id]
+
+    def test_multiple_terms_are_anded(self, populated_db):
+        """여러 단어는 모두 포함해야 매칭."""
+        db, _, _ = populated_db
+        assert len(db.search("서울 맑고")) == 1
+        assert db.search("서울 존재하지않는단어") == []
+
+    def test_fts_operators_are_escaped(self, populated_db):
+        """FTS 문법 문자가 들어가도 오류 없음."""
+        db, _, _ = populated_db
+        assert db.search('"계산 AND (') is not None
+        assert db.search("   ") == []
+
+    def test_deleted_messages_are_not_found(self, populated_db):
+        """삭제된 세션의 메시지는 검색되지 않음 (트리거 동기화)."""
+        db, weather, _ = populated_db
+        db.delete_session(weather.session_id)
+        assert db.search("날씨") == []
+
+
+class TestStatsAndOrdering:
+    """SQL 집계 통계 및 서버 측 정렬 테스트."""
+
+    def test_stats_covers_all_sessions(self, temp_db):
+        """기본 list_sessions 제한(50개)을 넘어도 전체 집계."""
+        for i in range(60):
+            session = temp_db.create_session(title=f"S{i}")
+            temp_db.add_messages(
+                session.session_id,
+                [ChatMessage(role="user", content="x") for _ in range(i % 3)],
+            )
+
+        stats = temp_db.stats()
+
+        assert stats.total_sessions == 60
+        assert stats.total_messages == sum(i % 3 for i in range(60))
+        assert stats.avg_messages_per_session == pytest.approx(stats.total_messages / 60)
+        assert stats.max_messages_per_session == 2
+
+    def test_stats_daily_counts(self, temp_db):
+        """최근 일별 세션/메시지 수 집계."""
+        session = temp_db.create_session()
+        temp_db.add_messages(
+            session.session_id,
+            [
+                ChatMessage(role="user", content="today"),
+                ChatMessage(
+                    role="user", content="old", timestamp=datetime.now() - timedelta(days=400)
+                ),
+            ],
+        )
+
+        stats = temp_db.stats(days=7)
+
+        assert len(stats.daily) == 7
+        assert stats.daily[-1].day == date.today()
+        assert stats.daily[-1].sessions == 1
+        assert stats.daily[-1].messages == 1
+        assert sum(d.messages for d in stats.daily) == 1
+
+    def test_stats_empty_database(self, temp_db):
+        """빈 데이터베이스 통계."""
+        stats = temp_db.stats()
+        assert stats.total_sessions == 0
+        assert stats.avg_messages_per_session == 0.0
+
+    def test_list_sessions_order_by(self, temp_db):
+        """정렬 기준별 세션 순서."""
+        first = temp_db.create_session(title="first")
+        second = temp_db.create_session(title="second")
+        third = temp_db.create_session(title="third")
+        temp_db.add_messages(
+            first.session_id, [ChatMessage(role="user", content="x") for _ in range(3)]
+        )
+        temp_db.add_message(third.session_id, ChatMessage(role="user", content="y"))
+
+        def titles(order_by):
+            return [s.title for s in temp_db.list_sessions(order_by=order_by)]
+
+        assert titles("updated_at") == ["third", "first", "second"]
+        assert titles("created_at") == ["third", "second", "first"]
+        assert titles("created_at_asc") == ["first", "second", "third"]
+        assert titles("message_count") == ["first", "third", "second"]
+        assert temp_db.list_sessions(order_by="message_count")[-1].session_id == second.session_id
+
+    def test_list_sessions_invalid_order_by(self, temp_db):
+        """지원하지 않는 정렬 기준은 ValueError."""
+        with pytest.raises(ValueError):
+            temp_db.list_sessions(order_by="title; DROP TABLE sessions")
+
+
+class TestBulkMessages:
+    """여러 세션 메시지 일괄 조회 테스트."""
+
+    def test_get_messages_for_sessions(self, temp_db):
+        """세션별 메시지를 한 번에 조회하고 세션당 개수 제한 적용."""
+        s1 = temp_db.create_session(title="A")
+        s2 = temp_db.create_session(title="B")
+        empty = temp_db.create_session(title="Empty")
+        temp_db.add_messages(
+            s1.session_id, [ChatMessage(role="user", content=f"a{i}") for i in range(5)]
+        )
+        temp_db.add_messages(
+            s2.session_id, [ChatMessage(role="user", content=f"b{i}") for i in range(2)]
+        )
+
+        result = temp_db.get_messages_for_sessions(
+            [s1.session_id, s2.session_id, empty.session_id], per_session_limit=3
+        )
+
+        assert [m.content for m in result[s1.session_id]] == ["a0", "a1", "a2"]
+        assert [m.content for m in result[s2.session_id]] == ["b0", "b1"]
+        assert result[empty.session_id] == []
+
+    def test_matches_get_messages(self, temp_db):
+        """세션별 get_messages와 같은 결과."""
+        session = temp_db.create_session()
+        temp_db.add_messages(
+            session.session_id, [ChatMessage(role="user", content=str(i)) for i in range(10)]
+        )
+
+        bulk = temp_db.get_messages_for_sessions([session.session_id], per_session_limit=100)
+        assert bulk[session.session_id] == temp_db.get_messages(session.session_id)
+
+    def test_many_sessions_are_chunked(self, temp_db, monkeypatch):
+        """바인딩 제한을 넘는 세션 수는 나눠서 조회."""
+        monkeypatch.setattr(ChatDatabase, "BULK_QUERY_CHUNK", 2)
+        sessions = [temp_db.create_session() for _ in range(5)]
+        for session in sessions:
+            temp_db.add_message(session.session_id, ChatMessage(role="user", content="x"))
+
+        result = temp_db.get_messages_for_sessions([s.session_id for s in sessions])
+        assert all(len(messages) == 1 for messages in result.values())
+
+    def test_empty_input(self, temp_db):
+        """빈 목록 입력."""
+        assert temp_db.get_messages_for_sessions([]) == {}
+
+
+class TestRetentionAndCompaction:
+    """연쇄 삭제, 보존 정책, 컴팩션 테스트."""
+
+    def _backdate(self, db, session_id, days):
+        """세션의 마지막 활동 시각을 과거로 옮김."""
+        with db.pool.writer() as conn:
+            conn.execute(
+                "UPDATE sessions SET updated_at = ? WHERE session_id = ?",
+                (datetime.now() - timedelta(days=days), session_id),
+            )
+
+    def test_foreign_keys_enabled(self, temp_db):
+        """모든 연결에서 외래 키 제약 활성화."""
+        with temp_db.pool.writer() as conn:
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        with temp_db.pool.reader() as conn:
+            assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    def test_delete_cascades_to_messages_and_search(self, temp_db):
+        """세션 삭제 시 메시지와 검색 색인이 함께 삭제."""
+        session = temp_db.create_session()
+        temp_db.add_message(session.session_id, ChatMessage(role="user", content="cascade"))
+
+        with temp_db.pool.writer() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session.session_id,))
+
+        with temp_db.pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+        assert temp_db.search("cascade") == []
+
+    def test_messages_for_deleted_session_are_dropped(self, tmp_path):
+        """write-behind 버퍼에 남은 삭제된 세션 메시지는 버려짐."""
+        db = ChatDatabase(db_path=str(tmp_path / "wb.db"), write_behind=True, flush_interval=60)
+        kept = db.create_session()
+        gone = db.create_session()
+        db.add_message(kept.session_id, ChatMessage(role="user", content="keep"))
+        db.add_message(gone.session_id, ChatMessage(role="user", content="drop"))
+
+        with db.pool.writer() as conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (gone.session_id,))
+
+        db.flush()
+        assert [m.content for m in db.get_messages(kept.session_id)] == ["keep"]
+        assert db.get_messages(gone.session_id) == []
+        db.close()
+
+    def test_upgrade_removes_orphans_and_adds_cascade(self, tmp_path):
+        """v5 DB 업그레이드 시 고아 메시지 정리 및 CASCADE 적용."""
+        db_path = tmp_path / "v5.db"
+        conn = sqlite3.connect(db_path)
+        migrate(conn, target_version=5)
+        now = datetime.now()
+        conn.execute("INSERT INTO sessions VALUES ('s1', 't', ?, ?, 1)", (now, now))
+        conn.execute(
+            "INSERT INTO messages (session_id, role, content, timestamp) VALUES ('s1', 'user', 'kept', ?)",
+            (now,),
+        )
+        conn.execute(
+            "INSERT INTO messages (session_id, role, content, timestamp) VALUES ('orphan', 'user', 'lost', ?)",
+            (now,),
+        )
+        conn.commit()
+        conn.close()
+
+        db = ChatDatabase(db_path=str(db_path))
+        assert [r.snippet for r in db.search("kept")] == ["**kept**"]
+        assert db.search("lost") == []
+
+        db.delete_session("s1")
+        with db.pool.reader() as reader:
+            assert reader.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+        db.close()
+
+    def test_incremental_auto_vacuum(self, temp_db):
+        """auto_vacuum이 INCREMENTAL로 설정됨."""
+        with temp_db.pool.reader() as conn:
+            assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    def test_prune_by_age(self, temp_db):
+        """max_age_days보다 오래된 세션만 삭제."""
+        old = [temp_db.create_session(title=f"old {i}") for i in range(5)]
+        recent = temp_db.create_session(title="recent")
+        for session in old:
+            self._backdate(temp_db, session.session_id, days=40)
+
+        pruned = temp_db.prune(RetentionPolicy(max_age_days=30), batch_size=2)
+
+        assert pruned == 5
+        assert [s.session_id for s in temp_db.list_sessions()] == [recent.session_id]
+
+    def test_prune_by_count_keeps_most_recent(self, temp_db):
+        """max_sessions개만 최근 활동순으로 남김."""
+        sessions = [temp_db.create_session(title=f"s{i}") for i in range(7)]
+        for age, session in enumerate(reversed(sessions)):
+            self._backdate(temp_db, session.session_id, days=age)
+
+        pruned = temp_db.prune(RetentionPolicy(max_sessions=3), batch_size=2)
+
+        assert pruned == 4
+        remaining = {s.session_id for s in temp_db.list_sessions()}
+        assert remaining == {s.session_id for s in sessions[-3:]}
+
+    def test_disabled_policy_prunes_nothing(self, temp_db):
+        """조건 없는 정책은 아무것도 삭제하지 않음."""
+        temp_db.create_session()
+        assert temp_db.prune(RetentionPolicy()) == 0
+        assert len(temp_db.list_sessions()) == 1
+
+    def test_compact_shrinks_file(self, tmp_path):
+        """대량 삭제 후 컴팩션으로 파일 크기 감소."""
+        db_path = tmp_path / "big.db"
+        db = ChatDatabase(db_path=str(db_path))
+        for i in range(50):
+            session = db.create_session()
+            db.add_messages(
+                session.session_id,
+                [ChatMessage(role="user", content="x" * 500) for _ in range(40)],
+            )
+            self._backdate(db, session.session_id, days=100)
+        with db.pool.writer() as conn:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        size_before = db_path.stat().st_size
+
+        result = db.compact(RetentionPolicy(max_age_days=30))
+
+        assert result.pruned_sessions == 50
+        assert result.freed_pages > 0
+        assert db_path.stat().st_size < size_before / 2
+        db.close()
+
+    def test_background_compactor(self, tmp_path):
+        """retention 설정 시 백그라운드 컴팩터가 주기적으로 정리."""
+        db = ChatDatabase(
+            db_path=str(tmp_path / "bg.db"),
+            retention=RetentionPolicy(max_sessions=1),
+            compaction_interval=0.05,
+        )
+        for _ in range(3):
+            db.create_session()
+
+        deadline = time.time() + 5
+        while len(db.list_sessions()) > 1 and time.time() < deadline:
+            time.sleep(0.05)
+
+        assert len(db.list_sessions()) == 1
+        db.close()
+
+
+class TestFastRecords:
+    """검증 없는 경량 레코드 조회 테스트."""
+
+    def test_message_records_match_models(self, temp_db):
+        """레코드가 get_messages와 같은 내용과 시간을 가짐."""
+        session = temp_db.create_session()
+        base = datetime(2025, 3, 1, 12, 0, 0, 123456)
+        temp_db.add_messages(
+            session.session_id,
+            [
+                ChatMessage(role="user", content=f"m{i}", timestamp=base + timedelta(seconds=i))
+                for i in range(5)
+            ],
+        )
+
+        records = temp_db.get_message_records(session.session_id)
+        models = temp_db.get_messages(session.session_id)
+
+        assert [r.to_model() for r in records] == models
+        assert records[0].timestamp == base
+        assert isinstance(records[0].timestamp_us, int)
+        assert len(temp_db.get_message_records(session.session_id, limit=2)) == 2
+
+    def test_session_records(self, temp_db):
+        """세션 레코드 정렬 및 전체 조회."""
+        sessions = [temp_db.create_session(title=f"s{i}") for i in range(3)]
+        temp_db.add_message(sessions[0].session_id, ChatMessage(role="user", content="x"))
+
+        records = temp_db.list_session_records(limit=None, order_by="created_at_asc")
+
+        assert [r.session_id for r in records] == [s.session_id for s in sessions]
+        assert records[0].message_count == 1
+        assert records[0].updated_at >= records[0].created_at
+        assert records[1].to_model() == temp_db.get_session(sessions[1].session_id)
+
+    def test_epoch_conversion(self):
+        """epoch 변환은 naive 시각을 그대로 보존하고 aware 값은 UTC로 맞춤."""
+        from datetime import timezone
+
+        from backend.records import from_epoch_us, to_epoch_us
+
+        naive = datetime(2025, 1, 2, 3, 4, 5, 678901)
+        assert from_epoch_us(to_epoch_us(naive)) == naive
+
+        kst = timezone(timedelta(hours=9))
+        assert to_epoch_us(datetime(2025, 1, 2, 12, 0, tzinfo=kst)) == to_epoch_us(
+            datetime(2025, 1, 2, 3, 0)
+        )
+
+    def test_upgrade_backfills_epoch_columns(self, tmp_path):
+        """v6 DB 업그레이드 시 기존 행의 epoch 컬럼을 채움."""
+        db_path = tmp_path / "v6.db"
+        conn = sqlite3.connect(db_path)
+        migrate(conn, target_version=6)
+        created = datetime(2025, 1, 1, 9, 0, 0)
+        conn.execute("INSERT INTO sessions VALUES ('s1', 't', ?, ?, 1)", (created, created))
+        conn.execute(
+            "INSERT INTO messages (session_id, role, content, timestamp) VALUES ('s1', 'user', 'hi', ?)",
+            (created.replace(microsecond=42),),
+        )
+        conn.commit()
+        conn.close()
+
+        db = ChatDatabase(db_path=str(db_path))
+        [record] = db.get_message_records("s1")
+        assert record.timestamp == created.replace(microsecond=42)
+        assert db.list_session_records()[0].created_at == created
+        db.close()
+
+
+class TestSessionSummaries:
+    """세션 요약 저장 (ContextBudget) 테스트."""
+
+    def test_save_and_get_summary(self, temp_db):
+        """저장한 요약을 다시 읽고, 다시 저장하면 덮어씀."""
+        session = temp_db.create_session()
+        assert temp_db.get_summary(session.session_id) is None
+
+        for covered in (4, 10):
+            temp_db.save_summary(
+                session.session_id,
+                SessionSummary(
+                    covered_messages=covered,
+                    covered_tokens=covered * 50,
+                    content=f"요약 {covered}",
+                    tokens=20,
+                    checksum="abc",
+                ),
+            )
+
+        summary = temp_db.get_summary(session.session_id)
+        assert summary.covered_messages == 10
+        assert summary.covered_tokens == 500
+        assert summary.content == "요약 10"
+
+    def test_summary_deleted_with_session(self, temp_db):
+        """세션을 지우면 요약도 함께 삭제."""
+        session = temp_db.create_session()
+        temp_db.save_summary(
+            session.session_id,
+            SessionSummary(covered_messages=2, content="요약", checksum="abc"),
+        )
+
+        temp_db.delete_session(session.session_id)
+
+        assert temp_db.get_summary(session.session_id) is None
@@ -0,0 +1,110 @@
+"""MCPAgent streaming tests with a fake chat model."""
+
+import json
+import re
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from backend import MCPAgent
+
+
+class FakeToolModel(GenericFakeChatModel):
+    """도구 호출을 스트리밍할 수 있는 가짜 모델 (응답은 공백 단위 토큰)."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        message = next(self.messages)
+        if isinstance(message, Exception):
+            raise message
+        if message.tool_calls:
+            chunks = [
+                {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                for i, c in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=chunks))
+            return
+        for token in re.split(r"(\s)", message.content):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=token))
+
+
+@tool
+def add(a: int, b: int) -> int:
+    """두 수를 더합니다."""
+    return a + b
+
+
+def make_agent(*responses) -> MCPAgent:
+    """가짜 모델 응답 순서대로 동작하는 에이전트."""
+    agent = MCPAgent()
+    model = FakeToolModel(messages=iter(responses))
+    agent.agent = create_react_agent(model, [add])
+    agent._initialized = True
+    return agent
+
+
+class TestAstreamChat:
+    """astream_chat 이벤트 스트림."""
+
+    async def test_tokens_only(self):
+        """도구 없이 답하면 토큰 이벤트만 나오고 이어 붙이면 최종 응답."""
+        agent = make_agent(AIMessage(content="안녕하세요 반갑습니다"))
+
+        history = [{"role": "user", "content": "hi"}]
+
+        events = [e async for e in agent.astream_chat("안녕", history=history)]
+
+        assert {e.type for e in events} == {"token"}
+        assert len(events) > 1
+        assert "".join(e.content for e in events) == "안녕하세요 반갑습니다"
+
+    async def test_tool_call_and_result(self):
+        """ReAct 루프의 도구 호출/결과가 답변 토큰보다 먼저 전달됨."""
+        agent = make_agent(
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "add", "args": {"a": 5, "b": 3}, "id": "call-1"}],
+            ),
+            AIMessage(content="결과는 8 입니다"),
+        )
+
+        events = [e async for e in agent.astream_chat("5 + 3을 계산해줘")]
+
+        call, result, *tokens = events
+        assert (call.type, call.tool_name, call.tool_args, call.tool_call_id) == (
+            "tool_call",
+            "add",
+            {"a": 5, "b": 3},
+            "call-1",
+        )
+        assert (result.type, result.content, result.tool_call_id) == ("tool_result", "8", "call-1")
+        assert "".join(t.content for t in tokens) == "결과는 8 입니다"
+
+    async def test_error_event(self):
+        """모델 오류는 예외 대신 error 이벤트로 전달."""
+        agent = make_agent(RuntimeError("LLM 연결 실패"))
+
+        events = [e async for e in agent.astream_chat("안녕")]
+
+        assert [e.type for e in events] == ["error"]
+        assert "LLM 연결 실패" in events[0].content
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("text", "text"),
+        ([{"type": "text", "text": "a"}, {"type": "image_url"}, "b"], "ab"),
+    ],
+)
+def test_content_text(content, expected):
+    """문자열/content block 목록에서 텍스트만 추출."""
+    from backend.langgraph_agent import _content_text
+
+    assert _content_text(content) == expected
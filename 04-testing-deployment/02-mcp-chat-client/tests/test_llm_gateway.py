@@ -0,0 +1,267 @@
+"""Tests for the shared LLM gateway."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from langchain_openai import ChatOpenAI
+
+from agentic_coding_workshop.llm_gateway import LLMGateway
+
+URL = "http://llm.test/v1/chat/completions"
+
+
+def completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "test-model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+    }
+
+
+class FakeServer:
+    """요청을 기록하고 정해진 응답을 돌려주는 가짜 OpenAI 호환 서버."""
+
+    def __init__(self, delay: float = 0.0, failures: list | None = None) -> None:
+        self.delay = delay
+        self.failures = list(failures or [])  # 앞쪽 요청에 돌려줄 상태 코드/예외
+        self.requests: list[dict] = []
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.requests.append(body)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        if self.failures:
+            failure = self.failures.pop(0)
+            if isinstance(failure, Exception):
+                raise failure
+            status, headers = failure if isinstance(failure, tuple) else (failure, {})
+            return httpx.Response(status, headers=headers, json={"error": "busy"})
+        prompt = body["messages"][-1]["content"]
+        if body.get("stream"):
+            return httpx.Response(200, content=sse(f"답: {prompt}"))
+        return httpx.Response(200, json=completion(f"답: {prompt}"))
+
+
+async def sse(content: str):
+    """스트리밍 응답 본문 (읽을 때 만들어지는 청크)."""
+    for token in content.split():
+        chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+        yield f"data: {json.dumps(chunk)}\n\n".encode()
+    yield b"data: [DONE]\n\n"
+
+
+class RecordingSleep:
+    def __init__(self) -> None:
+        self.delays: list[float] = []
+
+    async def __call__(self, delay: float) -> None:
+        self.delays.append(delay)
+
+
+def make_gateway(server: FakeServer, **options) -> LLMGateway:
+    options.setdefault("sleep", RecordingSleep())
+    options.setdefault("rng", lambda: 1.0)
+    return LLMGateway(transport_factory=lambda: httpx.MockTransport(server), **options)
+
+
+def chat_body(prompt: str, **extra) -> dict:
+    return {"model": "test-model", "messages": [{"role": "user", "content": prompt}], **extra}
+
+
+class TestConcurrency:
+    async def test_max_in_flight(self):
+        server = FakeServer(delay=0.02)
+        gateway = make_gateway(server, max_in_flight=2, coalesce=False)
+
+        responses = await asyncio.gather(
+            *(gateway.client.post(URL, json=chat_body(f"질문 {i}")) for i in range(8))
+        )
+
+        assert all(r.status_code == 200 for r in responses)
+        assert server.peak == 2
+        stats = gateway.stats()
+        assert (stats.upstream, stats.in_flight, stats.peak_in_flight) == (8, 0, 2)
+
+    async def test_streaming_response_holds_slot_until_closed(self):
+        server = FakeServer()
+        gateway = make_gateway(server, max_in_flight=1)
+
+        async with gateway.client.stream("POST", URL, json=chat_body("a", stream=True)) as r:
+            assert gateway.stats().in_flight == 1
+            await r.aread()
+        assert gateway.stats().in_flight == 0
+
+        response = await asyncio.wait_for(gateway.client.post(URL, json=chat_body("b")), 1)
+        assert response.status_code == 200
+
+
+class TestRetry:
+    async def test_retry_with_jittered_backoff(self):
+        server = FakeServer(failures=[503, 502])
+        sleep = RecordingSleep()
+        gateway = make_gateway(server, sleep=sleep, rng=lambda: 0.5, backoff=0.5)
+
+        response = await gateway.client.post(URL, json=chat_body("안녕"))
+
+        assert response.json()["choices"][0]["message"]["content"] == "답: 안녕"
+        assert sleep.delays == [0.25, 0.5]
+        stats = gateway.stats()
+        assert (stats.upstream, stats.retries, stats.failures, stats.in_flight) == (3, 2, 0, 0)
+
+    async def test_retry_after_header(self):
+        server = FakeServer(failures=[(429, {"retry-after": "2"})])
+        sleep = RecordingSleep()
+        gateway = make_gateway(server, sleep=sleep)
+
+        await gateway.client.post(URL, json=chat_body("안녕"))
+
+        assert sleep.delays == [2.0]
+
+    async def test_connection_error_retried(self):
+        server = FakeServer(failures=[httpx.ConnectError("refused")])
+        gateway = make_gateway(server)
+
+        response = await gateway.client.post(URL, json=chat_body("안녕"))
+
+        assert response.status_code == 200
+        assert gateway.stats().retries == 1
+
+    async def test_gives_up_after_retries(self):
+        server = FakeServer(failures=[503] * 5)
+        gateway = make_gateway(server, retries=2)
+
+        response = await gateway.client.post(URL, json=chat_body("안녕"))
+
+        assert response.status_code == 503
+        stats = gateway.stats()
+        assert (stats.upstream, stats.failures, stats.in_flight) == (3, 1, 0)
+
+    async def test_client_errors_not_retried(self):
+        server = FakeServer(failures=[400])
+        gateway = make_gateway(server)
+
+        response = await gateway.client.post(URL, json=chat_body("안녕"))
+
+        assert response.status_code == 400
+        assert gateway.stats().retries == 0
+
+
+class TestCoalescing:
+    async def test_identical_in_flight_requests_sent_once(self):
+        server = FakeServer(delay=0.02)
+        gateway = make_gateway(server)
+
+        responses = await asyncio.gather(
+            *(gateway.client.post(URL, json=chat_body("서울 날씨")) for _ in range(5)),
+            gateway.client.post(URL, json=chat_body("부산 날씨")),
+        )
+
+        assert len(server.requests) == 2
+        assert [r.json()["choices"][0]["message"]["content"] for r in responses[:5]] == [
+            "답: 서울 날씨"
+        ] * 5
+        assert gateway.stats().coalesced == 4
+
+    async def test_different_api_keys_not_coalesced(self):
+        server = FakeServer(delay=0.02)
+        gateway = make_gateway(server)
+
+        await asyncio.gather(
+            *(
+                gateway.client.post(
+                    URL, json=chat_body("서울 날씨"), headers={"Authorization": f"Bearer {key}"}
+                )
+                for key in ["key-a", "key-b", "key-a"]
+            )
+        )
+
+        assert len(server.requests) == 2
+        assert gateway.stats().coalesced == 1
+
+    async def test_finished_requests_not_reused(self):
+        server = FakeServer()
+        gateway = make_gateway(server)
+
+        await gateway.client.post(URL, json=chat_body("서울 날씨"))
+        await gateway.client.post(URL, json=chat_body("서울 날씨"))
+
+        assert len(server.requests) == 2
+
+    async def test_streaming_requests_not_coalesced(self):
+        server = FakeServer(delay=0.02)
+        gateway = make_gateway(server)
+
+        await asyncio.gather(
+            *(gateway.client.post(URL, json=chat_body("서울", stream=True)) for _ in range(3))
+        )
+
+        assert len(server.requests) == 3
+        assert gateway.stats().coalesced == 0
+
+    async def test_cancelled_leader_hands_over(self):
+        """먼저 보낸 요청이 취소되면 기다리던 요청이 직접 보냄."""
+        server = FakeServer(delay=0.05)
+        gateway = make_gateway(server)
+
+        leader = asyncio.create_task(gateway.client.post(URL, json=chat_body("서울")))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(gateway.client.post(URL, json=chat_body("서울")))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        response = await follower
+        assert response.json()["choices"][0]["message"]["content"] == "답: 서울"
+        assert len(server.requests) == 2
+
+
+class TestOpenAIClients:
+    """ChatOpenAI / AsyncOpenAI가 게이트웨이 클라이언트를 사용."""
+
+    async def test_chat_openai(self):
+        server = FakeServer(delay=0.02)
+        gateway = make_gateway(server)
+        llm = ChatOpenAI(
+            model="test-model",
+            base_url="http://llm.test/v1",
+            api_key="test-key",
+            **gateway.openai_kwargs(),
+        )
+
+        results = await asyncio.gather(llm.ainvoke("안녕"), llm.ainvoke("안녕"))
+
+        assert [r.content for r in results] == ["답: 안녕", "답: 안녕"]
+        assert len(server.requests) == 1
+
+    async def test_async_openai(self):
+        server = FakeServer(failures=[503])
+        gateway = make_gateway(server)
+        client = gateway.async_openai(base_url="http://llm.test/v1", api_key="test-key")
+
+        response = await client.chat.completions.create(
+            model="test-model", messages=[{"role": "user", "content": "안녕"}]
+        )
+
+        assert response.choices[0].message.content == "답: 안녕"
+        assert gateway.stats().retries == 1
+
+    def test_requires_positive_limit(self):
+        with pytest.raises(ValueError):
+            LLMGateway(max_in_flight=0)
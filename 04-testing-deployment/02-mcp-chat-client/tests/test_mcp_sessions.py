@@ -0,0 +1,406 @@
+"""Tests for persistent MCP sessions with a fake session factory."""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import anyio
+import pytest
+from mcp import types
+
+from backend import MCPSessionManager
+from backend.mcp_sessions import SERVER_METADATA_KEY, load_server_configs
+
+
+def make_tool(name: str) -> types.Tool:
+    return types.Tool(
+        name=name,
+        description=f"{name} 도구",
+        inputSchema={"type": "object", "properties": {"a": {"type": "integer"}}},
+    )
+
+
+class FakeServer:
+    """세션이 열릴 때마다 spawn 수를 세는 가짜 MCP 서버."""
+
+    def __init__(self, tools: list[str], fail_starts: int = 0) -> None:
+        self.tools = [make_tool(name) for name in tools]
+        self.fail_starts = fail_starts
+        self.spawns = 0
+        self.calls = 0
+        self.session: "FakeSession | None" = None
+
+    def crash(self) -> None:
+        """프로세스가 죽은 것처럼 현재 세션을 끊음."""
+        assert self.session is not None
+        self.session.alive = False
+
+    async def notify_tools_changed(self, tools: list[str]) -> None:
+        self.tools = [make_tool(name) for name in tools]
+        await self.session.message_handler(
+            types.ServerNotification(
+                types.ToolListChangedNotification(method="notifications/tools/list_changed")
+            )
+        )
+
+
+class FakeSession:
+    def __init__(self, server: FakeServer, message_handler) -> None:
+        self.server = server
+        self.message_handler = message_handler
+        self.alive = True
+
+    def _check(self) -> None:
+        if not self.alive:
+            raise anyio.ClosedResourceError
+
+    async def initialize(self) -> None:
+        self._check()
+
+    async def list_tools(self, cursor: str | None = None) -> types.ListToolsResult:
+        self._check()
+        # 한 페이지에 하나씩 (페이지네이션 확인)
+        index = int(cursor or 0)
+        next_cursor = str(index + 1) if index + 1 < len(self.server.tools) else None
+        return types.ListToolsResult(
+            tools=self.server.tools[index : index + 1], nextCursor=next_cursor
+        )
+
+    async def call_tool(self, name: str, arguments=None, **kwargs) -> types.CallToolResult:
+        self._check()
+        # 동시 호출이 서로 겹치도록 한 번 양보
+        await asyncio.sleep(0)
+        self._check()
+        self.server.calls += 1
+        return types.CallToolResult(
+            content=[types.TextContent(type="text", text=f"{name}:{json.dumps(arguments)}")]
+        )
+
+    async def send_ping(self) -> types.EmptyResult:
+        self._check()
+        return types.EmptyResult()
+
+
+def make_factory(servers: dict[str, FakeServer]):
+    @asynccontextmanager
+    async def factory(connection):
+        server = servers[connection["command"]]
+        server.spawns += 1
+        if server.fail_starts > 0:
+            server.fail_starts -= 1
+            raise ConnectionError("spawn failed")
+        session = FakeSession(server, connection["session_kwargs"]["message_handler"])
+        server.session = session
+        try:
+            yield session
+        finally:
+            # 실제 stdio 세션처럼 컨텍스트를 빠져나가면 더는 쓸 수 없음
+            session.alive = False
+
+    return factory
+
+
+def result_text(result) -> str:
+    """도구 결과(content block 목록)의 텍스트."""
+    return "".join(block["text"] for block in result)
+
+
+def make_manager(servers: dict[str, FakeServer], **kwargs) -> MCPSessionManager:
+    connections = {name: {"transport": "stdio", "command": name, "args": []} for name in servers}
+    kwargs.setdefault("ping_interval", 0)
+    return MCPSessionManager(connections, session_factory=make_factory(servers), **kwargs)
+
+
+@pytest.fixture
+async def managed():
+    servers = {"calc": FakeServer(["add", "mul"]), "weather": FakeServer(["forecast"])}
+    manager = make_manager(servers)
+    await manager.start()
+    yield manager, servers
+    await manager.close()
+
+
+class TestMCPSessionManager:
+    """서버별 영속 세션."""
+
+    async def test_start_loads_tools(self, managed):
+        """시작하면 모든 서버의 도구 목록을 (페이지를 넘기며) 가져옴."""
+        manager, _ = managed
+        tools = await manager.get_tools()
+        assert sorted(t.name for t in tools) == ["add", "forecast", "mul"]
+        assert {t.name: t.metadata[SERVER_METADATA_KEY] for t in tools} == {
+            "add": "calc",
+            "mul": "calc",
+            "forecast": "weather",
+        }
+        assert {s.name: s.state for s in manager.status()} == {"calc": "ready", "weather": "ready"}
+
+    async def test_session_reused_across_calls(self, managed):
+        """도구를 여러 번 호출해도 서버는 한 번만 시작."""
+        manager, servers = managed
+        add = next(t for t in await manager.get_tools() if t.name == "add")
+
+        for i in range(5):
+            assert result_text(await add.ainvoke({"a": i})) == f'add:{{"a": {i}}}'
+
+        assert servers["calc"].spawns == 1
+        assert servers["calc"].calls == 5
+
+    async def test_crashed_server_restarts_transparently(self, managed):
+        """세션이 끊긴 서버는 다음 호출에서 재시작하고, 기존 도구 객체도 계속 동작."""
+        manager, servers = managed
+        add = next(t for t in await manager.get_tools() if t.name == "add")
+
+        servers["calc"].crash()
+        assert result_text(await add.ainvoke({"a": 1})) == 'add:{"a": 1}'
+
+        assert servers["calc"].spawns == 2
+        status = {s.name: s for s in manager.status()}
+        assert status["calc"].state == "ready"
+        assert status["calc"].restarts == 1
+        assert status["weather"].restarts == 0
+
+    async def test_concurrent_calls_restart_crashed_server_once(self, managed):
+        """같은 죽은 세션에서 실패한 동시 호출들은 서버를 한 번만 재시작."""
+        manager, servers = managed
+
+        servers["calc"].crash()
+        results = await asyncio.gather(
+            *(manager.call_tool("calc", "add", {"a": i}) for i in range(3))
+        )
+
+        assert [r.content[0].text for r in results] == [f'add:{{"a": {i}}}' for i in range(3)]
+        assert servers["calc"].spawns == 2
+        assert {s.name: s.restarts for s in manager.status()}["calc"] == 1
+
+    async def test_health_check_restarts_unresponsive_server(self, managed):
+        """ping에 실패한 서버는 상태 확인에서 재시작."""
+        manager, servers = managed
+        servers["weather"].crash()
+
+        await manager.check_health()
+
+        assert servers["weather"].spawns == 2
+        assert servers["calc"].spawns == 1
+        status = {s.name: s for s in manager.status()}
+        assert status["weather"].state == "ready"
+        assert status["calc"].last_ping_ms is not None
+
+    async def test_list_changed_refreshes_only_on_change(self, managed):
+        """list_changed 알림은 실제로 목록이 바뀐 경우에만 tools_version을 올림."""
+        manager, servers = managed
+        version = manager.tools_version
+        tools = await manager.get_tools()
+
+        await servers["calc"].notify_tools_changed(["add", "mul"])  # 같은 목록
+        assert await manager.get_tools() is tools
+        assert manager.tools_version == version
+
+        await servers["calc"].notify_tools_changed(["add", "mul", "sub"])
+        await manager.check_health()
+        assert manager.tools_version == version + 1
+        assert sorted(t.name for t in await manager.get_tools()) == [
+            "add",
+            "forecast",
+            "mul",
+            "sub",
+        ]
+
+    async def test_failed_start_backs_off_then_recovers(self):
+        """시작에 실패한 서버는 다른 서버를 막지 않고, 백오프 후 재시작."""
+        servers = {"calc": FakeServer(["add"], fail_starts=2), "weather": FakeServer(["forecast"])}
+        manager = make_manager(servers)
+        await manager.start()
+        try:
+            status = {s.name: s for s in manager.status()}
+            assert status["calc"].state == "failed"
+            assert "spawn failed" in status["calc"].last_error
+            assert [t.name for t in await manager.get_tools()] == ["forecast"]
+
+            # 백오프 시간 전에는 재시도하지 않음
+            await manager.check_health()
+            assert servers["calc"].spawns == 1
+
+            for server in manager._servers.values():
+                server.next_retry_at = 0.0
+            await manager.check_health()  # 두 번째 실패
+            for server in manager._servers.values():
+                server.next_retry_at = 0.0
+            await manager.check_health()
+
+            assert servers["calc"].spawns == 3
+            assert {s.name: s.state for s in manager.status()}["calc"] == "ready"
+            assert sorted(t.name for t in await manager.get_tools()) == ["add", "forecast"]
+        finally:
+            await manager.close()
+
+    async def test_call_on_unreachable_server_raises(self):
+        """재시작도 실패하면 원인과 함께 오류."""
+        servers = {"calc": FakeServer(["add"])}
+        manager = make_manager(servers)
+        await manager.start()
+        try:
+            servers["calc"].crash()
+            servers["calc"].fail_starts = 1
+            with pytest.raises(RuntimeError, match="spawn failed"):
+                await manager.call_tool("calc", "add", {"a": 1})
+        finally:
+            await manager.close()
+
+    async def test_background_health_loop(self):
+        """ping_interval마다 백그라운드에서 상태 확인."""
+        servers = {"calc": FakeServer(["add"])}
+        manager = make_manager(servers, ping_interval=0.01)
+        await manager.start()
+        try:
+            servers["calc"].crash()
+            for _ in range(100):
+                if servers["calc"].spawns == 2:
+                    break
+                await asyncio.sleep(0.01)
+            assert servers["calc"].spawns == 2
+        finally:
+            await manager.close()
+        assert {s.state for s in manager.status()} == {"stopped"}
+
+
+class TestToolManifest:
+    """도구 매니페스트와 첫 호출 때 서버 시작 (lazy)."""
+
+    async def warm(self, path, servers):
+        """모든 서버를 띄워 매니페스트를 만듦."""
+        manager = make_manager(servers, manifest_path=path)
+        await manager.start()
+        await manager.close()
+
+    async def test_manifest_written_after_start(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        await self.warm(path, {"calc": FakeServer(["add", "mul"])})
+
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        assert [t["name"] for t in manifest["servers"]["calc"]["tools"]] == ["add", "mul"]
+
+    async def test_lazy_start_spawns_on_first_call(self, tmp_path):
+        """매니페스트에 도구가 있는 서버는 시작하지 않고, 첫 도구 호출 때 한 번 띄움."""
+        path = tmp_path / "manifest.json"
+        await self.warm(
+            path, {"calc": FakeServer(["add", "mul"]), "weather": FakeServer(["forecast"])}
+        )
+
+        servers = {"calc": FakeServer(["add", "mul"]), "weather": FakeServer(["forecast"])}
+        manager = make_manager(servers, manifest_path=path, lazy=True)
+        await manager.start()
+        try:
+            tools = await manager.get_tools()
+            assert sorted(t.name for t in tools) == ["add", "forecast", "mul"]
+            assert {s.name: (s.state, s.tool_count) for s in manager.status()} == {
+                "calc": ("idle", 2),
+                "weather": ("idle", 1),
+            }
+            # 상태 확인도 쓰지 않은 서버를 띄우지 않음
+            await manager.check_health()
+            assert [s.spawns for s in servers.values()] == [0, 0]
+
+            add = next(t for t in tools if t.name == "add")
+            await add.ainvoke({"a": 1})
+            await add.ainvoke({"a": 2})
+
+            assert (servers["calc"].spawns, servers["weather"].spawns) == (1, 0)
+            status = {s.name: s for s in manager.status()}
+            assert status["calc"].state == "ready"
+            assert status["calc"].restarts == 0
+            assert status["calc"].start_ms is not None
+        finally:
+            await manager.close()
+
+    async def test_concurrent_first_calls_spawn_once(self, tmp_path):
+        """idle 서버에 동시에 들어온 첫 호출들은 서버 하나를 함께 씀."""
+        path = tmp_path / "manifest.json"
+        await self.warm(path, {"calc": FakeServer(["add"])})
+
+        servers = {"calc": FakeServer(["add"])}
+        manager = make_manager(servers, manifest_path=path, lazy=True)
+        await manager.start()
+        try:
+            results = await asyncio.gather(
+                *(manager.call_tool("calc", "add", {"a": i}) for i in range(3))
+            )
+
+            assert [r.content[0].text for r in results] == [f'add:{{"a": {i}}}' for i in range(3)]
+            assert servers["calc"].spawns == 1
+            (status,) = manager.status()
+            assert (status.state, status.restarts) == ("ready", 0)
+        finally:
+            await manager.close()
+
+    async def test_changed_connection_ignores_entry(self, tmp_path):
+        """연결 설정이 바뀐 서버는 매니페스트 항목을 버리고 바로 시작."""
+        path = tmp_path / "manifest.json"
+        await self.warm(path, {"calc": FakeServer(["add"])})
+
+        servers = {"calc": FakeServer(["add"])}
+        manager = MCPSessionManager(
+            {"calc": {"transport": "stdio", "command": "calc", "args": ["--new"]}},
+            ping_interval=0,
+            session_factory=make_factory(servers),
+            manifest_path=path,
+            lazy=True,
+        )
+        await manager.start()
+        try:
+            assert servers["calc"].spawns == 1
+            assert {s.state for s in manager.status()} == {"ready"}
+        finally:
+            await manager.close()
+
+    async def test_stale_manifest_refreshed_on_spawn(self, tmp_path):
+        """서버를 띄워 보니 도구가 바뀌었으면 도구 버전을 올리고 매니페스트도 고침."""
+        path = tmp_path / "manifest.json"
+        await self.warm(path, {"calc": FakeServer(["add"])})
+
+        servers = {"calc": FakeServer(["add", "sub"])}
+        manager = make_manager(servers, manifest_path=path, lazy=True)
+        await manager.start()
+        try:
+            assert [t.name for t in await manager.get_tools()] == ["add"]
+            version = manager.tools_version
+
+            await manager.call_tool("calc", "add", {"a": 1})
+
+            assert manager.tools_version == version + 1
+            assert [t.name for t in await manager.get_tools()] == ["add", "sub"]
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+            assert [t["name"] for t in manifest["servers"]["calc"]["tools"]] == ["add", "sub"]
+        finally:
+            await manager.close()
+
+    async def test_corrupt_manifest_starts_servers(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text("{not json", encoding="utf-8")
+        servers = {"calc": FakeServer(["add"])}
+        manager = make_manager(servers, manifest_path=path, lazy=True)
+        await manager.start()
+        try:
+            assert servers["calc"].spawns == 1
+            assert json.loads(path.read_text(encoding="utf-8"))["servers"]["calc"]
+        finally:
+            await manager.close()
+
+
+def test_load_server_configs(tmp_path):
+    """활성화된 서버만 읽고, 파일이 없으면 빈 목록."""
+    path = tmp_path / "server_config.json"
+    assert load_server_configs(path) == []
+
+    path.write_text(
+        json.dumps(
+            {
+                "servers": [
+                    {"name": "on", "command": "uv", "transport": "stdio", "enabled": True},
+                    {"name": "off", "command": "uv", "transport": "stdio", "enabled": False},
+                ]
+            }
+        ),
+        encoding="utf-8",
+    )
+    assert [s.name for s in load_server_configs(path)] == ["on"]
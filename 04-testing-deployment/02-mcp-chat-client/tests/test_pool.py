@@ -0,0 +1,132 @@
+"""Connection pool tests for MCP Chat Client."""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend import ChatDatabase, ChatMessage
+from backend.pool import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """테이블 하나가 있는 임시 연결 풀."""
+    pool = ConnectionPool(tmp_path / "pool.db", readers=2, timeout=0.2)
+    with pool.writer() as conn:
+        conn.execute("CREATE TABLE items (value INTEGER)")
+
+    yield pool
+
+    pool.close()
+
+
+class TestConnectionPool:
+    """ConnectionPool 클래스 테스트."""
+
+    def test_writer_commits(self, pool):
+        """정상 종료 시 커밋."""
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items VALUES (1)")
+
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+    def test_writer_rolls_back_on_error(self, pool):
+        """예외 발생 시 롤백."""
+        with pytest.raises(ValueError):
+            with pool.writer() as conn:
+                conn.execute("INSERT INTO items VALUES (1)")
+                raise ValueError("boom")
+
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+    def test_reader_is_read_only(self, pool):
+        """reader 연결로는 쓰기 불가."""
+        with pool.reader() as conn:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO items VALUES (1)")
+
+    def test_read_during_open_write_transaction(self, pool):
+        """쓰기 트랜잭션이 열려 있어도 읽기는 기다리지 않음 (WAL)."""
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO items VALUES (1)")
+
+            def count() -> int:
+                with pool.reader() as reader:
+                    return reader.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+            # 다른 스레드의 reader는 커밋 전 상태를 즉시 읽음
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                assert executor.submit(count).result(timeout=2) == 0
+
+    def test_reader_checkout_timeout(self, pool):
+        """reader를 모두 사용 중이면 timeout 후 오류."""
+        with pool.reader(), pool.reader():
+            with pytest.raises(TimeoutError):
+                with pool.reader():
+                    pass
+
+    def test_readers_are_reused(self, pool):
+        """반환된 reader는 재사용."""
+        for _ in range(10):
+            with pool.reader():
+                pass
+
+        assert len(pool._all_readers) == 1
+
+    def test_memory_database_uses_writer(self):
+        """메모리 DB는 reader 없이 writer 연결을 공유."""
+        pool = ConnectionPool(":memory:")
+        try:
+            with pool.writer() as conn:
+                conn.execute("CREATE TABLE t (x INTEGER)")
+            with pool.reader() as conn:
+                assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+            assert pool.max_readers == 0
+        finally:
+            pool.close()
+
+    def test_closed_pool_rejects_checkout(self, pool):
+        """닫힌 풀은 체크아웃 거부."""
+        pool.close()
+        with pytest.raises(RuntimeError):
+            with pool.reader():
+                pass
+
+
+def test_concurrent_reads_and_writes(tmp_path):
+    """여러 스레드가 ChatDatabase를 공유해도 안전."""
+    db = ChatDatabase(db_path=str(tmp_path / "concurrent.db"), readers=4)
+    session = db.create_session(title="Concurrent")
+    errors: list[Exception] = []
+
+    def write(n: int) -> None:
+        try:
+            for i in range(n):
+                db.add_message(session.session_id, ChatMessage(role="user", content=str(i)))
+        except Exception as e:
+            errors.append(e)
+
+    def read(n: int) -> None:
+        try:
+            for _ in range(n):
+                db.get_messages(session.session_id)
+                db.list_sessions()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(50,)) for _ in range(2)]
+    threads += [threading.Thread(target=read, args=(50,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        assert errors == []
+        assert db.get_session(session.session_id).message_count == 100
+    finally:
+        db.close()
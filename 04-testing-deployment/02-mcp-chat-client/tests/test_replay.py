@@ -0,0 +1,170 @@
+"""Tests for the offline replay harness (scripted model, conversation loading, reports)."""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.prebuilt import create_react_agent
+
+from backend import ChatDatabase, ChatMessage, ReplayReport, StageStats, settings
+from backend.replay import (
+    WORKSHOP_SERVERS,
+    Conversation,
+    ScriptedChatModel,
+    compare_reports,
+    config_mismatch,
+    load_conversations,
+    run_replay,
+    script_tool_calls,
+    seed_conversations,
+)
+
+CALCULATOR = {"add", "multiply", "power", "divide", "get_weather", "get_forecast"}
+
+
+@tool
+def add(a: float, b: float) -> float:
+    """두 수를 더합니다."""
+    return a + b
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = ChatDatabase(db_path=str(tmp_path / "recorded.db"))
+    yield database
+    database.close()
+
+
+class TestScript:
+    """질문 → 도구 호출 규칙."""
+
+    def test_arithmetic_and_weather(self):
+        calls = script_tool_calls("3 ^ 2 그리고 10 / 4, 부산 예보도", CALCULATOR)
+
+        assert [(c["name"], c["args"]) for c in calls] == [
+            ("power", {"base": 3.0, "exponent": 2.0}),
+            ("divide", {"a": 10.0, "b": 4.0}),
+            ("get_forecast", {"city": "부산", "days": 3}),
+        ]
+
+    def test_only_available_tools(self):
+        assert script_tool_calls("지금 몇 시야? 서울 날씨는?", {"get_weather"}) == [
+            {"name": "get_weather", "args": {"city": "서울"}, "id": ""}
+        ]
+        assert script_tool_calls("안녕하세요", CALCULATOR) == []
+
+    def test_workshop_servers_exist(self):
+        assert all(path.exists() for path in WORKSHOP_SERVERS.values())
+
+
+class TestScriptedChatModel:
+    def test_tool_call_then_recorded_reply(self):
+        model = ScriptedChatModel(replies={"5 + 3은?": "8 입니다"}).bind_tools([add])
+        prompt = HumanMessage(content="5 + 3은?")
+
+        first = model.invoke([prompt])
+        (call,) = first.tool_calls
+        assert (call["name"], call["args"]) == ("add", {"a": 5.0, "b": 3.0})
+
+        result = ToolMessage(content="8.0", tool_call_id=call["id"])
+        assert model.invoke([prompt, first, result]).content == "8 입니다"
+
+    def test_without_tools_answers_directly(self):
+        model = ScriptedChatModel(replies={"5 + 3은?": "8 입니다"})
+
+        assert model.invoke([HumanMessage(content="5 + 3은?")]).content == "8 입니다"
+        assert model.invoke([HumanMessage(content="기록 없음")]).content == "네, 알겠습니다."
+
+    async def test_streams_reply_in_react_graph(self):
+        model = ScriptedChatModel(replies={"1 + 2": "답은 3 입니다"})
+        graph = create_react_agent(model, [add])
+
+        tokens = [
+            chunk.content
+            async for chunk, _ in graph.astream(
+                {"messages": [HumanMessage(content="1 + 2")]}, stream_mode="messages"
+            )
+            if isinstance(chunk, AIMessage) and chunk.content
+        ]
+
+        assert tokens == ["답은", " ", "3", " ", "입니다"]
+
+
+class TestConversations:
+    def test_seed_is_deterministic(self, tmp_path):
+        loaded = []
+        for name in ["a.db", "b.db"]:
+            database = ChatDatabase(db_path=str(tmp_path / name))
+            seed_conversations(database, sessions=3, turns=4, seed=7)
+            loaded.append([c.turns for c in load_conversations(database)])
+            database.close()
+
+        assert loaded[0] == loaded[1]
+        assert [len(turns) for turns in loaded[0]] == [4, 4, 4]
+
+    def test_load_pairs_user_and_assistant(self, db):
+        old = db.create_session(title="old")
+        db.add_messages(
+            old.session_id,
+            [
+                ChatMessage(role="user", content="질문1"),
+                ChatMessage(role="assistant", content="답1"),
+                ChatMessage(role="user", content="답 없는 질문"),
+                ChatMessage(role="user", content="질문2"),
+                ChatMessage(role="assistant", content="답2"),
+            ],
+        )
+        new = db.create_session(title="new")
+        db.add_message(new.session_id, ChatMessage(role="user", content="답 없음"))
+
+        assert load_conversations(db) == [Conversation("old", [("질문1", "답1"), ("질문2", "답2")])]
+        assert load_conversations(db, limit=1) == []
+        assert load_conversations(db, max_turns=1)[0].turns == [("질문1", "답1")]
+
+
+class TestReplay:
+    async def test_replay_without_servers(self, db):
+        seed_conversations(db, sessions=3, turns=2)
+        database_url = settings.database_url
+
+        report = await run_replay(load_conversations(db), servers=[], concurrency=2)
+
+        assert settings.database_url == database_url
+        assert (report.sessions, report.turns, report.errors) == (2, 4, 0)
+        assert report.turns_per_s > 0
+        assert report.config["servers"] == []
+        stages = {stage.stage: stage for stage in report.stages}
+        assert stages["turn"].count == 4
+        assert stages["db"].count > 0
+        assert report.tool_calls == {}
+
+    def test_compare_reports(self):
+        stage = StageStats(stage="tool", count=10, p50_ms=10, p95_ms=20)
+        baseline = ReplayReport(
+            config={"concurrency": 4},
+            turns_per_s=100,
+            turn_p50_ms=50,
+            turn_p95_ms=80,
+            stages=[stage],
+        )
+        current = ReplayReport(
+            config={"concurrency": 8},
+            turns_per_s=85,
+            turn_p50_ms=52,
+            turn_p95_ms=70,
+            stages=[stage.model_copy(update={"p95_ms": 30})],
+        )
+
+        deltas = {d.metric: d for d in compare_reports(current, baseline, threshold=0.1)}
+
+        assert deltas["turns_per_s"].change == pytest.approx(-0.15)
+        assert deltas["turns_per_s"].regression
+        assert not deltas["turn_p50_ms"].regression
+        assert not deltas["turn_p95_ms"].regression
+        assert deltas["tool.p95_ms"].regression
+        assert "peak_rss_mb" not in deltas
+        assert config_mismatch(current, baseline) == {"concurrency": (4, 8)}
+
+    def test_report_json_roundtrip(self):
+        report = ReplayReport(commit="abc1234", stages=[StageStats(stage="llm", count=1)])
+
+        assert ReplayReport.model_validate_json(report.model_dump_json()) == report
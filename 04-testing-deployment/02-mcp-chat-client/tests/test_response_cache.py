@@ -0,0 +1,284 @@
+"""Tests for the agent response cache."""
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.prebuilt import create_react_agent
+
+from backend import MCPAgent, ResponseCache
+from backend.mcp_sessions import SERVER_METADATA_KEY
+from backend.models import MCPServerConfig
+from backend.response_cache import (
+    cosine,
+    embed_ngrams,
+    keywords,
+    normalize_prompt,
+    side_effect_tools,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestNormalization:
+    def test_normalize_prompt(self):
+        assert normalize_prompt("  서울 날씨는   어때? ") == normalize_prompt("서울날씨는 어때")
+        assert normalize_prompt("What's UP!!") == "what'sup"
+
+    def test_paraphrase_similar_entity_change_not(self):
+        """어미가 다른 질문은 기준 이상, 도시가 바뀐 질문은 기준 미만."""
+        query = embed_ngrams("서울 날씨는 어때?")
+        assert cosine(query, embed_ngrams("서울 날씨는 어때요?")) >= 0.9
+        assert cosine(query, embed_ngrams("부산 날씨는 어때?")) < 0.9
+
+    def test_keywords_strip_particles(self):
+        assert keywords("서울 날씨를 알려줘!") == ["서울", "날씨", "알려줘"]
+        assert keywords("오후에 우산이 필요한지도") == ["오후", "우산", "필요한지"]
+        assert keywords("비가 와") == ["비가", "와"]
+
+
+class TestResponseCache:
+    """정확 일치 + 유사도 두 단계 캐시."""
+
+    def test_exact_hit(self, clock):
+        cache = ResponseCache(clock=clock)
+        assert cache.lookup("5 + 3을 계산해줘") is None
+
+        assert cache.store("5 + 3을 계산해줘", [], "8입니다")
+        hit = cache.lookup("5+3을 계산해줘!")
+
+        assert hit.response == "8입니다"
+        assert hit.tier == "exact"
+        stats = cache.stats()
+        assert (stats.exact_hits, stats.semantic_hits, stats.misses) == (1, 0, 1)
+
+    def test_semantic_hit(self, clock):
+        cache = ResponseCache(clock=clock)
+        cache.store("서울 날씨는 어때?", [], "맑음")
+
+        hit = cache.lookup("서울 날씨는 어때요?")
+
+        assert hit.tier == "semantic"
+        assert hit.response == "맑음"
+        assert cache.lookup("부산 날씨는 어때?") is None
+
+    def test_particle_paraphrase_hit(self, clock):
+        """조사만 다른 질문은 적중."""
+        cache = ResponseCache(clock=clock)
+        cache.store("서울 날씨 알려줘", [], "맑음")
+
+        hit = cache.lookup("서울 날씨를 알려줘")
+
+        assert (hit.tier, hit.response) == ("semantic", "맑음")
+
+    def test_keyword_change_in_long_question_not_hit(self, clock):
+        """긴 질문에서 도시 하나만 바뀌면 n-gram 유사도가 높아도 적중하지 않음."""
+        cache = ResponseCache(clock=clock)
+        question = "오늘 오후에 {} 날씨가 어떤지 자세하게 알려주고 우산이 필요한지도 말해줘"
+        cache.store(question.format("서울"), [], "서울은 맑음")
+
+        seoul, busan = (embed_ngrams(question.format(city)) for city in ("서울", "부산"))
+        assert cosine(seoul, busan) > 0.85
+        assert cache.lookup(question.format("부산")) is None
+        assert cache.lookup(question.format("서울") + "요").response == "서울은 맑음"
+
+    def test_numbers_must_match(self, clock):
+        """숫자가 다르면 유사도가 높아도 적중하지 않음."""
+        cache = ResponseCache(similarity=0.5, clock=clock)
+        cache.store("5 + 3을 계산해줘", [], "8입니다")
+
+        assert cache.lookup("5 + 4를 계산해줘") is None
+
+    def test_exact_only(self, clock):
+        cache = ResponseCache(similarity=1.0, clock=clock)
+        cache.store("서울 날씨는 어때?", [], "맑음")
+
+        assert cache.lookup("서울 날씨는 어때요?") is None
+        assert len(cache.index) == 0
+
+    def test_history_is_part_of_key(self, clock):
+        """후속 질문은 직전 대화가 같을 때만 적중."""
+        cache = ResponseCache(history_messages=2, clock=clock)
+        seoul = [
+            {"role": "user", "content": "서울 날씨는 어때?"},
+            {"role": "assistant", "content": "맑음"},
+        ]
+        busan = [
+            {"role": "user", "content": "부산 날씨는 어때?"},
+            {"role": "assistant", "content": "비"},
+        ]
+        cache.store("내일은?", seoul, "서울 내일 흐림")
+
+        assert cache.lookup("내일은?", seoul).response == "서울 내일 흐림"
+        assert cache.lookup("내일은?", busan) is None
+        # 키에 포함하는 범위보다 앞의 대화는 무관
+        assert cache.lookup("내일은?", [{"role": "user", "content": "안녕"}, *seoul]) is not None
+
+    def test_ttl(self, clock):
+        cache = ResponseCache(ttl=300, clock=clock)
+        cache.store("서울 날씨는 어때?", [], "맑음")
+
+        clock.now = 299
+        assert cache.lookup("서울 날씨는 어때요?") is not None
+        clock.now = 300
+        assert cache.lookup("서울 날씨는 어때?") is None
+        assert cache.lookup("서울 날씨는 어때요?") is None
+
+    def test_side_effect_tools_not_stored(self, clock):
+        cache = ResponseCache(side_effect_tools={"write_file"}, clock=clock)
+
+        assert not cache.store("메모 저장해줘", [], "저장했습니다", tools=["write_file"])
+        assert cache.store("메모 읽어줘", [], "내용", tools=["read_file"])
+
+        assert cache.lookup("메모 저장해줘") is None
+        assert cache.stats().skipped == 1
+
+    def test_eviction_prunes_index(self, clock):
+        cache = ResponseCache(maxsize=2, clock=clock)
+        for i in range(10):
+            cache.store(f"질문 번호 {i}", [], f"답 {i}")
+
+        assert len(cache.cache) == 2
+        assert len(cache.index) <= 4
+        assert cache.lookup("질문 번호 0") is None
+        assert cache.lookup("질문 번호 9").response == "답 9"
+
+    def test_latency_stats(self, clock):
+        cache = ResponseCache(clock=clock)
+        cache.lookup("서울 날씨는 어때?")
+        cache.store("서울 날씨는 어때?", [], "맑음", elapsed=1.5)
+        cache.lookup("서울 날씨는 어때?")
+
+        stats = cache.stats()
+        assert stats.hit_rate == 0.5
+        assert stats.miss_latency_ms == pytest.approx(1500)
+        assert 0 < stats.hit_latency_ms < 1500
+
+    def test_side_effect_tools_from_server_configs(self):
+        def make_tool(name: str, server: str) -> StructuredTool:
+            return StructuredTool.from_function(
+                func=lambda: "",
+                name=name,
+                description=name,
+                metadata={SERVER_METADATA_KEY: server},
+            )
+
+        def make_server(name: str, side_effects: list[str]) -> MCPServerConfig:
+            return MCPServerConfig(
+                name=name, command="uv", transport="stdio", side_effects=side_effects
+            )
+
+        tools = [
+            make_tool("write_file", "fs"),
+            make_tool("read_file", "fs"),
+            make_tool("now", "dt"),
+        ]
+        servers = [make_server("fs", ["write_file"]), make_server("dt", ["*"])]
+
+        assert side_effect_tools(tools, servers) == {"write_file", "now"}
+
+
+class CountingModel(GenericFakeChatModel):
+    """호출 횟수를 세는 가짜 모델."""
+
+    calls: int = 0
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+def make_agent(*responses, side_effects=(), checkpointer=None) -> tuple[MCPAgent, CountingModel]:
+    def write_file(path: str) -> str:
+        """파일을 씁니다."""
+        return "ok"
+
+    model = CountingModel(messages=iter(responses))
+    agent = MCPAgent(checkpointer=checkpointer)
+    agent.agent = create_react_agent(
+        model, [StructuredTool.from_function(write_file)], checkpointer=checkpointer
+    )
+    agent.response_cache = ResponseCache(side_effect_tools=side_effects)
+    agent._initialized = True
+    return agent, model
+
+
+class TestAgentResponseCache:
+    """MCPAgent.chat / astream_chat 앞의 응답 캐시."""
+
+    async def test_chat_hit_skips_agent(self):
+        agent, model = make_agent(AIMessage(content="맑음"))
+
+        assert await agent.chat("서울 날씨는 어때?") == "맑음"
+        assert await agent.chat("서울 날씨는 어때요?") == "맑음"
+
+        assert model.calls == 1
+        assert agent.response_cache_stats().semantic_hits == 1
+
+    async def test_stream_hit_yields_cached_answer(self):
+        agent, model = make_agent(AIMessage(content="맑음"))
+
+        first = [e async for e in agent.astream_chat("서울 날씨는 어때?")]
+        second = [e async for e in agent.astream_chat("서울 날씨는 어때?")]
+
+        assert "".join(e.content for e in first if e.type == "token") == "맑음"
+        assert [(e.type, e.content) for e in second] == [("token", "맑음")]
+        assert model.calls == 1
+
+    async def test_hit_recorded_in_session_thread(self):
+        """체크포인터를 쓰면 캐시 응답도 세션 스레드에 남아 다음 턴이 이어 감."""
+        agent, model = make_agent(
+            AIMessage(content="맑음"), AIMessage(content="비"), checkpointer=InMemorySaver()
+        )
+
+        assert await agent.chat("서울 날씨는 어때?", session_id="s1") == "맑음"
+        events = [e async for e in agent.astream_chat("서울 날씨는 어때?", session_id="s2")]
+        assert [(e.type, e.content) for e in events] == [("token", "맑음")]
+
+        thread = await agent._load_thread("s2")
+        assert [(m.type, m.content) for m in thread] == [
+            ("human", "서울 날씨는 어때?"),
+            ("ai", "맑음"),
+        ]
+
+        assert await agent.chat("부산은?", session_id="s2") == "비"
+        assert [m.content for m in await agent._load_thread("s2")][-2:] == ["부산은?", "비"]
+        assert model.calls == 2
+
+    async def test_side_effect_response_not_cached(self):
+        agent, model = make_agent(
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "write_file", "args": {"path": "a.txt"}, "id": "c1"}],
+            ),
+            AIMessage(content="저장했습니다"),
+            AIMessage(content="다시 저장했습니다"),
+            side_effects={"write_file"},
+        )
+
+        assert await agent.chat("a.txt에 저장해줘") == "저장했습니다"
+        assert await agent.chat("a.txt에 저장해줘") == "다시 저장했습니다"
+
+        assert model.calls == 3
+        assert agent.response_cache_stats().skipped == 1
+
+    async def test_errors_not_cached(self):
+        agent, model = make_agent(RuntimeError("LLM 연결 실패"), AIMessage(content="맑음"))
+
+        assert (await agent.chat("서울 날씨는 어때?")).startswith("❌")
+        assert await agent.chat("서울 날씨는 어때?") == "맑음"
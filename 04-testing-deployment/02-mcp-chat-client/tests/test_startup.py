@@ -0,0 +1,54 @@
+"""Tests for the cold-start profile report."""
+
+from backend.models import MCPServerStatus
+from backend.startup import StartupProfile, format_profile, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       200 |        200 |   _io
+import time:       300 |        500 | encodings
+import time:      1000 |       1000 |       pydantic.fields
+import time:      2000 |       3000 |     pydantic
+import time:      4000 |       4000 |     langgraph
+import time:       500 |       7500 |   backend.config
+import time:       100 |       7600 | backend
+import time:        50 |         50 | atexit
+"""
+
+
+def test_parse_importtime():
+    """backend 아래에서 import된 모듈만 최상위 패키지별로 합산."""
+    total_ms, breakdown = parse_importtime(IMPORTTIME)
+
+    assert total_ms == 7.6
+    assert breakdown == {"pydantic": 3.0, "langgraph": 4.0, "backend": 0.6}
+
+
+def test_parse_importtime_missing_module():
+    assert parse_importtime(IMPORTTIME, "streamlit") == (0.0, {})
+
+
+def test_format_profile():
+    profile = StartupProfile(
+        import_ms=1500,
+        import_breakdown={"openai": 700, "mcp": 400},
+        mcp_start_ms=900,
+        servers=[
+            MCPServerStatus(
+                name="tools", state="ready", tool_count=3, start_ms=850, list_tools_ms=40
+            ),
+            MCPServerStatus(name="files", state="idle", tool_count=4),
+        ],
+        graph_compile_ms=5,
+        initialize_ms=1000,
+        lazy=True,
+        manifest=True,
+    )
+
+    report = format_profile(profile)
+
+    assert "lazy, 매니페스트 있음" in report
+    assert "tools spawn" in report and "850 ms" in report
+    assert "매니페스트 도구 4개, 첫 호출 때 시작" in report
+    assert report.splitlines()[-1].endswith("2,500 ms")
+    assert profile.other_ms == 95
@@ -0,0 +1,206 @@
+"""Tests for the MCP tool-result cache."""
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool, ToolException
+from langgraph.graph import START, MessagesState, StateGraph
+
+from backend import ToolLimiter, ToolResultCache, create_tool_node
+from backend.mcp_sessions import SERVER_METADATA_KEY
+from backend.models import MCPServerConfig
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingTools:
+    """도구별 실제 실행 횟수를 세는 가짜 MCP 도구 모음."""
+
+    def __init__(self) -> None:
+        self.calls: dict[str, int] = {}
+        self.forecast = "맑음"
+
+    def tools(self) -> list[StructuredTool]:
+        async def add(a: int, b: int) -> int:
+            self.calls["add"] = self.calls.get("add", 0) + 1
+            return a + b
+
+        async def get_forecast(city: str) -> str:
+            self.calls["get_forecast"] = self.calls.get("get_forecast", 0) + 1
+            return f"{city}: {self.forecast}"
+
+        async def get_current_datetime() -> str:
+            self.calls["get_current_datetime"] = self.calls.get("get_current_datetime", 0) + 1
+            return f"now-{self.calls['get_current_datetime']}"
+
+        async def divide(a: int, b: int) -> float:
+            self.calls["divide"] = self.calls.get("divide", 0) + 1
+            if b == 0:
+                raise ToolException("0으로 나눌 수 없습니다")
+            return a / b
+
+        servers = {
+            "add": "calc",
+            "divide": "calc",
+            "get_forecast": "weather",
+            "get_current_datetime": "datetime",
+        }
+        return [
+            StructuredTool.from_function(
+                coroutine=func,
+                name=func.__name__,
+                description=f"{func.__name__} 도구",
+                metadata={SERVER_METADATA_KEY: servers[func.__name__]},
+                handle_tool_error=True,
+            )
+            for func in (add, divide, get_forecast, get_current_datetime)
+        ]
+
+
+async def run_turn(tools, cache: ToolResultCache, *calls: tuple[str, dict]) -> list:
+    """도구 노드 하나짜리 그래프로 한 턴의 도구 호출을 실행하고 ToolMessage 목록을 반환."""
+    message = AIMessage(
+        content="",
+        tool_calls=[{"name": n, "args": a, "id": f"c{i}"} for i, (n, a) in enumerate(calls)],
+    )
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", create_tool_node(tools, ToolLimiter(), cache))
+    graph.add_edge(START, "tools")
+    result = await graph.compile().ainvoke({"messages": [message]})
+    return result["messages"][1:]
+
+
+@pytest.fixture
+def fake():
+    return CountingTools()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_cache(clock, maxsize=512) -> ToolResultCache:
+    return ToolResultCache(
+        {
+            "calc": {"*": None},
+            "weather": {"get_forecast": 600},
+        },
+        maxsize=maxsize,
+        clock=clock,
+    )
+
+
+class TestToolResultCache:
+    """(서버, 도구, 인자) 단위 결과 캐시."""
+
+    async def test_repeated_call_skips_server(self, fake, clock):
+        """같은 인자(키 순서 무관)로 다시 부르면 실행하지 않고 같은 결과."""
+        cache = make_cache(clock)
+        tools = fake.tools()
+
+        (first,) = await run_turn(tools, cache, ("add", {"a": 5, "b": 3}))
+        (second,) = await run_turn(tools, cache, ("add", {"b": 3, "a": 5}))
+
+        assert first.content == second.content == "8"
+        assert second.tool_call_id == "c0"
+        assert fake.calls["add"] == 1
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+    async def test_different_args_miss(self, fake, clock):
+        cache = make_cache(clock)
+        tools = fake.tools()
+
+        await run_turn(tools, cache, ("add", {"a": 1, "b": 1}), ("add", {"a": 1, "b": 2}))
+
+        assert fake.calls["add"] == 2
+
+    async def test_undeclared_tool_not_cached(self, fake, clock):
+        """선언하지 않은 도구는 매번 실행."""
+        cache = make_cache(clock)
+        tools = fake.tools()
+
+        first = await run_turn(tools, cache, ("get_current_datetime", {}))
+        second = await run_turn(tools, cache, ("get_current_datetime", {}))
+
+        assert first[0].content != second[0].content
+        assert fake.calls["get_current_datetime"] == 2
+        assert cache.stats().misses == 0  # 캐시 대상이 아니면 집계하지 않음
+
+    async def test_ttl_expiry(self, fake, clock):
+        """TTL이 지나면 다시 실행해 새 값을 받음."""
+        cache = make_cache(clock)
+        tools = fake.tools()
+
+        await run_turn(tools, cache, ("get_forecast", {"city": "서울"}))
+        fake.forecast = "비"
+        clock.now = 599
+        (cached,) = await run_turn(tools, cache, ("get_forecast", {"city": "서울"}))
+        clock.now = 600
+        (fresh,) = await run_turn(tools, cache, ("get_forecast", {"city": "서울"}))
+
+        assert cached.content == "서울: 맑음"
+        assert fresh.content == "서울: 비"
+        assert fake.calls["get_forecast"] == 2
+
+    async def test_errors_not_cached(self, fake, clock):
+        """오류 결과는 캐시하지 않음."""
+        cache = make_cache(clock)
+        tools = fake.tools()
+
+        for _ in range(2):
+            (result,) = await run_turn(tools, cache, ("divide", {"a": 1, "b": 0}))
+            assert result.status == "error"
+
+        assert fake.calls["divide"] == 2
+        assert cache.stats().size == 0
+
+    async def test_lru_eviction(self, fake, clock):
+        cache = make_cache(clock, maxsize=2)
+        tools = fake.tools()
+
+        for a in range(3):
+            await run_turn(tools, cache, ("add", {"a": a, "b": 0}))
+        await run_turn(tools, cache, ("add", {"a": 0, "b": 0}))
+
+        assert fake.calls["add"] == 4
+        assert cache.stats().evictions == 2
+
+    async def test_invalidate_server(self, fake, clock):
+        """서버 단위로 비우면 그 서버 결과만 다시 실행."""
+        cache = make_cache(clock)
+        tools = fake.tools()
+        calls = [("add", {"a": 1, "b": 2}), ("get_forecast", {"city": "서울"})]
+
+        await run_turn(tools, cache, *calls)
+        assert cache.invalidate("calc") == 1
+        await run_turn(tools, cache, *calls)
+
+        assert fake.calls == {"add": 2, "get_forecast": 1}
+
+    def test_policy(self):
+        """도구 이름 선언이 "*"보다 우선."""
+        cache = ToolResultCache({"calc": {"*": None, "random": 1}})
+
+        assert cache.policy("calc", "add") == (True, None)
+        assert cache.policy("calc", "random") == (True, 1)
+        assert cache.policy("weather", "get_forecast") == (False, None)
+        assert cache.policy(None, "add") == (False, None)
+
+    def test_from_server_configs(self):
+        servers = [
+            MCPServerConfig(
+                name="weather", command="uv", transport="stdio", cache={"get_forecast": 600}
+            ),
+            MCPServerConfig(name="datetime", command="uv", transport="stdio"),
+        ]
+        cache = ToolResultCache.from_server_configs(servers, maxsize=8)
+
+        assert cache.policies == {"weather": {"get_forecast": 600}}
+        assert cache.stats().maxsize == 8
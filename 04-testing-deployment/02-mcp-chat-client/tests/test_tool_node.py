@@ -0,0 +1,168 @@
+"""Tests for concurrent tool execution with per-server limits."""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+from langgraph.graph import START, MessagesState, StateGraph
+
+from backend import ToolLimiter, create_tool_node
+from backend.mcp_sessions import SERVER_METADATA_KEY
+from backend.models import MCPServerConfig
+
+
+class InFlight:
+    """서버별 동시 실행 수의 최댓값을 기록."""
+
+    def __init__(self) -> None:
+        self.current: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.total = 0
+        self.peak_total = 0
+
+    def make_tool(self, name: str, server: str, delay: float) -> StructuredTool:
+        async def run(city: str) -> str:
+            self.current[server] = self.current.get(server, 0) + 1
+            self.total += 1
+            self.peak[server] = max(self.peak.get(server, 0), self.current[server])
+            self.peak_total = max(self.peak_total, self.total)
+            try:
+                await asyncio.sleep(delay)
+                return f"{name}:{city}"
+            finally:
+                self.current[server] -= 1
+                self.total -= 1
+
+        return StructuredTool.from_function(
+            coroutine=run,
+            name=name,
+            description=f"{name} 도구",
+            metadata={SERVER_METADATA_KEY: server},
+        )
+
+
+def tool_calls(*calls: tuple[str, str]) -> dict:
+    message = AIMessage(
+        content="",
+        tool_calls=[
+            {"name": name, "args": {"city": city}, "id": f"c{i}"}
+            for i, (name, city) in enumerate(calls)
+        ],
+    )
+    return {"messages": [message]}
+
+
+async def run_tools(tools, limiter: ToolLimiter, *calls: tuple[str, str]) -> list:
+    """도구 노드 하나짜리 그래프로 실행하고 ToolMessage 목록을 반환."""
+    graph = StateGraph(MessagesState)
+    graph.add_node("tools", create_tool_node(tools, limiter))
+    graph.add_edge(START, "tools")
+    result = await graph.compile().ainvoke(tool_calls(*calls))
+    return result["messages"][1:]
+
+
+@pytest.fixture
+def inflight():
+    return InFlight()
+
+
+class TestToolLimiter:
+    """ToolNode 동시 실행 제한."""
+
+    async def test_independent_calls_run_concurrently(self, inflight):
+        """여러 서버의 도구 호출이 함께 실행되어 가장 느린 호출만큼 걸림."""
+        tools = [
+            inflight.make_tool("get_weather", "weather", 0.1),
+            inflight.make_tool("get_current_datetime", "datetime", 0.1),
+        ]
+        start = time.perf_counter()
+        messages = await run_tools(
+            tools,
+            ToolLimiter(max_concurrency=8),
+            ("get_weather", "서울"),
+            ("get_weather", "부산"),
+            ("get_weather", "제주"),
+            ("get_current_datetime", "서울"),
+        )
+        elapsed = time.perf_counter() - start
+
+        assert [m.content for m in messages] == [
+            "get_weather:서울",
+            "get_weather:부산",
+            "get_weather:제주",
+            "get_current_datetime:서울",
+        ]
+        assert inflight.peak_total == 4
+        assert elapsed < 0.3
+
+    async def test_server_limit(self, inflight):
+        """서버별 상한은 그 서버에만 적용되고 다른 서버는 계속 동시 실행."""
+        tools = [
+            inflight.make_tool("get_weather", "weather", 0.05),
+            inflight.make_tool("get_current_datetime", "datetime", 0.05),
+        ]
+        await run_tools(
+            tools,
+            ToolLimiter(max_concurrency=8, server_limits={"weather": 1}),
+            ("get_weather", "서울"),
+            ("get_weather", "부산"),
+            ("get_current_datetime", "서울"),
+            ("get_current_datetime", "부산"),
+        )
+
+        assert inflight.peak == {"weather": 1, "datetime": 2}
+
+    async def test_total_limit_one_is_sequential(self, inflight):
+        """전체 상한이 1이면 순차 실행."""
+        tools = [
+            inflight.make_tool("get_weather", "weather", 0.01),
+            inflight.make_tool("get_current_datetime", "datetime", 0.01),
+        ]
+        await run_tools(
+            tools,
+            ToolLimiter(max_concurrency=1),
+            ("get_weather", "서울"),
+            ("get_current_datetime", "서울"),
+        )
+
+        assert inflight.peak_total == 1
+
+    async def test_timeout_becomes_error_message(self, inflight):
+        """제한 시간을 넘긴 호출만 오류 메시지가 되고 나머지 결과는 그대로."""
+        tools = [
+            inflight.make_tool("get_weather", "weather", 5),
+            inflight.make_tool("get_current_datetime", "datetime", 0.01),
+        ]
+        limiter = ToolLimiter(timeout=1.0, server_timeouts={"weather": 0.05})
+        start = time.perf_counter()
+        weather, now = await run_tools(
+            tools, limiter, ("get_weather", "서울"), ("get_current_datetime", "서울")
+        )
+
+        assert weather.status == "error"
+        assert "시간 초과" in weather.content
+        assert now.status == "success"
+        assert now.content == "get_current_datetime:서울"
+        assert time.perf_counter() - start < 1.0
+        assert inflight.total == 0  # 취소된 호출도 정리됨
+
+    def test_from_server_configs(self):
+        """server_config.json의 서버별 설정을 읽음 (없는 값은 기본값)."""
+        servers = [
+            MCPServerConfig(
+                name="weather", command="uv", transport="stdio", max_concurrency=2, timeout=5
+            ),
+            MCPServerConfig(name="datetime", command="uv", transport="stdio"),
+        ]
+        limiter = ToolLimiter.from_server_configs(servers, max_concurrency=4, timeout=30)
+
+        assert limiter.server_limits == {"weather": 2}
+        assert limiter.timeout_for("weather") == 5
+        assert limiter.timeout_for("datetime") == 30
+        assert limiter.timeout_for(None) == 30
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError):
+            ToolLimiter(max_concurrency=0)
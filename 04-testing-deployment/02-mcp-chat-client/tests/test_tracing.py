@@ -0,0 +1,280 @@
+"""Tests for tracing spans, OTLP export and Prometheus metrics."""
+
+import asyncio
+import json
+import urllib.request
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+from langgraph.graph import START, MessagesState, StateGraph
+from langgraph.prebuilt import create_react_agent
+
+from backend import ChatDatabase, ChatMessage, MCPAgent
+from backend.langgraph_agent import _LLMSpanHandler
+from backend.tool_node import create_tool_node
+from backend.tracing import (
+    FileSpanExporter,
+    LatencyMetrics,
+    MetricsServer,
+    OTLPHttpSpanExporter,
+    Tracer,
+)
+
+from .test_langgraph_agent import FakeToolModel, add
+
+
+class RecordingExporter:
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+
+    @property
+    def spans(self) -> list[dict]:
+        return [
+            span
+            for request in self.requests
+            for resource in request["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+    def export(self, request: dict) -> None:
+        self.requests.append(request)
+
+    def close(self) -> None:
+        pass
+
+
+def attributes(span: dict) -> dict:
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+@pytest.fixture
+def exporter():
+    return RecordingExporter()
+
+
+@pytest.fixture
+def tracer(exporter):
+    tracer = Tracer(exporters=[exporter], export_interval=60)
+    yield tracer
+    tracer.close()
+
+
+class TestTracer:
+    """구간 부모 관계와 내보내기."""
+
+    async def test_children_share_trace_across_tasks_and_threads(self, tracer, exporter):
+        def db_write() -> None:
+            with tracer.span("db.write_messages", stage="db"):
+                pass
+
+        async def tool() -> None:
+            with tracer.span("tool.call", stage="tool", tool="add"):
+                await asyncio.to_thread(db_write)
+
+        with tracer.span("turn", stage="turn") as turn:
+            await asyncio.gather(tool(), tool())
+        tracer.flush()
+
+        spans = {s["spanId"]: s for s in exporter.spans}
+        assert len(spans) == 5
+        assert {s["traceId"] for s in spans.values()} == {turn.trace_id}
+        for span in spans.values():
+            if span["name"] == "tool.call":
+                assert span["parentSpanId"] == turn.span_id
+                assert attributes(span) == {"tool": "add"}
+            elif span["name"] == "db.write_messages":
+                assert spans[span["parentSpanId"]]["name"] == "tool.call"
+        assert "parentSpanId" not in spans[turn.span_id]
+
+    def test_error_recorded_and_reraised(self, tracer, exporter):
+        with pytest.raises(ValueError):
+            with tracer.span("llm.call", stage="llm"):
+                raise ValueError("boom")
+        tracer.flush()
+
+        (span,) = exporter.spans
+        assert span["status"] == {"code": 2, "message": "ValueError: boom"}
+        (stats,) = tracer.metrics.stats()
+        assert (stats.stage, stats.count, stats.errors, stats.error_rate) == ("llm", 1, 1, 1.0)
+
+    def test_close_flushes_to_file(self, tmp_path):
+        path = tmp_path / "traces.jsonl"
+        tracer = Tracer(exporters=[FileSpanExporter(path)], export_interval=60)
+        with tracer.span("turn", stage="turn", session_id="s1", cached=False):
+            pass
+        tracer.close()
+
+        (line,) = path.read_text(encoding="utf-8").splitlines()
+        request = json.loads(line)
+        resource = request["resourceSpans"][0]
+        assert attributes(resource["resource"]) == {"service.name": "mcp-chat-client"}
+        (span,) = resource["scopeSpans"][0]["spans"]
+        assert attributes(span) == {"session_id": "s1", "cached": False}
+        assert int(span["endTimeUnixNano"]) >= int(span["startTimeUnixNano"])
+
+    def test_otlp_http_exporter(self):
+        received = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received.append((str(request.url), json.loads(request.content)))
+            return httpx.Response(200, json={})
+
+        exporter = OTLPHttpSpanExporter("http://collector:4318/")
+        exporter._client = httpx.Client(transport=httpx.MockTransport(handler))
+        tracer = Tracer(exporters=[exporter], export_interval=60)
+        with tracer.span("turn"):
+            pass
+        tracer.close()
+
+        ((url, body),) = received
+        assert url == "http://collector:4318/v1/traces"
+        assert body["resourceSpans"][0]["scopeSpans"][0]["spans"][0]["name"] == "turn"
+
+    def test_metrics_only_without_exporters(self):
+        tracer = Tracer()
+        with tracer.span("db.get_messages", stage="db"):
+            pass
+        with tracer.span("unstaged"):
+            pass
+
+        assert [s.stage for s in tracer.metrics.stats()] == ["db"]
+
+
+class TestLatencyMetrics:
+    def test_percentiles_use_recent_window(self):
+        metrics = LatencyMetrics(window=100)
+        for ms in range(1, 201):
+            metrics.observe("llm", ms / 1000)
+
+        (stats,) = metrics.stats()
+        assert stats.count == 200
+        assert (stats.p50_ms, stats.p95_ms) == pytest.approx((150.0, 195.0))
+
+    def test_stage_order(self):
+        metrics = LatencyMetrics()
+        for stage in ["render", "custom", "db", "turn"]:
+            metrics.observe(stage, 0.01)
+
+        assert [s.stage for s in metrics.stats()] == ["turn", "db", "render", "custom"]
+
+    def test_prometheus_text(self):
+        metrics = LatencyMetrics(buckets=(0.1, 1.0))
+        metrics.observe("tool", 0.05)
+        metrics.observe("tool", 0.5, error=True)
+        metrics.observe("tool", 3.0)
+        metrics.count_tool_call("calc", "add", "success")
+        metrics.count_tool_call("calc", 'we"ird', "error")
+
+        lines = metrics.render().splitlines()
+
+        assert 'chat_stage_duration_seconds_bucket{stage="tool",le="0.1"} 1' in lines
+        assert 'chat_stage_duration_seconds_bucket{stage="tool",le="1"} 2' in lines
+        assert 'chat_stage_duration_seconds_bucket{stage="tool",le="+Inf"} 3' in lines
+        assert 'chat_stage_duration_seconds_sum{stage="tool"} 3.550000' in lines
+        assert 'chat_stage_errors_total{stage="tool"} 1' in lines
+        assert 'chat_tool_calls_total{server="calc",tool="add",status="success"} 1' in lines
+        assert 'chat_tool_calls_total{server="calc",tool="we\\"ird",status="error"} 1' in lines
+
+    def test_metrics_server(self):
+        metrics = LatencyMetrics()
+        metrics.observe("turn", 0.2)
+        server = MetricsServer(metrics, port=0)
+        try:
+            url = f"http://127.0.0.1:{server.port}"
+            with urllib.request.urlopen(f"{url}/metrics") as response:
+                body = response.read().decode()
+                assert response.headers["Content-Type"].startswith("text/plain")
+            assert 'chat_stage_duration_seconds_count{stage="turn"} 1' in body
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{url}/other")
+        finally:
+            server.close()
+
+
+class TestInstrumentation:
+    """에이전트 턴, 도구 노드, DB 구간."""
+
+    async def test_agent_turn_spans(self, tracer, exporter):
+        agent = MCPAgent()
+        agent.tracer = tracer
+        agent._callbacks = [_LLMSpanHandler(tracer)]
+        model = FakeToolModel(
+            messages=iter(
+                [
+                    AIMessage(
+                        content="",
+                        tool_calls=[{"name": "add", "args": {"a": 5, "b": 3}, "id": "call-1"}],
+                    ),
+                    AIMessage(content="결과는 8 입니다"),
+                ]
+            )
+        )
+        agent.agent = create_react_agent(model, create_tool_node([add], tracer=tracer))
+        agent._initialized = True
+
+        events = [e async for e in agent.astream_chat("5 + 3을 계산해줘", session_id=None)]
+        assert events[-1].type == "token"
+        tracer.flush()
+
+        spans = exporter.spans
+        (turn,) = [s for s in spans if s["name"] == "turn"]
+        assert sorted(s["name"] for s in spans if s.get("parentSpanId") == turn["spanId"]) == [
+            "llm.call",
+            "llm.call",
+            "tool.call",
+        ]
+        (tool,) = [s for s in spans if s["name"] == "tool.call"]
+        assert attributes(tool)["status"] == "success"
+        assert tracer.metrics.tool_calls() == {("", "add", "success"): 1}
+        assert [s.stage for s in tracer.metrics.stats()] == ["turn", "llm", "tool"]
+
+    async def test_turn_error(self, tracer):
+        agent = MCPAgent()
+        agent.tracer = tracer
+        agent.agent = create_react_agent(FakeToolModel(messages=iter([RuntimeError("실패")])), [])
+        agent._initialized = True
+
+        assert (await agent.chat("안녕")).startswith("❌")
+
+        turn = next(s for s in tracer.metrics.stats() if s.stage == "turn")
+        assert turn.errors == 1
+
+    async def test_tool_error_counted(self, tracer):
+        def broken(a: int) -> int:
+            """항상 실패."""
+            raise ValueError("nope")
+
+        graph = StateGraph(MessagesState)
+        graph.add_node(
+            "tools", create_tool_node([StructuredTool.from_function(broken)], tracer=tracer)
+        )
+        graph.add_edge(START, "tools")
+        message = AIMessage(
+            content="", tool_calls=[{"name": "broken", "args": {"a": 1}, "id": "c1"}]
+        )
+        with pytest.raises(ValueError):
+            await graph.compile().ainvoke({"messages": [message]})
+
+        assert tracer.metrics.tool_calls() == {("", "broken", "error"): 1}
+        assert tracer.metrics.stats()[0].errors == 1
+
+    def test_database_spans(self, tmp_path, monkeypatch, tracer, exporter):
+        monkeypatch.setattr("backend.tracing._tracer", tracer)
+        db = ChatDatabase(db_path=str(tmp_path / "chat.db"))
+        try:
+            session = db.create_session()
+            db.add_message(session.session_id, ChatMessage(role="user", content="안녕"))
+            db.get_messages(session.session_id)
+        finally:
+            db.close()
+        tracer.flush()
+
+        assert [s["name"] for s in exporter.spans] == [
+            "db.create_session",
+            "db.write_messages",
+            "db.get_messages",
+        ]
+        assert tracer.metrics.stats()[0].count == 3
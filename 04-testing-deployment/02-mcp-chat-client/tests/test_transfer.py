@@ -0,0 +1,159 @@
+"""Export/import tests for chat history."""
+
+import importlib.util
+import io
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend import ChatDatabase, ChatMessage
+from backend.transfer import main
+
+requires_pyarrow = pytest.mark.skipif(
+    importlib.util.find_spec("pyarrow") is None, reason="pyarrow 미설치"
+)
+
+FORMATS = [
+    "jsonl",
+    pytest.param("parquet", marks=requires_pyarrow),
+    pytest.param("arrow", marks=requires_pyarrow),
+]
+
+
+@pytest.fixture
+def source_db(tmp_path):
+    """세션 3개, 메시지 25개가 있는 원본 DB."""
+    db = ChatDatabase(db_path=str(tmp_path / "source.db"))
+    base = datetime(2025, 1, 1, 9, 0, 0, 123456)
+    for s, count in enumerate([5, 7, 13]):
+        session = db.create_session(title=f"세션 {s}")
+        db.add_messages(
+            session.session_id,
+            [
+                ChatMessage(
+                    role="user" if i % 2 == 0 else "assistant",
+                    content=f'서울 날씨 {s}-{i} "quoted"\n줄바꿈',
+                    timestamp=base + timedelta(minutes=s * 10 + i),
+                )
+                for i in range(count)
+            ],
+        )
+    yield db
+    db.close()
+
+
+def roundtrip(source: ChatDatabase, target: ChatDatabase, format: str, chunk_size: int = 4):
+    """source를 내보내 target으로 가져오고 (export 결과, import 결과)를 반환."""
+    stream = io.StringIO() if format == "jsonl" else io.BytesIO()
+    exported = source.export(stream, format=format, chunk_size=chunk_size)
+    stream.seek(0)
+    imported = target.import_(stream, format=format, chunk_size=chunk_size)
+    return exported, imported
+
+
+def snapshot(db: ChatDatabase) -> dict:
+    """비교용 세션/메시지 스냅샷."""
+    return {
+        s.session_id: (s.title, s.created_at, s.message_count, db.get_messages(s.session_id))
+        for s in db.list_sessions(limit=1000)
+    }
+
+
+@pytest.mark.parametrize("format", FORMATS)
+class TestTransfer:
+    """형식별 내보내기/가져오기."""
+
+    def test_roundtrip(self, source_db, tmp_path, format):
+        """내보낸 기록을 그대로 가져옴 (청크 경계 포함)."""
+        target = ChatDatabase(db_path=str(tmp_path / "target.db"))
+
+        exported, imported = roundtrip(source_db, target, format)
+
+        assert exported.sessions == imported.sessions == 3
+        assert exported.messages == imported.messages == 25
+        assert snapshot(target) == snapshot(source_db)
+        assert len(target.search("날씨")) == 20  # FTS 색인도 채워짐
+        target.close()
+
+    def test_reimport_skips_existing_sessions(self, source_db, tmp_path, format):
+        """같은 파일을 다시 가져와도 중복되지 않음."""
+        target = ChatDatabase(db_path=str(tmp_path / "target.db"))
+        roundtrip(source_db, target, format)
+
+        _, imported = roundtrip(source_db, target, format)
+
+        assert imported.sessions == 0
+        assert imported.skipped_sessions == 3
+        assert imported.messages == 0
+        assert target.stats().total_messages == 25
+        target.close()
+
+
+def test_import_keeps_search_trigger(source_db, tmp_path):
+    """가져오기 후에도 새 메시지가 검색 색인에 반영됨 (실패한 청크는 롤백)."""
+    target = ChatDatabase(db_path=str(tmp_path / "target.db"))
+    roundtrip(source_db, target, "jsonl")
+
+    # content NOT NULL 위반으로 트리거를 내린 뒤 청크 트랜잭션이 실패
+    session_id = target.list_sessions()[0].session_id
+    bad = io.StringIO(
+        json.dumps(
+            {
+                "type": "message",
+                "session_id": session_id,
+                "role": "user",
+                "content": None,
+                "timestamp": "2025-01-01T00:00:00",
+            }
+        )
+        + "\n"
+    )
+    with pytest.raises(sqlite3.IntegrityError):
+        target.import_(bad)
+
+    session = target.create_session()
+    target.add_message(session.session_id, ChatMessage(role="user", content="트리거확인"))
+    assert len(target.search("트리거확인")) == 1
+    target.close()
+
+
+class TestJsonl:
+    """JSONL 형식 세부 사항."""
+
+    def test_sessions_before_messages(self, source_db):
+        """세션 레코드가 메시지보다 먼저 나오고 한글이 그대로 기록됨."""
+        stream = io.StringIO()
+        source_db.export(stream)
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+        kinds = [r["type"] for r in records]
+        assert kinds == ["session"] * 3 + ["message"] * 25
+        assert "서울" in stream.getvalue()
+
+    def test_unknown_record_type(self, source_db):
+        """알 수 없는 레코드 타입은 오류."""
+        with pytest.raises(ValueError, match="1번째 줄"):
+            source_db.import_(io.StringIO('{"type": "bogus"}\n'))
+
+    def test_invalid_format(self, source_db):
+        """지원하지 않는 형식."""
+        with pytest.raises(ValueError):
+            source_db.export(io.StringIO(), format="csv")
+
+
+@requires_pyarrow
+def test_cli_roundtrip(source_db, tmp_path, capsys):
+    """CLI로 파일 내보내기/가져오기 (확장자로 형식 추정)."""
+    backup = tmp_path / "backup.parquet"
+    target_path = tmp_path / "cli.db"
+    source_db.flush()
+
+    main(["export", str(source_db.db_path), str(backup)])
+    main(["import", str(target_path), str(backup), "--chunk-size", "7"])
+
+    assert "메시지 25개" in capsys.readouterr().err
+    target = ChatDatabase(db_path=str(target_path))
+    assert snapshot(target) == snapshot(source_db)
+    target.close()
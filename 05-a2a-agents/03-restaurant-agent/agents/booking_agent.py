@@ -5,17 +5,24 @@
 
 from config import settings
 from fastapi import FastAPI
-from openai import OpenAI
 from pydantic import BaseModel
 from tools.restaurant_search import RestaurantSearchTool
 
+from agentic_coding_workshop.llm_gateway import LLMGateway
+
 app = FastAPI(title="Restaurant Booking Agent")
 
 # 도구 초기화
 search_tool = RestaurantSearchTool()
 
-# LLM 클라이언트
-llm = OpenAI(base_url=settings.base_url, api_key=settings.api_key)
+# LLM 클라이언트 (연결 풀 공유, 동시 요청 상한, 재시도, 같은 요청 합치기)
+gateway = LLMGateway(
+    max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+    retries=settings.LLM_RETRIES,
+    backoff=settings.LLM_RETRY_BACKOFF,
+    coalesce=settings.LLM_COALESCE,
+)
+llm = gateway.async_openai(base_url=settings.base_url, api_key=settings.api_key)
 
 
 class TaskRequest(BaseModel):
@@ -95,7 +102,7 @@ async def extract_restaurant_name(message: str) -> str:
 
 레스토랑 이름만 응답하세요. 목록에 없으면 "없음"이라고 응답하세요."""
 
-    response = llm.chat.completions.create(
+    response = await llm.chat.completions.create(
         model=settings.model_name,
         messages=[{"role": "user", "content": prompt}],
         temperature=0
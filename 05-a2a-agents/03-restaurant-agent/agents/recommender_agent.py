@@ -11,10 +11,11 @@ import httpx
 from config import settings
 from fastapi import FastAPI
 from memory.mem0_client import Mem0Client
-from openai import OpenAI
 from pydantic import BaseModel
 from tools.restaurant_search import RestaurantSearchTool
 
+from agentic_coding_workshop.llm_gateway import LLMGateway
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -32,8 +33,14 @@ app = FastAPI(title="Restaurant Recommender Agent")
 mem0_client = Mem0Client()
 search_tool = RestaurantSearchTool()
 
-# LLM 클라이언트
-llm = OpenAI(base_url=settings.base_url, api_key=settings.api_key)
+# LLM 클라이언트 (연결 풀 공유, 동시 요청 상한, 재시도, 같은 요청 합치기)
+gateway = LLMGateway(
+    max_in_flight=settings.LLM_MAX_IN_FLIGHT,
+    retries=settings.LLM_RETRIES,
+    backoff=settings.LLM_RETRY_BACKOFF,
+    coalesce=settings.LLM_COALESCE,
+)
+llm = gateway.async_openai(base_url=settings.base_url, api_key=settings.api_key)
 
 # Function Calling Tools 정의
 tools = [
@@ -229,7 +236,7 @@ async def receive_task(task: TaskRequest):
     a2a_calls = []
 
     # LLM Function Calling
-    response_llm = llm.chat.completions.create(
+    response_llm = await llm.chat.completions.create(
         model=settings.model_name,
         messages=[{"role": "user", "content": task.message}],
         tools=tools,
@@ -267,7 +274,7 @@ async def receive_task(task: TaskRequest):
         response = "선호도가 저장되었습니다."
 
     elif function_name == "query_preference":
-        response = handle_query_preference(task.user_id)
+        response = await handle_query_preference(task.user_id)
 
     elif function_name == "recommend_restaurant":
         response, calls = await handle_recommendation(task.user_id, task.message)
@@ -283,7 +290,7 @@ async def receive_task(task: TaskRequest):
     return TaskResponse(task_id=task.task_id, response=response, a2a_calls=a2a_calls)
 
 
-def handle_query_preference(user_id: str) -> str:
+async def handle_query_preference(user_id: str) -> str:
     """선호도 조회 핸들러 (신규 기능 - Mem0 기반 intelligent 응답)"""
     try:
         preferences = mem0_client.get_all_preferences(user_id)
@@ -302,7 +309,7 @@ def handle_query_preference(user_id: str) -> str:
 **중요: 반드시 한국어로 답변하세요.**
 자연스럽고 친근하게 답변하되, 모든 선호도를 언급해주세요."""
 
-        response = llm.chat.completions.create(
+        response = await llm.chat.completions.create(
             model=settings.model_name,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7
@@ -368,7 +375,7 @@ async def extract_category(preferences: list[str]) -> str:
 
 위 중 가장 적합한 하나만 응답하세요."""
 
-    response = llm.chat.completions.create(
+    response = await llm.chat.completions.create(
         model=settings.model_name,
         messages=[{"role": "user", "content": prompt}],
         temperature=0
@@ -53,6 +53,14 @@ class Settings:
             return self.OPENAI_API_KEY
         return "ollama"  # Ollama는 API 키 불필요
 
+    # LLM 게이트웨이 (agentic_coding_workshop/llm_gateway.py, 에이전트 서버 프로세스별)
+    LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))  # 동시에 보내는 요청 수
+    LLM_RETRIES: int = int(os.getenv("LLM_RETRIES", "3"))  # 연결 오류, 429/5xx 재시도 횟수
+    LLM_RETRY_BACKOFF: float = float(
+        os.getenv("LLM_RETRY_BACKOFF", "0.5")
+    )  # 첫 재시도 최대 대기(초)
+    LLM_COALESCE: bool = os.getenv("LLM_COALESCE", "true").lower() == "true"  # 같은 요청 합치기
+
     # mem0 클라우드 설정
     MEM0_API_KEY: str = os.getenv("MEM0_API_KEY", "")
 
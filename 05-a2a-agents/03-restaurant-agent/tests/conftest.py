@@ -5,7 +5,7 @@ pytest fixtures for testing
 """
 
 import json
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from tools.restaurant_search import RestaurantSearchTool
@@ -72,9 +72,9 @@ def mock_llm(request):
     with patch("agents.recommender_agent.llm") as mock_recommender_llm, \
          patch("agents.booking_agent.llm") as mock_booking_llm:
 
-        # chat.completions.create를 mock
-        mock_recommender_llm.chat.completions.create.return_value = mock_response
-        mock_booking_llm.chat.completions.create.return_value = mock_response
+        # chat.completions.create를 mock (AsyncOpenAI라서 await하는 코루틴)
+        mock_recommender_llm.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_booking_llm.chat.completions.create = AsyncMock(return_value=mock_response)
 
         yield
 
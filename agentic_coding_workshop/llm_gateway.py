@@ -0,0 +1,351 @@
+"""Shared LLM gateway for OpenAI-compatible backends (Ollama, OpenAI).
+
+채팅 클라이언트의 `MCPAgent`와 레스토랑 에이전트들은 각자 `ChatOpenAI`/`OpenAI`
+클라이언트를 만들어서 HTTP 연결 풀을 공유하지 않았고, Ollama에 보내는 동시 요청 수에도
+제한이 없었습니다. 로컬 Ollama는 동시에 처리할 수 있는 요청이 몇 개뿐이라 한꺼번에 몰리면
+느려지거나 503을 돌려줍니다.
+
+`LLMGateway`는 프로세스 안의 모든 LLM 호출이 함께 쓰는 httpx 클라이언트를 만들고,
+그 아래 전송 계층에서 다음을 처리합니다.
+
+- 연결 재사용: keep-alive 연결 풀 (`max_connections`, `keepalive_expiry`)
+- 동시 요청 상한: 진행 중인 요청이 `max_in_flight`개를 넘으면 게이트웨이에서 대기
+  (스트리밍 응답은 본문을 다 읽거나 닫을 때 슬롯을 반환)
+- 재시도: 연결 오류와 429/5xx 응답을 지터를 넣은 지수 백오프로 다시 보냄
+  (`Retry-After` 헤더가 있으면 따름). 재시도는 게이트웨이가 하므로 SDK 재시도는 끔
+- 요청 합치기: 본문까지 똑같은 요청이 이미 진행 중이면 새로 보내지 않고 그 응답을 나눠 받음
+  (스트리밍 요청은 제외, 끝난 요청의 응답을 저장하지는 않음)
+
+클라이언트는 이벤트 루프 밖(모듈 import 시점)에서 만들어도 되며, 루프에 묶이는 연결 풀과
+세마포어는 요청을 보낼 때 이벤트 루프별로 따로 만듭니다.
+
+사용 예:
+    >>> gateway = LLMGateway(max_in_flight=4)
+    >>> llm = ChatOpenAI(model=..., base_url=..., **gateway.openai_kwargs())
+    >>> client = gateway.async_openai(base_url=..., api_key=...)  # openai.AsyncOpenAI
+    >>> gateway.stats().coalesced
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass, replace
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# 다시 보내는 응답 상태 코드 (요청 한도 초과, 서버 과부하/일시 오류)
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+# 요청 합치기 키에 넣는 인증 헤더 (OpenAI: Authorization, Azure OpenAI: api-key)
+_AUTH_HEADERS = ("authorization", "api-key")
+
+
+@dataclass
+class GatewayStats:
+    """게이트웨이 요청 카운터."""
+
+    requests: int = 0  # 클라이언트가 보낸 요청
+    upstream: int = 0  # 실제로 서버에 보낸 요청 (재시도 포함)
+    coalesced: int = 0  # 진행 중인 같은 요청의 응답을 나눠 받은 요청
+    retries: int = 0
+    failures: int = 0  # 재시도 후에도 실패한 요청 (오류 또는 재시도 대상 응답)
+    in_flight: int = 0
+    waiting: int = 0  # 동시 요청 슬롯을 기다리는 요청
+    peak_in_flight: int = 0
+
+
+@dataclass
+class _SharedResponse:
+    """합쳐진 요청들이 나눠 받는 응답 (본문은 디코딩 전 바이트)."""
+
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    extensions: dict[str, Any]
+
+    def build(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            stream=httpx.ByteStream(self.content),
+            request=request,
+            extensions=self.extensions,
+        )
+
+
+class _SlotStream(httpx.AsyncByteStream):
+    """본문을 다 읽거나 닫을 때 동시 요청 슬롯을 반환하는 응답 스트림."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+            self._release = _noop
+
+
+def _noop() -> None:
+    pass
+
+
+def _hold_slot(response: httpx.Response, release: Callable[[], None]) -> httpx.Response:
+    """응답 본문이 닫힐 때 슬롯을 반환하도록 연결 (이미 다 읽은 응답이면 바로 반환)."""
+    if response.is_closed:
+        release()
+    else:
+        response.stream = _SlotStream(response.stream, release)
+    return response
+
+
+class _Abandoned(Exception):
+    """합친 요청을 대표로 보내던 요청이 취소됨 (기다리던 요청은 직접 다시 보냄)."""
+
+
+class _LoopState:
+    """이벤트 루프 하나에 묶인 전송 계층, 동시 요청 슬롯, 진행 중인 요청."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_in_flight: int) -> None:
+        self.transport = transport
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.pending: dict[str, asyncio.Future[_SharedResponse]] = {}
+
+
+class GatewayTransport(httpx.AsyncBaseTransport):
+    """동시 요청 상한, 재시도, 요청 합치기를 처리하는 httpx 전송 계층."""
+
+    def __init__(self, gateway: "LLMGateway") -> None:
+        self.gateway = gateway
+        self._loops: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            state = _LoopState(self.gateway._transport_factory(), self.gateway.max_in_flight)
+            self._loops[loop] = state
+        return state
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self.gateway._stats
+        stats.requests += 1
+        state = self._state()
+        key = self._coalesce_key(request)
+        if key is None:
+            return await self._send(state, request)
+
+        while (pending := state.pending.get(key)) is not None:
+            try:
+                shared = await asyncio.shield(pending)
+            except _Abandoned:
+                continue
+            stats.coalesced += 1
+            return shared.build(request)
+
+        future: asyncio.Future[_SharedResponse] = asyncio.get_running_loop().create_future()
+        state.pending[key] = future
+        try:
+            response = await self._send(state, request)
+            try:
+                content = b"".join([chunk async for chunk in response.stream])
+            finally:
+                await response.aclose()
+            shared = _SharedResponse(
+                response.status_code, response.headers, content, dict(response.extensions)
+            )
+            future.set_result(shared)
+        except BaseException as e:
+            future.set_exception(_Abandoned() if isinstance(e, asyncio.CancelledError) else e)
+            # 기다리는 요청이 없으면 "예외를 가져가지 않음" 경고가 나지 않도록 표시
+            future.exception()
+            raise
+        finally:
+            del state.pending[key]
+        return shared.build(request)
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 연결 풀 닫기."""
+        state = self._loops.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state.transport.aclose()
+
+    def _coalesce_key(self, request: httpx.Request) -> str | None:
+        """합칠 수 있는 요청의 키 (스트리밍이 아닌 POST, URL + 인증 헤더 + 본문 해시).
+
+        API 키가 다른 요청은 본문이 같아도 다른 사용자의 요청이므로 합치지 않습니다.
+        """
+        if not self.gateway.coalesce or request.method != "POST":
+            return None
+        body = request.content
+        try:
+            if json.loads(body).get("stream"):
+                return None
+        except (ValueError, AttributeError):
+            return None
+        digest = hashlib.sha256(str(request.url).encode())
+        for header in _AUTH_HEADERS:
+            digest.update(b"\0" + request.headers.get(header, "").encode())
+        digest.update(b"\0" + body)
+        return digest.hexdigest()
+
+    async def _send(self, state: _LoopState, request: httpx.Request) -> httpx.Response:
+        """슬롯을 잡고 보내며, 재시도 대상이면 백오프 후 다시 보냄."""
+        gateway = self.gateway
+        stats = gateway._stats
+        attempt = 0
+        while True:
+            release = await self._acquire(state.slots)
+            try:
+                stats.upstream += 1
+                response = await state.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                release()
+                if attempt >= gateway.retries:
+                    stats.failures += 1
+                    raise
+                delay = gateway.backoff_delay(attempt)
+                logger.warning(f"LLM 요청 실패, {delay:.2f}초 후 다시 시도: {e!r}")
+            except BaseException:
+                release()
+                raise
+            else:
+                if response.status_code not in gateway.retry_statuses:
+                    return _hold_slot(response, release)
+                if attempt >= gateway.retries:
+                    stats.failures += 1
+                    return _hold_slot(response, release)
+                await response.aclose()
+                release()
+                delay = gateway.backoff_delay(attempt, response.headers.get("retry-after"))
+                logger.warning(f"LLM 응답 {response.status_code}, {delay:.2f}초 후 다시 시도")
+            attempt += 1
+            stats.retries += 1
+            await gateway.sleep(delay)
+
+    async def _acquire(self, slots: asyncio.Semaphore) -> Callable[[], None]:
+        stats = self.gateway._stats
+        stats.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            stats.waiting -= 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                stats.in_flight -= 1
+                slots.release()
+
+        return release
+
+
+class LLMGateway:
+    """프로세스 안의 LLM 호출이 함께 쓰는 연결 풀 + 동시 요청 상한 + 재시도 + 요청 합치기."""
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        max_connections: int = 32,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 120.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8.0,
+        coalesce: bool = True,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        transport_factory: Callable[[], httpx.AsyncBaseTransport] | None = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """게이트웨이 생성.
+
+        Args:
+            max_in_flight: 동시에 서버로 보내는 요청 수 (이벤트 루프별)
+            max_connections: 연결 풀 크기 (keep-alive 연결 수도 같음)
+            keepalive_expiry: 쉬는 연결을 닫기까지 시간 (초)
+            timeout: 요청 제한 시간 (초)
+            retries: 재시도 횟수 (0이면 재시도 안 함)
+            backoff: 첫 재시도의 최대 대기 시간 (초, 재시도마다 두 배)
+            max_backoff: 재시도 대기 시간 상한 (초)
+            coalesce: 진행 중인 같은 요청 합치기
+            retry_statuses: 다시 보낼 응답 상태 코드
+            transport_factory: 실제 전송 계층 생성 함수 (테스트용, 기본은 keep-alive 연결 풀)
+            sleep: 대기 함수 (테스트용)
+            rng: 0~1 난수 함수 (테스트용)
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight는 1 이상이어야 합니다: {max_in_flight}")
+        self.max_in_flight = max_in_flight
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 10.0))
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.coalesce = coalesce
+        self.retry_statuses = frozenset(retry_statuses)
+        self.sleep = sleep
+        self.rng = rng
+        self._transport_factory = transport_factory or (
+            lambda: httpx.AsyncHTTPTransport(limits=self.limits)
+        )
+        self._stats = GatewayStats()
+        self._transport = GatewayTransport(self)
+        self.client = httpx.AsyncClient(transport=self._transport, timeout=self.timeout)
+
+    def backoff_delay(self, attempt: int, retry_after: str | None = None) -> float:
+        """attempt번째 재시도 전 대기 시간 (full jitter, Retry-After 우선)."""
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_backoff)
+            except ValueError:
+                pass
+        return self.rng() * min(self.max_backoff, self.backoff * 2**attempt)
+
+    def openai_kwargs(self) -> dict[str, Any]:
+        """`ChatOpenAI`에 넘길 인자 (공유 클라이언트, SDK 재시도 끔)."""
+        return {"http_async_client": self.client, "max_retries": 0}
+
+    def async_openai(self, base_url: str, api_key: str, **kwargs: Any) -> Any:
+        """공유 클라이언트를 쓰는 `openai.AsyncOpenAI`."""
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            http_client=self.client,
+            max_retries=0,
+            **kwargs,
+        )
+
+    def stats(self) -> GatewayStats:
+        """요청 카운터 복사본."""
+        return replace(self._stats)
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 연결 풀 닫기 (클라이언트는 다른 루프에서 계속 사용 가능)."""
+        await self._transport.aclose()